@@ -105,32 +105,40 @@ class IsolationForestDetector:
         Returns:
             AnomalyDetectionResult
         """
-        if not self.is_fitted:
-            raise ValueError("모델이 학습되지 않았습니다")
-
-        # 스케일링
-        features_scaled = self.scaler.transform(features.reshape(1, -1))
-
-        # 예측
-        prediction = self.model.predict(features_scaled)[0]  # -1 or 1
-        anomaly_score = self.model.score_samples(features_scaled)[0]
+        return self.detect_batch(features.reshape(1, -1))[0]
 
-        is_anomaly = (prediction == -1)
+    def detect_batch(self, X: np.ndarray) -> List[AnomalyDetectionResult]:
+        """
+        이상 탐지 일괄 실행 (스케일링/점수 계산을 배치 전체에 1회 수행)
 
-        # 심각도 계산
-        severity = self._calculate_severity(anomaly_score)
+        Args:
+            X: 특징 배열 (n_samples, n_features)
 
-        # 설명 생성
-        explanation = self._generate_explanation(features, anomaly_score, is_anomaly)
+        Returns:
+            샘플별 AnomalyDetectionResult 리스트
+        """
+        if not self.is_fitted:
+            raise ValueError("모델이 학습되지 않았습니다")
 
-        return AnomalyDetectionResult(
-            is_anomaly=is_anomaly,
-            anomaly_score=anomaly_score,
-            severity=severity,
-            explanation=explanation,
-            detected_at=datetime.now(),
-            features_analyzed={'features': features.tolist(), 'score': float(anomaly_score)}
-        )
+        # 스케일링
+        X_scaled = self.scaler.transform(X)
+
+        # 예측 (predict 는 decision_function = score_samples - offset_ 의 부호와 동일)
+        anomaly_scores = self.model.score_samples(X_scaled)
+        is_anomaly = (anomaly_scores - self.model.offset_) < 0
+
+        detected_at = datetime.now()
+        return [
+            AnomalyDetectionResult(
+                is_anomaly=bool(is_anomaly[i]),
+                anomaly_score=float(anomaly_scores[i]),
+                severity=self._calculate_severity(anomaly_scores[i]),
+                explanation=self._generate_explanation(X[i], anomaly_scores[i], bool(is_anomaly[i])),
+                detected_at=detected_at,
+                features_analyzed={'features': X[i].tolist(), 'score': float(anomaly_scores[i])}
+            )
+            for i in range(X.shape[0])
+        ]
 
     def _calculate_severity(self, anomaly_score: float) -> int:
         """
@@ -255,12 +263,14 @@ class StatisticalAnomalyDetector:
 class RealTimeAnomalyMonitor:
     """실시간 이상 탐지 모니터"""
 
-    def __init__(self, detector: IsolationForestDetector):
+    def __init__(self, detector: IsolationForestDetector, inference_service=None):
         """
         Args:
             detector: 학습된 이상 탐지 모델
+            inference_service: InferenceService (지정 시 동시 요청을 마이크로배치로 묶어 탐지)
         """
         self.detector = detector
+        self.inference_service = inference_service
         self.alert_history = []
         self.consecutive_anomalies = 0
 
@@ -284,7 +294,10 @@ class RealTimeAnomalyMonitor:
                 'recommendation': str
             }
         """
-        result = self.detector.detect(features)
+        if self.inference_service is not None:
+            result = self.inference_service.detect_anomaly(features)
+        else:
+            result = self.detector.detect(features)
 
         # 연속 이상 카운트
         if result.is_anomaly:
@@ -0,0 +1,288 @@
+"""
+불량 예측 특징 생성 (컬럼 단위 벡터화)
+DefectPredictor.prepare_features 와 같은 16개 특징 행렬을 레코드 루프 없이 생성
+
+입력:
+- 레코드 리스트 (prepare_features 호환, 레코드에 담긴 값을 그대로 사용)
+- pandas DataFrame / 컬럼 dict (원시 측정값에서 파생 특징 계산)
+- QualityMeasurement 쿼리셋 (values_list 로 컬럼만 조회)
+
+파생 특징은 제품(group)별 측정시각 순서로 계산하며 현재 측정의 판정은 사용하지 않는다(라벨 누수 방지).
+출력 행 순서는 입력 행 순서와 같다 (쿼리셋 입력은 제품 → 측정시각 → ID 순).
+- diff_from_prev: 직전 측정값과의 차이
+- diff_from_mean: 직전 window 개 측정 평균과의 차이
+- recent_defect_rate: 직전 window 개 측정 중 규격 이탈 비율
+- consecutive_within_spec: 직전까지 연속 규격 내 측정 개수
+
+cache_dir 를 지정하면 특징 행렬을 .npy 로 저장하고 memory-map 으로 다시 읽는다.
+캐시 키: 쿼리 + 건수 + 최신 ID (+ 최종 수정시각, updated_at 컬럼이 있을 때) + 호출자 토큰
+(updated_at 이 없는 모델의 기존 행 수정은 호출자가 cache_token 으로 구분)
+"""
+import hashlib
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+
+DEFECT_FEATURE_NAMES = [
+    'measurement_value', 'measurement_std', 'measurement_range',
+    'hour_of_day', 'is_day_shift', 'is_night_shift',
+    'machine_age_days', 'machine_usage_hours', 'days_since_maintenance',
+    'temperature', 'humidity', 'pressure',
+    'diff_from_prev', 'diff_from_mean',
+    'recent_defect_rate', 'consecutive_within_spec'
+]
+
+# 레코드/컬럼에 값이 없을 때 기본값 (prepare_features 와 동일)
+FEATURE_DEFAULTS = {name: 0.0 for name in DEFECT_FEATURE_NAMES}
+FEATURE_DEFAULTS.update({'temperature': 20.0, 'humidity': 50.0, 'pressure': 1.0})
+
+# 측정 metadata(JSON)에서 읽는 공정/설비 조건
+METADATA_FEATURES = (
+    'machine_age_days', 'machine_usage_hours', 'days_since_maintenance',
+    'temperature', 'humidity', 'pressure',
+)
+
+QUERYSET_FIELDS = (
+    'product_id', 'subgroup_number', 'measured_at', 'measurement_value', 'is_within_spec', 'metadata',
+)
+
+
+def shift_flags(hour: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """주간(06~14시) / 야간(14~22시) 교대 플래그"""
+    return (
+        ((hour >= 6) & (hour < 14)).astype(float),
+        ((hour >= 14) & (hour < 22)).astype(float),
+    )
+
+
+def features_from_records(data: List[Dict]) -> np.ndarray:
+    """레코드 리스트 → 특징 행렬 (레코드에 있는 값을 그대로 사용)"""
+    n = len(data)
+    X = np.empty((n, len(DEFECT_FEATURE_NAMES)))
+    for j, name in enumerate(DEFECT_FEATURE_NAMES):
+        if name in ('is_day_shift', 'is_night_shift'):
+            continue
+        default = FEATURE_DEFAULTS[name]
+        X[:, j] = np.fromiter((record.get(name, default) for record in data), dtype=float, count=n)
+    X[:, 4], X[:, 5] = shift_flags(X[:, 3])
+    return X
+
+
+class DefectFeatureBuilder:
+    """원시 측정 컬럼에서 16개 특징을 벡터 연산으로 생성"""
+
+    def __init__(self, window: int = 20, cache_dir: Optional[str] = None):
+        """
+        Args:
+            window: diff_from_mean / recent_defect_rate 계산 구간 (직전 측정 개수)
+            cache_dir: 특징 행렬 .npy 캐시 디렉터리 (None 이면 캐시 안 함)
+        """
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas is required")
+        self.window = window
+        self.cache_dir = cache_dir
+
+    # ------------------------------------------------------------------
+    # 입력 변환
+    # ------------------------------------------------------------------
+
+    def from_frame(self, frame) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        DataFrame / 컬럼 dict → (X, y, feature_names)
+
+        필요한 컬럼: measurement_value
+        선택 컬럼: product_id(그룹), measured_at, subgroup_number, is_within_spec,
+                  METADATA_FEATURES 및 파생 특징 컬럼(있으면 계산 대신 그대로 사용)
+
+        y 는 is_within_spec 이 있으면 불량(규격 이탈)=1, 없으면 None
+        행 순서는 입력과 같다 (파생 특징만 그룹 → 측정시각 순으로 정렬해 계산)
+        """
+        df = frame if isinstance(frame, pd.DataFrame) else pd.DataFrame(frame)
+        df = df.reset_index(drop=True)
+        n = len(df)
+
+        group = df['product_id'] if 'product_id' in df else pd.Series(0, index=df.index)
+        if 'measured_at' in df:
+            measured_at = pd.to_datetime(df['measured_at'])
+            order = np.lexsort((np.arange(n), measured_at.to_numpy(), group.to_numpy()))
+        else:
+            measured_at = None
+            order = np.lexsort((np.arange(n), group.to_numpy()))
+        df = df.iloc[order].reset_index(drop=True)
+        group = group.iloc[order].reset_index(drop=True)
+        if measured_at is not None:
+            measured_at = measured_at.iloc[order].reset_index(drop=True)
+
+        value = df['measurement_value'].astype(float)
+        within = df['is_within_spec'].astype(bool) if 'is_within_spec' in df else None
+        by_group = value.groupby(group)
+
+        columns = {'measurement_value': value.to_numpy()}
+
+        # 부분군 통계
+        if 'subgroup_number' in df:
+            by_subgroup = value.groupby([group, df['subgroup_number']])
+            columns['measurement_std'] = by_subgroup.transform('std').fillna(0.0).to_numpy()
+            columns['measurement_range'] = (
+                by_subgroup.transform('max') - by_subgroup.transform('min')
+            ).to_numpy()
+
+        if measured_at is not None:
+            columns['hour_of_day'] = measured_at.dt.hour.to_numpy(dtype=float)
+
+        # 이전 측정 기반 파생 특징
+        values = value.to_numpy()
+        group_ids = group.to_numpy()
+        group_start = np.r_[True, group_ids[1:] != group_ids[:-1]] if n else np.zeros(0, dtype=bool)
+
+        prev = by_group.shift(1)
+        columns['diff_from_prev'] = (value - prev).fillna(0.0).to_numpy()
+        prior_mean = self._prior_window_mean(values, group_start, self.window)
+        columns['diff_from_mean'] = np.where(np.isnan(prior_mean), 0.0, values - prior_mean)
+
+        if within is not None:
+            within_spec = within.to_numpy()
+            defect_rate = self._prior_window_mean((~within_spec).astype(float), group_start, self.window)
+            columns['recent_defect_rate'] = np.nan_to_num(defect_rate, nan=0.0)
+            columns['consecutive_within_spec'] = self._prior_streak(within_spec, group_start)
+
+        # 공정/설비 조건: 컬럼 → metadata(JSON) → 기본값
+        metadata = df['metadata'] if 'metadata' in df else None
+        for name in METADATA_FEATURES:
+            if name in df:
+                columns[name] = df[name].astype(float).fillna(FEATURE_DEFAULTS[name]).to_numpy()
+            elif metadata is not None:
+                columns[name] = np.fromiter(
+                    ((m or {}).get(name, FEATURE_DEFAULTS[name]) for m in metadata), dtype=float, count=n
+                )
+
+        X = np.empty((n, len(DEFECT_FEATURE_NAMES)))
+        for j, name in enumerate(DEFECT_FEATURE_NAMES):
+            if name in df:
+                X[:, j] = df[name].astype(float).fillna(FEATURE_DEFAULTS[name]).to_numpy()
+            else:
+                X[:, j] = columns.get(name, FEATURE_DEFAULTS[name])
+        X[:, 4], X[:, 5] = shift_flags(X[:, 3])
+
+        y = (~within).to_numpy().astype(int) if within is not None else None
+
+        # 정렬 전 입력 행 순서로 되돌림
+        if not np.array_equal(order, np.arange(n)):
+            restore = np.empty(n, dtype=np.int64)
+            restore[order] = np.arange(n)
+            X = X[restore]
+            if y is not None:
+                y = y[restore]
+        return X, y, list(DEFECT_FEATURE_NAMES)
+
+    def from_queryset(
+        self,
+        queryset,
+        chunk_size: int = 20000,
+        cache_token: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        QualityMeasurement 쿼리셋 → (X, y, feature_names)
+
+        모델 인스턴스를 만들지 않고 필요한 컬럼만 청크 단위로 읽는다.
+        cache_dir 가 있으면 쿼리/건수/최신 ID/최종 수정시각/cache_token 이 같은 한 캐시를 재사용한다.
+        """
+        cache_key = self._queryset_key(queryset, cache_token) if self.cache_dir else None
+        if cache_key:
+            cached = self.load_cache(cache_key)
+            if cached is not None:
+                return cached[0], cached[1], list(DEFECT_FEATURE_NAMES)
+
+        rows = queryset.order_by('product_id', 'measured_at', 'pk').values_list(*QUERYSET_FIELDS)
+        columns = {name: [] for name in QUERYSET_FIELDS}
+        for row in rows.iterator(chunk_size=chunk_size):
+            for name, value in zip(QUERYSET_FIELDS, row):
+                columns[name].append(value)
+
+        X, y, names = self.from_frame(columns)
+        if cache_key:
+            X, y = self.save_cache(cache_key, X, y)
+        return X, y, names
+
+    # ------------------------------------------------------------------
+    # 내부 계산
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _prior_window_mean(x: np.ndarray, group_start: np.ndarray, window: int) -> np.ndarray:
+        """그룹 내 직전 window 개 값의 평균 (누적합 차분, 이전 값이 없으면 NaN)"""
+        n = len(x)
+        idx = np.arange(n)
+        first = np.maximum.accumulate(np.where(group_start, idx, 0)) if n else idx
+        lo = np.maximum(first, idx - window)
+        count = idx - lo
+        csum = np.r_[0.0, np.cumsum(x)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(count > 0, (csum[idx] - csum[lo]) / count, np.nan)
+
+    @staticmethod
+    def _prior_streak(within: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+        """직전까지 연속 규격 내 측정 개수 (그룹 시작/규격 이탈에서 0으로 리셋)"""
+        n = len(within)
+        streak = np.zeros(n)
+        if n == 0:
+            return streak
+        idx = np.arange(n)
+        reset = group_start | ~within
+        # 현재 측정까지 포함한 연속 개수: 마지막 리셋 위치 이후 개수 (+ 리셋 위치가 규격 내 그룹 시작이면 1)
+        last_reset = np.maximum.accumulate(np.where(reset, idx, 0))
+        inclusive = np.where(within, idx - last_reset + within[last_reset], 0)
+        # 직전 측정까지의 값으로 이동 (그룹 첫 측정은 0)
+        streak[1:] = inclusive[:-1]
+        streak[group_start] = 0
+        return streak
+
+    # ------------------------------------------------------------------
+    # .npy 캐시 (memory-map)
+    # ------------------------------------------------------------------
+
+    def _queryset_key(self, queryset, cache_token: Optional[str] = None) -> str:
+        from django.db.models import Count, Max
+
+        aggregates = {'count': Count('pk'), 'last': Max('pk')}
+        if any(f.name == 'updated_at' for f in queryset.model._meta.concrete_fields):
+            aggregates['updated'] = Max('updated_at')
+        stats = queryset.aggregate(**aggregates)
+        source = (
+            f"{queryset.query}|{stats['count']}|{stats['last']}|{stats.get('updated')}|{cache_token}|{self.window}"
+        )
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+    def _cache_paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, f"defect_features_{key}")
+        return f"{base}_X.npy", f"{base}_y.npy"
+
+    def load_cache(self, key: str) -> Optional[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """캐시된 (X, y) 를 memory-map 으로 로드 (없으면 None)"""
+        x_path, y_path = self._cache_paths(key)
+        if not os.path.exists(x_path):
+            return None
+        X = np.load(x_path, mmap_mode='r')
+        y = np.load(y_path, mmap_mode='r') if os.path.exists(y_path) else None
+        return X, y
+
+    def save_cache(self, key: str, X: np.ndarray, y: Optional[np.ndarray]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """(X, y) 저장 후 memory-map 으로 다시 열어 반환 (임시 파일 → rename 으로 원자적 교체)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        x_path, y_path = self._cache_paths(key)
+        for path, array in ((x_path, X), (y_path, y)):
+            if array is None:
+                continue
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp_path, path)
+        return self.load_cache(key)
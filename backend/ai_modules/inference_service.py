@@ -0,0 +1,372 @@
+"""
+온라인 추론 서비스
+워커 프로세스당 모델을 1회 로드하고 동시 요청을 마이크로배치로 묶어 추론
+
+- 요청은 큐에 넣고 Future 를 즉시 반환
+- 배치 스레드는 첫 요청 이후 max_batch_size 에 도달하거나 max_wait_ms 가 지나면 배치를 실행
+- 배치 전체에 decision_function / predict_proba 를 1회 호출한 뒤 요청별 Future 를 완료
+- 큐 깊이, 배치 크기 히스토그램과 대기/실행 시간 통계 제공
+
+asyncio 호출자는 asyncio.wrap_future(service.submit_anomaly(x)) 로 await 할 수 있다.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .anomaly_detector import AnomalyDetectionResult, IsolationForestDetector
+from .quality_predictor import DefectPredictor, PredictionResult, QualityScorePredictor
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_MAX_QUEUE_SIZE = 10000
+DEFAULT_TIMEOUT_SEC = 5.0
+
+HISTOGRAM_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (스레드 안전)"""
+
+    def __init__(self, buckets: Sequence[float] = HISTOGRAM_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = int(np.searchsorted(self.buckets, value, side='left'))
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            self._max = max(self._max, value)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            labels = [f"le_{b}" for b in self.buckets] + ['le_inf']
+            cumulative = np.cumsum(self._counts).tolist()
+            return {
+                'count': self._count,
+                'sum': self._sum,
+                'mean': self._sum / self._count if self._count else 0.0,
+                'max': self._max,
+                'buckets': dict(zip(labels, cumulative)),
+            }
+
+
+class _Request:
+    __slots__ = ('features', 'future', 'enqueued_at')
+
+    def __init__(self, features: np.ndarray):
+        self.features = features
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    동시 요청을 마이크로배치로 묶어 batch_fn 실행
+
+    batch_fn: (n_samples, n_features) 배열을 받아 샘플별 결과 리스트를 반환
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[np.ndarray], List],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        n_features: Optional[int] = None
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.n_features = n_features
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self._closed = False
+
+        # 통계
+        self.batch_sizes = Histogram()
+        self.queue_depths = Histogram()
+        self.wait_ms = Histogram(buckets=(0.5, 1, 2, 5, 10, 20, 50, 100, 250, 1000))
+        self.batch_ms = Histogram(buckets=(0.5, 1, 2, 5, 10, 20, 50, 100, 250, 1000))
+        self.requests = 0
+        self.failed_batches = 0
+        self._counter_lock = threading.Lock()
+
+    def submit(self, features: np.ndarray) -> Future:
+        """
+        요청 등록 (즉시 Future 반환)
+
+        Raises:
+            ValueError: 특징 개수 불일치 (같은 배치의 다른 요청까지 실패시키지 않도록 제출 시 검사)
+            RuntimeError: 종료된 배처
+            queue.Full: 대기 큐가 가득 찬 경우
+        """
+        features = np.asarray(features, dtype=float).ravel()
+        if self.n_features is not None and features.shape[0] != self.n_features:
+            raise ValueError(f"특징 개수가 {self.n_features}개여야 합니다 (입력: {features.shape[0]}개)")
+
+        request = _Request(features)
+        # close() 와 같은 잠금 안에서 넣어야 _STOP 뒤에 요청이 들어가지 않음
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} 배처가 종료되었습니다")
+            self._ensure_started()
+            self._queue.put(request, timeout=DEFAULT_TIMEOUT_SEC)
+        with self._counter_lock:
+            self.requests += 1
+        return request.future
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: float = DEFAULT_TIMEOUT_SEC):
+        """남은 요청 처리 후 배치 스레드 종료 (처리하지 못한 요청은 RuntimeError 로 실패)"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(_STOP)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._thread is None or not self._thread.is_alive():
+            self._fail_pending()
+
+    def stats(self) -> Dict:
+        return {
+            'name': self.name,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'queue_depth': self.queue_depth(),
+            'requests': self.requests,
+            'failed_batches': self.failed_batches,
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_depth_at_dispatch': self.queue_depths.snapshot(),
+            'wait_ms': self.wait_ms.snapshot(),
+            'batch_ms': self.batch_ms.snapshot(),
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f"inference-{self.name}", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            batch = [first]
+            deadline = first.enqueued_at + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._dispatch(batch)
+
+        self._fail_pending()
+
+    def _fail_pending(self):
+        """종료 후 큐에 남은 요청을 실패 처리"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and not item.future.done():
+                item.future.set_exception(RuntimeError(f"{self.name} 배처가 종료되었습니다"))
+
+    def _dispatch(self, batch: List[_Request]):
+        started = time.monotonic()
+        self.batch_sizes.observe(len(batch))
+        self.queue_depths.observe(self._queue.qsize())
+        for request in batch:
+            self.wait_ms.observe((started - request.enqueued_at) * 1000)
+
+        try:
+            results = self.batch_fn(np.vstack([request.features for request in batch]))
+            if len(results) != len(batch):
+                raise RuntimeError(f"batch_fn 결과 수 불일치 (요청 {len(batch)}건, 결과 {len(results)}건)")
+        except Exception as e:
+            self.failed_batches += 1
+            logger.exception("Inference batch failed: %s (size=%d)", self.name, len(batch))
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        finally:
+            self.batch_ms.observe((time.monotonic() - started) * 1000)
+
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
+
+
+class ModelRegistry:
+    """모델 파일 경로별 1회 로드 캐시 (워커 프로세스 단위)"""
+
+    LOADERS = {
+        'anomaly': IsolationForestDetector,
+        'defect': DefectPredictor,
+        'quality': QualityScorePredictor,
+    }
+
+    def __init__(self):
+        self._models: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, filepath: str):
+        key = (kind, filepath)
+        model = self._models.get(key)
+        if model is None:
+            with self._lock:
+                model = self._models.get(key)
+                if model is None:
+                    model = self.LOADERS[kind]()
+                    model.load_model(filepath)
+                    self._models[key] = model
+                    logger.info("Loaded %s model from %s", kind, filepath)
+        return model
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+
+registry = ModelRegistry()
+
+
+class InferenceService:
+    """이상 탐지 / 불량 확률 / 품질 점수 마이크로배치 추론"""
+
+    def __init__(
+        self,
+        anomaly_detector: Optional[IsolationForestDetector] = None,
+        defect_predictor: Optional[DefectPredictor] = None,
+        quality_predictor: Optional[QualityScorePredictor] = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS
+    ):
+        models = {
+            'anomaly': (anomaly_detector, 'detect_batch'),
+            'defect': (defect_predictor, 'predict_defect_probability_batch'),
+            'quality': (quality_predictor, 'predict_quality_score_batch'),
+        }
+        self.batchers: Dict[str, MicroBatcher] = {
+            name: MicroBatcher(
+                name,
+                getattr(model, method),
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+                n_features=getattr(model.scaler, 'n_features_in_', None),
+            )
+            for name, (model, method) in models.items() if model is not None
+        }
+
+    @classmethod
+    def from_model_files(
+        cls,
+        anomaly_path: Optional[str] = None,
+        defect_path: Optional[str] = None,
+        quality_path: Optional[str] = None,
+        **options
+    ) -> 'InferenceService':
+        """저장된 모델 파일로 생성 (같은 경로는 프로세스 내에서 1회만 로드)"""
+        return cls(
+            anomaly_detector=registry.get('anomaly', anomaly_path) if anomaly_path else None,
+            defect_predictor=registry.get('defect', defect_path) if defect_path else None,
+            quality_predictor=registry.get('quality', quality_path) if quality_path else None,
+            **options
+        )
+
+    def _batcher(self, name: str) -> MicroBatcher:
+        try:
+            return self.batchers[name]
+        except KeyError:
+            raise ValueError(f"{name} 모델이 등록되지 않았습니다") from None
+
+    # Future 반환 (비동기 제출)
+    def submit_anomaly(self, features: np.ndarray) -> Future:
+        return self._batcher('anomaly').submit(features)
+
+    def submit_defect(self, features: np.ndarray) -> Future:
+        return self._batcher('defect').submit(features)
+
+    def submit_quality(self, features: np.ndarray) -> Future:
+        return self._batcher('quality').submit(features)
+
+    # 결과 대기 (동기 호출)
+    def detect_anomaly(self, features: np.ndarray, timeout: float = DEFAULT_TIMEOUT_SEC) -> AnomalyDetectionResult:
+        return self.submit_anomaly(features).result(timeout)
+
+    def predict_defect_probability(self, features: np.ndarray, timeout: float = DEFAULT_TIMEOUT_SEC) -> PredictionResult:
+        return self.submit_defect(features).result(timeout)
+
+    def predict_quality_score(self, features: np.ndarray, timeout: float = DEFAULT_TIMEOUT_SEC) -> PredictionResult:
+        return self.submit_quality(features).result(timeout)
+
+    def stats(self) -> Dict:
+        return {name: batcher.stats() for name, batcher in self.batchers.items()}
+
+    def close(self):
+        for batcher in self.batchers.values():
+            batcher.close()
+
+
+# 사용 예시
+if __name__ == '__main__':
+    from concurrent.futures import ThreadPoolExecutor
+
+    np.random.seed(42)
+    detector = IsolationForestDetector(contamination=0.1)
+    detector.fit(np.random.randn(500, 5))
+
+    service = InferenceService(anomaly_detector=detector, max_batch_size=64, max_wait_ms=5)
+    samples = np.random.randn(2000, 5)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(service.detect_anomaly, samples))
+    elapsed = time.monotonic() - started
+
+    single_started = time.monotonic()
+    for x in samples[:200]:
+        detector.detect(x)
+    single_elapsed = (time.monotonic() - single_started) * len(samples) / 200
+
+    stats = service.stats()['anomaly']
+    print(f"마이크로배치: {len(results)}건 {elapsed:.2f}초 (평균 배치 {stats['batch_size']['mean']:.1f})")
+    print(f"단건 호출 추정: {single_elapsed:.2f}초")
+    service.close()
@@ -5,11 +5,189 @@ RDF 그래프로 인과관계 추적 + SPARQL 쿼리
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS, OWL, XSD
 from typing import List, Dict, Tuple, Optional
+from bisect import bisect_left
+from collections import deque
 import json
+import time
 from pathlib import Path
 from datetime import datetime
 
 
+CAUSE_RELATIONS = ('causes', 'leadsTo')
+KPI_RELATIONS = ('affects', 'decreases', 'increases')
+
+
+def _local_name(uri) -> str:
+    return str(uri).split('#')[-1]
+
+
+class CausalGraphIndex:
+    """
+    인과 그래프 인접 인덱스 (메모리)
+
+    RDF 그래프에서 1회 구축한 뒤 APSKPITracer 의 add_* 호출로 증분 갱신한다.
+    - causes_of: 결과 이벤트 → {(원인, 관계): None} (causes / leadsTo 역방향 인접)
+    - kpi_events: KPI → {(이벤트, 관계): None} (affects / decreases / increases)
+    - 설비 가동률은 내림차순 정렬 배열로 보관하여 임계값 이상만 이분 탐색
+
+    원인 트리는 (노드, 깊이, 최대 깊이) 단위로 메모이제이션하여 공유 하위 체인을 한 번만 계산한다.
+    그래프가 바뀌면 메모는 비운다.
+    """
+
+    def __init__(self, namespace: Namespace):
+        self.APS = namespace
+        self.cause_relations = {namespace[r] for r in CAUSE_RELATIONS}
+        self.kpi_relations = {namespace[r] for r in KPI_RELATIONS}
+        self.clear()
+
+    def clear(self):
+        self.descriptions: Dict[URIRef, str] = {}
+        self.severities: Dict[URIRef, float] = {}
+        self.causes_of: Dict[URIRef, Dict[Tuple[URIRef, URIRef], None]] = {}
+        self.kpi_events: Dict[URIRef, Dict[Tuple[URIRef, URIRef], None]] = {}
+        self.equipment: Dict[URIRef, Tuple[str, float]] = {}
+        self._memo: Dict[Tuple[URIRef, int, int], List[Dict]] = {}
+        self._utilization_sorted: Optional[Tuple[List[float], List[Tuple[str, float]]]] = None
+
+    def build(self, graph: Graph):
+        """RDF 그래프 전체에서 인덱스 재구축"""
+        self.clear()
+        for subject, _, obj in graph.triples((None, self.APS.description, None)):
+            self.descriptions[subject] = str(obj)
+        for subject, _, obj in graph.triples((None, self.APS.severity, None)):
+            self.severities[subject] = float(obj)
+        for relation in self.cause_relations | self.kpi_relations:
+            for subject, _, obj in graph.triples((None, relation, None)):
+                self.add_relation(subject, relation, obj)
+
+        equipment_ids = {
+            subject: str(obj)
+            for subject, _, obj in graph.triples((None, self.APS.equipmentId, None))
+            if (subject, RDF.type, self.APS.Equipment) in graph
+        }
+        for subject, _, obj in graph.triples((None, self.APS.utilization, None)):
+            if subject in equipment_ids:
+                self.equipment[subject] = (equipment_ids[subject], float(obj))
+        return self
+
+    # ------------------------------------------------------------------
+    # 증분 갱신
+    # ------------------------------------------------------------------
+
+    def set_event(self, event_uri: URIRef, description: str, severity: float):
+        self.descriptions[event_uri] = description
+        self.severities[event_uri] = severity
+        self._memo.clear()
+
+    def add_relation(self, source_uri: URIRef, relation_uri: URIRef, target_uri: URIRef):
+        if relation_uri in self.cause_relations:
+            self.causes_of.setdefault(target_uri, {})[(source_uri, relation_uri)] = None
+            self._memo.clear()
+        elif relation_uri in self.kpi_relations:
+            self.kpi_events.setdefault(target_uri, {})[(source_uri, relation_uri)] = None
+
+    def set_equipment(self, equipment_uri: URIRef, equipment_id: str, utilization: float):
+        self.equipment[equipment_uri] = (equipment_id, utilization)
+        self._utilization_sorted = None
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def kpi_impacts(self, kpi_uri: URIRef) -> List[Tuple[URIRef, URIRef]]:
+        """KPI 에 영향을 주는 (이벤트, 관계) - 설명/심각도가 있는 이벤트만, 심각도 내림차순"""
+        impacts = [
+            (event, relation) for event, relation in self.kpi_events.get(kpi_uri, ())
+            if event in self.descriptions and event in self.severities
+        ]
+        impacts.sort(key=lambda item: -self.severities[item[0]])
+        return impacts
+
+    def cause_tree(self, event_uri: URIRef, depth: int, max_depth: int) -> List[Dict]:
+        """
+        이벤트의 원인 트리 (APSKPITracer._trace_event_causes 와 같은 구조)
+
+        명시적 스택으로 후위 순회하며 (노드, 깊이) 결과를 메모 → 재귀 한도 / 중복 하위 체인 계산 없음.
+        반환되는 하위 리스트는 공유될 수 있으므로 수정하지 말 것.
+        """
+        memo = self._memo
+        root_key = (event_uri, depth, max_depth)
+        stack = [(event_uri, depth, False)]
+        while stack:
+            node, node_depth, expanded = stack.pop()
+            key = (node, node_depth, max_depth)
+            if key in memo:
+                continue
+            if node_depth >= max_depth:
+                memo[key] = []
+                continue
+
+            causes = [
+                (cause, relation) for cause, relation in self.causes_of.get(node, ())
+                if cause in self.descriptions
+            ]
+            if not expanded:
+                stack.append((node, node_depth, True))
+                stack.extend(
+                    (cause, node_depth + 1, False) for cause, _ in causes
+                    if (cause, node_depth + 1, max_depth) not in memo
+                )
+                continue
+
+            memo[key] = [
+                {
+                    'cause': _local_name(cause),
+                    'relation': _local_name(relation),
+                    'description': self.descriptions[cause],
+                    'depth': node_depth + 1,
+                    'sub_causes': memo[(cause, node_depth + 1, max_depth)],
+                }
+                for cause, relation in causes
+            ]
+        return memo[root_key]
+
+    def root_causes(self, event_uri: URIRef, max_depth: int) -> List[Dict]:
+        """
+        이벤트의 근본 원인 (더 이상 원인이 없는 노드) BFS - 노드별 최단 깊이, 경로 1개
+
+        원인 트리 전체를 펼치지 않으므로 분기가 많은 대형 그래프에서도 노드 수에 선형
+        """
+        parents: Dict[URIRef, Optional[URIRef]] = {event_uri: None}
+        queue = deque([(event_uri, 0)])
+        roots = []
+        while queue:
+            node, node_depth = queue.popleft()
+            causes = [cause for cause, _ in self.causes_of.get(node, ()) if cause in self.descriptions]
+            if node is not event_uri and (not causes or node_depth >= max_depth):
+                path = []
+                step = node
+                while step is not None:
+                    path.append(_local_name(step))
+                    step = parents[step]
+                roots.append({
+                    'cause': _local_name(node),
+                    'description': self.descriptions[node],
+                    'depth': node_depth,
+                    'is_root': not causes,
+                    'path': path,
+                })
+                continue
+            for cause in causes:
+                if cause not in parents:
+                    parents[cause] = node
+                    queue.append((cause, node_depth + 1))
+        return roots
+
+    def bottlenecks(self, threshold: float) -> List[Tuple[str, float]]:
+        """가동률 threshold 이상 설비 (가동률 내림차순)"""
+        if self._utilization_sorted is None:
+            rows = sorted(self.equipment.values(), key=lambda row: row[1])
+            self._utilization_sorted = ([row[1] for row in rows], rows)
+        values, rows = self._utilization_sorted
+        start = bisect_left(values, threshold)
+        return rows[start:][::-1]
+
+
 class APSKPITracer:
     """
     APS 온톨로지 기반 KPI 영향 분석 시스템
@@ -32,6 +210,17 @@ class APSKPITracer:
         # 온톨로지 구축
         self._build_ontology()
 
+        # 인과 그래프 인접 인덱스 (add_* 호출 시 증분 갱신)
+        self.index = CausalGraphIndex(self.APS).build(self.graph)
+
+    def rebuild_index(self):
+        """
+        인접 인덱스 재구축
+
+        self.graph 를 add_* 메서드를 거치지 않고 직접 수정한 경우 호출
+        """
+        self.index.build(self.graph)
+
     def _build_ontology(self):
         """
         APS 도메인 온톨로지 구축
@@ -103,6 +292,8 @@ class APSKPITracer:
         if timestamp:
             self.graph.add((event_uri, self.APS.timestamp, Literal(timestamp, datatype=XSD.dateTime)))
 
+        self.index.set_event(event_uri, description, float(severity))
+
     def add_kpi(self, kpi_id: str, kpi_name: str, value: float, target: float):
         """
         KPI 추가
@@ -135,6 +326,8 @@ class APSKPITracer:
         self.graph.add((equipment_uri, self.APS.equipmentName, Literal(equipment_name, lang='ko')))
         self.graph.add((equipment_uri, self.APS.utilization, Literal(utilization, datatype=XSD.float)))
 
+        self.index.set_equipment(equipment_uri, equipment_id, float(utilization))
+
     def add_causal_relation(
         self,
         source_id: str,
@@ -159,6 +352,8 @@ class APSKPITracer:
         self.graph.add((source_uri, relation_uri, target_uri))
         self.graph.add((source_uri, self.APS.impactWeight, Literal(weight, datatype=XSD.float)))
 
+        self.index.add_relation(source_uri, relation_uri, target_uri)
+
     def _infer_uri(self, entity_id: str) -> URIRef:
         """
         엔티티 ID로부터 URI 추론
@@ -167,6 +362,9 @@ class APSKPITracer:
             return self.APS[f"Equipment_{entity_id}"]
         elif entity_id.startswith('JOB'):
             return self.APS[f"Job_{entity_id}"]
+        elif entity_id.startswith('KPI_'):
+            # 'KPI_<id>' 형식은 add_kpi 의 URI 와 동일
+            return self.APS[entity_id]
         elif entity_id.startswith('KPI'):
             return self.APS[f"KPI_{entity_id}"]
         elif entity_id.startswith('Event'):
@@ -175,13 +373,14 @@ class APSKPITracer:
             # 기본값
             return self.APS[entity_id]
 
-    def trace_kpi_impact(self, kpi_id: str, max_depth: int = 5) -> List[Dict]:
+    def trace_kpi_impact(self, kpi_id: str, max_depth: int = 5, use_index: bool = True) -> List[Dict]:
         """
         KPI 변화의 인과 체인 추적
 
         Args:
             kpi_id: 추적할 KPI ID
             max_depth: 최대 추적 깊이
+            use_index: 인접 인덱스 사용 (False 면 노드별 SPARQL 재귀 조회)
 
         Returns:
             인과 체인 리스트: [{'source': ..., 'relation': ..., 'target': ..., 'depth': ...}, ...]
@@ -189,6 +388,17 @@ class APSKPITracer:
         kpi_uri = self.APS[f"KPI_{kpi_id}"]
         causal_chains = []
 
+        if use_index:
+            for event_uri, relation in self.index.kpi_impacts(kpi_uri):
+                causal_chains.append({
+                    'event': _local_name(event_uri),
+                    'relation': _local_name(relation),
+                    'description': self.index.descriptions[event_uri],
+                    'severity': self.index.severities[event_uri],
+                    'root_causes': self.index.cause_tree(event_uri, 0, max_depth)
+                })
+            return causal_chains
+
         # SPARQL 쿼리: KPI에 영향을 주는 이벤트 찾기
         query = f"""
         PREFIX aps: <{self.APS}>
@@ -225,6 +435,26 @@ class APSKPITracer:
 
         return causal_chains
 
+    def trace_root_causes(self, kpi_id: str, max_depth: int = 10) -> List[Dict]:
+        """
+        KPI 영향 이벤트별 근본 원인 요약 (BFS, 노드별 최단 경로 1개)
+
+        원인 트리 전체 대신 말단 원인만 반환하므로 대형 그래프의 설명 생성에 사용
+
+        Returns:
+            [{'event', 'relation', 'severity', 'root_causes': [{'cause', 'description', 'depth', 'is_root', 'path'}]}, ...]
+        """
+        kpi_uri = self.APS[f"KPI_{kpi_id}"]
+        return [
+            {
+                'event': _local_name(event_uri),
+                'relation': _local_name(relation),
+                'severity': self.index.severities[event_uri],
+                'root_causes': self.index.root_causes(event_uri, max_depth)
+            }
+            for event_uri, relation in self.index.kpi_impacts(kpi_uri)
+        ]
+
     def _trace_event_causes(
         self,
         event_uri: URIRef,
@@ -232,7 +462,7 @@ class APSKPITracer:
         max_depth: int
     ) -> List[Dict]:
         """
-        이벤트의 근본 원인 재귀 추적
+        이벤트의 근본 원인 재귀 추적 (SPARQL, trace_kpi_impact(use_index=False) 경로)
         """
         if depth >= max_depth:
             return []
@@ -270,16 +500,27 @@ class APSKPITracer:
 
         return causes
 
-    def find_bottlenecks(self, threshold: float = 0.9) -> List[Dict]:
+    def find_bottlenecks(self, threshold: float = 0.9, use_index: bool = True) -> List[Dict]:
         """
         병목 설비 탐지
 
         Args:
             threshold: 가동률 임계값 (기본 0.9 = 90%)
+            use_index: 인덱스의 정렬된 가동률 사용 (False 면 SPARQL 전체 스캔)
 
         Returns:
             병목 설비 리스트
         """
+        if use_index:
+            return [
+                {
+                    'equipment_id': equipment_id,
+                    'utilization': utilization,
+                    'severity': min(1.0, (utilization - threshold) / (1.0 - threshold))
+                }
+                for equipment_id, utilization in self.index.bottlenecks(threshold)
+            ]
+
         query = f"""
         PREFIX aps: <{self.APS}>
         PREFIX xsd: <{XSD}>
@@ -326,27 +567,22 @@ class APSKPITracer:
             format: 포맷 ('turtle', 'xml', 'json-ld')
         """
         self.graph.parse(input_path, format=format)
+        self.rebuild_index()
         print(f"✅ RDF 그래프 로드: {input_path}")
 
 
-def create_example_scenario():
+def build_example_tracer() -> 'APSKPITracer':
     """
-    예제 시나리오 생성: MC001 과부하 → 생산 지연 → KPI 감소
+    예제 인과 그래프: MC001 과부하 → 대기시간 증가 → 생산 지연 → KPI 감소
     """
-    print("=" * 80)
-    print("🧪 KPI 영향 분석 예제 시나리오")
-    print("=" * 80)
-
     tracer = APSKPITracer()
 
     # 1. 설비 추가
-    print("\n📦 설비 등록...")
     tracer.add_equipment('MC001', '가공기 1호', utilization=0.95)
     tracer.add_equipment('MC002', '가공기 2호', utilization=0.65)
     tracer.add_equipment('MC003', '조립기 1호', utilization=0.75)
 
     # 2. 이벤트 추가
-    print("📅 이벤트 등록...")
     tracer.add_event(
         'E001',
         'overload',
@@ -372,7 +608,6 @@ def create_example_scenario():
     )
 
     # 3. KPI 추가
-    print("📊 KPI 등록...")
     tracer.add_kpi(
         'production_efficiency',
         '생산효율',
@@ -388,8 +623,6 @@ def create_example_scenario():
     )
 
     # 4. 인과관계 추가
-    print("🔗 인과관계 구축...")
-
     # MC001 과부하 → 대기시간 증가
     tracer.add_causal_relation('Event_E001', 'causes', 'Event_E002', weight=0.9)
 
@@ -401,6 +634,19 @@ def create_example_scenario():
 
     # 생산 지연 → 지연시간 KPI 증가
     tracer.add_causal_relation('Event_E003', 'increases', 'KPI_total_tardiness', weight=0.9)
+    return tracer
+
+
+def create_example_scenario():
+    """
+    예제 시나리오 생성: MC001 과부하 → 생산 지연 → KPI 감소
+    """
+    print("=" * 80)
+    print("🧪 KPI 영향 분석 예제 시나리오")
+    print("=" * 80)
+
+    print("\n📦 설비 / 이벤트 / KPI / 인과관계 등록...")
+    tracer = build_example_tracer()
 
     # 5. 인과 체인 추적
     print("\n🔍 KPI 영향 분석 (생산효율)...")
@@ -440,5 +686,88 @@ def create_example_scenario():
     return tracer, causal_chains, bottlenecks
 
 
+def benchmark_causal_index(
+    n_events: int = 100000,
+    n_kpis: int = 20,
+    events_per_kpi: int = 5,
+    max_causes: int = 3,
+    max_depth: int = 5,
+    n_equipment: int = 500,
+    seed: int = 42
+) -> Dict:
+    """
+    대형 인과 그래프 벤치마크 (인덱스 vs SPARQL)
+
+    이벤트 i 는 이전 이벤트 중 1~max_causes 개를 원인으로 가진다 (공유 하위 체인이 많은 DAG).
+    SPARQL 경로는 노드별 쿼리 수가 분기^깊이 로 증가하므로 KPI 1개에 대해서만 측정한다.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    tracer = APSKPITracer()
+
+    started = time.perf_counter()
+    for i in range(n_events):
+        tracer.add_event(f'E{i}', 'event', f'이벤트 {i}', severity=float(rng.random()))
+        if i > 0:
+            n_causes = int(rng.integers(1, max_causes + 1))
+            window = max(1, min(i, 1000))
+            for cause in set((i - rng.integers(1, window + 1, n_causes)).tolist()):
+                tracer.add_causal_relation(f'Event_E{cause}', 'causes', f'Event_E{i}')
+    for k in range(n_kpis):
+        tracer.add_kpi(f'K{k}', f'KPI {k}', value=1.0, target=0.0)
+        for event in rng.integers(n_events // 2, n_events, events_per_kpi).tolist():
+            tracer.add_causal_relation(f'Event_E{event}', 'decreases', f'KPI_K{k}')
+    for m in range(n_equipment):
+        tracer.add_equipment(f'MC{m:04d}', f'설비 {m}', utilization=float(rng.random()))
+    load_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    tracer.rebuild_index()
+    build_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    chains = [tracer.trace_kpi_impact(f'K{k}', max_depth=max_depth) for k in range(n_kpis)]
+    trace_ms = (time.perf_counter() - started) * 1000 / n_kpis
+
+    started = time.perf_counter()
+    for k in range(n_kpis):
+        tracer.trace_root_causes(f'K{k}', max_depth=max_depth)
+    root_ms = (time.perf_counter() - started) * 1000 / n_kpis
+
+    started = time.perf_counter()
+    tracer.find_bottlenecks(0.9)
+    bottleneck_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    sparql_chains = tracer.trace_kpi_impact('K0', max_depth=max_depth, use_index=False)
+    sparql_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    tracer.find_bottlenecks(0.9, use_index=False)
+    sparql_bottleneck_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        'n_events': n_events,
+        'n_triples': len(tracer.graph),
+        'graph_load_sec': round(load_sec, 2),
+        'index_build_sec': round(build_sec, 2),
+        'trace_kpi_impact_ms': round(trace_ms, 2),
+        'trace_root_causes_ms': round(root_ms, 2),
+        'find_bottlenecks_ms': round(bottleneck_ms, 3),
+        'sparql_trace_kpi_impact_ms': round(sparql_ms, 2),
+        'sparql_find_bottlenecks_ms': round(sparql_bottleneck_ms, 2),
+        'chains_per_kpi': sum(len(c) for c in chains) / n_kpis,
+        'sparql_chains': len(sparql_chains),
+    }
+
+
 if __name__ == '__main__':
-    create_example_scenario()
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        n_events = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+        for key, value in benchmark_causal_index(n_events=n_events).items():
+            print(f"{key}: {value}")
+    else:
+        create_example_scenario()
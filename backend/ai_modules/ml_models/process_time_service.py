@@ -0,0 +1,250 @@
+"""
+공정 시간 배치 예측 서비스
+ProcessTimePredictorXGB 로 학습/저장한 모델을 1회 로드하여 시나리오 전체 작업을 한 번에 예측
+
+- 모델 디렉터리: 인자 → PROCESS_TIME_MODEL_DIR 환경변수 → ml_models/saved
+- 범주형 인코딩은 학습 시 LabelEncoder 를 dict 로 변환해 벡터 매핑 (미학습 카테고리 = -1)
+- 특징 행 해시(bytes) 기준 LRU 캐시, 캐시 미스 행만 모아 DMatrix 1회 예측
+- 예측 결과를 작업 dict 의 duration_minutes 에 반영 (GA / CP-SAT 입력)
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import xgboost as xgb
+
+from .xgboost_predict import (
+    META_FILENAME,
+    MODEL_FILENAME,
+    default_model_dir,
+    encoder_lookup,
+)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_SIZE = 100000
+DEFAULT_STD_ERROR = 5.0  # 신뢰구간 근사용 RMSE (ProcessTimePredictorXGB.predict 와 동일)
+
+# 작업 dict 에서 특징을 찾을 키 (앞에서부터 우선)
+FEATURE_ALIASES = {
+    'process_name': ('process_name', 'operation_nm'),
+    'machine_id': ('machine_id', 'resource_code', 'mc_cd'),
+    'batch_size': ('batch_size', 'plan_qty'),
+}
+
+
+class ProcessTimePredictionService:
+    """XGBoost 공정 시간 배치 예측 (프로세스당 모델 1회 로드)"""
+
+    _instances: Dict[str, 'ProcessTimePredictionService'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        model_dir: Optional[str] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        feature_defaults: Optional[Dict[str, Any]] = None,
+        std_error: float = DEFAULT_STD_ERROR
+    ):
+        """
+        Args:
+            model_dir: 모델 디렉터리 (xgboost_process_time_model.json, model_metadata.pkl)
+            cache_size: 예측 캐시 최대 행 수
+            feature_defaults: 작업에 없는 특징의 기본값 (예: {'shift': 1, 'operator_skill': 3})
+            std_error: 95% 신뢰구간 계산용 표준오차 (분)
+        """
+        self.model_dir = Path(model_dir) if model_dir else default_model_dir()
+        self.cache_size = cache_size
+        self.feature_defaults = dict(feature_defaults or {})
+        self.std_error = std_error
+
+        self.booster = xgb.Booster()
+        self.booster.load_model(str(self.model_dir / MODEL_FILENAME))
+        metadata = joblib.load(self.model_dir / META_FILENAME)
+        self.feature_names: List[str] = list(metadata['feature_names'])
+        self.categories = {
+            col: encoder_lookup(encoder)
+            for col, encoder in metadata['label_encoders'].items()
+            if col in self.feature_names
+        }
+
+        self._cache: 'OrderedDict[bytes, float]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        logger.info("Loaded process time model from %s (%d features)", self.model_dir, len(self.feature_names))
+
+    @classmethod
+    def get(cls, model_dir: Optional[str] = None, **options) -> 'ProcessTimePredictionService':
+        """모델 디렉터리별 공유 인스턴스"""
+        key = str(Path(model_dir) if model_dir else default_model_dir())
+        service = cls._instances.get(key)
+        if service is None:
+            with cls._instances_lock:
+                service = cls._instances.get(key)
+                if service is None:
+                    service = cls(key, **options)
+                    cls._instances[key] = service
+        return service
+
+    # ------------------------------------------------------------------
+    # 특징 행렬
+    # ------------------------------------------------------------------
+
+    def _column(self, rows: Sequence[Dict], name: str) -> List:
+        aliases = FEATURE_ALIASES.get(name, (name,))
+        default = self.feature_defaults.get(name)
+        column = []
+        for row in rows:
+            value = None
+            for alias in aliases:
+                value = row.get(alias)
+                if value is not None:
+                    break
+            column.append(default if value is None else value)
+        return column
+
+    def build_matrix(self, rows: Sequence[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        작업 dict 리스트 → (특징 행렬 float32, 유효 행 마스크)
+
+        필요한 특징이 하나라도 없으면(기본값도 없으면) 해당 행은 무효로 표시한다.
+        """
+        n = len(rows)
+        X = np.empty((n, len(self.feature_names)), dtype=np.float32)
+        valid = np.ones(n, dtype=bool)
+        for j, name in enumerate(self.feature_names):
+            column = self._column(rows, name)
+            if name in self.categories:
+                lookup = self.categories[name]
+                X[:, j] = [lookup.get(value, -1) if value is not None else -1 for value in column]
+                valid &= np.fromiter((value is not None for value in column), dtype=bool, count=n)
+            else:
+                values = np.array([np.nan if value is None else value for value in column], dtype=np.float64)
+                X[:, j] = values
+                valid &= ~np.isnan(values)
+        return X, valid
+
+    # ------------------------------------------------------------------
+    # 예측
+    # ------------------------------------------------------------------
+
+    def predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        """특징 행렬 → 예측 시간(분), 캐시 미스 행만 DMatrix 1회로 예측"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        keys = [row.tobytes() for row in X]
+        result = np.empty(len(keys))
+
+        missing: Dict[bytes, List[int]] = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    result[i] = cached
+            self.hits += len(keys) - sum(len(idx) for idx in missing.values())
+
+        if missing:
+            first_rows = [indices[0] for indices in missing.values()]
+            dmatrix = xgb.DMatrix(X[first_rows], feature_names=self.feature_names)
+            predicted = self.booster.predict(dmatrix)
+            with self._lock:
+                self.batches += 1
+                for (key, indices), value in zip(missing.items(), predicted):
+                    result[indices] = value
+                    self._cache[key] = float(value)
+                    self.misses += len(indices)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return result
+
+    def predict(self, rows: Sequence[Dict]) -> List[Dict]:
+        """
+        작업 dict 리스트 → 작업별 예측 결과 (ProcessTimePredictorXGB.predict 와 같은 형식)
+
+        특징이 부족한 작업은 predicted_time_minutes=None
+        """
+        X, valid = self.build_matrix(rows)
+        predicted = np.full(len(rows), np.nan)
+        if valid.any():
+            predicted[valid] = self.predict_matrix(X[valid])
+
+        margin = 1.96 * self.std_error
+        results = []
+        for row, value in zip(rows, predicted):
+            if np.isnan(value):
+                result = {'predicted_time_minutes': None, 'confidence_interval_95': None}
+            else:
+                result = {
+                    'predicted_time_minutes': round(float(value), 2),
+                    'confidence_interval_95': {
+                        'lower': round(float(value - margin), 2),
+                        'upper': round(float(value + margin), 2)
+                    }
+                }
+            if 'job_id' in row:
+                result['job_id'] = row['job_id']
+            results.append(result)
+        return results
+
+    def apply_durations(
+        self,
+        jobs: List[Dict],
+        as_int: bool = False,
+        min_minutes: float = 1.0
+    ) -> Dict[str, Any]:
+        """
+        작업 dict 의 duration_minutes 를 예측값으로 교체 (in-place)
+
+        기존 값은 planned_duration_minutes 에 보존하고, 특징이 부족한 작업은 그대로 둔다.
+
+        Args:
+            as_int: CP-SAT 입력처럼 정수 분이 필요한 경우 올림
+            min_minutes: 최소 처리 시간
+
+        Returns:
+            {'predicted': int, 'skipped': int, 'elapsed_ms': float}
+        """
+        started = time.perf_counter()
+        X, valid = self.build_matrix(jobs)
+        index = np.flatnonzero(valid)
+        if len(index):
+            minutes = np.maximum(self.predict_matrix(X[index]), min_minutes)
+            if as_int:
+                minutes = np.ceil(minutes).astype(int)
+            for i, value in zip(index.tolist(), minutes.tolist()):
+                job = jobs[i]
+                job.setdefault('planned_duration_minutes', job.get('duration_minutes'))
+                job['duration_minutes'] = value
+                job['duration_source'] = 'xgb'
+
+        return {
+            'predicted': int(len(index)),
+            'skipped': int(len(jobs) - len(index)),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'model_dir': str(self.model_dir),
+            'cache_size': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'batches': self.batches,
+        }
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
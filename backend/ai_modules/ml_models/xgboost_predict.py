@@ -10,10 +10,26 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.preprocessing import LabelEncoder
 import joblib
 import json
+import os
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+MODEL_FILENAME = 'xgboost_process_time_model.json'
+META_FILENAME = 'model_metadata.pkl'
+CATEGORICAL_FEATURES = ['process_name', 'machine_id', 'item_type']
+
+
+def default_model_dir():
+    """모델 저장 디렉터리 (PROCESS_TIME_MODEL_DIR 환경변수, 없으면 ml_models/saved)"""
+    return Path(os.getenv('PROCESS_TIME_MODEL_DIR', Path(__file__).resolve().parent / 'saved'))
+
+
+def encoder_lookup(encoder):
+    """LabelEncoder → {카테고리: 코드} dict"""
+    return {value: code for code, value in enumerate(encoder.classes_)}
+
+
 class ProcessTimePredictorXGB:
     """
     XGBoost 기반 공정 시간 예측기
@@ -40,9 +56,7 @@ class ProcessTimePredictorXGB:
         df = df.copy()
 
         # 범주형 변수 인코딩
-        categorical_features = ['process_name', 'machine_id', 'item_type']
-
-        for col in categorical_features:
+        for col in CATEGORICAL_FEATURES:
             if fit:
                 if col not in self.label_encoders:
                     self.label_encoders[col] = LabelEncoder()
@@ -50,11 +64,8 @@ class ProcessTimePredictorXGB:
             else:
                 if col in self.label_encoders:
                     # 학습 시 보지 못한 카테고리는 -1로 처리
-                    df[col] = df[col].apply(
-                        lambda x: self.label_encoders[col].transform([x])[0]
-                        if x in self.label_encoders[col].classes_
-                        else -1
-                    )
+                    lookup = encoder_lookup(self.label_encoders[col])
+                    df[col] = df[col].map(lookup).fillna(-1).astype(int)
 
         # 특성과 타겟 분리
         if 'process_time_minutes' in df.columns:
@@ -222,18 +233,19 @@ class ProcessTimePredictorXGB:
 
         return results if len(results) > 1 else results[0]
 
-    def save_model(self, model_dir='C:\\Claude\\online-aps-cps-scheduler\\backend\\ai_modules\\ml_models\\saved'):
+    def save_model(self, model_dir=None):
         """
-        모델 저장
+        모델 저장 (model_dir 미지정 시 default_model_dir())
         """
+        model_dir = model_dir or default_model_dir()
         Path(model_dir).mkdir(parents=True, exist_ok=True)
 
         # XGBoost 모델 저장
-        model_path = Path(model_dir) / 'xgboost_process_time_model.json'
+        model_path = Path(model_dir) / MODEL_FILENAME
         self.model.save_model(str(model_path))
 
         # 메타데이터 저장 (LabelEncoders, feature_names 등)
-        meta_path = Path(model_dir) / 'model_metadata.pkl'
+        meta_path = Path(model_dir) / META_FILENAME
         metadata = {
             'feature_names': self.feature_names,
             'label_encoders': self.label_encoders,
@@ -244,12 +256,13 @@ class ProcessTimePredictorXGB:
         print(f"\n✅ 모델 저장 완료: {model_dir}")
         return model_path, meta_path
 
-    def load_model(self, model_dir='C:\\Claude\\online-aps-cps-scheduler\\backend\\ai_modules\\ml_models\\saved'):
+    def load_model(self, model_dir=None):
         """
-        저장된 모델 로드
+        저장된 모델 로드 (model_dir 미지정 시 default_model_dir())
         """
-        model_path = Path(model_dir) / 'xgboost_process_time_model.json'
-        meta_path = Path(model_dir) / 'model_metadata.pkl'
+        model_dir = model_dir or default_model_dir()
+        model_path = Path(model_dir) / MODEL_FILENAME
+        meta_path = Path(model_dir) / META_FILENAME
 
         # XGBoost 모델 로드
         self.model = xgb.XGBRegressor()
@@ -8,6 +8,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+from .feature_builder import DEFECT_FEATURE_NAMES, DefectFeatureBuilder, features_from_records
+
 try:
     from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
     from sklearn.model_selection import train_test_split, cross_val_score
@@ -64,54 +66,34 @@ class DefectPredictor:
         Returns:
             (features_array, feature_names)
         """
-        feature_list = []
-        feature_names = []
-
-        for record in data:
-            features = []
-
-            # 측정값 통계
-            features.append(record.get('measurement_value', 0))
-            features.append(record.get('measurement_std', 0))  # 부분군 표준편차
-            features.append(record.get('measurement_range', 0))  # 부분군 범위
-
-            # 시간 특징
-            hour = record.get('hour_of_day', 0)
-            features.append(hour)
-            features.append(1 if 6 <= hour < 14 else 0)  # 주간 교대
-            features.append(1 if 14 <= hour < 22 else 0)  # 야간 교대
-
-            # 기계 특징
-            features.append(record.get('machine_age_days', 0))
-            features.append(record.get('machine_usage_hours', 0))
-            features.append(record.get('days_since_maintenance', 0))
-
-            # 공정 조건
-            features.append(record.get('temperature', 20))
-            features.append(record.get('humidity', 50))
-            features.append(record.get('pressure', 1))
-
-            # 이전 측정값과의 차이
-            features.append(record.get('diff_from_prev', 0))
-            features.append(record.get('diff_from_mean', 0))
-
-            # 누적 통계
-            features.append(record.get('recent_defect_rate', 0))  # 최근 불량률
-            features.append(record.get('consecutive_within_spec', 0))  # 연속 규격 내 개수
-
-            feature_list.append(features)
-
-        if not feature_names:
-            feature_names = [
-                'measurement_value', 'measurement_std', 'measurement_range',
-                'hour_of_day', 'is_day_shift', 'is_night_shift',
-                'machine_age_days', 'machine_usage_hours', 'days_since_maintenance',
-                'temperature', 'humidity', 'pressure',
-                'diff_from_prev', 'diff_from_mean',
-                'recent_defect_rate', 'consecutive_within_spec'
-            ]
-
-        return np.array(feature_list), feature_names
+        return features_from_records(data), list(DEFECT_FEATURE_NAMES)
+
+    def prepare_features_from_frame(self, frame, window: int = 20) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        DataFrame / 컬럼 dict 에서 특징 추출 (파생 특징은 벡터 연산으로 계산)
+
+        Returns:
+            (features_array, labels, feature_names) - labels 는 is_within_spec 컬럼이 없으면 None
+        """
+        return DefectFeatureBuilder(window=window).from_frame(frame)
+
+    def prepare_features_from_queryset(
+        self,
+        queryset,
+        window: int = 20,
+        cache_dir: Optional[str] = None,
+        cache_token: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        QualityMeasurement 쿼리셋에서 특징 추출
+
+        Args:
+            cache_dir: 지정 시 특징 행렬을 .npy 로 캐시하고 memory-map 으로 로드
+            cache_token: 캐시 키에 더할 값 (기존 측정 수정 시 호출자가 바꿔 캐시 무효화)
+        """
+        return DefectFeatureBuilder(window=window, cache_dir=cache_dir).from_queryset(
+            queryset, cache_token=cache_token
+        )
 
     def train(
         self,
@@ -165,27 +147,41 @@ class DefectPredictor:
         Returns:
             PredictionResult
         """
+        return self.predict_defect_probability_batch(features.reshape(1, -1))[0]
+
+    def predict_defect_probability_batch(self, X: np.ndarray) -> List[PredictionResult]:
+        """
+        불량 발생 확률 일괄 예측 (predict_proba 1회)
+
+        Args:
+            X: 특징 배열 (n_samples, n_features)
+
+        Returns:
+            샘플별 PredictionResult 리스트
+        """
         if not self.is_trained:
             raise ValueError("모델이 학습되지 않았습니다")
 
         # 스케일링
-        features_scaled = self.scaler.transform(features.reshape(1, -1))
+        X_scaled = self.scaler.transform(X)
 
         # 예측
-        prob = self.model.predict_proba(features_scaled)[0][1]  # 불량 확률
-        confidence = max(self.model.predict_proba(features_scaled)[0])
-
-        # 설명 생성
-        explanation = self._generate_explanation(features, prob)
-
-        return PredictionResult(
-            predicted_value=prob,
-            confidence_score=confidence,
-            prediction_type='defect_probability',
-            features_used={'features': features.tolist()},
-            explanation=explanation,
-            timestamp=datetime.now()
-        )
+        proba = self.model.predict_proba(X_scaled)
+        probs = proba[:, 1]  # 불량 확률
+        confidences = proba.max(axis=1)
+
+        timestamp = datetime.now()
+        return [
+            PredictionResult(
+                predicted_value=float(probs[i]),
+                confidence_score=float(confidences[i]),
+                prediction_type='defect_probability',
+                features_used={'features': X[i].tolist()},
+                explanation=self._generate_explanation(X[i], probs[i]),
+                timestamp=timestamp
+            )
+            for i in range(X.shape[0])
+        ]
 
     def _generate_explanation(self, features: np.ndarray, prob: float) -> str:
         """예측 설명 생성"""
@@ -285,30 +281,43 @@ class QualityScorePredictor:
         Returns:
             PredictionResult
         """
+        return self.predict_quality_score_batch(features.reshape(1, -1))[0]
+
+    def predict_quality_score_batch(self, X: np.ndarray) -> List[PredictionResult]:
+        """
+        품질 점수 일괄 예측 (트리별 예측을 배치 단위로 1회씩 수행)
+
+        Args:
+            X: 특징 배열 (n_samples, n_features)
+
+        Returns:
+            샘플별 PredictionResult 리스트
+        """
         if not self.is_trained:
             raise ValueError("모델이 학습되지 않았습니다")
 
         # 스케일링
-        features_scaled = self.scaler.transform(features.reshape(1, -1))
+        X_scaled = self.scaler.transform(X)
 
-        # 예측
-        score = self.model.predict(features_scaled)[0]
-        score = np.clip(score, 0, 100)  # 0-100 범위로 제한
+        # 예측 (포레스트 예측 = 트리 예측 평균)
+        tree_predictions = np.stack([tree.predict(X_scaled) for tree in self.model.estimators_])
+        scores = np.clip(tree_predictions.mean(axis=0), 0, 100)  # 0-100 범위로 제한
 
         # 신뢰도 (예측값의 표준편차 기반)
-        tree_predictions = [tree.predict(features_scaled)[0] for tree in self.model.estimators_]
-        confidence = 1 - (np.std(tree_predictions) / 100)  # 표준화
-
-        explanation = self._generate_explanation(score)
-
-        return PredictionResult(
-            predicted_value=score,
-            confidence_score=confidence,
-            prediction_type='quality_score',
-            features_used={'features': features.tolist()},
-            explanation=explanation,
-            timestamp=datetime.now()
-        )
+        confidences = 1 - (tree_predictions.std(axis=0) / 100)  # 표준화
+
+        timestamp = datetime.now()
+        return [
+            PredictionResult(
+                predicted_value=float(scores[i]),
+                confidence_score=float(confidences[i]),
+                prediction_type='quality_score',
+                features_used={'features': X[i].tolist()},
+                explanation=self._generate_explanation(scores[i]),
+                timestamp=timestamp
+            )
+            for i in range(X.shape[0])
+        ]
 
     def _generate_explanation(self, score: float) -> str:
         """품질 점수 설명 생성"""
@@ -321,6 +330,25 @@ class QualityScorePredictor:
         else:
             return f"낮은 품질 (점수: {score:.1f}/100). 즉각적인 조치 필요."
 
+    def save_model(self, filepath: str):
+        """모델 저장"""
+        with open(filepath, 'wb') as f:
+            pickle.dump({
+                'model': self.model,
+                'scaler': self.scaler,
+                'feature_names': self.feature_names,
+                'is_trained': self.is_trained
+            }, f)
+
+    def load_model(self, filepath: str):
+        """모델 로드"""
+        with open(filepath, 'rb') as f:
+            data = pickle.load(f)
+            self.model = data['model']
+            self.scaler = data['scaler']
+            self.feature_names = data['feature_names']
+            self.is_trained = data['is_trained']
+
 
 # 사용 예시
 if __name__ == '__main__':
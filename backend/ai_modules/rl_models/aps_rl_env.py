@@ -65,7 +65,8 @@ class APSSchedulingEnv(gym.Env):
         self.total_tardiness = None
         self.total_makespan = None
 
-    def _default_config(self) -> Dict:
+    @staticmethod
+    def _default_config() -> Dict:
         """
         기본 환경 설정
         """
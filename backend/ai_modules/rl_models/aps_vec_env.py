@@ -0,0 +1,273 @@
+"""
+APS 스케줄링 벡터화 강화학습 환경 (stable-baselines3 VecEnv)
+N개 환경을 NumPy 배열 연산으로 동시에 진행 (lockstep)
+
+- 작업은 구조화 NumPy 배열 (n_envs, n_jobs) 로 보관
+- 관찰 버퍼를 미리 할당하고 설비 가용 시간 / 스케줄 플래그 구간만 갱신
+- action_masks(): 이미 스케줄된 작업 / 부적합 설비 조합을 제외한 (n_envs, n_jobs * n_machines) 마스크
+  (sb3-contrib MaskablePPO 와 masked_predict 에서 사용)
+- 관찰 / 행동 / 보상 정의는 APSSchedulingEnv 와 동일 → 학습된 정책을 서로 교환 가능
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+
+from aps_rl_env import APSSchedulingEnv
+
+INVALID_ACTION_PENALTY = -100.0
+
+
+def job_dtype(n_machines: int) -> np.dtype:
+    """작업 구조화 배열 dtype"""
+    return np.dtype([
+        ('process_time', np.float32),
+        ('due_date', np.float32),
+        ('priority', np.float32),
+        ('eligible', np.bool_, (n_machines,)),
+    ])
+
+
+class VecAPSSchedulingEnv(VecEnv):
+    """
+    APS 작업 스케줄링 벡터화 환경
+
+    에피소드가 끝난 환경은 SB3 규약대로 자동 리셋되며,
+    종료 시점 관찰은 info['terminal_observation'] 으로 전달된다.
+    """
+
+    def __init__(self, n_envs: int = 8, config: Optional[Dict] = None, seed: Optional[int] = None):
+        config = {**APSSchedulingEnv._default_config(), **(config or {})}
+        self.config = config
+        self.n_machines = config['n_machines']
+        self.n_jobs = config['n_jobs']
+        self.max_process_time = config['max_process_time']
+        # 무효 행동 반복으로 에피소드가 끝나지 않는 경우 대비
+        self.max_episode_steps = config.get('max_episode_steps', self.n_jobs * self.n_machines)
+
+        obs_dim = self.n_machines + self.n_jobs * 4
+        observation_space = spaces.Box(low=0, high=np.inf, shape=(obs_dim,), dtype=np.float32)
+        action_space = spaces.Discrete(self.n_jobs * self.n_machines)
+        super().__init__(n_envs, observation_space, action_space)
+
+        self.rng = np.random.default_rng(seed)
+        self.jobs = np.zeros((n_envs, self.n_jobs), dtype=job_dtype(self.n_machines))
+        self.machine_available_times = np.zeros((n_envs, self.n_machines), dtype=np.float32)
+        self.scheduled_jobs = np.zeros((n_envs, self.n_jobs), dtype=bool)
+        self.total_tardiness = np.zeros(n_envs, dtype=np.float64)
+        self.total_makespan = np.zeros(n_envs, dtype=np.float64)
+        self.episode_steps = np.zeros(n_envs, dtype=np.int64)
+
+        # 관찰 버퍼: [machine_times | process_times | due_dates | priorities | scheduled]
+        self._obs = np.zeros((n_envs, obs_dim), dtype=np.float32)
+        m, j = self.n_machines, self.n_jobs
+        self._obs_machine = slice(0, m)
+        self._obs_jobs = slice(m, m + 3 * j)
+        self._obs_scheduled = slice(m + 3 * j, m + 4 * j)
+
+        self._actions = np.zeros(n_envs, dtype=np.int64)
+        self._env_index = np.arange(n_envs)
+
+    # ------------------------------------------------------------------
+    # 작업 생성 / 로드
+    # ------------------------------------------------------------------
+
+    def _generate_jobs(self, env_indices: np.ndarray):
+        """APSSchedulingEnv._generate_jobs 와 같은 분포로 작업 일괄 생성"""
+        k, j, m = len(env_indices), self.n_jobs, self.n_machines
+        jobs = np.zeros((k, j), dtype=self.jobs.dtype)
+        jobs['process_time'] = self.rng.integers(10, self.max_process_time + 1, size=(k, j))
+        jobs['due_date'] = self.rng.integers(50, self.config['max_due_date'] + 1, size=(k, j))
+        jobs['priority'] = self.rng.integers(1, self.config['max_priority'] + 1, size=(k, j))
+
+        # 80%: 모든 설비 가능 / 20%: 일부 설비만 가능 (최소 1개 보장)
+        restricted = self.rng.random((k, j)) >= 0.8
+        eligible = np.where(restricted[..., None], self.rng.random((k, j, m)) > 0.5, True)
+        none = ~eligible.any(axis=2)
+        if none.any():
+            rows, cols = np.nonzero(none)
+            eligible[rows, cols, self.rng.integers(0, m, size=len(rows))] = True
+        jobs['eligible'] = eligible
+        self.jobs[env_indices] = jobs
+
+    def load_jobs(self, jobs: List[Dict], env_index: int = 0) -> np.ndarray:
+        """
+        실제 작업 리스트를 환경에 로드 (RLScheduler 용)
+
+        Args:
+            jobs: [{'process_time', 'due_date', 'priority', 'machine_eligibility'}, ...]
+
+        Returns:
+            전체 환경 관찰 (n_envs, obs_dim)
+        """
+        if len(jobs) != self.n_jobs:
+            raise ValueError(f"작업 수가 {self.n_jobs}개여야 합니다 (입력: {len(jobs)}개)")
+        row = self.jobs[env_index]
+        row['process_time'] = [job['process_time'] for job in jobs]
+        row['due_date'] = [job['due_date'] for job in jobs]
+        row['priority'] = [job.get('priority', 1) for job in jobs]
+        row['eligible'] = [
+            job.get('machine_eligibility', [True] * self.n_machines) for job in jobs
+        ]
+        self._reset_state(np.array([env_index]))
+        return self._obs.copy()
+
+    def _reset_state(self, env_indices: np.ndarray):
+        self.machine_available_times[env_indices] = 0.0
+        self.scheduled_jobs[env_indices] = False
+        self.total_tardiness[env_indices] = 0.0
+        self.total_makespan[env_indices] = 0.0
+        self.episode_steps[env_indices] = 0
+
+        jobs = self.jobs[env_indices]
+        self._obs[env_indices, self._obs_jobs] = np.concatenate(
+            [jobs['process_time'], jobs['due_date'], jobs['priority']], axis=1
+        )
+        self._obs[env_indices, self._obs_machine] = 0.0
+        self._obs[env_indices, self._obs_scheduled] = 0.0
+
+    def _reset_envs(self, env_indices: np.ndarray):
+        self._generate_jobs(env_indices)
+        self._reset_state(env_indices)
+
+    # ------------------------------------------------------------------
+    # VecEnv 인터페이스
+    # ------------------------------------------------------------------
+
+    def reset(self) -> np.ndarray:
+        seed = self._seeds[0] if getattr(self, '_seeds', None) else None
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+            self._reset_seeds()
+        self._reset_envs(self._env_index)
+        return self._obs.copy()
+
+    def step_async(self, actions: np.ndarray):
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        envs = self._env_index
+        job_idx = self._actions // self.n_machines
+        machine_idx = self._actions % self.n_machines
+        jobs = self.jobs[envs, job_idx]
+
+        # 무효 행동: 이미 스케줄된 작업 / 부적합 설비 (상태 변화 없이 패널티)
+        valid = ~self.scheduled_jobs[envs, job_idx] & jobs['eligible'][np.arange(self.num_envs), machine_idx]
+        rewards = np.full(self.num_envs, INVALID_ACTION_PENALTY, dtype=np.float32)
+
+        v_env, v_job, v_mc = envs[valid], job_idx[valid], machine_idx[valid]
+        completion = self.machine_available_times[v_env, v_mc] + jobs['process_time'][valid]
+        self.machine_available_times[v_env, v_mc] = completion
+        self.scheduled_jobs[v_env, v_job] = True
+
+        tardiness = np.maximum(0.0, completion - jobs['due_date'][valid])
+        self.total_tardiness[v_env] += tardiness
+        rewards[valid] = (
+            np.where(tardiness == 0, 100.0, -tardiness * self.config['tardiness_penalty'])
+            + jobs['priority'][valid] * 5
+        )
+
+        self.episode_steps += 1
+        terminated = self.scheduled_jobs.all(axis=1)
+        truncated = ~terminated & (self.episode_steps >= self.max_episode_steps)
+
+        if terminated.any():
+            times = self.machine_available_times[terminated]
+            makespan = times.max(axis=1)
+            self.total_makespan[terminated] = makespan
+            rewards[terminated] += (
+                -makespan * self.config['makespan_penalty']
+                + self.config['balance_reward'] / (1 + times.std(axis=1))
+            )
+
+        self._obs[:, self._obs_machine] = self.machine_available_times
+        self._obs[:, self._obs_scheduled] = self.scheduled_jobs
+        infos = self._infos()
+
+        done = terminated | truncated
+        if done.any():
+            done_idx = np.flatnonzero(done)
+            for i in done_idx:
+                infos[i]['terminal_observation'] = self._obs[i].copy()
+                infos[i]['TimeLimit.truncated'] = bool(truncated[i])
+            self._reset_envs(done_idx)
+
+        return self._obs.copy(), rewards, done, infos
+
+    def _infos(self) -> List[Dict[str, Any]]:
+        scheduled = self.scheduled_jobs.sum(axis=1)
+        utilization = self.machine_available_times.mean(axis=1)
+        return [
+            {
+                'total_tardiness': float(self.total_tardiness[i]),
+                'makespan': float(self.total_makespan[i]),
+                'scheduled_jobs': int(scheduled[i]),
+                'utilization': float(utilization[i]),
+            }
+            for i in range(self.num_envs)
+        ]
+
+    def action_masks(self) -> np.ndarray:
+        """유효 (작업, 설비) 조합 마스크 (n_envs, n_jobs * n_machines)"""
+        mask = self.jobs['eligible'] & ~self.scheduled_jobs[..., None]
+        return mask.reshape(self.num_envs, -1)
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        # sb3-contrib get_action_masks() 는 env_method('action_masks') 결과를 환경별로 stack
+        if method_name == 'action_masks':
+            masks = self.action_masks()
+            return [masks[i] for i in self._get_indices(indices)]
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False for _ in self._get_indices(indices)]
+
+
+def masked_predict(model, observations: np.ndarray, masks: np.ndarray, deterministic: bool = True) -> np.ndarray:
+    """
+    무효 행동을 제외하고 행동 선택
+
+    MaskablePPO 는 action_masks 인자를 그대로 사용하고,
+    일반 PPO 는 정책 분포의 logits 에 마스크를 적용해 argmax / 샘플링한다.
+    """
+    try:
+        return model.predict(observations, action_masks=masks, deterministic=deterministic)[0]
+    except TypeError:
+        pass
+
+    import torch
+
+    obs_tensor, _ = model.policy.obs_to_tensor(observations)
+    with torch.no_grad():
+        logits = model.policy.get_distribution(obs_tensor).distribution.logits.cpu().numpy()
+    logits = np.where(masks, logits, -np.inf)
+    if deterministic:
+        return logits.argmax(axis=1)
+    gumbel = -np.log(-np.log(np.random.random(logits.shape)))
+    return (logits + gumbel).argmax(axis=1)
+
+
+def load_agent(model_path: str):
+    """PPO / MaskablePPO 저장 모델 로드 (MaskablePPO 정책은 PPO.load 로 복원되지 않음)"""
+    from stable_baselines3 import PPO
+
+    try:
+        from sb3_contrib import MaskablePPO
+    except ImportError:
+        return PPO.load(model_path)
+
+    try:
+        return PPO.load(model_path)
+    except TypeError:
+        return MaskablePPO.load(model_path)
@@ -2,8 +2,7 @@
 RL 기반 최적 스케줄링 실행 스크립트
 학습된 PPO 에이전트를 사용하여 실제 작업 스케줄링
 """
-from stable_baselines3 import PPO
-from aps_rl_env import APSSchedulingEnv
+from aps_vec_env import VecAPSSchedulingEnv, load_agent, masked_predict
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -20,10 +19,10 @@ class RLScheduler:
         초기화
 
         Args:
-            model_path: 학습된 PPO 모델 경로
+            model_path: 학습된 PPO / MaskablePPO 모델 경로
         """
         print(f"🔄 RL 모델 로드 중: {model_path}")
-        self.model = PPO.load(model_path)
+        self.model = load_agent(model_path)
         print(f"✅ 모델 로드 완료")
 
     def schedule_jobs(
@@ -67,57 +66,44 @@ class RLScheduler:
             'max_due_date': max(job['due_date'] for job in jobs)
         }
 
-        env = APSSchedulingEnv(config=env_config)
+        env = VecAPSSchedulingEnv(n_envs=1, config=env_config)
+        observation = env.load_jobs(jobs)
 
-        # 작업 데이터 설정
-        env.jobs = jobs
-        env.n_jobs = len(jobs)
-        env.n_machines = len(machines)
-        env.machine_available_times = np.zeros(len(machines), dtype=np.float32)
-        env.scheduled_jobs = np.zeros(len(jobs), dtype=bool)
-        env.total_tardiness = 0.0
-        env.total_makespan = 0.0
-
-        # 초기 관찰
-        observation = env._get_observation()
-
-        # 스케줄링 실행
+        # 스케줄링 실행 (무효 행동을 마스킹하므로 작업 수만큼만 진행)
         schedule = []
-        step = 0
-
-        while not env.scheduled_jobs.all():
-            step += 1
-
-            # RL 에이전트가 액션 선택
-            action, _states = self.model.predict(observation, deterministic=deterministic)
+        info = {'total_tardiness': 0.0, 'makespan': 0.0, 'utilization': 0.0, 'scheduled_jobs': 0}
 
-            # 액션 실행
-            observation, reward, terminated, truncated, info = env.step(action)
+        for step in range(len(jobs)):
+            masks = env.action_masks()
+            if not masks.any():
+                break
 
-            # 액션 디코딩
+            # RL 에이전트가 유효 행동 중 선택
+            action = int(masked_predict(self.model, observation, masks, deterministic=deterministic)[0])
             job_idx = action // env.n_machines
             machine_idx = action % env.n_machines
 
-            # 스케줄 기록 (유효한 액션인 경우)
-            if reward > -100:  # Invalid action 아닌 경우
-                job = env.jobs[job_idx]
-                machine = machines[machine_idx]
-
-                start_time = env.machine_available_times[machine_idx] - job['process_time']
-                end_time = env.machine_available_times[machine_idx]
-
-                schedule_entry = {
-                    'job_id': job.get('job_id', f'JOB{job_idx:03d}'),
-                    'machine_id': machine['machine_id'],
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'process_time': job['process_time'],
-                    'due_date': job['due_date'],
-                    'tardiness': max(0, end_time - job['due_date'])
-                }
-                schedule.append(schedule_entry)
+            job = jobs[job_idx]
+            machine = machines[machine_idx]
+            start_time = float(env.machine_available_times[0, machine_idx])
+            end_time = start_time + job['process_time']
+
+            # 액션 실행 (마지막 작업이면 환경이 자동 리셋되므로 종료 정보는 info 에서 사용)
+            observation, reward, done, infos = env.step(np.array([action]))
+            info = infos[0]
+
+            schedule_entry = {
+                'job_id': job.get('job_id', f'JOB{job_idx:03d}'),
+                'machine_id': machine['machine_id'],
+                'start_time': start_time,
+                'end_time': end_time,
+                'process_time': job['process_time'],
+                'due_date': job['due_date'],
+                'tardiness': max(0, end_time - job['due_date'])
+            }
+            schedule.append(schedule_entry)
 
-            if terminated or truncated:
+            if done[0]:
                 break
 
         # 최종 메트릭
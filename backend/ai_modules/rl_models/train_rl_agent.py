@@ -6,12 +6,20 @@ import gymnasium as gym
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.callbacks import EvalCallback, CheckpointCallback
-from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecMonitor
 import numpy as np
 from pathlib import Path
 import os
 
 from aps_rl_env import APSSchedulingEnv
+from aps_vec_env import VecAPSSchedulingEnv, load_agent
+
+try:
+    from sb3_contrib import MaskablePPO
+    from sb3_contrib.common.maskable.callbacks import MaskableEvalCallback
+    SB3_CONTRIB_AVAILABLE = True
+except ImportError:
+    SB3_CONTRIB_AVAILABLE = False
 
 def train_ppo_agent(
     n_jobs=20,
@@ -19,7 +27,9 @@ def train_ppo_agent(
     total_timesteps=500000,
     save_dir='saved_models',
     use_parallel_envs=True,
-    n_envs=4
+    n_envs=4,
+    use_vector_env=True,
+    use_action_masking=True
 ):
     """
     PPO 에이전트 학습
@@ -31,6 +41,9 @@ def train_ppo_agent(
         save_dir: 모델 저장 디렉토리
         use_parallel_envs: 병렬 환경 사용 여부
         n_envs: 병렬 환경 수
+        use_vector_env: 배열 기반 벡터화 환경(VecAPSSchedulingEnv) 사용 여부
+            (False 면 APSSchedulingEnv 를 SubprocVecEnv/DummyVecEnv 로 병렬화)
+        use_action_masking: sb3-contrib MaskablePPO 로 무효 행동 마스킹 (벡터화 환경 + sb3-contrib 설치 시)
     """
     print("=" * 80)
     print("🚀 PPO 에이전트 학습 시작")
@@ -53,7 +66,11 @@ def train_ppo_agent(
     }
 
     # 환경 생성
-    if use_parallel_envs:
+    use_action_masking = use_action_masking and use_vector_env and SB3_CONTRIB_AVAILABLE
+    if use_vector_env:
+        print(f"\n🔧 벡터화 환경 생성 ({n_envs}개, 마스킹={use_action_masking})...")
+        env = VecMonitor(VecAPSSchedulingEnv(n_envs=n_envs, config=env_config))
+    elif use_parallel_envs:
         print(f"\n🔧 병렬 환경 생성 ({n_envs}개)...")
         env = make_vec_env(
             lambda: APSSchedulingEnv(config=env_config),
@@ -66,8 +83,11 @@ def train_ppo_agent(
         env = DummyVecEnv([lambda: env])
 
     # 평가 환경 (별도)
-    eval_env = APSSchedulingEnv(config=env_config)
-    eval_env = DummyVecEnv([lambda: eval_env])
+    if use_vector_env:
+        eval_env = VecMonitor(VecAPSSchedulingEnv(n_envs=1, config=env_config))
+    else:
+        eval_env = APSSchedulingEnv(config=env_config)
+        eval_env = DummyVecEnv([lambda: eval_env])
 
     # PPO 하이퍼파라미터
     ppo_config = {
@@ -94,11 +114,12 @@ def train_ppo_agent(
 
     # PPO 에이전트 생성
     print(f"\n🤖 PPO 에이전트 생성 중...")
-    model = PPO(**ppo_config)
+    model = MaskablePPO(**ppo_config) if use_action_masking else PPO(**ppo_config)
 
     # 콜백 설정
     # 1. 평가 콜백 (10,000 스텝마다 평가)
-    eval_callback = EvalCallback(
+    eval_callback_cls = MaskableEvalCallback if use_action_masking else EvalCallback
+    eval_callback = eval_callback_cls(
         eval_env,
         best_model_save_path=str(save_path / 'best_model'),
         log_path=str(save_path / 'eval_logs'),
@@ -161,7 +182,7 @@ def evaluate_agent(model_path, n_episodes=100, render=False):
 
     # 모델 로드
     print(f"\n🔄 모델 로드 중: {model_path}")
-    model = PPO.load(model_path)
+    model = load_agent(model_path)
 
     # 평가 환경 생성
     env_config = {
@@ -0,0 +1,68 @@
+"""
+Tests for the vectorized APS scheduling environment (ai_modules/rl_models/aps_vec_env.py)
+
+같은 작업 / 같은 행동이면 벡터 환경과 APSSchedulingEnv 의 관찰 / 보상 / 종료가 같아야 한다
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# rl_models 모듈은 스크립트 방식 import (from aps_rl_env import ...) 를 사용
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'rl_models'))
+
+from aps_rl_env import APSSchedulingEnv  # noqa: E402
+from aps_vec_env import VecAPSSchedulingEnv  # noqa: E402
+
+CONFIG = {**APSSchedulingEnv._default_config(), 'n_machines': 3, 'n_jobs': 6}
+
+
+def _actions(env):
+    """무효 행동 (부적합 설비 / 중복 작업) 을 섞은 전체 스케줄 행동 순서"""
+    m = env.n_machines
+    actions = []
+    for job_idx, job in enumerate(env.jobs):
+        eligible = np.flatnonzero(job['machine_eligibility'])
+        ineligible = np.flatnonzero(~job['machine_eligibility'])
+        if len(ineligible):
+            actions.append(job_idx * m + int(ineligible[0]))
+        actions.append(job_idx * m + int(eligible[job_idx % len(eligible)]))
+        if job_idx == 1:
+            actions.append(0)  # 이미 스케줄된 작업 0
+    return actions
+
+
+@pytest.mark.parametrize('seed', [0, 7, 42])
+def test_reset_and_step_match_single_env(seed):
+    env = APSSchedulingEnv(dict(CONFIG))
+    obs, info = env.reset(seed=seed)
+    vec = VecAPSSchedulingEnv(n_envs=1, config=dict(CONFIG), seed=seed)
+    vec.reset()
+
+    vec_obs = vec.load_jobs(env.jobs)
+    np.testing.assert_array_equal(vec_obs[0], obs)
+
+    actions = _actions(env)
+    for step, action in enumerate(actions):
+        obs, reward, terminated, truncated, info = env.step(action)
+        vec_obs, vec_rewards, vec_dones, vec_infos = vec.step(np.array([action]))
+
+        assert vec_dones[0] == (terminated or truncated)
+        assert vec_rewards[0] == pytest.approx(reward, rel=1e-5)
+        if vec_dones[0]:
+            # 종료된 환경은 자동 리셋되므로 종료 시점 관찰은 terminal_observation 으로 비교
+            np.testing.assert_allclose(vec_infos[0]['terminal_observation'], obs, rtol=1e-6)
+        else:
+            np.testing.assert_allclose(vec_obs[0], obs, rtol=1e-6)
+            assert vec_infos[0]['total_tardiness'] == pytest.approx(float(info['total_tardiness']))
+
+    assert terminated and step == len(actions) - 1
+
+
+def test_default_config_is_shared():
+    vec = VecAPSSchedulingEnv(n_envs=2, config={'n_jobs': 4})
+
+    assert vec.config == {**APSSchedulingEnv._default_config(), 'n_jobs': 4}
+    assert vec.reset().shape == (2, vec.n_machines + 4 * 4)
+    assert vec.action_masks().shape == (2, 4 * vec.n_machines)
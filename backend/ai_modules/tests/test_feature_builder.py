@@ -0,0 +1,148 @@
+"""
+Tests for the vectorized defect feature builder (ai_modules/feature_builder.py)
+
+벡터 연산 결과는 레코드 단위 계산 (prepare_features 입력) 과 같아야 한다
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from django.utils import timezone
+
+from ai_modules.feature_builder import DEFECT_FEATURE_NAMES, DefectFeatureBuilder, features_from_records
+from apps.spc.models import Product, QualityMeasurement
+
+WINDOW = 3
+
+
+def _raw_columns(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1, 5)
+    order = rng.permutation(n)  # 입력 행 순서는 측정시각 순서와 다름
+    return {
+        'product_id': [int(i % 2) + 1 for i in order],
+        'subgroup_number': [int(i // 4) for i in order],
+        'measured_at': [start + timedelta(minutes=37 * int(i)) for i in order],
+        'measurement_value': rng.normal(10.0, 1.0, n).round(3).tolist(),
+        'is_within_spec': (rng.random(n) > 0.25).tolist(),
+        'metadata': [{'temperature': 21.5, 'machine_age_days': 100} if i % 3 else {} for i in order],
+    }
+
+
+def _reference_records(columns, window=WINDOW):
+    """prepare_features 에 넘기던 레코드를 행 단위 루프로 계산"""
+    n = len(columns['measurement_value'])
+    rows = [{name: values[i] for name, values in columns.items()} for i in range(n)]
+    records = [None] * n
+    history = {}
+    for i in sorted(range(n), key=lambda i: (rows[i]['product_id'], rows[i]['measured_at'], i)):
+        row = rows[i]
+        prior = history.setdefault(row['product_id'], [])
+        subgroup = [r['measurement_value'] for r in rows
+                    if (r['product_id'], r['subgroup_number']) == (row['product_id'], row['subgroup_number'])]
+        recent = prior[-window:]
+        streak = 0
+        for previous in reversed(prior):
+            if not previous['is_within_spec']:
+                break
+            streak += 1
+        value = row['measurement_value']
+        records[i] = {
+            'measurement_value': value,
+            'measurement_std': float(np.std(subgroup, ddof=1)) if len(subgroup) > 1 else 0.0,
+            'measurement_range': max(subgroup) - min(subgroup),
+            'hour_of_day': row['measured_at'].hour,
+            'diff_from_prev': value - prior[-1]['measurement_value'] if prior else 0.0,
+            'diff_from_mean': value - np.mean([r['measurement_value'] for r in recent]) if recent else 0.0,
+            'recent_defect_rate': np.mean([not r['is_within_spec'] for r in recent]) if recent else 0.0,
+            'consecutive_within_spec': streak,
+            **row['metadata'],
+        }
+        prior.append(row)
+    return records
+
+
+class TestFromFrame:
+    """DataFrame / 컬럼 dict 입력"""
+
+    def test_matches_record_features(self):
+        columns = _raw_columns()
+
+        X, y, names = DefectFeatureBuilder(window=WINDOW).from_frame(columns)
+        expected = features_from_records(_reference_records(columns))
+
+        assert names == DEFECT_FEATURE_NAMES
+        np.testing.assert_allclose(X, expected, atol=1e-9)
+        assert y.tolist() == [int(not within) for within in columns['is_within_spec']]
+
+    def test_given_derived_columns_are_used_as_is(self):
+        records = _reference_records(_raw_columns())
+        X, y, _ = DefectFeatureBuilder(window=WINDOW).from_frame(records)
+
+        assert y is None
+        np.testing.assert_allclose(X, features_from_records(records), atol=1e-9)
+
+
+@pytest.fixture
+def measurements():
+    columns = _raw_columns(n=24)
+    products = {
+        pid: Product.objects.create(product_code=f'P{pid}', product_name=f'제품 {pid}', usl=12.0, lsl=8.0)
+        for pid in (1, 2)
+    }
+    for i in range(24):
+        QualityMeasurement.objects.create(
+            product=products[columns['product_id'][i]],
+            measurement_value=columns['measurement_value'][i],
+            sample_number=1,
+            subgroup_number=columns['subgroup_number'][i],
+            measured_at=timezone.make_aware(columns['measured_at'][i]),
+            measured_by='tester',
+            is_within_spec=columns['is_within_spec'][i],
+            metadata=columns['metadata'][i],
+        )
+    return products
+
+
+@pytest.mark.django_db
+class TestFromQueryset:
+    """쿼리셋 입력 / .npy memory-map 캐시"""
+
+    def test_matches_frame_features(self, measurements):
+        queryset = QualityMeasurement.objects.all()
+        rows = list(queryset.order_by('product_id', 'measured_at', 'pk').values(
+            'product_id', 'subgroup_number', 'measured_at', 'measurement_value', 'is_within_spec', 'metadata',
+        ))
+        columns = {name: [row[name] for row in rows] for name in rows[0]}
+
+        X, y, _ = DefectFeatureBuilder(window=WINDOW).from_queryset(queryset)
+        expected_X, expected_y, _ = DefectFeatureBuilder(window=WINDOW).from_frame(columns)
+
+        np.testing.assert_allclose(X, expected_X)
+        assert y.tolist() == expected_y.tolist()
+
+    def test_cache_round_trip_and_invalidation(self, measurements, tmp_path):
+        builder = DefectFeatureBuilder(window=WINDOW, cache_dir=str(tmp_path))
+        queryset = QualityMeasurement.objects.filter(product=measurements[1])
+
+        X, y, _ = builder.from_queryset(queryset)
+        cached_X, cached_y, _ = builder.from_queryset(queryset)
+
+        assert isinstance(cached_X, np.memmap)
+        np.testing.assert_array_equal(cached_X, X)
+        np.testing.assert_array_equal(cached_y, y)
+        assert len(list(tmp_path.glob('*_X.npy'))) == 1
+
+        # 새 측정 (건수 / 최신 ID 변경) → 새 키
+        QualityMeasurement.objects.create(
+            product=measurements[1], measurement_value=99.0, sample_number=1, subgroup_number=99,
+            measured_at=timezone.now(), measured_by='tester', is_within_spec=False,
+        )
+        grown, _, _ = builder.from_queryset(queryset)
+        assert grown.shape[0] == X.shape[0] + 1
+
+        # 기존 행 수정은 호출자 토큰으로 구분
+        queryset.filter(subgroup_number=99).update(measurement_value=50.0)
+        assert builder.from_queryset(queryset)[0][-1, 0] == 99.0
+        assert builder.from_queryset(queryset, cache_token='v2')[0][-1, 0] == 50.0
+        assert len(list(tmp_path.glob('*_X.npy'))) == 3
@@ -0,0 +1,100 @@
+"""
+Tests for micro-batched inference (ai_modules/inference_service.py)
+"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ai_modules.inference_service import MicroBatcher, _Request
+
+
+class RecordingBatch:
+    """배치 크기를 기록하고 행 합계를 반환하는 batch_fn"""
+
+    def __init__(self):
+        self.sizes = []
+        self.lock = threading.Lock()
+
+    def __call__(self, features):
+        with self.lock:
+            self.sizes.append(len(features))
+        return features.sum(axis=1).tolist()
+
+
+class TestMicroBatcher:
+    """배치 묶음 / 대기 시간 / 오류 전파 / 종료"""
+
+    def test_batches_up_to_max_batch_size(self):
+        batch_fn = RecordingBatch()
+        batcher = MicroBatcher('test', batch_fn, max_batch_size=4, max_wait_ms=200)
+
+        futures = [batcher.submit([i, 1.0]) for i in range(10)]
+        results = [future.result(5) for future in futures]
+        batcher.close()
+
+        assert results == [i + 1.0 for i in range(10)]
+        assert sum(batch_fn.sizes) == 10
+        assert max(batch_fn.sizes) <= 4
+        assert batch_fn.sizes[:2] == [4, 4]
+        assert batcher.stats()['requests'] == 10
+
+    def test_partial_batch_flushes_after_max_wait(self):
+        batch_fn = RecordingBatch()
+        batcher = MicroBatcher('test', batch_fn, max_batch_size=64, max_wait_ms=20)
+
+        started = time.monotonic()
+        assert batcher.submit([1.0, 2.0]).result(5) == 3.0
+        elapsed = time.monotonic() - started
+        batcher.close()
+
+        assert batch_fn.sizes == [1]
+        assert 0.015 <= elapsed < 2.0
+
+    def test_batch_error_fails_every_request(self):
+        def broken(features):
+            raise ValueError('model failure')
+
+        batcher = MicroBatcher('test', broken, max_batch_size=8, max_wait_ms=50)
+        futures = [batcher.submit([1.0]) for _ in range(3)]
+
+        for future in futures:
+            with pytest.raises(ValueError, match='model failure'):
+                future.result(5)
+        batcher.close()
+        assert batcher.failed_batches >= 1
+
+    def test_short_result_fails_batch(self):
+        batcher = MicroBatcher('test', lambda features: [0.0], max_batch_size=8, max_wait_ms=50)
+        futures = [batcher.submit([1.0]) for _ in range(3)]
+
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(5)
+        batcher.close()
+
+    def test_feature_count_checked_on_submit(self):
+        batcher = MicroBatcher('test', RecordingBatch(), n_features=2)
+        with pytest.raises(ValueError):
+            batcher.submit([1.0, 2.0, 3.0])
+
+    def test_close_processes_queued_requests_then_rejects(self):
+        batcher = MicroBatcher('test', RecordingBatch(), max_batch_size=2, max_wait_ms=100)
+        futures = [batcher.submit([1.0]) for _ in range(5)]
+
+        batcher.close()
+
+        assert [future.result(0) for future in futures] == [1.0] * 5
+        with pytest.raises(RuntimeError):
+            batcher.submit([1.0])
+
+    def test_close_fails_requests_left_in_queue(self):
+        batcher = MicroBatcher('test', RecordingBatch())
+        request = _Request(np.array([1.0]))
+        batcher._queue.put(request)
+
+        batcher.close()
+
+        with pytest.raises(RuntimeError):
+            request.future.result(0)
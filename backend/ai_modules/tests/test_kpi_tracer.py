@@ -0,0 +1,92 @@
+"""
+Tests for the causal graph index (ai_modules/llm_modules/kpi_tracer.py)
+
+인접 인덱스 조회 결과는 SPARQL 재귀 조회와 같은 원인 / 경로를 반환해야 한다
+"""
+import pytest
+
+from ai_modules.llm_modules.kpi_tracer import APSKPITracer, build_example_tracer
+
+
+def _normalized(chains):
+    """원인 순서는 SPARQL 결과 순서에 의존하므로 원인 이름으로 정렬해 비교"""
+    def tree(causes):
+        return sorted(
+            ({**cause, 'sub_causes': tree(cause['sub_causes'])} for cause in causes),
+            key=lambda cause: cause['cause'],
+        )
+    return [{**chain, 'root_causes': tree(chain['root_causes'])} for chain in chains]
+
+
+def _leaf_paths(causes, path):
+    """원인 트리의 말단까지 경로 (근본 원인 → 이벤트 순)"""
+    paths = []
+    for cause in causes:
+        step = [cause['cause']] + path
+        paths.extend(_leaf_paths(cause['sub_causes'], step) if cause['sub_causes'] else [step])
+    return paths
+
+
+@pytest.fixture
+def branched():
+    """공유 원인 / 다중 분기가 있는 그래프"""
+    tracer = APSKPITracer()
+    for event_id, severity in (('A', 0.9), ('B', 0.6), ('C', 0.5), ('D', 0.4), ('R', 0.3)):
+        tracer.add_event(event_id, 'delay', f'이벤트 {event_id}', severity=severity)
+    tracer.add_kpi('otd', '납기준수율', value=80.0, target=95.0)
+    tracer.add_causal_relation('Event_B', 'causes', 'Event_A')
+    tracer.add_causal_relation('Event_C', 'leadsTo', 'Event_A')
+    tracer.add_causal_relation('Event_R', 'causes', 'Event_B')
+    tracer.add_causal_relation('Event_D', 'causes', 'Event_C')
+    tracer.add_causal_relation('Event_A', 'decreases', 'KPI_otd')
+    tracer.add_causal_relation('Event_D', 'affects', 'KPI_otd')
+    return tracer
+
+
+class TestCausalGraphIndex:
+    """인덱스 조회 vs SPARQL"""
+
+    @pytest.mark.parametrize('kpi_id', ['production_efficiency', 'total_tardiness'])
+    @pytest.mark.parametrize('max_depth', [1, 3, 5])
+    def test_example_graph_matches_sparql(self, kpi_id, max_depth):
+        tracer = build_example_tracer()
+
+        indexed = tracer.trace_kpi_impact(kpi_id, max_depth=max_depth)
+        sparql = tracer.trace_kpi_impact(kpi_id, max_depth=max_depth, use_index=False)
+
+        assert indexed == sparql
+        assert indexed[0]['event'] == 'Event_E003'
+
+    def test_branched_graph_matches_sparql(self, branched):
+        indexed = branched.trace_kpi_impact('otd', max_depth=5)
+        sparql = branched.trace_kpi_impact('otd', max_depth=5, use_index=False)
+
+        assert _normalized(indexed) == _normalized(sparql)
+        assert [chain['event'] for chain in indexed] == ['Event_A', 'Event_D']
+
+    def test_root_cause_paths_match_sparql_tree(self, branched):
+        sparql = {chain['event']: chain for chain in branched.trace_kpi_impact('otd', max_depth=5, use_index=False)}
+
+        for chain in branched.trace_root_causes('otd', max_depth=5):
+            expected = _leaf_paths(sparql[chain['event']]['root_causes'], [chain['event']])
+            assert sorted(root['path'] for root in chain['root_causes']) == sorted(expected)
+            assert all(root['is_root'] for root in chain['root_causes'])
+
+    def test_index_rebuilt_from_exported_graph(self, tmp_path):
+        tracer = build_example_tracer()
+        path = tmp_path / 'example.ttl'
+        tracer.export_graph(str(path))
+
+        loaded = APSKPITracer()
+        loaded.import_graph(str(path))
+
+        assert loaded.trace_kpi_impact('production_efficiency', max_depth=3) == \
+               tracer.trace_kpi_impact('production_efficiency', max_depth=3, use_index=False)
+
+    @pytest.mark.parametrize('threshold', [0.5, 0.75, 0.9, 0.99])
+    def test_bottlenecks_match_sparql(self, threshold):
+        tracer = build_example_tracer()
+
+        indexed = tracer.find_bottlenecks(threshold)
+
+        assert indexed == pytest.approx(tracer.find_bottlenecks(threshold, use_index=False))
@@ -1,14 +1,30 @@
 """
 SPC Endpoints - SPC-01
 """
-from fastapi import APIRouter, Query
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.deps import get_async_db
+from app.models.spc import spc_chart_def, spc_chart_point, spc_event
 from app.schemas.common import ApiResponse
 from app.schemas.spc import (
     SpcChartDefDTO, SpcPointDTO, SpcEventDTO, SamplingRuleDTO,
     SpcChartCreateRequest, SpcRecalcResponse, SpcEventCreateRequest
 )
 
+from app.services.spc_recalc import (
+    ChartNotFoundError, fetch_points, parse_datetime, recalc_chart_points,
+)
+
 router = APIRouter()
+settings = get_settings()
+
+SEVERITY_LEVELS = {1: 'LOW', 2: 'MEDIUM', 3: 'HIGH', 4: 'CRITICAL'}
 
 
 @router.get("/sampling/rules", response_model=ApiResponse[SamplingRuleDTO])
@@ -31,32 +47,146 @@ async def create_chart(chart: SpcChartCreateRequest):
 
 @router.post("/charts/{chart_def_id}/recalc", response_model=ApiResponse[SpcRecalcResponse])
 async def recalc_chart(
-    chart_def_id: str,
+    chart_def_id: int,
     from_date: str = Query(...),
-    to_date: str = Query(...)
+    to_date: str = Query(...),
+    chunk_size: Optional[int] = Query(None, ge=100, le=100000),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Recalculate SPC chart points"""
-    # TODO: Implement recalculation logic
+    """Recalculate SPC chart points (streams measurements, rebuilds points in the range)"""
+    try:
+        from_dt = parse_datetime(from_date)
+        to_dt = parse_datetime(to_date, end=True)
+    except ValueError:
+        return ApiResponse(ok=False, data=None, error="from_date/to_date must be ISO dates")
+
+    try:
+        result = await recalc_chart_points(db, chart_def_id, from_dt, to_dt, chunk_size)
+    except ChartNotFoundError as e:
+        return ApiResponse(ok=False, data=None, error=str(e))
+    except ValueError as e:
+        return ApiResponse(ok=False, data=None, error=str(e))
+
     return ApiResponse(ok=True, data=SpcRecalcResponse(
-        chart_def_id=chart_def_id,
-        points_created=0,
-        violations=0
+        chart_def_id=str(chart_def_id),
+        points_created=result['points_created'],
+        violations=result['violations'],
+        measurements=result['measurements'],
+        limits_source=result['limits_source'],
+        elapsed_ms=result['elapsed_ms'],
     ), error=None)
 
 
 @router.get("/charts/{chart_def_id}/points", response_model=ApiResponse[dict])
 async def get_points(
-    chart_def_id: str,
+    chart_def_id: int,
     from_date: str = Query(None),
-    to_date: str = Query(None)
+    to_date: str = Query(None),
+    cursor: str = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(None, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get SPC chart points"""
-    # TODO: Implement DB query
-    return ApiResponse(ok=True, data={"chart_type": "XBAR_R", "points": []}, error=None)
+    """Get SPC chart points (keyset pagination on point_dt, point_id)"""
+    try:
+        from_dt = parse_datetime(from_date) if from_date else None
+        to_dt = parse_datetime(to_date, end=True) if to_date else None
+        page = await fetch_points(
+            db, chart_def_id, from_dt, to_dt, cursor, limit or settings.SPC_POINTS_PAGE_SIZE
+        )
+    except ChartNotFoundError as e:
+        return ApiResponse(ok=False, data=None, error=str(e))
+    except ValueError:
+        return ApiResponse(ok=False, data=None, error="Invalid date or cursor")
+
+    chart = page['chart']
+    return ApiResponse(ok=True, data={
+        "chart_type": chart['chart_type'],
+        "points": [_point_dto(row).model_dump() for row in page['points']],
+        "has_more": page['has_more'],
+        "next_cursor": page['next_cursor'],
+    }, error=None)
 
 
 @router.post("/events", response_model=ApiResponse[SpcEventDTO])
-async def create_event(event: SpcEventCreateRequest):
+async def create_event(event: SpcEventCreateRequest, db: AsyncSession = Depends(get_async_db)):
     """Create SPC event"""
-    # TODO: Implement DB insert
-    return ApiResponse(ok=True, data=None, error=None)
+    try:
+        chart_def_id, point_id = int(event.chart_def_id), int(event.point_id)
+        owner_user_id = int(event.owner_user_id) if event.owner_user_id else 0  # 0 = unassigned
+    except ValueError:
+        return ApiResponse(ok=False, data=None, error="chart_def_id/point_id/owner_user_id must be numeric")
+
+    async with db.begin():
+        point = (await db.execute(
+            select(spc_chart_point.c.violation_codes, spc_chart_def.c.site_id)
+            .join(spc_chart_def, spc_chart_def.c.chart_def_id == spc_chart_point.c.chart_def_id)
+            .where(spc_chart_point.c.point_id == point_id, spc_chart_point.c.chart_def_id == chart_def_id)
+        )).first()
+        if point is None:
+            return ApiResponse(ok=False, data=None, error="Point not found for chart")
+
+        now = datetime.now(timezone.utc)
+        codes = point.violation_codes or []
+        values = {
+            'site_id': point.site_id,
+            'chart_def_id': chart_def_id,
+            'point_id': point_id,
+            'event_dt': now,
+            'severity': SEVERITY_LEVELS[min(max(event.severity, 1), 4)],
+            'event_type': event.event_type,
+            'description': f"{event.event_type}: {', '.join(codes)}" if codes else event.event_type,
+            'status': 'OPEN',
+            'owner_user_id': owner_user_id,
+            'root_cause': '',
+            'corrective_action': '',
+            'preventive_action': '',
+            'created_at': now,
+            'updated_at': now,
+        }
+        event_id = (await db.execute(
+            insert(spc_event).values(values).returning(spc_event.c.event_id)
+        )).scalar_one()
+
+    return ApiResponse(ok=True, data=SpcEventDTO(
+        event_id=str(event_id),
+        site_id=str(point.site_id),
+        chart_def_id=str(chart_def_id),
+        point_id=str(point_id),
+        event_dt=now,
+        severity=event.severity,
+        event_type=event.event_type,
+        status='OPEN',
+        owner_user_id=event.owner_user_id,
+        ai_rootcause_id=None,
+        created_at=now,
+        created_by=None,
+        updated_at=now,
+        updated_by=None,
+    ), error=None)
+
+
+def _point_dto(row: dict) -> SpcPointDTO:
+    return SpcPointDTO(
+        point_id=str(row['point_id']),
+        chart_def_id=str(row['chart_def_id']),
+        run_id=str(row['run_id']) if row['run_id'] is not None else None,
+        point_dt=row['point_dt'],
+        n=row['n'],
+        xbar=row['xbar'],
+        r=row['r'],
+        s=row['s'],
+        p=row['p'],
+        u=row['u'],
+        mr=row['mr'],
+        ucl=row['ucl'],
+        cl=row['cl'],
+        lcl=row['lcl'],
+        cp=row['cp'],
+        cpk=row['cpk'],
+        is_violation=row['is_violation'],
+        violation_codes=row['violation_codes'] or [],
+        created_at=row['created_at'],
+        created_by=None,
+        updated_at=row['created_at'],
+        updated_by=None,
+    )
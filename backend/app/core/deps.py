@@ -1,9 +1,10 @@
 """
 Dependencies for dependency injection
 """
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db as get_db_session
+from app.database import get_db as get_db_session, get_async_db as get_async_db_session
 
 
 async def get_db() -> Generator[Session, None, None]:
@@ -13,3 +14,9 @@ async def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session (pooled)"""
+    async for session in get_async_db_session():
+        yield session
@@ -1,7 +1,12 @@
 """
 Database Connection and Session Management
 """
+from functools import lru_cache
+from typing import AsyncGenerator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
@@ -30,3 +35,59 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ============================================================================
+# Async engine (connection pool shared by all requests)
+# ============================================================================
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url() -> str:
+    """ASYNC_DATABASE_URL or DATABASE_URL converted to an async driver"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(url.drivername)
+    if driver:
+        url = url.set(drivername=driver)
+    return url.render_as_string(hide_password=False)
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """Create the async engine lazily so the sync-only paths don't need the async driver"""
+    url = async_database_url()
+    options = {
+        "pool_pre_ping": True,
+        "echo": settings.ENVIRONMENT == "development",
+    }
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return create_async_engine(url, **options)
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False, autoflush=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session"""
+    async with get_async_sessionmaker()() as session:
+        yield session
+
+
+async def dispose_async_engine():
+    """Close pooled connections (application shutdown)"""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
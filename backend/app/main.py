@@ -4,6 +4,7 @@ FastAPI Application Main Entry Point
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
+from app.database import dispose_async_engine
 
 settings = get_settings()
 
@@ -36,6 +37,12 @@ async def root():
     }
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Release pooled async DB connections"""
+    await dispose_async_engine()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
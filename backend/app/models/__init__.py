@@ -0,0 +1,3 @@
+"""
+Table definitions (Django-managed tables read/written by the FastAPI tier)
+"""
@@ -0,0 +1,111 @@
+"""
+SPC Tables - SPC-01
+Core table definitions for the Django-managed SPC tables (apps/spc/models_spc.py,
+apps/spc/models_inspection.py). Schema is owned by Django migrations; do not create_all().
+"""
+from sqlalchemy import (
+    Boolean, Column, DateTime, Float, ForeignKey, Integer, JSON, String, Table, Text,
+)
+from app.database import Base
+
+metadata = Base.metadata
+
+
+qc_characteristic = Table(
+    "qc_characteristic", metadata,
+    Column("char_id", Integer, primary_key=True),
+    Column("site_id", Integer, nullable=False),
+    Column("char_name", String(100), nullable=False),
+    Column("char_type", String(20), nullable=False),
+    Column("target", Float),
+    Column("lsl", Float),
+    Column("usl", Float),
+)
+
+inspection_run = Table(
+    "inspection_run", metadata,
+    Column("run_id", Integer, primary_key=True),
+    Column("site_id", Integer, nullable=False),
+    Column("run_dt", DateTime(timezone=True), nullable=False),
+)
+
+inspection_result = Table(
+    "inspection_result", metadata,
+    Column("result_id", Integer, primary_key=True),
+    Column("run_id", Integer, ForeignKey("inspection_run.run_id"), nullable=False),
+    Column("char_id", Integer, ForeignKey("qc_characteristic.char_id"), nullable=False),
+    Column("sample_no", Integer, nullable=False),
+    Column("value_num", Float),
+    Column("is_out_of_spec", Boolean, nullable=False),
+)
+
+spc_chart_def = Table(
+    "spc_chart_def", metadata,
+    Column("chart_def_id", Integer, primary_key=True),
+    Column("site_id", Integer, nullable=False),
+    Column("char_id", Integer, ForeignKey("qc_characteristic.char_id"), nullable=False),
+    Column("chart_type", String(20), nullable=False),
+    Column("calc_method", String(20), nullable=False),
+    Column("subgroup_size", Integer, nullable=False),
+    Column("rule_set", JSON, nullable=False),
+    Column("baseline_from_dt", DateTime(timezone=True), nullable=False),
+    Column("baseline_to_dt", DateTime(timezone=True), nullable=False),
+    Column("ucl", Float),
+    Column("cl", Float),
+    Column("lcl", Float),
+    Column("cp", Float),
+    Column("cpk", Float),
+    Column("status", String(20), nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+)
+
+spc_chart_point = Table(
+    "spc_chart_point", metadata,
+    Column("point_id", Integer, primary_key=True, autoincrement=True),
+    Column("chart_def_id", Integer, ForeignKey("spc_chart_def.chart_def_id"), nullable=False),
+    Column("run_id", Integer, ForeignKey("inspection_run.run_id")),
+    Column("point_dt", DateTime(timezone=True), nullable=False),
+    Column("n", Integer, nullable=False),
+    Column("xbar", Float),
+    Column("r", Float),
+    Column("s", Float),
+    Column("mr", Float),
+    Column("p", Float),
+    Column("np", Float),
+    Column("c", Float),
+    Column("u", Float),
+    Column("ucl", Float),
+    Column("cl", Float),
+    Column("lcl", Float),
+    Column("cp", Float),
+    Column("cpk", Float),
+    Column("is_violation", Boolean, nullable=False),
+    Column("violation_codes", JSON, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+)
+
+spc_event = Table(
+    "spc_event", metadata,
+    Column("event_id", Integer, primary_key=True, autoincrement=True),
+    Column("site_id", Integer, nullable=False),
+    Column("chart_def_id", Integer, ForeignKey("spc_chart_def.chart_def_id"), nullable=False),
+    Column("point_id", Integer, ForeignKey("spc_chart_point.point_id"), nullable=False),
+    Column("event_dt", DateTime(timezone=True), nullable=False),
+    Column("severity", String(20), nullable=False),
+    Column("event_type", String(20), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("owner_user_id", Integer, nullable=False),
+    Column("ai_rootcause_id", Integer),
+    Column("ai_analysis", JSON),
+    Column("acknowledged_at", DateTime(timezone=True)),
+    Column("acknowledged_by", Integer),
+    Column("root_cause", Text, nullable=False),
+    Column("corrective_action", Text, nullable=False),
+    Column("preventive_action", Text, nullable=False),
+    Column("resolved_at", DateTime(timezone=True)),
+    Column("resolved_by", Integer),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+)
@@ -2,7 +2,7 @@
 Common Schemas
 Standard API response wrapper
 """
-from pydantic import BaseModel, Generic
+from pydantic import BaseModel
 from typing import TypeVar, Generic, Optional
 
 
@@ -102,6 +102,9 @@ class SpcRecalcResponse(BaseModel):
     chart_def_id: str
     points_created: int
     violations: int
+    measurements: int = 0
+    limits_source: Optional[str] = None  # 'CHART_DEF' | 'BASELINE' | 'RANGE'
+    elapsed_ms: int = 0
 
 
 class SpcEventCreateRequest(BaseModel):
@@ -0,0 +1,3 @@
+"""
+Domain services for the FastAPI tier
+"""
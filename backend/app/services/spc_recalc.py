@@ -0,0 +1,565 @@
+"""
+SPC Recalculation Engine - SPC-01
+Streams inspection results for a chart, aggregates subgroups and rebuilds spc_chart_point rows.
+
+- Measurements are read in chunks (server-side cursor); a subgroup cut by a chunk boundary
+  is carried over to the next chunk
+- Subgroup statistics, control limits and WECO run rules are computed with NumPy on whole arrays
+- Limits come from the chart definition; when empty they are estimated from the baseline
+  window once and stored on the definition
+- Points are written with executemany batches; points referenced by spc_event are updated
+  in place instead of being deleted
+"""
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, bindparam, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.spc.services.spc_calculator import SPCConstants
+from app.config import get_settings
+from app.models.spc import (
+    inspection_result,
+    inspection_run,
+    qc_characteristic,
+    spc_chart_def,
+    spc_chart_point,
+    spc_event,
+)
+
+settings = get_settings()
+
+VARIABLE_CHARTS = ('XBAR_R', 'XBAR_S', 'I_MR')
+ATTRIBUTE_CHARTS = ('P', 'NP', 'C', 'U')
+RULE_CODES = tuple(f"RULE_{i}" for i in range(1, 9))
+WRITE_BATCH_SIZE = 1000
+I_MR_E2 = 2.66     # 3 / d2(n=2)
+I_MR_D2 = 1.128
+
+
+class ChartNotFoundError(LookupError):
+    """Chart definition does not exist"""
+
+
+def parse_datetime(value: str, end: bool = False) -> datetime:
+    """
+    Parse an ISO date/datetime query value (naive values are UTC)
+
+    A bare date used as the end of a range covers the whole day.
+    """
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) <= 10:
+        parsed += timedelta(days=1)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+# ============================================================================
+# Subgroup aggregation
+# ============================================================================
+
+@dataclass
+class Subgroups:
+    """Per-subgroup statistics (parallel arrays)"""
+    run_id: np.ndarray
+    point_dt: np.ndarray    # object array of datetimes
+    n: np.ndarray
+    mean: np.ndarray
+    range: np.ndarray
+    std: np.ndarray
+    defects: np.ndarray
+
+    def __len__(self):
+        return len(self.run_id)
+
+    @classmethod
+    def empty(cls) -> 'Subgroups':
+        return cls(
+            np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0, dtype=np.int64),
+            np.empty(0), np.empty(0), np.empty(0), np.empty(0, dtype=np.int64),
+        )
+
+    @classmethod
+    def concat(cls, parts: List['Subgroups']) -> 'Subgroups':
+        if not parts:
+            return cls.empty()
+        return cls(*(
+            np.concatenate([getattr(p, name) for p in parts])
+            for name in ('run_id', 'point_dt', 'n', 'mean', 'range', 'std', 'defects')
+        ))
+
+    def select(self, mask: np.ndarray) -> 'Subgroups':
+        return Subgroups(
+            self.run_id[mask], self.point_dt[mask], self.n[mask], self.mean[mask],
+            self.range[mask], self.std[mask], self.defects[mask],
+        )
+
+
+class SubgroupAccumulator:
+    """
+    Aggregates (run_id, run_dt, value, is_out_of_spec) rows sorted by (run_dt, run_id)
+
+    One inspection run is one subgroup; for individual charts every measurement is its own point.
+    """
+
+    def __init__(self, individual: bool = False):
+        self.individual = individual
+        self.parts: List[Subgroups] = []
+        self.rows_read = 0
+        self._pending: Optional[Tuple[np.ndarray, ...]] = None
+
+    def add(self, rows) -> None:
+        if not rows:
+            return
+        self.rows_read += len(rows)
+        run_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        run_dts = np.array([row[1] for row in rows], dtype=object)
+        values = np.array([np.nan if row[2] is None else row[2] for row in rows], dtype=float)
+        oos = np.fromiter((bool(row[3]) for row in rows), dtype=bool, count=len(rows))
+
+        if self.individual:
+            self.parts.append(self._aggregate(np.arange(len(rows)), run_ids, run_dts, values, oos))
+            return
+
+        if self._pending is not None:
+            run_ids, run_dts, values, oos = (
+                np.concatenate([old, new]) for old, new in zip(self._pending, (run_ids, run_dts, values, oos))
+            )
+
+        # The last run may continue in the next chunk, so hold it back
+        earlier = np.flatnonzero(run_ids != run_ids[-1])
+        tail = int(earlier[-1]) + 1 if len(earlier) else 0
+        self._pending = (run_ids[tail:], run_dts[tail:], values[tail:], oos[tail:])
+        if tail:
+            self.parts.append(
+                self._aggregate(run_ids[:tail], run_ids[:tail], run_dts[:tail], values[:tail], oos[:tail])
+            )
+
+    def finish(self) -> Subgroups:
+        if self._pending is not None and len(self._pending[0]):
+            run_ids, run_dts, values, oos = self._pending
+            self.parts.append(self._aggregate(run_ids, run_ids, run_dts, values, oos))
+            self._pending = None
+        return Subgroups.concat(self.parts)
+
+    @staticmethod
+    def _aggregate(keys, run_ids, run_dts, values, oos) -> Subgroups:
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        n = np.diff(np.r_[starts, len(keys)])
+
+        with np.errstate(invalid='ignore'):
+            mean = np.add.reduceat(values, starts) / n
+            dev = values - np.repeat(mean, n)
+            sum_sq = np.add.reduceat(dev * dev, starts)
+            std = np.where(n > 1, np.sqrt(sum_sq / np.maximum(n - 1, 1)), np.nan)
+            spread = np.maximum.reduceat(values, starts) - np.minimum.reduceat(values, starts)
+
+        return Subgroups(
+            run_id=run_ids[starts],
+            point_dt=run_dts[starts],
+            n=n,
+            mean=mean,
+            range=np.where(n > 1, spread, np.nan),
+            std=std,
+            defects=np.add.reduceat(oos.astype(np.int64), starts),
+        )
+
+
+# ============================================================================
+# Statistics / limits / run rules
+# ============================================================================
+
+def _constant(table: Dict[int, float], n: int) -> float:
+    return table[min(max(int(n), 2), 25)]
+
+
+def plotted_statistic(chart_type: str, sg: Subgroups) -> np.ndarray:
+    """Value plotted on the primary chart"""
+    if chart_type in VARIABLE_CHARTS:
+        return sg.mean
+    if chart_type in ('P', 'U'):
+        return sg.defects / np.maximum(sg.n, 1)
+    return sg.defects.astype(float)
+
+
+def moving_range(values: np.ndarray) -> np.ndarray:
+    mr = np.full(len(values), np.nan)
+    if len(values) > 1:
+        mr[1:] = np.abs(np.diff(values))
+    return mr
+
+
+def estimate_parameters(chart_type: str, sg: Subgroups, subgroup_size: int) -> Dict[str, float]:
+    """Center line / dispersion estimates from (baseline) subgroups"""
+    if chart_type == 'XBAR_R':
+        rbar = float(np.nanmean(sg.range))
+        return {'center': float(np.mean(sg.mean)), 'rbar': rbar,
+                'sigma': rbar * _constant(SPCConstants.A2, subgroup_size) * math.sqrt(subgroup_size) / 3}
+    if chart_type == 'XBAR_S':
+        sbar = float(np.nanmean(sg.std))
+        return {'center': float(np.mean(sg.mean)), 'sbar': sbar,
+                'sigma': sbar / _constant(SPCConstants.c4, subgroup_size)}
+    if chart_type == 'I_MR':
+        mrbar = float(np.nanmean(moving_range(sg.mean))) if len(sg) > 1 else 0.0
+        return {'center': float(np.mean(sg.mean)), 'mrbar': mrbar, 'sigma': mrbar / I_MR_D2}
+
+    total_n = max(int(sg.n.sum()), 1)
+    rate = float(sg.defects.sum()) / total_n
+    if chart_type == 'C':
+        return {'center': float(np.mean(sg.defects))}
+    return {'center': rate}
+
+
+def control_limits(chart_type: str, params: Dict[str, float], n: np.ndarray,
+                   subgroup_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-point (UCL, CL, LCL); attribute limits follow each subgroup's n"""
+    size = len(n)
+    center = params['center']
+    if chart_type == 'XBAR_R':
+        half = _constant(SPCConstants.A2, subgroup_size) * params['rbar']
+    elif chart_type == 'XBAR_S':
+        half = _constant(SPCConstants.A3, subgroup_size) * params['sbar']
+    elif chart_type == 'I_MR':
+        half = I_MR_E2 * params['mrbar']
+    elif chart_type == 'P':
+        half = 3 * np.sqrt(center * (1 - center) / np.maximum(n, 1))
+    elif chart_type == 'NP':
+        half = 3 * np.sqrt(n * center * (1 - center))
+        cl = n * center
+        return cl + half, cl, np.maximum(cl - half, 0.0)
+    elif chart_type == 'U':
+        half = 3 * np.sqrt(center / np.maximum(n, 1))
+    else:  # C
+        half = 3 * math.sqrt(max(center, 0.0))
+
+    cl = np.full(size, center)
+    ucl = cl + half
+    lcl = cl - half
+    if chart_type in ATTRIBUTE_CHARTS:
+        lcl = np.maximum(lcl, 0.0)
+    if chart_type == 'P':
+        ucl = np.minimum(ucl, 1.0)
+    return ucl, cl, lcl
+
+
+def _window_hits(condition: np.ndarray, window: int, required: int) -> np.ndarray:
+    """True at index i when `required` of the `window` points ending at i satisfy condition"""
+    hits = np.zeros(len(condition), dtype=bool)
+    if len(condition) < window:
+        return hits
+    csum = np.concatenate([[0], np.cumsum(condition, dtype=np.int64)])
+    counts = csum[window:] - csum[:-window]
+    hits[window - 1:] = counts >= required
+    return hits
+
+
+def run_rule_flags(x: np.ndarray, ucl: np.ndarray, cl: np.ndarray, lcl: np.ndarray,
+                   enabled=RULE_CODES) -> Dict[str, np.ndarray]:
+    """
+    Western Electric rules (codes match apps.spc.services.run_rules.RuleType), vectorized
+
+    Each flag marks the point that completes the pattern.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = (ucl - cl) / 3
+        z = np.where(sigma > 0, (x - cl) / sigma, 0.0)
+    above, below = z > 0, z < 0
+    step = np.sign(np.diff(x))
+
+    flags = {}
+    if 'RULE_1' in enabled:
+        flags['RULE_1'] = (x > ucl) | (x < lcl)
+    if 'RULE_2' in enabled:
+        flags['RULE_2'] = _window_hits(above, 9, 9) | _window_hits(below, 9, 9)
+    if 'RULE_3' in enabled:
+        trend = np.zeros(len(x), dtype=bool)
+        trend[1:] = _window_hits(step > 0, 5, 5) | _window_hits(step < 0, 5, 5)
+        flags['RULE_3'] = trend
+    if 'RULE_4' in enabled:
+        alternating = np.zeros(len(x), dtype=bool)
+        if len(step) > 1:
+            alternating[2:] = _window_hits(step[:-1] * step[1:] < 0, 12, 12)
+        flags['RULE_4'] = alternating
+    if 'RULE_5' in enabled:
+        flags['RULE_5'] = _window_hits(z > 2, 3, 2) | _window_hits(z < -2, 3, 2)
+    if 'RULE_6' in enabled:
+        flags['RULE_6'] = _window_hits(z > 1, 5, 4) | _window_hits(z < -1, 5, 4)
+    if 'RULE_7' in enabled:
+        flags['RULE_7'] = _window_hits(np.abs(z) < 1, 15, 15)
+    if 'RULE_8' in enabled:
+        flags['RULE_8'] = _window_hits(np.abs(z) > 1, 8, 8)
+    return flags
+
+
+def capability(params: Dict[str, float], lsl: Optional[float], usl: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
+    """Cp / Cpk from the within-subgroup sigma"""
+    sigma = params.get('sigma')
+    if not sigma or lsl is None or usl is None:
+        return None, None
+    mu = params['center']
+    return (usl - lsl) / (6 * sigma), min(usl - mu, mu - lsl) / (3 * sigma)
+
+
+def build_points(chart: Dict[str, Any], sg: Subgroups, params: Dict[str, float],
+                 fixed_limits: Optional[Tuple[float, float, float]],
+                 cp: Optional[float], cpk: Optional[float]) -> List[Dict[str, Any]]:
+    """spc_chart_point rows for all subgroups"""
+    chart_type = chart['chart_type']
+    x = plotted_statistic(chart_type, sg)
+    if fixed_limits:
+        ucl, cl, lcl = (np.full(len(sg), v, dtype=float) for v in fixed_limits)
+    else:
+        ucl, cl, lcl = control_limits(chart_type, params, sg.n, chart['subgroup_size'])
+
+    enabled = (chart.get('rule_set') or {}).get('rules') or RULE_CODES
+    flags = run_rule_flags(x, ucl, cl, lcl, enabled)
+    codes_matrix = np.column_stack([flags[code] for code in flags]) if flags else np.zeros((len(sg), 0), bool)
+    flag_codes = list(flags)
+    mr = moving_range(x) if chart_type == 'I_MR' else None
+    now = datetime.now(timezone.utc)
+    variable = chart_type in VARIABLE_CHARTS
+
+    def value(arr, i):
+        v = float(arr[i])
+        return None if math.isnan(v) else v
+
+    rows = []
+    for i in range(len(sg)):
+        codes = [flag_codes[j] for j in np.flatnonzero(codes_matrix[i])]
+        n_i = int(sg.n[i])
+        d_i = int(sg.defects[i])
+        rows.append({
+            'chart_def_id': chart['chart_def_id'],
+            'run_id': int(sg.run_id[i]),
+            'point_dt': sg.point_dt[i],
+            'n': n_i,
+            'xbar': value(sg.mean, i) if variable else None,
+            'r': value(sg.range, i) if chart_type == 'XBAR_R' else None,
+            's': value(sg.std, i) if chart_type == 'XBAR_S' else None,
+            'mr': value(mr, i) if mr is not None else None,
+            'p': d_i / n_i if chart_type == 'P' and n_i else None,
+            'np': float(d_i) if chart_type == 'NP' else None,
+            'c': float(d_i) if chart_type == 'C' else None,
+            'u': d_i / n_i if chart_type == 'U' and n_i else None,
+            'ucl': float(ucl[i]),
+            'cl': float(cl[i]),
+            'lcl': float(lcl[i]),
+            'cp': cp,
+            'cpk': cpk,
+            'is_violation': bool(codes),
+            'violation_codes': codes,
+            'created_at': now,
+        })
+    return rows
+
+
+# ============================================================================
+# DB access
+# ============================================================================
+
+async def load_chart(session: AsyncSession, chart_def_id: int) -> Dict[str, Any]:
+    stmt = (
+        select(spc_chart_def, qc_characteristic.c.lsl, qc_characteristic.c.usl)
+        .join(qc_characteristic, qc_characteristic.c.char_id == spc_chart_def.c.char_id)
+        .where(spc_chart_def.c.chart_def_id == chart_def_id)
+    )
+    row = (await session.execute(stmt)).mappings().first()
+    if row is None:
+        raise ChartNotFoundError(f"Chart definition {chart_def_id} not found")
+    return dict(row)
+
+
+async def stream_subgroups(session: AsyncSession, chart: Dict[str, Any], from_dt: datetime,
+                           to_dt: datetime, chunk_size: int) -> Tuple[Subgroups, int]:
+    """Read measurements in [from_dt, to_dt) chunk by chunk and aggregate into subgroups"""
+    stmt = (
+        select(
+            inspection_run.c.run_id,
+            inspection_run.c.run_dt,
+            inspection_result.c.value_num,
+            inspection_result.c.is_out_of_spec,
+        )
+        .join(inspection_run, inspection_run.c.run_id == inspection_result.c.run_id)
+        .where(
+            inspection_result.c.char_id == chart['char_id'],
+            inspection_run.c.run_dt >= from_dt,
+            inspection_run.c.run_dt < to_dt,
+        )
+        .order_by(inspection_run.c.run_dt, inspection_run.c.run_id, inspection_result.c.sample_no)
+        .execution_options(yield_per=chunk_size)
+    )
+    if chart['chart_type'] in VARIABLE_CHARTS:
+        stmt = stmt.where(inspection_result.c.value_num.isnot(None))
+
+    accumulator = SubgroupAccumulator(individual=chart['chart_type'] == 'I_MR')
+    result = await session.stream(stmt)
+    async for partition in result.partitions(chunk_size):
+        accumulator.add(partition)
+    return accumulator.finish(), accumulator.rows_read
+
+
+async def write_points(session: AsyncSession, chart_def_id: int, rows: List[Dict[str, Any]],
+                       from_dt: datetime, to_dt: datetime) -> int:
+    """
+    Replace the chart points in [from_dt, to_dt)
+
+    Points referenced by events are kept and updated in place (matched by run and order within the run).
+    """
+    in_range = and_(
+        spc_chart_point.c.chart_def_id == chart_def_id,
+        spc_chart_point.c.point_dt >= from_dt,
+        spc_chart_point.c.point_dt < to_dt,
+    )
+    referenced = select(spc_event.c.point_id).where(spc_event.c.chart_def_id == chart_def_id)
+    kept = (await session.execute(
+        select(spc_chart_point.c.point_id, spc_chart_point.c.run_id)
+        .where(in_range, spc_chart_point.c.point_id.in_(referenced))
+        .order_by(spc_chart_point.c.run_id, spc_chart_point.c.point_id)
+    )).all()
+    await session.execute(delete(spc_chart_point).where(in_range, spc_chart_point.c.point_id.notin_(referenced)))
+
+    kept_ids = {}
+    for point_id, run_id in kept:
+        kept_ids.setdefault(run_id, []).append(point_id)
+
+    inserts, updates, seen = [], [], {}
+    for row in rows:
+        ordinal = seen.get(row['run_id'], 0)
+        seen[row['run_id']] = ordinal + 1
+        existing = kept_ids.get(row['run_id'], [])
+        if ordinal < len(existing):
+            updates.append({**row, 'b_point_id': existing[ordinal]})
+        else:
+            inserts.append(row)
+
+    for start in range(0, len(inserts), WRITE_BATCH_SIZE):
+        await session.execute(insert(spc_chart_point), inserts[start:start + WRITE_BATCH_SIZE])
+    if updates:
+        stmt = (
+            update(spc_chart_point)
+            .where(spc_chart_point.c.point_id == bindparam('b_point_id'))
+            .values({key: bindparam(key) for key in rows[0] if key != 'chart_def_id'})
+        )
+        for start in range(0, len(updates), WRITE_BATCH_SIZE):
+            await session.execute(stmt, updates[start:start + WRITE_BATCH_SIZE])
+    return len(inserts) + len(updates)
+
+
+async def recalc_chart_points(session: AsyncSession, chart_def_id: int, from_dt: datetime,
+                              to_dt: datetime, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Recalculate chart points for [from_dt, to_dt) in one transaction
+
+    Returns:
+        {'chart_def_id', 'points_created', 'violations', 'measurements', 'limits_source', 'elapsed_ms'}
+    """
+    started = time.monotonic()
+    chunk_size = chunk_size or settings.SPC_RECALC_CHUNK_SIZE
+
+    async with session.begin():
+        chart = await load_chart(session, chart_def_id)
+        chart_type = chart['chart_type']
+        if chart_type not in VARIABLE_CHARTS + ATTRIBUTE_CHARTS:
+            raise ValueError(f"Unsupported chart type: {chart_type}")
+        subgroup_size = chart['subgroup_size']
+
+        sg, measurements = await stream_subgroups(session, chart, from_dt, to_dt, chunk_size)
+
+        fixed = None
+        if None not in (chart['ucl'], chart['cl'], chart['lcl']):
+            fixed = (chart['ucl'], chart['cl'], chart['lcl'])
+            limits_source = 'CHART_DEF'
+            params = _parameters_from_limits(chart_type, fixed, subgroup_size)
+        else:
+            baseline, _ = await stream_subgroups(
+                session, chart, chart['baseline_from_dt'], chart['baseline_to_dt'], chunk_size
+            )
+            if len(baseline):
+                limits_source = 'BASELINE'
+                params = estimate_parameters(chart_type, baseline, subgroup_size)
+                await _store_baseline_limits(session, chart, params)
+            else:
+                limits_source = 'RANGE'
+                params = estimate_parameters(chart_type, sg, subgroup_size) if len(sg) else None
+
+        rows = []
+        if len(sg):
+            cp, cpk = capability(params, chart['lsl'], chart['usl']) if chart_type in VARIABLE_CHARTS else (None, None)
+            rows = build_points(chart, sg, params, fixed, cp, cpk)
+        written = await write_points(session, chart_def_id, rows, from_dt, to_dt)
+
+    return {
+        'chart_def_id': chart_def_id,
+        'points_created': written,
+        'violations': sum(1 for row in rows if row['is_violation']),
+        'measurements': measurements,
+        'limits_source': limits_source,
+        'elapsed_ms': round((time.monotonic() - started) * 1000),
+    }
+
+
+def _parameters_from_limits(chart_type: str, limits: Tuple[float, float, float], subgroup_size: int) -> Dict[str, float]:
+    ucl, cl, _ = limits
+    sigma_plot = (ucl - cl) / 3
+    sigma = sigma_plot * math.sqrt(subgroup_size) if chart_type in ('XBAR_R', 'XBAR_S') else sigma_plot
+    return {'center': cl, 'sigma': sigma if chart_type in VARIABLE_CHARTS else None}
+
+
+async def _store_baseline_limits(session: AsyncSession, chart: Dict[str, Any], params: Dict[str, float]):
+    """Persist baseline limits (nominal subgroup size) so later recalcs skip the baseline scan"""
+    ucl, cl, lcl = control_limits(
+        chart['chart_type'], params, np.array([chart['subgroup_size']]), chart['subgroup_size']
+    )
+    cp, cpk = capability(params, chart['lsl'], chart['usl']) if chart['chart_type'] in VARIABLE_CHARTS else (None, None)
+    await session.execute(
+        update(spc_chart_def)
+        .where(spc_chart_def.c.chart_def_id == chart['chart_def_id'])
+        .values(ucl=float(ucl[0]), cl=float(cl[0]), lcl=float(lcl[0]), cp=cp, cpk=cpk,
+                updated_at=datetime.now(timezone.utc))
+    )
+
+
+# ============================================================================
+# Reads
+# ============================================================================
+
+def encode_cursor(point_dt: datetime, point_id: int) -> str:
+    return f"{point_dt.isoformat()}|{point_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    point_dt, point_id = cursor.rsplit('|', 1)
+    return datetime.fromisoformat(point_dt), int(point_id)
+
+
+async def fetch_points(session: AsyncSession, chart_def_id: int, from_dt: Optional[datetime],
+                       to_dt: Optional[datetime], cursor: Optional[str], limit: int) -> Dict[str, Any]:
+    """Keyset page of points ordered by (point_dt, point_id)"""
+    chart = await load_chart(session, chart_def_id)
+    stmt = select(spc_chart_point).where(spc_chart_point.c.chart_def_id == chart_def_id)
+    if from_dt is not None:
+        stmt = stmt.where(spc_chart_point.c.point_dt >= from_dt)
+    if to_dt is not None:
+        stmt = stmt.where(spc_chart_point.c.point_dt < to_dt)
+    if cursor:
+        after_dt, after_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            spc_chart_point.c.point_dt > after_dt,
+            and_(spc_chart_point.c.point_dt == after_dt, spc_chart_point.c.point_id > after_id),
+        ))
+    stmt = stmt.order_by(spc_chart_point.c.point_dt, spc_chart_point.c.point_id).limit(limit + 1)
+
+    rows = [dict(row) for row in (await session.execute(stmt)).mappings()]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'chart': chart,
+        'points': rows,
+        'has_more': has_more,
+        'next_cursor': encode_cursor(rows[-1]['point_dt'], rows[-1]['point_id']) if has_more else None,
+    }
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ApsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.aps'
+
+    def ready(self):
+        """앱이 준비될 때 signals 연결"""
+        import apps.aps.signals  # noqa
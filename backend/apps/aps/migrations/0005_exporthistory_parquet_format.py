@@ -0,0 +1,27 @@
+# Generated manually: PARQUET export format for ExportHistory
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aps', '0004_add_unplanned_reason'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exporthistory',
+            name='file_format',
+            field=models.CharField(
+                choices=[
+                    ('PDF', 'PDF Document'),
+                    ('EXCEL', 'Excel Spreadsheet'),
+                    ('CSV', 'CSV File'),
+                    ('JSON', 'JSON Data'),
+                    ('PARQUET', 'Parquet File'),
+                ],
+                max_length=20,
+            ),
+        ),
+    ]
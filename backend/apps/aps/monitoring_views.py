@@ -5,6 +5,7 @@ from django.utils import timezone
 from django.db.models import Sum, Avg, Count, Q
 from datetime import timedelta
 import random
+from smart_spc.resource_versions import versioned_response
 from .monitoring_models import ProductionStatus, MachineMetrics, Alert, KPISnapshot
 from rest_framework import serializers
 
@@ -96,6 +97,7 @@ class MonitoringViewSet(viewsets.ViewSet):
         })
 
     @action(detail=False, methods=["get"])
+    @versioned_response("monitoring_kpi")
     def kpi_summary(self, request):
         """
         GET /api/aps/monitoring/kpi_summary/
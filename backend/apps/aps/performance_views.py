@@ -6,6 +6,7 @@ from django.db import models
 from datetime import timedelta
 from apps.core.models import StageFactPlanOut
 from .models import AlgorithmComparison, BottleneckAnalysis
+from .services.analytics import machine_utilization
 
 
 class PerformanceMetricsViewSet(viewsets.ViewSet):
@@ -23,10 +24,11 @@ class PerformanceMetricsViewSet(viewsets.ViewSet):
         end_date = timezone.now()
         start_date = end_date - timedelta(days=days)
 
-        # Get plans in time range
+        # Get plans in time range (single columnar fetch)
         plans = StageFactPlanOut.objects.filter(fr_ts__gte=start_date, fr_ts__lte=end_date)
+        intervals = machine_utilization.fetch_intervals(plans)
 
-        if not plans.exists():
+        if intervals.n_machines == 0:
             return Response(
                 {
                     "summary": {
@@ -41,26 +43,15 @@ class PerformanceMetricsViewSet(viewsets.ViewSet):
             )
 
         # Calculate metrics
-        total_jobs = plans.count()
-        machines = plans.values_list("mc_cd", flat=True).distinct()
-        total_machines = len(machines)
+        utilization = machine_utilization.utilization_summary(intervals)
+        total_jobs = len(intervals.start)
+        total_machines = intervals.n_machines
 
         # Makespan (max completion time - min start time)
-        all_times = plans.aggregate(min_start=models.Min("fr_ts"), max_end=models.Max("to_ts"))
-        if all_times["min_start"] and all_times["max_end"]:
-            makespan = (all_times["max_end"] - all_times["min_start"]).total_seconds() / 60
-        else:
-            makespan = 0
-
-        # Utilization per machine
-        utilizations = []
-        for mc_cd in machines:
-            mc_plans = plans.filter(mc_cd=mc_cd)
-            total_process_time = sum([(p.to_ts - p.fr_ts).total_seconds() / 60 for p in mc_plans])
-            if makespan > 0:
-                utilizations.append(total_process_time / makespan * 100)
-
-        avg_utilization = sum(utilizations) / len(utilizations) if utilizations else 0
+        makespan = utilization["makespan"]
+
+        # Utilization per machine (process time / makespan)
+        avg_utilization = utilization["avg_utilization"]
 
         # Throughput (jobs per day)
         time_window_days = (end_date - start_date).total_seconds() / (24 * 3600)
@@ -90,36 +81,10 @@ class PerformanceMetricsViewSet(viewsets.ViewSet):
         start_date = end_date - timedelta(days=days)
 
         plans = StageFactPlanOut.objects.filter(fr_ts__gte=start_date, fr_ts__lte=end_date)
-        machines = plans.values_list("mc_cd", flat=True).distinct()
-
-        comparison_data = []
-        for mc_cd in machines:
-            mc_plans = plans.filter(mc_cd=mc_cd)
-            job_count = mc_plans.count()
-
-            if job_count == 0:
-                continue
-
-            # Calculate total process time
-            total_process_time = sum([(p.to_ts - p.fr_ts).total_seconds() / 60 for p in mc_plans])
 
-            # Time window
-            mc_times = mc_plans.aggregate(min_start=models.Min("fr_ts"), max_end=models.Max("to_ts"))
-            if mc_times["min_start"] and mc_times["max_end"]:
-                time_window = (mc_times["max_end"] - mc_times["min_start"]).total_seconds() / 60
-                utilization = (total_process_time / time_window * 100) if time_window > 0 else 0
-            else:
-                utilization = 0
-
-            comparison_data.append(
-                {
-                    "mc_cd": mc_cd,
-                    "job_count": job_count,
-                    "total_process_time": round(total_process_time, 2),
-                    "utilization": round(utilization, 2),
-                    "avg_job_duration": round(total_process_time / job_count, 2),
-                }
-            )
+        # Utilization = process time / machine time window
+        intervals = machine_utilization.fetch_intervals(plans)
+        comparison_data = machine_utilization.utilization_summary(intervals)["machines"]
 
         # Sort by utilization descending
         comparison_data.sort(key=lambda x: x["utilization"], reverse=True)
@@ -158,7 +158,10 @@ class ExportHistory(models.Model):
     record_count = models.IntegerField(default=0)
 
     # File info
-    file_format = models.CharField(max_length=20, choices=Report.EXPORT_FORMATS)
+    FILE_FORMATS = Report.EXPORT_FORMATS + [
+        ("PARQUET", "Parquet File"),
+    ]
+    file_format = models.CharField(max_length=20, choices=FILE_FORMATS)
     file_path = models.CharField(max_length=500)
     file_size = models.IntegerField(default=0)
 
@@ -3,14 +3,15 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
 from django.db.models import Count, Avg, Sum, Max, Min
-from datetime import timedelta
+from django.http import FileResponse, StreamingHttpResponse
+import os
 import time
 import json
 import csv
 from io import StringIO
 from .report_models import Report, ReportTemplate, ExportHistory
 from .monitoring_models import ProductionStatus, MachineMetrics, Alert, KPISnapshot
-from apps.core.models import StageFactPlanOut
+from .services import exports
 from rest_framework import serializers
 
 
@@ -352,118 +353,128 @@ class ReportViewSet(viewsets.ModelViewSet):
 class ExportViewSet(viewsets.ViewSet):
     """
     Data export functionality
+
+    Exports are not truncated: rows are read with a server-side cursor and
+    CSV / JSON (NDJSON) are streamed to the client as they are produced.
+    PARQUET / EXCEL are written to EXPORT_ROOT and returned as a file.
+    Pass "background": true to run the export as a Celery task and download
+    it later from /api/aps/exports/{export_id}/download/.
     """
 
+    def _export(self, request, dataset_name, params):
+        export_format = str(request.data.get("format", "CSV")).upper()
+        created_by = request.data.get("created_by", "system")
+        dataset = exports.get_dataset(dataset_name)
+
+        if export_format not in exports.STREAM_FORMATS + exports.FILE_FORMATS:
+            return Response(
+                {"error": f"Unsupported format: {export_format}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if request.data.get("background"):
+            if export_format not in exports.FILE_FORMATS:
+                return Response(
+                    {"error": f"Background export supports {', '.join(exports.FILE_FORMATS)}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            from .tasks import export_dataset
+
+            result = export_dataset.delay(dataset_name, params, export_format, created_by)
+            return Response(
+                {"task_id": result.id, "status": "QUEUED", "format": export_format},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        filename = exports.export_filename(
+            dataset, export_format if export_format in exports.FILE_EXTENSIONS else "CSV"
+        )
+
+        if export_format in exports.STREAM_FORMATS:
+            if export_format == "JSON":
+                filename = filename.rsplit(".", 1)[0] + ".ndjson"
+                streamer = exports.stream_ndjson
+            else:
+                streamer = exports.stream_csv
+
+            def on_complete(record_count, byte_count):
+                exports.record_export(
+                    dataset, export_format, f"stream:{filename}", record_count, byte_count, created_by
+                )
+
+            response = StreamingHttpResponse(
+                streamer(dataset.fields, exports.iter_rows(dataset, params), on_complete=on_complete),
+                content_type=exports.CONTENT_TYPES[export_format],
+            )
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return response
+
+        history = exports.export_to_file(dataset_name, params, export_format, created_by)
+        if history.status != "SUCCESS":
+            return Response(
+                {"error": history.error_message, "export_id": history.export_id},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        return self._file_response(history)
+
+    @staticmethod
+    def _file_response(history):
+        response = FileResponse(
+            open(history.file_path, "rb"),
+            as_attachment=True,
+            filename=os.path.basename(history.file_path),
+            content_type=exports.CONTENT_TYPES[history.file_format],
+        )
+        response["X-Export-Id"] = str(history.export_id)
+        response["X-Record-Count"] = str(history.record_count)
+        return response
+
     @action(detail=False, methods=["post"])
     def schedule(self, request):
         """
         POST /api/aps/exports/schedule/
         Export schedule data
-        """
-        export_format = request.data.get("format", "CSV")
-        start_date = request.data.get("start_date")
-        end_date = request.data.get("end_date")
 
-        # Get plan data
-        plans = StageFactPlanOut.objects.all()
-        if start_date:
-            plans = plans.filter(fr_ts__gte=start_date)
-        if end_date:
-            plans = plans.filter(fr_ts__lte=end_date)
-
-        plans = plans[:1000]  # Limit for performance
-
-        # Generate export
-        if export_format == "JSON":
-            data = list(plans.values())
-            export_data = {
-                "format": "JSON",
-                "record_count": len(data),
-                "data": data,
-            }
-        elif export_format == "CSV":
-            output = StringIO()
-            writer = csv.writer(output)
-
-            # Headers
-            headers = ["plan_id", "wo_no", "item_cd", "mc_cd", "fr_ts", "to_ts", "qty"]
-            writer.writerow(headers)
-
-            # Data
-            for plan in plans:
-                writer.writerow([
-                    plan.plan_id,
-                    plan.wo_no,
-                    plan.item_cd,
-                    plan.mc_cd,
-                    plan.fr_ts,
-                    plan.to_ts,
-                    plan.qty,
-                ])
-
-            export_data = {
-                "format": "CSV",
-                "record_count": plans.count(),
-                "content": output.getvalue(),
-                "filename": f"schedule_export_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            }
-        else:
-            export_data = {
-                "format": export_format,
-                "message": "Format not yet supported",
-            }
-
-        # Create export history
-        ExportHistory.objects.create(
-            export_type="SCHEDULE",
-            data_type="plans",
-            record_count=plans.count(),
-            file_format=export_format,
-            file_path=f"exports/schedule_{timezone.now().strftime('%Y%m%d_%H%M%S')}",
-            file_size=len(str(export_data)),
-            status="SUCCESS",
-            created_by=request.data.get("created_by", "system"),
-        )
-
-        return Response(export_data)
+        Body: format (CSV | JSON | PARQUET | EXCEL), start_date, end_date, mc_cd, background
+        """
+        params = {
+            key: request.data.get(key)
+            for key in ("start_date", "end_date", "mc_cd")
+            if request.data.get(key)
+        }
+        try:
+            return self._export(request, "schedule", params)
+        except exports.ExportError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=["post"])
     def performance_data(self, request):
         """
         POST /api/aps/exports/performance_data/
         Export performance metrics
-        """
-        export_format = request.data.get("format", "CSV")
-        hours = int(request.data.get("hours", 24))
-
-        start_time = timezone.now() - timedelta(hours=hours)
-        metrics = MachineMetrics.objects.filter(timestamp__gte=start_time)
-
-        if export_format == "CSV":
-            output = StringIO()
-            writer = csv.writer(output)
-
-            headers = ["mc_cd", "timestamp", "oee", "availability", "performance", "quality", "output_quantity"]
-            writer.writerow(headers)
-
-            for metric in metrics:
-                writer.writerow([
-                    metric.mc_cd,
-                    metric.timestamp,
-                    metric.oee,
-                    metric.availability,
-                    metric.performance,
-                    metric.quality,
-                    metric.output_quantity,
-                ])
 
-            return Response({
-                "format": "CSV",
-                "content": output.getvalue(),
-                "filename": f"performance_export_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            })
+        Body: format, hours (default 24) or start_date / end_date, mc_cd, bucket_type, background
+        """
+        params = {
+            key: request.data.get(key)
+            for key in ("hours", "start_date", "end_date", "mc_cd", "bucket_type")
+            if request.data.get(key)
+        }
+        try:
+            return self._export(request, "performance", params)
+        except exports.ExportError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response({"format": export_format, "message": "Format not supported"})
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """
+        GET /api/aps/exports/{export_id}/download/
+        Download a file export (e.g. one produced in the background)
+        """
+        history = ExportHistory.objects.filter(pk=pk, status="SUCCESS").first()
+        if history is None or not os.path.isfile(history.file_path):
+            return Response({"error": "Export file not found"}, status=status.HTTP_404_NOT_FOUND)
+        return self._file_response(history)
 
     @action(detail=False, methods=["get"])
     def history(self, request):
@@ -10,6 +10,7 @@ from .scenario_models import Scenario, ScenarioResult, ScenarioComparison
 from rest_framework import serializers
 from .services.or_repair import repair_schedule_with_cpsat
 from .services.down_risk_predictor import DownRiskPredictor
+from .services.process_time import apply_predicted_durations
 import logging
 
 logger = logging.getLogger(__name__)
@@ -455,9 +456,14 @@ class ScenarioViewSet(viewsets.ModelViewSet):
                 'to_ts': job.to_ts,
                 'due_date': job.to_ts,
                 'duration_minutes': (job.to_ts - job.fr_ts).total_seconds() / 60,
+                'itm_id': getattr(job, 'itm_id', None),
+                'plan_qty': getattr(job, 'plan_qty', None),
             }
             job_list.append(job_dict)
 
+        # XGBoost 예측 공정 시간 반영 (모델 미설정 시 계획 시간 유지)
+        apply_predicted_durations(job_list)
+
         logger.info(f"Running Hybrid GA+LS for {len(job_list)} jobs on {total_machines} machines")
 
         # Run GA + Local Search
@@ -745,8 +751,13 @@ class ScenarioViewSet(viewsets.ModelViewSet):
                     'end_dt': job.to_ts,
                     'duration_minutes': duration,
                     'due_date': getattr(job, 'due_dt', job.to_ts + timedelta(days=7)),
+                    'itm_id': getattr(job, 'itm_id', None),
+                    'plan_qty': getattr(job, 'plan_qty', None),
                 })
 
+            # XGBoost 예측 공정 시간 반영 (CP-SAT interval 은 정수 분)
+            apply_predicted_durations(schedule_rows, as_int=True)
+
             # Determine plant_cd (default to FAC01 if not provided)
             if not plant_cd and jobs:
                 # Try to get from job's plant_cd field
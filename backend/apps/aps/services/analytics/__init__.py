@@ -2,7 +2,9 @@
 Analytics Services
 
 STEP 3: 미계획 원인 자동 분류
+설비 가동률 / 병목 / 히트맵 집계
 """
 from .unplanned_classifier import UnplannedClassifier
+from . import machine_utilization
 
-__all__ = ['UnplannedClassifier']
+__all__ = ['UnplannedClassifier', 'machine_utilization']
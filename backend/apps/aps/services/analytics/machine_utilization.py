@@ -0,0 +1,338 @@
+"""
+설비 가동률 분석
+
+작업 계획 구간 (mc_cd, fr_ts, to_ts) 을 한 번의 컬럼 조회로 가져와 NumPy 로 설비별 지표 계산
+- 설비별 작업 수 / 가공 시간 / 작업 구간 (min 시작 ~ max 종료)
+- 스윕라인 대기 분석: 같은 설비에서 앞선 작업들의 최대 종료 시각보다 먼저 시작하는 작업 = 대기 (겹침)
+- 시간 버킷별 가동 시간 (히트맵): 누적 가동 함수 C(t) 의 버킷 경계 차분
+설비 수와 무관하게 쿼리 1회
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MachineIntervals:
+    """설비별로 정렬된 작업 구간 (시각은 epoch 분)"""
+    machines: np.ndarray  # (M,) 설비 코드
+    machine_idx: np.ndarray  # (N,) 작업별 설비 인덱스 (오름차순)
+    start: np.ndarray  # (N,) 시작 시각 (분)
+    end: np.ndarray  # (N,) 종료 시각 (분)
+
+    @property
+    def n_machines(self) -> int:
+        return len(self.machines)
+
+    @property
+    def duration(self) -> np.ndarray:
+        return self.end - self.start
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """설비별 구간 시작 위치 (M + 1,)"""
+        return np.searchsorted(self.machine_idx, np.arange(self.n_machines + 1))
+
+    @classmethod
+    def empty(cls) -> 'MachineIntervals':
+        return cls(
+            machines=np.array([], dtype=object),
+            machine_idx=np.array([], dtype=np.int64),
+            start=np.array([], dtype=np.float64),
+            end=np.array([], dtype=np.float64),
+        )
+
+
+def _to_minutes(ts: datetime) -> float:
+    return ts.timestamp() / 60.0
+
+
+def fetch_intervals(plans: QuerySet) -> MachineIntervals:
+    """작업 계획 queryset → MachineIntervals (쿼리 1회)"""
+    rows = list(plans.order_by('mc_cd', 'fr_ts').values_list('mc_cd', 'fr_ts', 'to_ts'))
+    if not rows:
+        return MachineIntervals.empty()
+
+    mc_cd, fr_ts, to_ts = zip(*rows)
+    machines, machine_idx = np.unique(np.array(mc_cd, dtype=object), return_inverse=True)
+    start = np.fromiter((ts.timestamp() for ts in fr_ts), dtype=np.float64, count=len(rows)) / 60.0
+    end = np.fromiter((ts.timestamp() for ts in to_ts), dtype=np.float64, count=len(rows)) / 60.0
+
+    # DB 정렬 (collation) 과 np.unique 순서가 다를 수 있으므로 (설비, 시작) 으로 재정렬
+    order = np.lexsort((start, machine_idx))
+    return MachineIntervals(
+        machines=machines,
+        machine_idx=machine_idx[order].astype(np.int64),
+        start=start[order],
+        end=end[order],
+    )
+
+
+def window_plans(plans: QuerySet, start_date: datetime, end_date: datetime) -> QuerySet:
+    """분석 구간에 시작 또는 종료가 포함된 작업"""
+    return plans.filter(
+        Q(fr_ts__gte=start_date, fr_ts__lte=end_date) | Q(to_ts__gte=start_date, to_ts__lte=end_date)
+    )
+
+
+# ----------------------------------------------------------------------
+# 설비별 지표
+# ----------------------------------------------------------------------
+
+def _segment_sum(values: np.ndarray, machine_idx: np.ndarray, n_machines: int) -> np.ndarray:
+    return np.bincount(machine_idx, weights=values, minlength=n_machines)
+
+
+def queue_waits(intervals: MachineIntervals) -> np.ndarray:
+    """
+    작업별 대기 시간 (분, 대기 없으면 0)
+
+    같은 설비의 앞선 작업들 중 가장 늦은 종료 시각 - 현재 작업 시작 시각.
+    설비마다 오프셋을 더해 한 번의 maximum.accumulate 로 설비별 누적 최대값을 구한다.
+    """
+    n = len(intervals.start)
+    if n == 0:
+        return np.zeros(0)
+    base = min(intervals.start.min(), intervals.end.min())
+    span = max(intervals.start.max(), intervals.end.max()) - base + 1.0
+    shifted = intervals.end - base + intervals.machine_idx * span
+    running_end = np.maximum.accumulate(shifted) - intervals.machine_idx * span + base
+
+    prev_end = np.empty(n)
+    prev_end[0] = -np.inf
+    prev_end[1:] = running_end[:-1]
+    first = np.ones(n, dtype=bool)
+    first[1:] = intervals.machine_idx[1:] != intervals.machine_idx[:-1]
+    prev_end[first] = -np.inf
+    return np.maximum(prev_end - intervals.start, 0.0)
+
+
+def machine_stats(intervals: MachineIntervals, now: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+    """
+    설비별 집계 (배열, machines 순서)
+
+    Returns:
+        job_count, busy_minutes, first_start, last_end, queue_length, total_wait, active_jobs
+    """
+    m = intervals.n_machines
+    if m == 0:
+        empty = np.zeros(0)
+        return {key: empty for key in (
+            'job_count', 'busy_minutes', 'first_start', 'last_end', 'queue_length', 'total_wait', 'active_jobs'
+        )}
+
+    idx = intervals.machine_idx
+    offsets = intervals.offsets
+    waits = queue_waits(intervals)
+    now_min = _to_minutes(now or timezone.now())
+    active = (intervals.start <= now_min) & (now_min <= intervals.end)
+
+    return {
+        'job_count': np.diff(offsets),
+        'busy_minutes': _segment_sum(intervals.duration, idx, m),
+        'first_start': intervals.start[offsets[:-1]],
+        'last_end': np.maximum.reduceat(intervals.end, offsets[:-1]),
+        'queue_length': np.bincount(idx, weights=(waits > 0), minlength=m).astype(np.int64),
+        'total_wait': _segment_sum(waits, idx, m),
+        'active_jobs': np.bincount(idx, weights=active, minlength=m).astype(np.int64),
+    }
+
+
+def bottleneck_metrics(
+    intervals: MachineIntervals,
+    start_date: datetime,
+    end_date: datetime,
+    now: Optional[datetime] = None
+) -> List[Dict]:
+    """
+    설비별 병목 지표 (BottleneckAnalysis / MachineLoadHistory 필드)
+
+    가동률 = 가공 시간 합 / 분석 구간 (최대 100),
+    병목 점수 = 가동률 * 0.5 + min(대기 작업 수 * 10, 30) + min(평균 대기 / 10, 20)
+    """
+    stats = machine_stats(intervals, now)
+    window = (end_date - start_date).total_seconds() / 60
+    busy = stats['busy_minutes']
+    queue_length = stats['queue_length']
+
+    utilization = np.minimum(100.0, busy / window * 100) if window > 0 else np.zeros_like(busy)
+    avg_wait = np.divide(
+        stats['total_wait'], queue_length, out=np.zeros_like(busy), where=queue_length > 0
+    )
+    score = np.minimum(
+        100.0,
+        utilization * 0.5 + np.minimum(queue_length * 10, 30) + np.minimum(avg_wait / 10, 20)
+    )
+
+    return [
+        {
+            'mc_cd': mc_cd,
+            'utilization_rate': round(float(utilization[i]), 2),
+            'queue_length': int(queue_length[i]),
+            'avg_waiting_time': round(float(avg_wait[i]), 2),
+            'bottleneck_score': round(float(score[i]), 2),
+            'affected_jobs': int(stats['job_count'][i]),
+            'total_delay': round(float(stats['total_wait'][i]), 2),
+            'active_jobs': int(stats['active_jobs'][i]),
+            'total_capacity': round(window, 2),
+            'used_capacity': round(float(busy[i]), 2),
+            'available_capacity': round(max(0.0, window - float(busy[i])), 2),
+        }
+        for i, mc_cd in enumerate(intervals.machines)
+    ]
+
+
+def utilization_summary(intervals: MachineIntervals) -> Dict:
+    """
+    전체 작업 구간 (makespan) 대비 설비별 가동률 / 설비 구간 대비 가동률
+
+    Returns:
+        makespan (분), avg_utilization, machines [{mc_cd, job_count, total_process_time, utilization, ...}]
+    """
+    if intervals.n_machines == 0:
+        return {'makespan': 0.0, 'avg_utilization': 0.0, 'machines': []}
+
+    stats = machine_stats(intervals)
+    makespan = float(intervals.end.max() - intervals.start.min())
+    busy = stats['busy_minutes']
+    job_count = stats['job_count']
+    machine_window = stats['last_end'] - stats['first_start']
+
+    makespan_utilization = busy / makespan * 100 if makespan > 0 else np.zeros_like(busy)
+    machine_utilization = np.divide(
+        busy * 100, machine_window, out=np.zeros_like(busy), where=machine_window > 0
+    )
+
+    return {
+        'makespan': makespan,
+        'avg_utilization': float(makespan_utilization.mean()) if makespan > 0 else 0.0,
+        'machines': [
+            {
+                'mc_cd': mc_cd,
+                'job_count': int(job_count[i]),
+                'total_process_time': round(float(busy[i]), 2),
+                'utilization': round(float(machine_utilization[i]), 2),
+                'avg_job_duration': round(float(busy[i] / job_count[i]), 2),
+            }
+            for i, mc_cd in enumerate(intervals.machines)
+        ],
+    }
+
+
+# ----------------------------------------------------------------------
+# 시간 버킷 히트맵
+# ----------------------------------------------------------------------
+
+def bucket_busy_minutes(
+    intervals: MachineIntervals,
+    start_date: datetime,
+    end_date: datetime,
+    bucket_minutes: int = 60
+) -> np.ndarray:
+    """
+    설비 × 시간 버킷별 가동 시간 (분), shape (M, B)
+
+    C(t) = Σ clip(t - s_i, 0, d_i) = Σ_{s_i<t}(t - s_i) - Σ_{e_i<t}(t - e_i)
+    를 정렬된 시작 / 종료 시각의 누적합과 searchsorted 로 버킷 경계에서 계산하고 차분한다.
+    """
+    t0 = _to_minutes(start_date)
+    n_buckets = max(1, int(np.ceil((_to_minutes(end_date) - t0) / bucket_minutes)))
+    edges = t0 + np.arange(n_buckets + 1) * bucket_minutes
+    busy = np.zeros((intervals.n_machines, n_buckets))
+
+    offsets = intervals.offsets
+    for i in range(intervals.n_machines):
+        starts = np.sort(intervals.start[offsets[i]:offsets[i + 1]])
+        ends = np.sort(intervals.end[offsets[i]:offsets[i + 1]])
+        start_cum = np.concatenate(([0.0], np.cumsum(starts)))
+        end_cum = np.concatenate(([0.0], np.cumsum(ends)))
+        n_started = np.searchsorted(starts, edges)
+        n_ended = np.searchsorted(ends, edges)
+        cumulative = (n_started * edges - start_cum[n_started]) - (n_ended * edges - end_cum[n_ended])
+        busy[i] = np.diff(cumulative)
+    return busy
+
+
+def utilization_heatmap(
+    intervals: MachineIntervals,
+    start_date: datetime,
+    end_date: datetime,
+    bucket_minutes: int = 60
+) -> List[Dict]:
+    """
+    설비별 버킷 가동률 (%) 히트맵
+
+    동시 작업이 있으면 버킷 가동률이 100% 를 넘을 수 있으므로 100 으로 제한한다.
+    """
+    busy = bucket_busy_minutes(intervals, start_date, end_date, bucket_minutes)
+    utilization = np.minimum(busy / bucket_minutes * 100, 100.0)
+    bucket_starts = [start_date + timedelta(minutes=bucket_minutes * b) for b in range(busy.shape[1])]
+
+    heatmap = []
+    for i, mc_cd in enumerate(intervals.machines):
+        row = utilization[i]
+        heatmap.append({
+            'mc_cd': mc_cd,
+            'avg_utilization': round(float(row.mean()), 2) if row.size else 0,
+            'max_utilization': round(float(row.max()), 2) if row.size else 0,
+            'data_points': [
+                {'timestamp': ts, 'utilization_rate': round(float(value), 2)}
+                for ts, value in zip(bucket_starts, row)
+            ],
+        })
+    return heatmap
+
+
+def load_history_heatmap(history: QuerySet, bucket_minutes: Optional[int] = None) -> List[Dict]:
+    """
+    MachineLoadHistory 기반 히트맵 (쿼리 1회)
+
+    bucket_minutes 를 지정하면 버킷 평균 가동률로 묶는다.
+    """
+    rows = list(history.order_by('mc_cd', 'timestamp').values_list('mc_cd', 'timestamp', 'utilization_rate'))
+    if not rows:
+        return []
+
+    mc_cd, timestamps, rates = zip(*rows)
+    machines, machine_idx = np.unique(np.array(mc_cd, dtype=object), return_inverse=True)
+    rates = np.array(rates, dtype=np.float64)
+    m = len(machines)
+    counts = np.bincount(machine_idx, minlength=m)
+    sums = np.bincount(machine_idx, weights=rates, minlength=m)
+    maxima = np.full(m, -np.inf)
+    np.maximum.at(maxima, machine_idx, rates)
+
+    points: List[List[Dict]] = [[] for _ in range(m)]
+    if bucket_minutes:
+        minutes = np.fromiter((ts.timestamp() for ts in timestamps), dtype=np.float64, count=len(rows)) / 60.0
+        bucket = np.floor(minutes / bucket_minutes).astype(np.int64)
+        keys, inverse = np.unique(np.stack([machine_idx, bucket], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        bucket_sum = np.bincount(inverse, weights=rates)
+        bucket_count = np.bincount(inverse)
+        tz = timezone.get_current_timezone()
+        for (i, b), total, count in zip(keys, bucket_sum, bucket_count):
+            points[i].append({
+                'timestamp': datetime.fromtimestamp(int(b) * bucket_minutes * 60, tz),
+                'utilization_rate': round(float(total / count), 2),
+            })
+    else:
+        for i, ts, rate in zip(machine_idx, timestamps, rates):
+            points[i].append({'timestamp': ts, 'utilization_rate': float(rate)})
+
+    return [
+        {
+            'mc_cd': machines[i],
+            'avg_utilization': float(sums[i] / counts[i]),
+            'max_utilization': float(maxima[i]),
+            'data_points': points[i],
+        }
+        for i in range(m)
+    ]
@@ -0,0 +1,423 @@
+"""
+대용량 데이터 내보내기
+
+- 서버측 커서: queryset.values_list(...).iterator(chunk_size) 로 행을 조금씩 읽어 메모리 사용량 일정
+- CSV / NDJSON: StreamingHttpResponse 로 바로 전송 (stream_csv / stream_ndjson)
+- Parquet: pyarrow ParquetWriter 로 row group 단위 기록
+- EXCEL: openpyxl write-only 워크북 (시트당 최대 행 수 초과 시 시트 분할)
+- 파일 내보내기는 EXPORT_ROOT 에 저장하고 ExportHistory 에 기록 (Celery 작업 apps.aps.tasks.export_dataset)
+"""
+import csv
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.aps.monitoring_models import MachineMetrics
+from apps.aps.report_models import ExportHistory
+from apps.core.models import StageFactPlanOut
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_ROW_GROUP_SIZE = 100000
+XLSX_MAX_ROWS = 1048575  # 헤더 1행 제외
+
+STREAM_FORMATS = ("CSV", "JSON")
+FILE_FORMATS = ("CSV", "PARQUET", "EXCEL")
+FILE_EXTENSIONS = {"CSV": "csv", "PARQUET": "parquet", "EXCEL": "xlsx"}
+CONTENT_TYPES = {
+    "CSV": "text/csv",
+    "JSON": "application/x-ndjson",
+    "PARQUET": "application/vnd.apache.parquet",
+    "EXCEL": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class ExportError(ValueError):
+    """잘못된 내보내기 요청 (데이터셋 / 형식 / 파라미터 / 선택 패키지 미설치)"""
+
+
+# ----------------------------------------------------------------------
+# 데이터셋 정의
+# ----------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ExportDataset:
+    """내보내기 대상: 컬럼 (이름, Arrow 타입) 과 요청 파라미터 → queryset"""
+    name: str
+    export_type: str
+    data_type: str
+    columns: Tuple[Tuple[str, str], ...]
+    build_queryset: Callable[[Dict[str, Any]], QuerySet]
+
+    @property
+    def fields(self) -> List[str]:
+        return [name for name, _ in self.columns]
+
+
+def _parse_ts(value):
+    if not value or isinstance(value, datetime):
+        return value
+    try:
+        parsed = parse_datetime(value) or datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ExportError(f"Invalid datetime: {value}") from None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _schedule_queryset(params: Dict[str, Any]) -> QuerySet:
+    plans = StageFactPlanOut.objects.all()
+    if params.get("start_date"):
+        plans = plans.filter(fr_ts__gte=_parse_ts(params["start_date"]))
+    if params.get("end_date"):
+        plans = plans.filter(fr_ts__lte=_parse_ts(params["end_date"]))
+    if params.get("mc_cd"):
+        plans = plans.filter(mc_cd=params["mc_cd"])
+    return plans.order_by("mc_cd", "fr_ts")  # ix_stage_mc_fr
+
+
+def _performance_queryset(params: Dict[str, Any]) -> QuerySet:
+    metrics = MachineMetrics.objects.all()
+    if params.get("start_date") or params.get("end_date"):
+        if params.get("start_date"):
+            metrics = metrics.filter(timestamp__gte=_parse_ts(params["start_date"]))
+        if params.get("end_date"):
+            metrics = metrics.filter(timestamp__lte=_parse_ts(params["end_date"]))
+    else:
+        try:
+            hours = int(params.get("hours", 24))
+        except (TypeError, ValueError):
+            raise ExportError(f"Invalid hours: {params.get('hours')}") from None
+        metrics = metrics.filter(timestamp__gte=timezone.now() - timedelta(hours=hours))
+    if params.get("mc_cd"):
+        metrics = metrics.filter(mc_cd=params["mc_cd"])
+    if params.get("bucket_type"):
+        metrics = metrics.filter(bucket_type=params["bucket_type"])
+    return metrics.order_by("-timestamp")
+
+
+EXPORT_DATASETS: Dict[str, ExportDataset] = {
+    "schedule": ExportDataset(
+        name="schedule",
+        export_type="SCHEDULE",
+        data_type="plans",
+        columns=(
+            ("wo_no", "string"),
+            ("mc_cd", "string"),
+            ("itm_id", "string"),
+            ("plan_qty", "float64"),
+            ("fr_ts", "timestamp"),
+            ("to_ts", "timestamp"),
+            ("locked_yn", "string"),
+            ("freeze_level", "int64"),
+        ),
+        build_queryset=_schedule_queryset,
+    ),
+    "performance": ExportDataset(
+        name="performance",
+        export_type="DATA",
+        data_type="performance",
+        columns=(
+            ("mc_cd", "string"),
+            ("timestamp", "timestamp"),
+            ("bucket_type", "string"),
+            ("oee", "float64"),
+            ("availability", "float64"),
+            ("performance", "float64"),
+            ("quality", "float64"),
+            ("output_quantity", "int64"),
+            ("defect_quantity", "int64"),
+        ),
+        build_queryset=_performance_queryset,
+    ),
+}
+
+
+def get_dataset(name: str) -> ExportDataset:
+    try:
+        return EXPORT_DATASETS[name]
+    except KeyError:
+        raise ExportError(f"Unknown export dataset: {name}") from None
+
+
+def iter_rows(dataset: ExportDataset, params: Dict[str, Any], chunk_size: Optional[int] = None) -> Iterator[tuple]:
+    """values_list 튜플을 서버측 커서로 chunk_size (EXPORT_CHUNK_SIZE) 씩 조회"""
+    chunk_size = chunk_size or getattr(settings, "EXPORT_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    queryset = dataset.build_queryset(params or {})
+    return queryset.values_list(*dataset.fields).iterator(chunk_size=chunk_size)
+
+
+# ----------------------------------------------------------------------
+# 스트리밍 (HTTP 응답)
+# ----------------------------------------------------------------------
+
+class _LineBuffer:
+    """csv.writer 출력 수집용 버퍼"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+
+    def write(self, value: str):
+        self.parts.append(value)
+
+    def drain(self) -> str:
+        data = "".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def stream_csv(
+    header: Sequence[str],
+    rows: Iterable[tuple],
+    batch_rows: int = 1000,
+    on_complete: Optional[Callable[[int, int], None]] = None
+) -> Iterator[bytes]:
+    """
+    CSV 바이트 청크 생성 (batch_rows 행씩 묶어 전송)
+
+    on_complete(record_count, byte_count) 는 마지막 청크 이후 호출된다.
+    """
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    record_count = byte_count = 0
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        record_count += 1
+        pending += 1
+        if pending >= batch_rows:
+            chunk = buffer.drain().encode("utf-8")
+            byte_count += len(chunk)
+            pending = 0
+            yield chunk
+    chunk = buffer.drain().encode("utf-8")
+    byte_count += len(chunk)
+    yield chunk
+    if on_complete:
+        on_complete(record_count, byte_count)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def stream_ndjson(
+    header: Sequence[str],
+    rows: Iterable[tuple],
+    batch_rows: int = 1000,
+    on_complete: Optional[Callable[[int, int], None]] = None
+) -> Iterator[bytes]:
+    """JSON Lines (행당 1개 객체) 바이트 청크 생성"""
+    lines: List[str] = []
+    record_count = byte_count = 0
+    for row in rows:
+        lines.append(json.dumps(dict(zip(header, row)), default=_json_default, ensure_ascii=False))
+        record_count += 1
+        if len(lines) >= batch_rows:
+            chunk = ("\n".join(lines) + "\n").encode("utf-8")
+            byte_count += len(chunk)
+            lines.clear()
+            yield chunk
+    if lines:
+        chunk = ("\n".join(lines) + "\n").encode("utf-8")
+        byte_count += len(chunk)
+        yield chunk
+    if on_complete:
+        on_complete(record_count, byte_count)
+
+
+# ----------------------------------------------------------------------
+# 파일 기록
+# ----------------------------------------------------------------------
+
+def write_csv(path: Path, dataset: ExportDataset, rows: Iterable[tuple]) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(dataset.fields)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _arrow_schema(dataset: ExportDataset):
+    import pyarrow as pa
+
+    types = {
+        "string": pa.string(),
+        "float64": pa.float64(),
+        "int64": pa.int64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in dataset.columns])
+
+
+def write_parquet(
+    path: Path,
+    dataset: ExportDataset,
+    rows: Iterable[tuple],
+    row_group_size: Optional[int] = None
+) -> int:
+    """row_group_size (EXPORT_PARQUET_ROW_GROUP_SIZE) 행씩 컬럼 배열로 모아 row group 단위로 기록"""
+    row_group_size = row_group_size or getattr(settings, "EXPORT_PARQUET_ROW_GROUP_SIZE", DEFAULT_ROW_GROUP_SIZE)
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("PARQUET export requires pyarrow") from None
+
+    schema = _arrow_schema(dataset)
+    decimal_columns = [i for i, (_, kind) in enumerate(dataset.columns) if kind == "float64"]
+    n_columns = len(dataset.columns)
+    count = 0
+
+    def flush(columns, writer):
+        for i in decimal_columns:
+            columns[i] = [float(v) if v is not None else None for v in columns[i]]
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema,
+        ))
+
+    with pq.ParquetWriter(str(path), schema, compression="snappy") as writer:
+        columns: List[list] = [[] for _ in range(n_columns)]
+        for row in rows:
+            for i in range(n_columns):
+                columns[i].append(row[i])
+            count += 1
+            if len(columns[0]) >= row_group_size:
+                flush(columns, writer)
+                columns = [[] for _ in range(n_columns)]
+        if columns[0] or count == 0:
+            flush(columns, writer)
+    return count
+
+
+def write_xlsx(path: Path, dataset: ExportDataset, rows: Iterable[tuple]) -> int:
+    """write-only 워크북 (행은 임시 파일로 흘려 쓰므로 메모리 일정)"""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ExportError("EXCEL export requires openpyxl") from None
+
+    workbook = Workbook(write_only=True)
+    timestamp_columns = [i for i, (_, kind) in enumerate(dataset.columns) if kind == "timestamp"]
+    sheet = None
+    count = 0
+    for row in rows:
+        if count % XLSX_MAX_ROWS == 0:
+            sheet = workbook.create_sheet(f"{dataset.name}_{count // XLSX_MAX_ROWS + 1}")
+            sheet.append(dataset.fields)
+        if timestamp_columns:
+            # Excel 은 timezone 정보를 저장하지 않으므로 현지 시각으로 변환
+            row = list(row)
+            for i in timestamp_columns:
+                if row[i] is not None and timezone.is_aware(row[i]):
+                    row[i] = timezone.localtime(row[i]).replace(tzinfo=None)
+        sheet.append(row)
+        count += 1
+    if sheet is None:
+        workbook.create_sheet(dataset.name).append(dataset.fields)
+    workbook.save(str(path))
+    return count
+
+
+FILE_WRITERS = {
+    "CSV": write_csv,
+    "PARQUET": write_parquet,
+    "EXCEL": write_xlsx,
+}
+
+
+def export_root() -> Path:
+    root = Path(getattr(settings, "EXPORT_ROOT", None) or Path(settings.BASE_DIR) / "exports")
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def export_filename(dataset: ExportDataset, file_format: str) -> str:
+    return f"{dataset.name}_export_{timezone.now().strftime('%Y%m%d_%H%M%S_%f')}.{FILE_EXTENSIONS[file_format]}"
+
+
+def record_export(
+    dataset: ExportDataset,
+    file_format: str,
+    file_path: str,
+    record_count: int,
+    file_size: int,
+    created_by: str = "system",
+    error_message: str = ""
+) -> ExportHistory:
+    return ExportHistory.objects.create(
+        export_type=dataset.export_type,
+        data_type=dataset.data_type,
+        record_count=record_count,
+        file_format=file_format,
+        file_path=file_path,
+        file_size=file_size,
+        status="FAILED" if error_message else "SUCCESS",
+        error_message=error_message,
+        created_by=created_by,
+    )
+
+
+def export_to_file(
+    dataset_name: str,
+    params: Optional[Dict[str, Any]] = None,
+    file_format: str = "CSV",
+    created_by: str = "system",
+    chunk_size: Optional[int] = None
+) -> ExportHistory:
+    """
+    데이터셋을 EXPORT_ROOT 파일로 내보내고 ExportHistory 기록
+
+    임시 파일(.part)에 기록한 뒤 완료 시 이름을 바꾸므로 실패한 파일이 다운로드되지 않는다.
+
+    Raises:
+        ExportError: 알 수 없는 데이터셋 / 형식, 잘못된 파라미터, 선택 패키지 미설치
+    """
+    dataset = get_dataset(dataset_name)
+    file_format = (file_format or "CSV").upper()
+    if file_format not in FILE_WRITERS:
+        raise ExportError(f"Unsupported file format: {file_format}")
+
+    path = export_root() / export_filename(dataset, file_format)
+    partial = path.with_name(path.name + ".part")
+    started = time.perf_counter()
+    try:
+        count = FILE_WRITERS[file_format](partial, dataset, iter_rows(dataset, params, chunk_size))
+        os.replace(partial, path)
+    except ExportError:
+        partial.unlink(missing_ok=True)
+        raise
+    except Exception as e:
+        partial.unlink(missing_ok=True)
+        logger.error(f"Export failed: {dataset_name} {file_format}: {e}", exc_info=True)
+        return record_export(dataset, file_format, str(path), 0, 0, created_by, error_message=str(e))
+
+    history = record_export(dataset, file_format, str(path), count, path.stat().st_size, created_by)
+    logger.info(
+        f"Exported {count} {dataset.data_type} rows to {path.name} "
+        f"({history.file_size} bytes, {time.perf_counter() - started:.1f}s)"
+    )
+    return history
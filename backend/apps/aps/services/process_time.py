@@ -0,0 +1,113 @@
+"""
+공정 시간 예측 연동
+
+settings.PROCESS_TIME_MODEL_DIR 의 XGBoost 모델로 GA / CP-SAT 입력 작업의 duration_minutes 를 예측값으로 교체
+모델이 없거나 로드에 실패하면 기존 계획 시간을 그대로 사용
+
+작업 dict 에는 설비 / 품목 / 수량만 있으므로 예측 전에 특징을 보강한다.
+- item_type: 품목 마스터 (master_item.itm_type)
+- process_name, setup_time: 라우팅 마스터 (op_seq 공정, 없으면 첫 공정)
+- shift: 작업 시작 시각 (주간 06~18시 = 1, 야간 = 2)
+- 나머지 (complexity, operator_skill, temperature, humidity 등): settings.PROCESS_TIME_FEATURE_DEFAULTS
+"""
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+from apps.erp.models import MasterItem, MasterRouting
+
+logger = logging.getLogger(__name__)
+
+_service = None
+_service_error = None
+_lock = threading.Lock()
+
+
+def get_process_time_service():
+    """프로세스당 1회 로드한 ProcessTimePredictionService (사용 불가 시 None)"""
+    global _service, _service_error
+    if _service is not None or _service_error is not None:
+        return _service
+
+    with _lock:
+        if _service is None and _service_error is None:
+            try:
+                from ai_modules.ml_models.process_time_service import ProcessTimePredictionService
+
+                _service = ProcessTimePredictionService.get(
+                    getattr(settings, 'PROCESS_TIME_MODEL_DIR', None),
+                    feature_defaults=getattr(settings, 'PROCESS_TIME_FEATURE_DEFAULTS', None),
+                )
+            except Exception as e:
+                _service_error = str(e)
+                logger.warning(f"Process time model unavailable, using planned durations: {e}")
+    return _service
+
+
+def enrich_job_features(jobs: List[Dict[str, Any]]) -> None:
+    """
+    품목 / 라우팅 마스터와 작업 시작 시각으로 예측 특징 보강 (in-place, 이미 있는 키는 유지)
+
+    마스터 조회는 작업 전체에 대해 품목 / 라우팅 각 1회
+    """
+    item_ids = {job['itm_id'] for job in jobs if job.get('itm_id')}
+    item_types = dict(
+        MasterItem.objects.filter(itm_id__in=item_ids).values_list('itm_id', 'itm_type')
+    )
+    routings: Dict[str, Dict[int, tuple]] = {}
+    rows = (
+        MasterRouting.objects.filter(item_id__in=item_ids, active_yn="Y")
+        .order_by('item_id', 'seq')
+        .values_list('item_id', 'seq', 'operation_nm', 'setup_time')
+    )
+    for item_id, seq, operation_nm, setup_time in rows:
+        routings.setdefault(item_id, {})[seq] = (operation_nm, setup_time)
+
+    for job in jobs:
+        item_id = job.get('itm_id')
+        if item_id in item_types:
+            job.setdefault('item_type', item_types[item_id])
+
+        steps = routings.get(item_id)
+        if steps:
+            operation_nm, setup_time = steps.get(job.get('op_seq'), next(iter(steps.values())))
+            job.setdefault('process_name', operation_nm)
+            job.setdefault('setup_time', setup_time)
+
+        start = job.get('fr_ts') or job.get('start_dt')
+        if start is not None:
+            job.setdefault('shift', 1 if 6 <= start.hour < 18 else 2)
+
+
+def apply_predicted_durations(jobs: List[Dict[str, Any]], as_int: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    작업 dict 리스트의 duration_minutes 를 예측값으로 교체 (in-place)
+
+    Args:
+        jobs: GA 입력 job dict 또는 CP-SAT schedule_rows
+        as_int: 정수 분으로 올림 (CP-SAT interval 변수용)
+
+    Returns:
+        {'predicted', 'skipped', 'elapsed_ms'} 또는 모델 미사용 시 None
+    """
+    if not jobs or not getattr(settings, 'PROCESS_TIME_PREDICTION_ENABLED', True):
+        return None
+
+    service = get_process_time_service()
+    if service is None:
+        return None
+
+    try:
+        enrich_job_features(jobs)
+        result = service.apply_durations(jobs, as_int=as_int)
+    except Exception as e:
+        logger.error(f"Process time prediction failed: {e}", exc_info=True)
+        return None
+
+    logger.info(
+        f"Predicted durations for {result['predicted']} jobs "
+        f"(skipped={result['skipped']}, {result['elapsed_ms']:.1f} ms)"
+    )
+    return result
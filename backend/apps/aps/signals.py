@@ -0,0 +1,8 @@
+"""
+APS Signals
+모니터링 KPI 스냅샷 변경 시 대시보드 리소스 버전 증가 (smart_spc/resource_versions.py)
+"""
+from smart_spc.resource_versions import track
+from .monitoring_models import KPISnapshot
+
+track(KPISnapshot, 'monitoring_kpi')
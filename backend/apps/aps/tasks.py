@@ -0,0 +1,36 @@
+"""
+Celery Tasks for APS
+
+비동기 작업 정의
+- 대용량 데이터 내보내기 (일정 / 성능 지표)
+"""
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from .services.exports import ExportError, export_to_file
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(bind=True, name='apps.aps.tasks.export_dataset')
+def export_dataset(self, dataset: str, params: dict = None, file_format: str = 'CSV', created_by: str = 'system'):
+    """
+    데이터셋 파일 내보내기 (비동기)
+
+    완료 후 ExportHistory 에 기록되며 /api/aps/exports/{export_id}/download/ 로 내려받는다.
+    """
+    logger.info(f"데이터 내보내기 시작: {dataset} ({file_format})")
+    try:
+        history = export_to_file(dataset, params or {}, file_format, created_by)
+    except ExportError as e:
+        logger.error(f"데이터 내보내기 요청 오류: {str(e)}")
+        return {'status': 'failed', 'error': str(e)}
+
+    logger.info(f"데이터 내보내기 완료: {history.export_id} ({history.record_count}건)")
+    return {
+        'export_id': history.export_id,
+        'status': history.status.lower(),
+        'record_count': history.record_count,
+        'file_size': history.file_size,
+    }
@@ -0,0 +1,218 @@
+"""
+Tests for export request parameter validation and writers (apps/aps/services/exports.py)
+
+잘못된 날짜 / hours 는 ExportError (뷰에서 400) 로 변환되어야 한다
+"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+import pytest
+from django.utils import timezone
+
+from apps.aps.monitoring_models import MachineMetrics
+from apps.aps.report_models import ExportHistory
+from apps.aps.services import exports
+
+START = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def metrics():
+    """MC-01 / MC-02 1월 1일 ~ 1월 3일 6시간 간격 지표"""
+    return MachineMetrics.objects.bulk_create([
+        MachineMetrics(
+            mc_cd=mc_cd, timestamp=START + timedelta(hours=6 * i), bucket_type='HOUR',
+            oee=60.0 + i, availability=90.0, performance=80.0 + i / 2, quality=99.5,
+            output_quantity=100 + i, defect_quantity=i % 3,
+        )
+        for mc_cd in ('MC-01', 'MC-02')
+        for i in range(12)
+    ])
+
+
+def _local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+def _expected(metrics, start, end, mc_cd=None):
+    """파라미터 조건을 직접 적용한 행 (timestamp 내림차순)"""
+    dataset = exports.get_dataset('performance')
+    selected = [
+        m for m in metrics
+        if start <= m.timestamp <= end and (mc_cd is None or m.mc_cd == mc_cd)
+    ]
+    selected.sort(key=lambda m: m.timestamp, reverse=True)
+    return [tuple(getattr(m, name) for name in dataset.fields) for m in selected]
+
+
+class TestExportParams:
+    """Export parameter parsing"""
+
+    @pytest.mark.parametrize('params', [
+        {'start_date': 'not-a-date'},
+        {'end_date': '2024-13-45'},
+        {'hours': 'abc'},
+    ])
+    def test_invalid_performance_params_raise_export_error(self, params):
+        with pytest.raises(exports.ExportError):
+            exports.iter_rows(exports.get_dataset('performance'), params)
+
+    def test_invalid_schedule_date_raises_export_error(self):
+        with pytest.raises(exports.ExportError):
+            exports.iter_rows(exports.get_dataset('schedule'), {'start_date': '24/01/2024'})
+
+    @pytest.mark.django_db
+    def test_valid_params_build_queryset(self, metrics):
+        rows = list(exports.iter_rows(
+            exports.get_dataset('performance'),
+            {'start_date': '2024-01-01', 'end_date': '2024-01-02T12:00:00', 'mc_cd': 'MC-01'},
+            chunk_size=2,
+        ))
+
+        # 시간대 없는 날짜는 TIME_ZONE 기준
+        expected = _expected(metrics, _local(2024, 1, 1), _local(2024, 1, 2, 12), mc_cd='MC-01')
+        assert len(expected) == 5  # 2024-01-01 00:00 ~ 01-02 00:00 UTC
+        # 타임스탬프 동률이 없도록 한 설비로 제한했으므로 순서까지 비교
+        assert rows == expected
+
+    @pytest.mark.django_db
+    def test_date_range_includes_both_machines(self, metrics):
+        rows = list(exports.iter_rows(
+            exports.get_dataset('performance'), {'start_date': '2024-01-02', 'end_date': '2024-01-02T06:00:00'}
+        ))
+        assert sorted(rows) == sorted(_expected(metrics, _local(2024, 1, 2), _local(2024, 1, 2, 6)))
+        assert {row[0] for row in rows} == {'MC-01', 'MC-02'}
+
+
+HEADER = ('name', 'value', 'at')
+ROWS = [
+    ('a', 1.5, START),
+    ('b,"q"', None, START + timedelta(hours=1)),
+    ('한글', 3, START + timedelta(hours=2)),
+]
+
+
+class TestStreaming:
+    """CSV / NDJSON 청크 본문과 완료 콜백"""
+
+    @pytest.mark.parametrize('batch_rows', [1, 2, 1000])
+    def test_csv_body_and_counts(self, batch_rows):
+        done = []
+        chunks = list(exports.stream_csv(HEADER, iter(ROWS), batch_rows=batch_rows,
+                                         on_complete=lambda *counts: done.append(counts)))
+        body = b''.join(chunks)
+
+        parsed = list(csv.reader(io.StringIO(body.decode('utf-8'))))
+        assert parsed == [list(HEADER)] + [[str(v) if v is not None else '' for v in row] for row in ROWS]
+        assert done == [(len(ROWS), len(body))]
+        # 헤더는 첫 청크, 이후 batch_rows 행마다 한 청크 (+ 마지막 잔여 청크)
+        assert len(chunks) == len(ROWS) // batch_rows + 1
+
+    @pytest.mark.parametrize('batch_rows', [1, 2, 1000])
+    def test_ndjson_body_and_counts(self, batch_rows):
+        done = []
+        body = b''.join(exports.stream_ndjson(HEADER, iter(ROWS), batch_rows=batch_rows,
+                                              on_complete=lambda *counts: done.append(counts)))
+
+        lines = body.decode('utf-8').splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {'name': name, 'value': value, 'at': at.isoformat()} for name, value, at in ROWS
+        ]
+        assert '한글' in body.decode('utf-8')  # ensure_ascii=False
+        assert done == [(len(ROWS), len(body))]
+
+    def test_empty_rows(self):
+        done = []
+        assert b''.join(exports.stream_csv(HEADER, [], on_complete=lambda *c: done.append(c))) == b'name,value,at\r\n'
+        assert b''.join(exports.stream_ndjson(HEADER, [], on_complete=lambda *c: done.append(c))) == b''
+        assert done == [(0, len(b'name,value,at\r\n')), (0, 0)]
+
+
+@pytest.mark.django_db
+class TestFileWriters:
+    """Parquet / Excel 파일 왕복"""
+
+    def test_parquet_round_trip(self, metrics, tmp_path):
+        pq = pytest.importorskip('pyarrow.parquet')
+        dataset = exports.get_dataset('performance')
+        rows = list(exports.iter_rows(dataset, {'start_date': '2024-01-01'}))
+        path = tmp_path / 'metrics.parquet'
+
+        count = exports.write_parquet(path, dataset, iter(rows), row_group_size=5)
+
+        assert count == len(rows) == 24
+        assert pq.ParquetFile(str(path)).metadata.num_row_groups == 5
+        table = pq.read_table(str(path))
+        assert table.column_names == dataset.fields
+        assert [tuple(record.values()) for record in table.to_pylist()] == rows
+
+    def test_xlsx_round_trip_splits_sheets(self, metrics, tmp_path, monkeypatch):
+        openpyxl = pytest.importorskip('openpyxl')
+        monkeypatch.setattr(exports, 'XLSX_MAX_ROWS', 10)
+        dataset = exports.get_dataset('performance')
+        rows = list(exports.iter_rows(dataset, {'start_date': '2024-01-01'}))
+        path = tmp_path / 'metrics.xlsx'
+
+        assert exports.write_xlsx(path, dataset, iter(rows)) == 24
+
+        workbook = openpyxl.load_workbook(str(path), read_only=True)
+        assert workbook.sheetnames == ['performance_1', 'performance_2', 'performance_3']
+        read = []
+        for sheet in workbook.worksheets:
+            values = list(sheet.iter_rows(values_only=True))
+            assert list(values[0]) == dataset.fields
+            read.extend(values[1:])
+        # Excel 에는 현지 시각 (timezone 없음) 으로 저장
+        ts = dataset.fields.index('timestamp')
+        assert read == [
+            tuple(timezone.localtime(v).replace(tzinfo=None) if i == ts else v for i, v in enumerate(row))
+            for row in rows
+        ]
+
+
+@pytest.mark.django_db
+class TestExportToFile:
+    """파일 내보내기 + ExportHistory 기록"""
+
+    def test_history_record(self, metrics, tmp_path, settings):
+        settings.EXPORT_ROOT = str(tmp_path)
+
+        history = exports.export_to_file(
+            'performance', {'start_date': '2024-01-01', 'mc_cd': 'MC-02'}, 'csv', created_by='planner', chunk_size=4,
+        )
+
+        history.refresh_from_db()
+        path = Path(history.file_path)
+        assert (history.export_type, history.data_type, history.file_format) == ('DATA', 'performance', 'CSV')
+        assert (history.status, history.error_message, history.created_by) == ('SUCCESS', '', 'planner')
+        assert history.record_count == 12
+        assert path.parent == tmp_path and path.suffix == '.csv'
+        assert history.file_size == path.stat().st_size
+        with open(path, newline='', encoding='utf-8') as f:
+            assert len(list(csv.reader(f))) == 13
+        assert list(tmp_path.glob('*.part')) == []
+
+    def test_writer_failure_records_failed_history(self, metrics, tmp_path, settings, monkeypatch):
+        settings.EXPORT_ROOT = str(tmp_path)
+
+        def broken_writer(path, dataset, rows):
+            path.write_text('partial')
+            raise OSError('disk full')
+
+        monkeypatch.setitem(exports.FILE_WRITERS, 'CSV', broken_writer)
+
+        history = exports.export_to_file('performance', {'start_date': '2024-01-01'})
+
+        assert (history.status, history.record_count, history.file_size) == ('FAILED', 0, 0)
+        assert history.error_message == 'disk full'
+        assert list(tmp_path.iterdir()) == []
+        assert ExportHistory.objects.filter(status='FAILED').count() == 1
+
+    def test_unknown_format_raises(self, tmp_path, settings):
+        settings.EXPORT_ROOT = str(tmp_path)
+        with pytest.raises(exports.ExportError):
+            exports.export_to_file('performance', file_format='PDF')
+        assert not ExportHistory.objects.exists()
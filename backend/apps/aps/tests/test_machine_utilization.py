@@ -0,0 +1,126 @@
+"""
+Tests for machine utilization analysis (apps/aps/services/analytics/machine_utilization.py)
+
+대기 시간 / 버킷 가동 시간은 손으로 계산한 구간 값과 같아야 한다
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from apps.aps.models import MachineLoadHistory
+from apps.aps.services.analytics.machine_utilization import (
+    MachineIntervals, bucket_busy_minutes, queue_waits,
+)
+from apps.aps.views import BottleneckAnalysisViewSet
+
+BASE = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+BASE_MIN = BASE.timestamp() / 60.0
+
+# (설비, 시작 분, 종료 분) - BASE 기준
+JOBS = [
+    ('MC-A', 0, 60),
+    ('MC-A', 30, 90),    # MC-A 0~60 과 겹침 → 30분 대기
+    ('MC-A', 50, 70),    # 앞선 작업 최대 종료 90 → 40분 대기
+    ('MC-A', 100, 120),  # 대기 없음
+    ('MC-B', -30, 10),   # 분석 구간 시작 전부터 진행
+    ('MC-B', 5, 20),     # 5분 대기
+    ('MC-B', 15, 40),    # 앞선 최대 종료 20 → 5분 대기
+]
+
+
+def _intervals(jobs):
+    """(설비, 시작) 정렬 MachineIntervals (fetch_intervals 와 같은 형태)"""
+    jobs = sorted(jobs)
+    machines, machine_idx = np.unique(np.array([mc for mc, _, _ in jobs], dtype=object), return_inverse=True)
+    return MachineIntervals(
+        machines=machines,
+        machine_idx=machine_idx.astype(np.int64),
+        start=np.array([BASE_MIN + s for _, s, _ in jobs], dtype=np.float64),
+        end=np.array([BASE_MIN + e for _, _, e in jobs], dtype=np.float64),
+    )
+
+
+class TestQueueWaits:
+    """앞선 작업들의 최대 종료 시각 - 시작 시각"""
+
+    def test_hand_computed_waits(self):
+        waits = queue_waits(_intervals(JOBS))
+        assert waits.tolist() == [0, 30, 40, 0, 0, 5, 5]
+
+    def test_first_job_of_each_machine_never_waits(self):
+        # MC-B 첫 작업은 MC-A 의 늦은 종료와 무관
+        waits = queue_waits(_intervals([('MC-A', 0, 500), ('MC-B', 10, 20), ('MC-B', 30, 40)]))
+        assert waits.tolist() == [0, 0, 0]
+
+    def test_empty(self):
+        assert queue_waits(MachineIntervals.empty()).size == 0
+
+
+class TestBucketBusyMinutes:
+    """설비 × 버킷 가동 시간"""
+
+    def test_hand_computed_buckets(self):
+        busy = bucket_busy_minutes(_intervals(JOBS), BASE, BASE + timedelta(hours=3), bucket_minutes=60)
+
+        # MC-A: [0,60) = 60 + 30 + 10, [60,120) = 30 + 10 + 20
+        # MC-B: [0,60) = 10 (구간 밖 30분 제외) + 15 + 25
+        np.testing.assert_allclose(busy, [[100, 60, 0], [50, 0, 0]])
+
+    def test_partial_last_bucket_and_uneven_size(self):
+        busy = bucket_busy_minutes(_intervals(JOBS), BASE, BASE + timedelta(minutes=100), bucket_minutes=45)
+
+        # 버킷 경계 0, 45, 90, 135 (마지막 버킷은 종료 시각을 넘어 확장)
+        np.testing.assert_allclose(busy, [[45 + 15, 15 + 45 + 20, 20], [10 + 15 + 25, 0, 0]])
+
+    def test_matches_brute_force_overlap(self):
+        rng = np.random.default_rng(3)
+        starts = rng.uniform(-60, 600, 40)
+        jobs = [(f'MC-{i % 3}', float(s), float(s + d)) for i, (s, d) in enumerate(zip(starts, rng.uniform(1, 120, 40)))]
+        intervals = _intervals(jobs)
+        busy = bucket_busy_minutes(intervals, BASE, BASE + timedelta(minutes=540), bucket_minutes=30)
+
+        expected = np.zeros_like(busy)
+        for mc, s, e in jobs:
+            i = list(intervals.machines).index(mc)
+            for b in range(busy.shape[1]):
+                expected[i, b] += max(0.0, min(e, 30 * (b + 1)) - max(s, 30 * b))
+        np.testing.assert_allclose(busy, expected, atol=1e-6)
+
+
+@pytest.mark.django_db
+class TestHeatmapView:
+    """GET bottleneck/heatmap/ bucket_minutes 검증"""
+
+    @pytest.fixture
+    def heatmap(self):
+        view = BottleneckAnalysisViewSet.as_view({'get': 'heatmap'})
+        factory = APIRequestFactory()
+        return lambda **params: view(factory.get('/api/aps/bottleneck/heatmap/', params))
+
+    @pytest.mark.parametrize('value', ['abc', '-5', '1.5', ''])
+    def test_invalid_bucket_minutes_returns_400(self, heatmap, value):
+        response = heatmap(bucket_minutes=value)
+        assert response.status_code == 400
+        assert 'bucket_minutes' in response.data['error']
+
+    def test_zero_and_positive_bucket_minutes(self, heatmap):
+        now = timezone.now().replace(second=0, microsecond=0)
+        MachineLoadHistory.objects.bulk_create([
+            MachineLoadHistory(mc_cd='MC-A', timestamp=now - timedelta(minutes=10 * i), utilization_rate=10.0 * i)
+            for i in range(1, 4)
+        ])
+
+        auto = heatmap(bucket_minutes='0')
+        assert auto.status_code == 200
+        assert len(auto.data['heatmap'][0]['data_points']) == 3
+
+        bucketed = heatmap(bucket_minutes='1')
+        assert bucketed.status_code == 200
+        assert [p['utilization_rate'] for p in bucketed.data['heatmap'][0]['data_points']] == [30.0, 20.0, 10.0]
+
+        plan = heatmap(bucket_minutes='30', source='plan')
+        assert plan.status_code == 200
+        assert plan.data['heatmap'] == []
@@ -0,0 +1,97 @@
+"""
+Tests for XGBoost process time integration (apps/aps/services/process_time.py)
+
+시나리오 작업 dict (설비 / 품목 / 수량만 있음) 도 마스터 + 기본값으로 특징을 채워 예측되어야 한다
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import xgboost as xgb
+
+from ai_modules.data.generate_training_data import generate_process_time_data
+from ai_modules.ml_models.process_time_service import ProcessTimePredictionService
+from ai_modules.ml_models.xgboost_predict import ProcessTimePredictorXGB
+from apps.aps.services import process_time
+from apps.erp.models import MasterItem, MasterRouting, MasterWorkCenter
+
+
+@pytest.fixture(scope='module')
+def model_dir(tmp_path_factory):
+    """학습 데이터 생성기로 만든 소형 모델"""
+    predictor = ProcessTimePredictorXGB()
+    X, y = predictor.preprocess_data(generate_process_time_data(n_samples=300), fit=True)
+    predictor.feature_names = X.columns.tolist()
+    predictor.model = xgb.XGBRegressor(n_estimators=20, max_depth=3).fit(X, y)
+    predictor.feature_importance = X.columns.to_frame(name='feature')
+    path = tmp_path_factory.mktemp('process_time_model')
+    predictor.save_model(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def service(model_dir, settings, monkeypatch):
+    settings.PROCESS_TIME_MODEL_DIR = model_dir
+    settings.PROCESS_TIME_PREDICTION_ENABLED = True
+    monkeypatch.setattr(process_time, '_service', None)
+    monkeypatch.setattr(process_time, '_service_error', None)
+    monkeypatch.setattr(ProcessTimePredictionService, '_instances', {})
+    return process_time.get_process_time_service()
+
+
+@pytest.fixture
+def masters():
+    workcenter = MasterWorkCenter.objects.create(wc_cd='WC01', wc_nm='가공반', plant_cd='FAC01')
+    item = MasterItem.objects.create(itm_id='ITM001', itm_nm='프레임 A', itm_type='프레임')
+    MasterRouting.objects.create(item=item, seq=1, workcenter=workcenter, operation_nm='가공', std_time=40, setup_time=10)
+    MasterRouting.objects.create(item=item, seq=2, workcenter=workcenter, operation_nm='검사', std_time=10)
+    return item
+
+
+def _scenario_job(itm_id='ITM001', op_seq=0):
+    """scenario_views._run_genetic_algorithm 의 작업 dict"""
+    fr_ts = datetime(2024, 1, 1, 9)
+    to_ts = datetime(2024, 1, 1, 11)
+    return {
+        'wo_no': 'WO001', 'order_id': 'WO001', 'op_seq': op_seq,
+        'mc_cd': 'MC001', 'resource_code': 'MC001',
+        'fr_ts': fr_ts, 'to_ts': to_ts, 'due_date': to_ts,
+        'duration_minutes': (to_ts - fr_ts).total_seconds() / 60,
+        'itm_id': itm_id, 'plan_qty': Decimal('50.0000'),
+    }
+
+
+@pytest.mark.django_db
+class TestProcessTimeIntegration:
+    """시나리오 작업 특징 보강 / 예측 반영"""
+
+    def test_features_from_item_master_and_routing(self, masters):
+        jobs = [_scenario_job(), _scenario_job(op_seq=2), _scenario_job(itm_id='UNKNOWN')]
+        jobs[2]['fr_ts'] = datetime(2024, 1, 1, 23)
+
+        process_time.enrich_job_features(jobs)
+
+        assert (jobs[0]['item_type'], jobs[0]['process_name'], jobs[0]['setup_time'], jobs[0]['shift']) == \
+               ('프레임', '가공', 10, 1)
+        assert jobs[1]['process_name'] == '검사'
+        assert 'item_type' not in jobs[2] and jobs[2]['shift'] == 2
+
+    def test_scenario_job_gets_predicted_duration(self, service, masters):
+        jobs = [_scenario_job()]
+
+        result = process_time.apply_predicted_durations(jobs)
+
+        assert service is not None
+        assert (result['predicted'], result['skipped']) == (1, 0)
+        assert jobs[0]['duration_source'] == 'xgb'
+        assert jobs[0]['planned_duration_minutes'] == 120
+        expected = service.predict([{**jobs[0], 'duration_minutes': None}])[0]['predicted_time_minutes']
+        assert jobs[0]['duration_minutes'] == pytest.approx(expected, abs=0.01)
+
+    def test_job_without_master_data_keeps_planned_duration(self, service, masters):
+        jobs = [_scenario_job(itm_id='UNKNOWN')]
+
+        result = process_time.apply_predicted_durations(jobs, as_int=True)
+
+        assert (result['predicted'], result['skipped']) == (0, 1)
+        assert jobs[0]['duration_minutes'] == 120
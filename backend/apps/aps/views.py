@@ -2,10 +2,11 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db import models
-from django.db.models import Count, Avg, Sum, F, Q, Max
+from django.db import models, transaction
+from django.db.models import Count, Sum, F
 from apps.core.models import StageFactPlanOut
 from .models import AlgorithmComparison, BottleneckAnalysis, MachineLoadHistory
+from .services.analytics import machine_utilization
 from .serializers import (
     StageFactPlanOutSerializer,
     AlgorithmComparisonSerializer,
@@ -228,29 +229,28 @@ class BottleneckAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
         end_date = timezone.now()
         start_date = end_date - timedelta(days=days)
 
-        # Get load history
-        history = MachineLoadHistory.objects.filter(
-            timestamp__gte=start_date, timestamp__lte=end_date
-        ).order_by("mc_cd", "timestamp")
-
-        # Group by machine and time bucket
-        heatmap_data = []
-        machines = history.values_list("mc_cd", flat=True).distinct()
-
-        for mc_cd in machines:
-            mc_history = history.filter(mc_cd=mc_cd)
-            utilization_series = list(
-                mc_history.values("timestamp", "utilization_rate").order_by("timestamp")
+        # Per-bucket utilization: ?bucket_minutes=60 (0 = auto: raw points / 60-minute plan buckets)
+        # source=plan computes busy time directly from the plan instead of load history
+        try:
+            bucket_minutes = int(request.query_params.get("bucket_minutes", 0))
+        except (TypeError, ValueError):
+            bucket_minutes = -1
+        if bucket_minutes < 0:
+            return Response(
+                {"error": "bucket_minutes must be a positive integer, or 0 for auto"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-
-            heatmap_data.append(
-                {
-                    "mc_cd": mc_cd,
-                    "avg_utilization": mc_history.aggregate(Avg("utilization_rate"))["utilization_rate__avg"] or 0,
-                    "max_utilization": mc_history.aggregate(max_util=Max("utilization_rate"))["max_util"] or 0,
-                    "data_points": utilization_series,
-                }
+        bucket_minutes = bucket_minutes or None
+        if request.query_params.get("source") == "plan":
+            plans = machine_utilization.window_plans(StageFactPlanOut.objects.all(), start_date, end_date)
+            heatmap_data = machine_utilization.utilization_heatmap(
+                machine_utilization.fetch_intervals(plans), start_date, end_date, bucket_minutes or 60
             )
+            return Response({"heatmap": heatmap_data})
+
+        # Get load history (grouped by machine in one query)
+        history = MachineLoadHistory.objects.filter(timestamp__gte=start_date, timestamp__lte=end_date)
+        heatmap_data = machine_utilization.load_history_heatmap(history, bucket_minutes)
 
         return Response({"heatmap": heatmap_data})
 
@@ -286,21 +286,16 @@ class BottleneckAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
         self, start_date: datetime, end_date: datetime, threshold: float
     ) -> List[Dict]:
         """Analyze bottlenecks in the given time window"""
-        results = []
-
-        # Get all plans in the time window
-        plans = StageFactPlanOut.objects.filter(
-            Q(fr_ts__gte=start_date, fr_ts__lte=end_date) | Q(to_ts__gte=start_date, to_ts__lte=end_date)
-        )
-
-        # Group by machine
-        machines = plans.values_list("mc_cd", flat=True).distinct()
+        # Get all plans in the time window (single columnar fetch)
+        plans = machine_utilization.window_plans(StageFactPlanOut.objects.all(), start_date, end_date)
+        intervals = machine_utilization.fetch_intervals(plans)
 
-        for mc_cd in machines:
-            mc_plans = plans.filter(mc_cd=mc_cd).order_by("fr_ts")
-
-            # Calculate metrics
-            metrics = self._calculate_machine_metrics(mc_cd, mc_plans, start_date, end_date)
+        # Calculate metrics for all machines
+        now = timezone.now()
+        analyses = []
+        load_history = []
+        for metrics in machine_utilization.bottleneck_metrics(intervals, start_date, end_date, now):
+            mc_cd = metrics["mc_cd"]
 
             # Generate recommendations
             recommendations = self._generate_recommendations(mc_cd, metrics)
@@ -308,90 +303,40 @@ class BottleneckAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
             # Determine if bottleneck
             is_bottleneck = metrics["utilization_rate"] >= threshold or metrics["bottleneck_score"] >= 70
 
-            # Save analysis
-            analysis = BottleneckAnalysis.objects.create(
-                mc_cd=mc_cd,
-                utilization_rate=metrics["utilization_rate"],
-                queue_length=metrics["queue_length"],
-                avg_waiting_time=metrics["avg_waiting_time"],
-                bottleneck_score=metrics["bottleneck_score"],
-                is_bottleneck=is_bottleneck,
-                affected_jobs=metrics["affected_jobs"],
-                total_delay=metrics["total_delay"],
-                recommendations=recommendations,
-                analysis_start=start_date,
-                analysis_end=end_date,
+            analyses.append(
+                BottleneckAnalysis(
+                    mc_cd=mc_cd,
+                    utilization_rate=metrics["utilization_rate"],
+                    queue_length=metrics["queue_length"],
+                    avg_waiting_time=metrics["avg_waiting_time"],
+                    bottleneck_score=metrics["bottleneck_score"],
+                    is_bottleneck=is_bottleneck,
+                    affected_jobs=metrics["affected_jobs"],
+                    total_delay=metrics["total_delay"],
+                    recommendations=recommendations,
+                    analysis_start=start_date,
+                    analysis_end=end_date,
+                )
             )
-
-            # Save load history
-            MachineLoadHistory.objects.create(
-                mc_cd=mc_cd,
-                timestamp=timezone.now(),
-                active_jobs=metrics["active_jobs"],
-                queued_jobs=metrics["queue_length"],
-                utilization_rate=metrics["utilization_rate"],
-                total_capacity=metrics["total_capacity"],
-                used_capacity=metrics["used_capacity"],
-                available_capacity=metrics["available_capacity"],
+            load_history.append(
+                MachineLoadHistory(
+                    mc_cd=mc_cd,
+                    timestamp=now,
+                    active_jobs=metrics["active_jobs"],
+                    queued_jobs=metrics["queue_length"],
+                    utilization_rate=metrics["utilization_rate"],
+                    total_capacity=metrics["total_capacity"],
+                    used_capacity=metrics["used_capacity"],
+                    available_capacity=metrics["available_capacity"],
+                )
             )
 
-            results.append(BottleneckAnalysisSerializer(analysis).data)
+        # Save analysis and load history
+        with transaction.atomic():
+            analyses = BottleneckAnalysis.objects.bulk_create(analyses, batch_size=500)
+            MachineLoadHistory.objects.bulk_create(load_history, batch_size=500)
 
-        return results
-
-    def _calculate_machine_metrics(
-        self, mc_cd: str, plans, start_date: datetime, end_date: datetime
-    ) -> Dict:
-        """Calculate utilization and bottleneck metrics for a machine"""
-        total_time_window = (end_date - start_date).total_seconds() / 60  # minutes
-
-        # Calculate total processing time
-        total_process_time = 0
-        overlaps = 0
-        waiting_times = []
-
-        plan_list = list(plans)
-        for i, plan in enumerate(plan_list):
-            duration = (plan.to_ts - plan.fr_ts).total_seconds() / 60
-            total_process_time += duration
-
-            # Check for overlaps (indicates queueing)
-            if i > 0:
-                prev_plan = plan_list[i - 1]
-                if plan.fr_ts < prev_plan.to_ts:
-                    overlaps += 1
-                    waiting_time = (prev_plan.to_ts - plan.fr_ts).total_seconds() / 60
-                    waiting_times.append(max(0, waiting_time))
-
-        # Utilization rate
-        utilization_rate = min(100, (total_process_time / total_time_window * 100)) if total_time_window > 0 else 0
-
-        # Queue metrics
-        queue_length = overlaps
-        avg_waiting_time = sum(waiting_times) / len(waiting_times) if waiting_times else 0
-
-        # Bottleneck score (0-100)
-        # Higher utilization + longer queues + more waiting = higher score
-        bottleneck_score = (
-            utilization_rate * 0.5 + min(queue_length * 10, 30) + min(avg_waiting_time / 10, 20)
-        )
-
-        # Affected jobs and delays
-        affected_jobs = len(plan_list)
-        total_delay = sum(waiting_times)
-
-        return {
-            "utilization_rate": round(utilization_rate, 2),
-            "queue_length": queue_length,
-            "avg_waiting_time": round(avg_waiting_time, 2),
-            "bottleneck_score": round(min(100, bottleneck_score), 2),
-            "affected_jobs": affected_jobs,
-            "total_delay": round(total_delay, 2),
-            "active_jobs": len([p for p in plan_list if p.fr_ts <= timezone.now() <= p.to_ts]),
-            "total_capacity": round(total_time_window, 2),
-            "used_capacity": round(total_process_time, 2),
-            "available_capacity": round(max(0, total_time_window - total_process_time), 2),
-        }
+        return BottleneckAnalysisSerializer(analyses, many=True).data
 
     def _generate_recommendations(self, mc_cd: str, metrics: Dict) -> List[Dict]:
         """Generate recommendations based on bottleneck analysis"""
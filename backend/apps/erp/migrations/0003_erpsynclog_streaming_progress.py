@@ -0,0 +1,73 @@
+# Generated by Django 6.0 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("erp", "0002_mastershift_masterworker_materialrequirement_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="erpsynclog",
+            name="sync_type",
+            field=models.CharField(
+                choices=[
+                    ("ITEM", "품목마스터"),
+                    ("MACHINE", "기계마스터"),
+                    ("WORKCENTER", "작업장마스터"),
+                    ("BOM", "BOM"),
+                    ("ROUTING", "라우팅"),
+                    ("WORKORDER", "작업지시"),
+                    ("PLANT_CALENDAR", "공장캘린더"),
+                    ("MACHINE_WORKTIME", "설비가동시간"),
+                    ("INVENTORY", "품목재고"),
+                    ("SHIFT", "작업조마스터"),
+                    ("WORKER", "작업자마스터"),
+                    ("WORKER_SKILL", "작업자숙련도"),
+                ],
+                max_length=50,
+                verbose_name="동기화유형",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="erpsynclog",
+            name="sync_status",
+            field=models.CharField(
+                choices=[
+                    ("RUNNING", "진행중"),
+                    ("SUCCESS", "성공"),
+                    ("FAILED", "실패"),
+                    ("PARTIAL", "부분성공"),
+                ],
+                max_length=20,
+                verbose_name="동기화상태",
+            ),
+        ),
+        migrations.AddField(
+            model_name="erpsynclog",
+            name="source_format",
+            field=models.CharField(
+                blank=True, max_length=20, null=True, verbose_name="입력형식"
+            ),
+        ),
+        migrations.AddField(
+            model_name="erpsynclog",
+            name="chunk_size",
+            field=models.IntegerField(default=0, verbose_name="청크크기"),
+        ),
+        migrations.AddField(
+            model_name="erpsynclog",
+            name="committed_chunks",
+            field=models.IntegerField(default=0, verbose_name="커밋된청크수"),
+        ),
+        migrations.AddField(
+            model_name="erpsynclog",
+            name="progress_ts",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="진행갱신시각"
+            ),
+        ),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 6.0 on 2026-10-19 10:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("erp", "0003_erpsynclog_streaming_progress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="masteritem",
+            name="row_hash",
+            field=models.CharField(
+                blank=True, max_length=40, null=True, verbose_name="변경감지해시"
+            ),
+        ),
+        migrations.AddField(
+            model_name="mastermachine",
+            name="row_hash",
+            field=models.CharField(
+                blank=True, max_length=40, null=True, verbose_name="변경감지해시"
+            ),
+        ),
+        migrations.AddField(
+            model_name="masterworkcenter",
+            name="row_hash",
+            field=models.CharField(
+                blank=True, max_length=40, null=True, verbose_name="변경감지해시"
+            ),
+        ),
+        migrations.AddField(
+            model_name="masterbom",
+            name="row_hash",
+            field=models.CharField(
+                blank=True, max_length=40, null=True, verbose_name="변경감지해시"
+            ),
+        ),
+        migrations.AddField(
+            model_name="masterrouting",
+            name="row_hash",
+            field=models.CharField(
+                blank=True, max_length=40, null=True, verbose_name="변경감지해시"
+            ),
+        ),
+        migrations.AddField(
+            model_name="erpsynclog",
+            name="sync_mode",
+            field=models.CharField(
+                choices=[("FULL", "전체"), ("DELTA", "증분"), ("SNAPSHOT", "전체스냅샷")],
+                default="FULL",
+                max_length=20,
+                verbose_name="동기화모드",
+            ),
+        ),
+        migrations.AddField(
+            model_name="erpsynclog",
+            name="records_created",
+            field=models.IntegerField(default=0, verbose_name="생성건수"),
+        ),
+        migrations.AddField(
+            model_name="erpsynclog",
+            name="records_updated",
+            field=models.IntegerField(default=0, verbose_name="변경건수"),
+        ),
+        migrations.AddField(
+            model_name="erpsynclog",
+            name="records_unchanged",
+            field=models.IntegerField(default=0, verbose_name="미변경건수"),
+        ),
+        migrations.AddField(
+            model_name="erpsynclog",
+            name="records_deactivated",
+            field=models.IntegerField(default=0, verbose_name="비활성화건수"),
+        ),
+        migrations.CreateModel(
+            name="MasterDataChange",
+            fields=[
+                ("change_id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "sync_type",
+                    models.CharField(max_length=50, verbose_name="동기화유형"),
+                ),
+                (
+                    "change_type",
+                    models.CharField(
+                        choices=[
+                            ("CREATED", "생성"),
+                            ("UPDATED", "변경"),
+                            ("DEACTIVATED", "비활성화"),
+                        ],
+                        max_length=20,
+                        verbose_name="변경유형",
+                    ),
+                ),
+                (
+                    "entity_key",
+                    models.CharField(max_length=200, verbose_name="엔티티키"),
+                ),
+                (
+                    "changed_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="변경시각"),
+                ),
+                (
+                    "sync_log",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="changes",
+                        to="erp.erpsynclog",
+                        verbose_name="동기화로그",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "마스터변경피드",
+                "verbose_name_plural": "마스터변경피드",
+                "db_table": "master_data_change",
+                "ordering": ["change_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["sync_type", "change_id"], name="ix_mdc_type_id"
+                    )
+                ],
+            },
+        ),
+    ]
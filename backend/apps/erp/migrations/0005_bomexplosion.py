@@ -0,0 +1,68 @@
+# Generated by Django 6.0 on 2026-10-19 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("erp", "0004_row_hash_delta_sync"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BOMExplosion",
+            fields=[
+                (
+                    "explosion_id",
+                    models.BigAutoField(primary_key=True, serialize=False),
+                ),
+                (
+                    "extended_qty",
+                    models.DecimalField(
+                        decimal_places=6, max_digits=18, verbose_name="누적소요량"
+                    ),
+                ),
+                (
+                    "min_depth",
+                    models.IntegerField(default=1, verbose_name="최소전개단계"),
+                ),
+                (
+                    "max_depth",
+                    models.IntegerField(default=1, verbose_name="최대전개단계"),
+                ),
+                ("low_level_code", models.IntegerField(default=0, verbose_name="LLC")),
+                ("exploded_at", models.DateTimeField(verbose_name="전개일시")),
+                (
+                    "component_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="explosion_roots",
+                        to="erp.masteritem",
+                        verbose_name="자품목",
+                    ),
+                ),
+                (
+                    "root_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="explosion_components",
+                        to="erp.masteritem",
+                        verbose_name="모품목",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "BOM전개",
+                "verbose_name_plural": "BOM전개",
+                "db_table": "bom_explosion",
+                "indexes": [
+                    models.Index(
+                        fields=["component_item"], name="ix_bomx_component"
+                    )
+                ],
+                "unique_together": {("root_item", "component_item")},
+            },
+        ),
+    ]
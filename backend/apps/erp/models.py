@@ -18,6 +18,7 @@ class MasterItem(models.Model):
     std_cycle_time = models.IntegerField(default=60, verbose_name="표준CT(분)")
     unit = models.CharField(max_length=20, default="EA", verbose_name="단위")
     active_yn = models.CharField(max_length=1, default="Y", verbose_name="사용여부")
+    row_hash = models.CharField(max_length=40, null=True, blank=True, verbose_name="변경감지해시")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -44,6 +45,7 @@ class MasterMachine(models.Model):
         max_digits=10, decimal_places=2, default=100.00, verbose_name="시간당비용"
     )
     active_yn = models.CharField(max_length=1, default="Y", verbose_name="사용여부")
+    row_hash = models.CharField(max_length=40, null=True, blank=True, verbose_name="변경감지해시")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -65,6 +67,7 @@ class MasterWorkCenter(models.Model):
     wc_nm = models.CharField(max_length=200, verbose_name="작업장명")
     plant_cd = models.CharField(max_length=20, verbose_name="공장코드")
     active_yn = models.CharField(max_length=1, default="Y", verbose_name="사용여부")
+    row_hash = models.CharField(max_length=40, null=True, blank=True, verbose_name="변경감지해시")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -88,6 +91,7 @@ class MasterBOM(models.Model):
     quantity = models.DecimalField(max_digits=10, decimal_places=4, verbose_name="소요량")
     seq = models.IntegerField(default=1, verbose_name="순번")
     active_yn = models.CharField(max_length=1, default="Y", verbose_name="사용여부")
+    row_hash = models.CharField(max_length=40, null=True, blank=True, verbose_name="변경감지해시")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -110,6 +114,7 @@ class MasterRouting(models.Model):
     std_time = models.IntegerField(verbose_name="표준시간(분)")
     setup_time = models.IntegerField(default=0, verbose_name="준비시간(분)")
     active_yn = models.CharField(max_length=1, default="Y", verbose_name="사용여부")
+    row_hash = models.CharField(max_length=40, null=True, blank=True, verbose_name="변경감지해시")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -172,12 +177,24 @@ class ERPSyncLog(models.Model):
             ("BOM", "BOM"),
             ("ROUTING", "라우팅"),
             ("WORKORDER", "작업지시"),
+            # Phase 1+2
+            ("PLANT_CALENDAR", "공장캘린더"),
+            ("MACHINE_WORKTIME", "설비가동시간"),
+            ("INVENTORY", "품목재고"),
+            ("SHIFT", "작업조마스터"),
+            ("WORKER", "작업자마스터"),
+            ("WORKER_SKILL", "작업자숙련도"),
         ],
         verbose_name="동기화유형",
     )
     sync_status = models.CharField(
         max_length=20,
-        choices=[("SUCCESS", "성공"), ("FAILED", "실패"), ("PARTIAL", "부분성공")],
+        choices=[
+            ("RUNNING", "진행중"),
+            ("SUCCESS", "성공"),
+            ("FAILED", "실패"),
+            ("PARTIAL", "부분성공"),
+        ],
         verbose_name="동기화상태",
     )
     records_total = models.IntegerField(default=0, verbose_name="총건수")
@@ -186,6 +203,26 @@ class ERPSyncLog(models.Model):
     error_message = models.TextField(null=True, blank=True, verbose_name="오류메시지")
     sync_ts = models.DateTimeField(auto_now_add=True, verbose_name="동기화시각")
 
+    # 스트리밍 Import 진행상황 (청크 커밋 단위, 재개 지점)
+    source_format = models.CharField(
+        max_length=20, null=True, blank=True, verbose_name="입력형식"
+    )
+    chunk_size = models.IntegerField(default=0, verbose_name="청크크기")
+    committed_chunks = models.IntegerField(default=0, verbose_name="커밋된청크수")
+    progress_ts = models.DateTimeField(null=True, blank=True, verbose_name="진행갱신시각")
+
+    # 증분(Delta) 동기화 결과
+    sync_mode = models.CharField(
+        max_length=20,
+        choices=[("FULL", "전체"), ("DELTA", "증분"), ("SNAPSHOT", "전체스냅샷")],
+        default="FULL",
+        verbose_name="동기화모드",
+    )
+    records_created = models.IntegerField(default=0, verbose_name="생성건수")
+    records_updated = models.IntegerField(default=0, verbose_name="변경건수")
+    records_unchanged = models.IntegerField(default=0, verbose_name="미변경건수")
+    records_deactivated = models.IntegerField(default=0, verbose_name="비활성화건수")
+
     class Meta:
         db_table = "erp_sync_log"
         verbose_name = "ERP동기화로그"
@@ -196,6 +233,44 @@ class ERPSyncLog(models.Model):
         return f"[{self.sync_type}] {self.sync_status} - {self.sync_ts}"
 
 
+class MasterDataChange(models.Model):
+    """
+    마스터 데이터 변경 피드
+
+    증분/스냅샷 동기화에서 실제로 바뀐 키만 기록
+    APS 캐시는 change_id 커서 이후 변경분만 읽어 선택적으로 무효화
+    """
+    change_id = models.BigAutoField(primary_key=True)
+    sync_log = models.ForeignKey(
+        ERPSyncLog,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="changes",
+        verbose_name="동기화로그",
+    )
+    sync_type = models.CharField(max_length=50, verbose_name="동기화유형")
+    change_type = models.CharField(
+        max_length=20,
+        choices=[("CREATED", "생성"), ("UPDATED", "변경"), ("DEACTIVATED", "비활성화")],
+        verbose_name="변경유형",
+    )
+    entity_key = models.CharField(max_length=200, verbose_name="엔티티키")
+    changed_at = models.DateTimeField(auto_now_add=True, verbose_name="변경시각")
+
+    class Meta:
+        db_table = "master_data_change"
+        verbose_name = "마스터변경피드"
+        verbose_name_plural = "마스터변경피드"
+        ordering = ["change_id"]
+        indexes = [
+            models.Index(fields=["sync_type", "change_id"], name="ix_mdc_type_id"),
+        ]
+
+    def __str__(self):
+        return f"#{self.change_id} [{self.sync_type}] {self.change_type} {self.entity_key}"
+
+
 # ============================================================================
 # Phase 1: 긴급 조치 - 공장 캘린더, 설비 가동시간, 재고 관리
 # ============================================================================
@@ -557,14 +632,17 @@ class ItemInventory(models.Model):
 
     def save(self, *args, **kwargs):
         """저장 시 자동 계산"""
+        self.compute_derived()
+        super().save(*args, **kwargs)
+
+    def compute_derived(self):
+        """파생 필드 계산 (bulk_create/bulk_update 시에도 호출)"""
         # 가용재고 = 현재고 - 할당량
         self.available_qty = self.on_hand_qty - self.allocated_qty
 
         # 재고금액 = 현재고 * 단위원가
         self.inventory_value = self.on_hand_qty * self.unit_cost
 
-        super().save(*args, **kwargs)
-
     def is_available(self, required_qty):
         """필요 수량을 충족하는지 확인"""
         return self.available_qty >= required_qty
@@ -749,6 +827,11 @@ class MaterialRequirement(models.Model):
 
     def save(self, *args, **kwargs):
         """저장 시 자동 계산"""
+        self.compute_derived()
+        super().save(*args, **kwargs)
+
+    def compute_derived(self):
+        """부족량/상태 계산 (bulk_create 시에도 호출)"""
         self.shortage_qty = max(Decimal('0'), self.required_qty - self.allocated_qty)
 
         # 상태 자동 갱신
@@ -759,8 +842,6 @@ class MaterialRequirement(models.Model):
         else:
             self.status = 'ALLOCATED'
 
-        super().save(*args, **kwargs)
-
     def check_availability(self):
         """재고 가용성 체크"""
         try:
@@ -774,6 +855,50 @@ class MaterialRequirement(models.Model):
             return False
 
 
+class BOMExplosion(models.Model):
+    """
+    BOM 전개 캐시 (MRP 전개표)
+
+    모품목 1단위 기준 하위 전 단계 자품목의 누적 소요량을 평탄화하여 보관
+    같은 자품목이 여러 경로로 쓰이면 경로별 소요량을 합산
+    """
+    explosion_id = models.BigAutoField(primary_key=True)
+    root_item = models.ForeignKey(
+        'MasterItem',
+        on_delete=models.CASCADE,
+        related_name='explosion_components',
+        verbose_name="모품목"
+    )
+    component_item = models.ForeignKey(
+        'MasterItem',
+        on_delete=models.CASCADE,
+        related_name='explosion_roots',
+        verbose_name="자품목"
+    )
+    extended_qty = models.DecimalField(
+        max_digits=18,
+        decimal_places=6,
+        verbose_name="누적소요량"
+    )
+    min_depth = models.IntegerField(default=1, verbose_name="최소전개단계")
+    max_depth = models.IntegerField(default=1, verbose_name="최대전개단계")
+    low_level_code = models.IntegerField(default=0, verbose_name="LLC")
+    # low_level_code: 자품목이 전체 BOM 에서 등장하는 가장 낮은 단계 (MRP 처리 순서)
+    exploded_at = models.DateTimeField(verbose_name="전개일시")
+
+    class Meta:
+        db_table = "bom_explosion"
+        verbose_name = "BOM전개"
+        verbose_name_plural = "BOM전개"
+        unique_together = (("root_item", "component_item"),)
+        indexes = [
+            models.Index(fields=["component_item"], name="ix_bomx_component"),
+        ]
+
+    def __str__(self):
+        return f"{self.root_item_id} >> {self.component_item_id} ({self.extended_qty})"
+
+
 # ============================================================================
 # Phase 2: 단기 - 작업조, 작업자, 숙련도, 작업 할당
 # ============================================================================
@@ -989,6 +1114,11 @@ class WorkerSkill(models.Model):
 
     def save(self, *args, **kwargs):
         """저장 시 숙련도에 따른 효율 자동 설정"""
+        self.compute_derived()
+        super().save(*args, **kwargs)
+
+    def compute_derived(self):
+        """숙련도별 기본 효율 설정 (bulk_create/bulk_update 시에도 호출)"""
         if not self.efficiency_rate or self.efficiency_rate == 100:
             # 숙련도별 기본 효율
             efficiency_map = {
@@ -1000,8 +1130,6 @@ class WorkerSkill(models.Model):
             }
             self.efficiency_rate = efficiency_map.get(self.skill_level, Decimal('100.00'))
 
-        super().save(*args, **kwargs)
-
 
 class WorkAssignment(models.Model):
     """
@@ -10,6 +10,8 @@ from .models import (
     MasterRouting,
     ERPWorkOrder,
     ERPSyncLog,
+    MasterDataChange,
+    BOMExplosion,
 )
 
 
@@ -64,6 +66,12 @@ class ERPSyncLogSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class MasterDataChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MasterDataChange
+        fields = "__all__"
+
+
 class ERPDataImportSerializer(serializers.Serializer):
     """ERP 데이터 일괄 Import"""
 
@@ -72,3 +80,20 @@ class ERPDataImportSerializer(serializers.Serializer):
     )
     data = serializers.ListField(child=serializers.DictField())
     overwrite = serializers.BooleanField(default=False)
+
+
+class BOMExplosionSerializer(serializers.ModelSerializer):
+    component_item_nm = serializers.CharField(source="component_item.itm_nm", read_only=True)
+
+    class Meta:
+        model = BOMExplosion
+        fields = [
+            "root_item",
+            "component_item",
+            "component_item_nm",
+            "extended_qty",
+            "min_depth",
+            "max_depth",
+            "low_level_code",
+            "exploded_at",
+        ]
@@ -959,18 +959,31 @@ class ERPDataService:
     # ==========================================================================
 
     @classmethod
-    def sync_all_master_data(cls, emax_data: Dict[str, List[Dict]]) -> Dict[str, Any]:
+    def sync_all_master_data(cls, emax_data: Dict[str, List[Dict]], mode: str = 'FULL',
+                             max_workers: int = None) -> Dict[str, Any]:
         """
         전체 기준정보 동기화 (EMAX → APS DB)
 
+        참조 관계 DAG 순서를 지키며 독립 유형(작업장/품목/작업조/캘린더 등)은 병렬 실행
+        (services_sync.MasterSyncOrchestrator)
+
         Args:
             emax_data: {
+                'workcenters': [...],
                 'items': [...],
                 'machines': [...],
-                'workcenters': [...],
                 'bom': [...],
-                'routing': [...]
+                'routing': [...],
+                # Phase 1+2
+                'plant_calendars': [...],
+                'machine_worktimes': [...],
+                'inventory': [...],
+                'shifts': [...],
+                'workers': [...],
+                'worker_skills': [...]
             }
+            mode: FULL(전체 업서트) / DELTA(변경분만) / SNAPSHOT(변경분 + 누락행 비활성화)
+            max_workers: 병렬 스레드 수 (1 이면 직렬 실행)
 
         Returns:
             {
@@ -983,43 +996,11 @@ class ERPDataService:
                 'total_records': 500,
                 'total_created': 250,
                 'total_updated': 200,
-                'total_failed': 50
+                'total_failed': 50,
+                'total_unchanged': 0,
+                'total_deactivated': 0
             }
         """
-        results = {}
-
-        # 순서 중요: 참조 무결성 유지
-        # 1. 작업장 먼저
-        if 'workcenters' in emax_data:
-            results['workcenters'] = cls.save_workcenters_from_emax(emax_data['workcenters'])
-
-        # 2. 품목
-        if 'items' in emax_data:
-            results['items'] = cls.save_items_from_emax(emax_data['items'])
-
-        # 3. 기계
-        if 'machines' in emax_data:
-            results['machines'] = cls.save_machines_from_emax(emax_data['machines'])
-
-        # 4. BOM (품목 참조)
-        if 'bom' in emax_data:
-            results['bom'] = cls.save_bom_from_emax(emax_data['bom'])
-
-        # 5. Routing (품목, 작업장 참조)
-        if 'routing' in emax_data:
-            results['routing'] = cls.save_routing_from_emax(emax_data['routing'])
-
-        # 전체 집계
-        total_records = sum(r.get('total', 0) for r in results.values())
-        total_created = sum(r.get('created', 0) for r in results.values())
-        total_updated = sum(r.get('updated', 0) for r in results.values())
-        total_failed = sum(r.get('failed', 0) for r in results.values())
-
-        return {
-            'success': all(r.get('success', False) for r in results.values()),
-            'results': results,
-            'total_records': total_records,
-            'total_created': total_created,
-            'total_updated': total_updated,
-            'total_failed': total_failed,
-        }
+        from .services_sync import sync_master_data
+
+        return sync_master_data(emax_data, mode=mode, max_workers=max_workers)
@@ -0,0 +1,863 @@
+"""
+ERP 스트리밍 Import 서비스
+EMAX ERP → APS DB 대용량 적재 (NDJSON / CSV, gzip 지원)
+
+- 요청 본문을 한 번에 메모리에 올리지 않고 행 단위로 파싱
+- 고정 크기 청크마다 검증 → bulk_create / bulk_update (청크당 1 트랜잭션)
+- 청크 커밋과 함께 ERPSyncLog 진행상황을 기록하여 마지막 커밋 청크부터 재개 가능
+- 증분(DELTA/SNAPSHOT) 모드: row_hash 로 미변경 행 생략, 변경 키는 MasterDataChange 피드에 기록
+"""
+import csv
+import gzip
+import hashlib
+import io
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import (
+    MasterItem,
+    MasterMachine,
+    MasterWorkCenter,
+    MasterBOM,
+    MasterRouting,
+    ERPWorkOrder,
+    ERPSyncLog,
+    MasterDataChange,
+    PlantCalendar,
+    MachineWorkTime,
+    ItemInventory,
+    MasterShift,
+    MasterWorker,
+    WorkerSkill,
+)
+from .signals import master_data_changed
+
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 20000
+MAX_LOGGED_ERRORS = 10
+
+SUPPORTED_FORMATS = ('ndjson', 'csv')
+
+CONTENT_TYPE_FORMATS = {
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/json-lines': 'ndjson',
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+}
+
+
+# ==========================================================================
+# EMAX → APS 필드 변환 (ERPDataService 의 변환 규칙과 동일)
+# ==========================================================================
+
+def _item_to_aps(row):
+    return {
+        'itm_id': row.get('itm_id'),
+        'itm_nm': row.get('itm_nm'),
+        'itm_type': row.get('itm_type', '제품'),
+        'itm_family': row.get('itm_family'),
+        'std_cycle_time': row.get('std_ct', 60),
+        'unit': row.get('unit', 'EA'),
+        'active_yn': 'Y',
+    }
+
+
+def _machine_to_aps(row):
+    return {
+        'mc_cd': row.get('mc_cd'),
+        'mc_nm': row.get('mc_nm'),
+        'wc_cd': row.get('wc_cd'),
+        'mc_type': row.get('mc_type', '일반'),
+        'capacity': row.get('capacity', 1),
+        'cost_per_hour': row.get('cost_per_hour', 100.0),
+        'active_yn': 'Y',
+    }
+
+
+def _workcenter_to_aps(row):
+    return {
+        'wc_cd': row.get('wc_cd'),
+        'wc_nm': row.get('wc_nm'),
+        'plant_cd': row.get('fac_cd', 'FAC01'),
+        'active_yn': 'Y',
+    }
+
+
+def _bom_to_aps(row):
+    return {
+        'parent_item_id': row.get('parent_itm_id'),
+        'child_item_id': row.get('child_itm_id'),
+        'quantity': row.get('quantity', 1.0),
+        'seq': row.get('seq', 1),
+        'active_yn': 'Y',
+    }
+
+
+def _routing_to_aps(row):
+    return {
+        'item_id': row.get('itm_id'),
+        'seq': row.get('seq', 1),
+        'workcenter_id': row.get('wc_cd'),
+        'operation_nm': row.get('operation_nm', '공정'),
+        'std_time': row.get('std_time', 60),
+        'setup_time': row.get('setup_time', 0),
+        'active_yn': 'Y',
+    }
+
+
+def _workorder_to_aps(row):
+    return {
+        'wo_no': row.get('wo_no'),
+        'item_id': row.get('itm_id'),
+        'order_qty': row.get('order_qty', 1),
+        'due_date': row.get('due_date'),
+        'priority': row.get('priority', 5),
+        'status': row.get('status', 'CREATED'),
+        'plant_cd': row.get('plant_cd', 'FAC01'),
+        'erp_sync_ts': timezone.now(),
+    }
+
+
+def _plant_calendar_to_aps(row):
+    return {
+        'work_date': row.get('work_date'),
+        'plant_cd': row.get('plant_cd', 'FAC01'),
+        'day_type': row.get('day_type', 'WORK'),
+        'work_start_time': row.get('work_start_time', '08:00:00'),
+        'work_end_time': row.get('work_end_time', '17:00:00'),
+        'break_start_time': row.get('break_start_time'),
+        'break_end_time': row.get('break_end_time'),
+        'is_available': row.get('is_available', True),
+        'capacity_rate': row.get('capacity_rate', 100.00),
+        'remarks': row.get('remarks'),
+    }
+
+
+def _machine_worktime_to_aps(row):
+    return {
+        'machine_id': row.get('mc_cd'),
+        'day_of_week': row.get('day_of_week'),
+        'start_time': row.get('start_time', '08:00:00'),
+        'end_time': row.get('end_time', '17:00:00'),
+        'is_available': row.get('is_available', True),
+        'is_overnight': row.get('is_overnight', False),
+        'remarks': row.get('remarks'),
+    }
+
+
+def _inventory_to_aps(row):
+    return {
+        'item_id': row.get('itm_id'),
+        'plant_cd': row.get('plant_cd', 'FAC01'),
+        'warehouse_cd': row.get('warehouse_cd', 'WH01'),
+        'on_hand_qty': row.get('on_hand_qty', 0),
+        'allocated_qty': row.get('allocated_qty', 0),
+        'safety_stock': row.get('safety_stock', 0),
+        'min_stock': row.get('min_stock', 0),
+        'max_stock': row.get('max_stock', 0),
+        'reorder_point': row.get('reorder_point', 0),
+        'order_qty': row.get('order_qty', 0),
+        'unit_cost': row.get('unit_cost', 0),
+    }
+
+
+def _shift_to_aps(row):
+    return {
+        'shift_cd': row.get('shift_cd'),
+        'shift_nm': row.get('shift_nm'),
+        'shift_type': row.get('shift_type', 'DAY'),
+        'start_time': row.get('start_time', '08:00:00'),
+        'end_time': row.get('end_time', '17:00:00'),
+        'break_time': row.get('break_time', 60),
+        'is_overnight': row.get('is_overnight', False),
+        'active_yn': 'Y',
+    }
+
+
+def _worker_to_aps(row):
+    return {
+        'worker_cd': row.get('worker_cd'),
+        'worker_nm': row.get('worker_nm'),
+        'workcenter_id': row.get('wc_cd'),
+        'shift_id': row.get('shift_cd') or None,
+        'worker_type': row.get('worker_type', 'REGULAR'),
+        'hire_date': row.get('hire_date') or None,
+        'experience_years': row.get('experience_years', 0),
+        'cost_per_hour': row.get('cost_per_hour', 20000),
+        'phone': row.get('phone'),
+        'email': row.get('email'),
+        'active_yn': 'Y',
+    }
+
+
+def _worker_skill_to_aps(row):
+    return {
+        'worker_id': row.get('worker_cd'),
+        'operation_nm': row.get('operation_nm'),
+        'skill_level': row.get('skill_level', 3),
+        'efficiency_rate': row.get('efficiency_rate', 100),
+        'certified_yn': row.get('certified_yn', 'N'),
+        'certification_nm': row.get('certification_nm'),
+        'certification_date': row.get('certification_date') or None,
+        'training_hours': row.get('training_hours', 0),
+        'last_training_date': row.get('last_training_date') or None,
+        'active_yn': 'Y',
+    }
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    """엔티티 유형별 Import 규칙"""
+    sync_type: str
+    payload_key: str
+    model: type
+    key_fields: Tuple[str, ...]
+    to_aps: Callable[[Dict[str, Any]], Dict[str, Any]]
+    # attname → 참조 모델 (청크 단위로 존재 여부를 한 번에 확인)
+    references: Dict[str, type] = field(default_factory=dict)
+    # 참조 대상이 없으면 실패 대신 NULL 로 저장하는 참조 (예: 작업자의 작업조)
+    nullable_references: Tuple[str, ...] = ()
+    # 참조 오류 메시지
+    reference_errors: Dict[str, str] = field(default_factory=dict)
+    # 모델 compute_derived() 가 채우는 파생 필드 (bulk_update 대상에 포함)
+    derived_fields: Tuple[str, ...] = ()
+    # FK 가 아닌 논리적 선행 유형 (예: 기계.wc_cd → 작업장), 동기화 순서 결정용
+    depends_on: Tuple[str, ...] = ()
+
+    def key_of(self, values: Dict[str, Any]) -> Tuple:
+        return tuple(values[f] for f in self.key_fields)
+
+    @property
+    def supports_snapshot(self) -> bool:
+        """스냅샷 비활성화는 사용여부(active_yn) 컬럼이 있는 모델만 가능"""
+        return any(f.name == 'active_yn' for f in self.model._meta.concrete_fields)
+
+
+IMPORT_SPECS: Dict[str, ImportSpec] = {
+    spec.sync_type: spec for spec in [
+        ImportSpec('WORKCENTER', 'workcenters', MasterWorkCenter, ('wc_cd',), _workcenter_to_aps),
+        ImportSpec('ITEM', 'items', MasterItem, ('itm_id',), _item_to_aps),
+        ImportSpec(
+            'MACHINE', 'machines', MasterMachine, ('mc_cd',), _machine_to_aps,
+            depends_on=('WORKCENTER',),
+        ),
+        ImportSpec(
+            'BOM', 'bom', MasterBOM, ('parent_item_id', 'child_item_id'), _bom_to_aps,
+            references={'parent_item_id': MasterItem, 'child_item_id': MasterItem},
+            reference_errors={
+                'parent_item_id': '모품목이 존재하지 않습니다',
+                'child_item_id': '자품목이 존재하지 않습니다',
+            },
+        ),
+        ImportSpec(
+            'ROUTING', 'routing', MasterRouting, ('item_id', 'seq'), _routing_to_aps,
+            references={'item_id': MasterItem, 'workcenter_id': MasterWorkCenter},
+            reference_errors={
+                'item_id': '품목이 존재하지 않습니다',
+                'workcenter_id': '작업장이 존재하지 않습니다',
+            },
+        ),
+        ImportSpec(
+            'WORKORDER', 'workorders', ERPWorkOrder, ('wo_no',), _workorder_to_aps,
+            references={'item_id': MasterItem},
+            reference_errors={'item_id': '품목이 존재하지 않습니다'},
+        ),
+        ImportSpec(
+            'PLANT_CALENDAR', 'plant_calendars', PlantCalendar, ('work_date', 'plant_cd'),
+            _plant_calendar_to_aps,
+        ),
+        ImportSpec(
+            'MACHINE_WORKTIME', 'machine_worktimes', MachineWorkTime, ('machine_id', 'day_of_week'),
+            _machine_worktime_to_aps,
+            references={'machine_id': MasterMachine},
+            reference_errors={'machine_id': '기계가 존재하지 않습니다'},
+        ),
+        ImportSpec(
+            'INVENTORY', 'inventory', ItemInventory, ('item_id', 'plant_cd', 'warehouse_cd'),
+            _inventory_to_aps,
+            references={'item_id': MasterItem},
+            reference_errors={'item_id': '품목이 존재하지 않습니다'},
+            derived_fields=('available_qty', 'inventory_value'),
+        ),
+        ImportSpec('SHIFT', 'shifts', MasterShift, ('shift_cd',), _shift_to_aps),
+        ImportSpec(
+            'WORKER', 'workers', MasterWorker, ('worker_cd',), _worker_to_aps,
+            references={'workcenter_id': MasterWorkCenter, 'shift_id': MasterShift},
+            nullable_references=('shift_id',),
+            reference_errors={'workcenter_id': '작업장이 존재하지 않습니다'},
+        ),
+        ImportSpec(
+            'WORKER_SKILL', 'worker_skills', WorkerSkill, ('worker_id', 'operation_nm'),
+            _worker_skill_to_aps,
+            references={'worker_id': MasterWorker},
+            reference_errors={'worker_id': '작업자가 존재하지 않습니다'},
+            derived_fields=('efficiency_rate',),
+        ),
+    ]
+}
+
+
+# ==========================================================================
+# 입력 스트림 파싱 (NDJSON / CSV, gzip)
+# ==========================================================================
+
+class _ReadableAdapter(io.RawIOBase):
+    """read() 만 제공하는 객체(HttpRequest 등)를 io 계층에서 쓸 수 있도록 감싸기"""
+
+    def __init__(self, source):
+        self._source = source
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._source.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        return n
+
+
+def open_text_stream(source, compressed: bool = False) -> io.TextIOBase:
+    """바이너리 스트림 → (gzip 해제) → UTF-8 텍스트 스트림 (BOM 허용)"""
+    raw = io.BufferedReader(_ReadableAdapter(source))
+    if compressed:
+        raw = gzip.GzipFile(fileobj=raw, mode='rb')
+    return io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+
+
+@dataclass
+class ParsedRecord:
+    """파싱된 입력 1행 (파싱 실패 시 error 에 사유)"""
+    line_no: int
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def iter_ndjson(text_stream: Iterable[str]) -> Iterator[ParsedRecord]:
+    """NDJSON: 한 줄에 JSON 객체 하나, 빈 줄 무시"""
+    for line_no, line in enumerate(text_stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield ParsedRecord(line_no, error=f'JSON 파싱 오류: {e}')
+            continue
+        if not isinstance(data, dict):
+            yield ParsedRecord(line_no, error='JSON 객체가 아닙니다')
+            continue
+        yield ParsedRecord(line_no, data=data)
+
+
+def iter_csv(text_stream: Iterable[str]) -> Iterator[ParsedRecord]:
+    """CSV: 첫 행은 헤더, 빈 값은 미지정으로 간주(기본값 적용)"""
+    reader = csv.DictReader(text_stream)
+    for row in reader:
+        data = {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and value is not None and value.strip() != ''
+        }
+        if not data:
+            continue
+        yield ParsedRecord(reader.line_num, data=data)
+
+
+def iter_records(source, fmt: str, compressed: bool = False) -> Iterator[ParsedRecord]:
+    """입력 형식에 맞는 레코드 이터레이터"""
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f'지원하지 않는 형식입니다: {fmt}')
+    text_stream = open_text_stream(source, compressed=compressed)
+    if fmt == 'csv':
+        return iter_csv(text_stream)
+    return iter_ndjson(text_stream)
+
+
+def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> Optional[str]:
+    """쿼리 파라미터 > Content-Type 순으로 입력 형식 결정"""
+    if requested:
+        requested = requested.lower()
+        if requested in ('jsonl', 'json-lines'):
+            return 'ndjson'
+        return requested
+    if content_type:
+        return CONTENT_TYPE_FORMATS.get(content_type.split(';')[0].strip().lower())
+    return None
+
+
+# ==========================================================================
+# 청크 단위 검증 + 일괄 업서트
+# ==========================================================================
+
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 't', '1', 'y', 'yes')
+    return bool(value)
+
+
+def coerce_values(model, values: Dict[str, Any]) -> Dict[str, Any]:
+    """모델 필드 정의에 따라 값 변환/검증 (CSV 문자열 → 파이썬 타입)"""
+    coerced = {}
+    for name, value in values.items():
+        model_field = model._meta.get_field(name)
+        if value is None or value == '':
+            if not model_field.null:
+                raise ValueError(f'{name}: 필수값이 없습니다')
+            coerced[name] = None
+            continue
+        if isinstance(model_field, models.BooleanField):
+            value = _to_bool(value)
+        try:
+            value = model_field.to_python(value)
+            model_field.run_validators(value)
+        except ValidationError as e:
+            raise ValueError(f'{name}: {"; ".join(e.messages)}')
+        coerced[name] = value
+    return coerced
+
+
+def _hashable(value):
+    if isinstance(value, Decimal):
+        # 2.5 / 2.50 / 2.5000 을 같은 값으로 취급
+        return format(value.normalize(), 'f')
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def compute_row_hash(values: Dict[str, Any]) -> str:
+    """변환/검증된 행 값의 내용 해시 (키 정렬된 JSON 의 SHA-1)"""
+    canonical = json.dumps(
+        {name: _hashable(value) for name, value in values.items() if name != 'row_hash'},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def format_entity_key(key: Tuple) -> str:
+    """변경 피드용 엔티티 키 문자열 (복합키는 '|' 로 연결)"""
+    return '|'.join(str(_hashable(k)) for k in key)
+
+
+class ChunkUpserter:
+    """
+    청크 단위 업서트
+
+    청크당 쿼리 수: 참조 모델별 1회 + 기존행 조회 1회 + bulk_create/bulk_update
+
+    delta=True 이면 row_hash 가 같은 기존 행은 갱신하지 않는다 (미변경 건수로 집계).
+    """
+
+    def __init__(self, spec: ImportSpec, overwrite: bool = True, delta: bool = False):
+        self.spec = spec
+        self.overwrite = overwrite
+        self.delta = delta
+        self.model = spec.model
+        field_names = {f.name for f in self.model._meta.concrete_fields}
+        self.has_updated_at = 'updated_at' in field_names
+        self.has_row_hash = 'row_hash' in field_names
+        self.has_active_yn = 'active_yn' in field_names
+
+    def prepare(self, records: List[ParsedRecord]) -> Tuple[Dict[Tuple, Tuple[int, Dict[str, Any]]], List[Dict]]:
+        """파싱 → 변환 → 필드 검증 → 참조 확인. (유효행 dict, 오류 목록) 반환"""
+        spec = self.spec
+        errors = []
+        valid: Dict[Tuple, Tuple[int, Dict[str, Any]]] = {}
+
+        for record in records:
+            if record.error:
+                errors.append({'line': record.line_no, 'error': record.error})
+                continue
+            try:
+                values = coerce_values(self.model, spec.to_aps(record.data))
+                key = spec.key_of(values)
+            except (ValueError, KeyError) as e:
+                error = {'line': record.line_no, 'error': str(e)}
+                # 키가 읽히는 행은 키를 남김 → 스냅샷에서 '입력에 있던 행' 으로 취급
+                key = self.key_of_record(record)
+                if key is not None:
+                    error['key'] = list(key)
+                errors.append(error)
+                continue
+            # 청크 내 중복 키는 마지막 행 기준
+            valid[key] = (record.line_no, values)
+
+        # 참조 무결성: 참조 모델별로 청크 전체를 한 번에 조회
+        for attname, ref_model in spec.references.items():
+            wanted = {values[attname] for _, values in valid.values() if values.get(attname) is not None}
+            if not wanted:
+                continue
+            existing = set(ref_model.objects.filter(pk__in=wanted).values_list('pk', flat=True))
+            missing = wanted - existing
+            if not missing:
+                continue
+            for key, (line_no, values) in list(valid.items()):
+                if values.get(attname) not in missing:
+                    continue
+                if attname in spec.nullable_references:
+                    values[attname] = None
+                    continue
+                message = spec.reference_errors.get(attname, f'{attname} 참조 대상이 존재하지 않습니다')
+                errors.append({'line': line_no, 'key': list(key), 'error': f'{message}: {values[attname]}'})
+                del valid[key]
+
+        if self.has_row_hash:
+            for _, values in valid.values():
+                values['row_hash'] = compute_row_hash(values)
+
+        return valid, errors
+
+    def key_of_record(self, record: ParsedRecord) -> Optional[Tuple]:
+        """키 필드만 변환 (다른 필드가 잘못된 행도 키는 추출, 키를 읽을 수 없으면 None)"""
+        if record.error:
+            return None
+        try:
+            values = self.spec.to_aps(record.data)
+            return self.spec.key_of(coerce_values(self.model, {f: values.get(f) for f in self.spec.key_fields}))
+        except (ValueError, KeyError):
+            return None
+
+    def keys_of(self, records: List[ParsedRecord]) -> List[Tuple]:
+        """DB 조회 없이 청크의 키만 추출 (재개 시 건너뛴 청크의 스냅샷 키 수집용)"""
+        return [key for key in map(self.key_of_record, records) if key is not None]
+
+    def fetch_existing(self, keys: Iterable[Tuple]) -> Dict[Tuple, models.Model]:
+        """기존 행 조회 (첫 번째 키 필드 IN 조건 1회 후 복합키 매칭)"""
+        keys = set(keys)
+        if not keys:
+            return {}
+        first = self.spec.key_fields[0]
+        candidates = self.model.objects.filter(**{f'{first}__in': {k[0] for k in keys}})
+        existing = {}
+        for obj in candidates:
+            key = tuple(getattr(obj, f) for f in self.spec.key_fields)
+            if key in keys:
+                existing[key] = obj
+        return existing
+
+    def is_unchanged(self, obj, values: Dict[str, Any]) -> bool:
+        if not (self.delta and self.has_row_hash) or obj.row_hash != values['row_hash']:
+            return False
+        # 수동 비활성화 등으로 해시만 같은 경우는 변경으로 간주
+        return not self.has_active_yn or obj.active_yn == values.get('active_yn', obj.active_yn)
+
+    def upsert(self, records: List[ParsedRecord]) -> Dict[str, Any]:
+        """청크 1개 업서트 (호출자가 트랜잭션 경계를 관리)"""
+        valid, errors = self.prepare(records)
+        existing = self.fetch_existing(valid.keys())
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        update_fields = set()
+        created_keys = []
+        updated_keys = []
+        unchanged = 0
+
+        for key, (_, values) in valid.items():
+            obj = existing.get(key)
+            if obj is None:
+                obj = self.model(**values)
+                to_create.append(obj)
+                created_keys.append(key)
+            elif not self.overwrite:
+                continue
+            elif self.is_unchanged(obj, values):
+                unchanged += 1
+                continue
+            else:
+                for name, value in values.items():
+                    setattr(obj, name, value)
+                update_fields.update(n for n in values if n not in self.spec.key_fields)
+                to_update.append(obj)
+                updated_keys.append(key)
+            if hasattr(obj, 'compute_derived'):
+                obj.compute_derived()
+            if self.has_updated_at:
+                obj.updated_at = now
+
+        if to_create:
+            self.model.objects.bulk_create(to_create)
+        if to_update:
+            update_fields.update(self.spec.derived_fields)
+            if self.has_updated_at:
+                update_fields.add('updated_at')
+            self.model.objects.bulk_update(to_update, sorted(update_fields))
+
+        return {
+            'created': len(to_create),
+            'updated': len(to_update),
+            'unchanged': unchanged,
+            'skipped': len(valid) - len(to_create) - len(to_update) - unchanged,
+            'failed': len(errors),
+            'errors': errors,
+            'created_keys': created_keys,
+            'updated_keys': updated_keys,
+            # 스냅샷 비활성화 제외 대상: 유효행 + 검증 / 참조 오류로 실패했지만 키가 있는 행
+            'seen_keys': list(valid.keys()) + [tuple(e['key']) for e in errors if 'key' in e],
+        }
+
+
+def iter_chunks(records: Iterable[ParsedRecord], chunk_size: int) -> Iterator[List[ParsedRecord]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_payload(rows: Iterable[Dict[str, Any]]) -> Iterator[ParsedRecord]:
+    """이미 파싱된 JSON 리스트(기존 일괄 API 본문)를 레코드 스트림으로 변환"""
+    for index, row in enumerate(rows, start=1):
+        if isinstance(row, dict):
+            yield ParsedRecord(index, data=row)
+        else:
+            yield ParsedRecord(index, error='JSON 객체가 아닙니다')
+
+
+# ==========================================================================
+# 변경 피드
+# ==========================================================================
+
+def record_changes(sync_log: ERPSyncLog, spec: ImportSpec, created=(), updated=(), deactivated=()):
+    """
+    변경 피드 기록 + master_data_changed 시그널 예약
+
+    호출자의 트랜잭션 안에서 피드 행을 저장하고, 시그널은 커밋 이후에만 발송한다.
+    """
+    changes = [
+        MasterDataChange(
+            sync_log=sync_log,
+            sync_type=spec.sync_type,
+            change_type=change_type,
+            entity_key=format_entity_key(key),
+        )
+        for change_type, keys in (('CREATED', created), ('UPDATED', updated), ('DEACTIVATED', deactivated))
+        for key in keys
+    ]
+    if not changes:
+        return
+    MasterDataChange.objects.bulk_create(changes)
+
+    payload = {
+        'sync_type': spec.sync_type,
+        'sync_id': sync_log.sync_id,
+        'created': [format_entity_key(k) for k in created],
+        'updated': [format_entity_key(k) for k in updated],
+        'deactivated': [format_entity_key(k) for k in deactivated],
+    }
+    transaction.on_commit(lambda: master_data_changed.send(sender=spec.model, **payload))
+
+
+def deactivate_missing(spec: ImportSpec, seen_keys, sync_log: ERPSyncLog, batch_size: int = 1000) -> int:
+    """
+    스냅샷에 없는 활성 행을 소프트 비활성화 (active_yn='N', row_hash 초기화)
+
+    row_hash 를 비워 두므로 같은 내용으로 다시 들어오면 변경으로 감지되어 재활성화된다.
+    """
+    model = spec.model
+    active_rows = model.objects.filter(active_yn='Y').values_list('pk', *spec.key_fields)
+    missing = [
+        (row[0], tuple(row[1:]))
+        for row in active_rows.iterator(chunk_size=5000)
+        if tuple(row[1:]) not in seen_keys
+    ]
+
+    now = timezone.now()
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        with transaction.atomic():
+            model.objects.filter(pk__in=[pk for pk, _ in batch]).update(
+                active_yn='N', row_hash=None, updated_at=now
+            )
+            record_changes(sync_log, spec, deactivated=[key for _, key in batch])
+    return len(missing)
+
+
+# ==========================================================================
+# 스트리밍 Import 실행
+# ==========================================================================
+
+SYNC_MODES = ('FULL', 'DELTA', 'SNAPSHOT')
+
+
+class StreamingImportService:
+    """스트리밍 Import (청크 커밋 + ERPSyncLog 진행상황 + 재개)"""
+
+    @staticmethod
+    def start_log(sync_type: str, fmt: str, chunk_size: int, mode: str = 'FULL') -> ERPSyncLog:
+        return ERPSyncLog.objects.create(
+            sync_type=sync_type,
+            sync_status='RUNNING',
+            sync_mode=mode,
+            source_format=fmt,
+            chunk_size=chunk_size,
+            progress_ts=timezone.now(),
+        )
+
+    @staticmethod
+    def resume_log(sync_id: int, sync_type: str) -> ERPSyncLog:
+        """재개 대상 로그 조회 (유형 불일치 / 이미 완료된 로그는 거부)"""
+        try:
+            sync_log = ERPSyncLog.objects.get(sync_id=sync_id)
+        except ERPSyncLog.DoesNotExist:
+            raise ValueError(f'동기화 로그 {sync_id}이 존재하지 않습니다')
+        if sync_log.sync_type != sync_type:
+            raise ValueError(f'동기화 유형이 다릅니다: {sync_log.sync_type} != {sync_type}')
+        if not sync_log.chunk_size:
+            raise ValueError('스트리밍 Import 로그가 아니므로 재개할 수 없습니다')
+        if sync_log.sync_status == 'SUCCESS':
+            raise ValueError('이미 완료된 동기화입니다')
+        return sync_log
+
+    @classmethod
+    def run(
+        cls,
+        records: Iterable[ParsedRecord],
+        sync_type: str,
+        fmt: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        overwrite: bool = True,
+        resume_sync_id: Optional[int] = None,
+        mode: str = 'FULL',
+    ) -> Dict[str, Any]:
+        """
+        레코드 스트림을 청크 단위로 적재
+
+        재개 시 요청 본문은 처음부터 다시 전송하고, 이미 커밋된
+        committed_chunks * chunk_size 개 레코드는 파싱만 하고 건너뛴다.
+
+        mode:
+            FULL     - 모든 행 업서트 (기본)
+            DELTA    - row_hash 가 같은 행은 건너뜀, 변경분만 변경 피드에 기록
+            SNAPSHOT - DELTA + 입력에 없는 활성 행 소프트 비활성화 (전체 스냅샷 전송 시)
+
+        Returns:
+            {
+                'sync_id': 12,
+                'status': 'SUCCESS',
+                'total': 250000,
+                'success': 249990,
+                'failed': 10,
+                'created': ..., 'updated': ..., 'unchanged': ..., 'deactivated': ...,
+                'committed_chunks': 250,
+                'resumed_from_chunk': 0,
+                'errors': [...]
+            }
+        """
+        spec = IMPORT_SPECS[sync_type]
+        if mode not in SYNC_MODES:
+            raise ValueError(f"mode 는 {', '.join(SYNC_MODES)} 중 하나여야 합니다")
+
+        upserter = ChunkUpserter(spec, overwrite=overwrite, delta=mode != 'FULL')
+        if mode == 'SNAPSHOT' and not spec.supports_snapshot:
+            raise ValueError(f'{sync_type} 은 사용여부(active_yn)가 없어 스냅샷 동기화를 지원하지 않습니다')
+
+        if resume_sync_id:
+            sync_log = cls.resume_log(resume_sync_id, sync_type)
+            chunk_size = sync_log.chunk_size
+            mode = sync_log.sync_mode
+            upserter.delta = mode != 'FULL'
+            sync_log.sync_status = 'RUNNING'
+            sync_log.save(update_fields=['sync_status'])
+        else:
+            sync_log = cls.start_log(sync_type, fmt, chunk_size, mode)
+
+        resumed_from = sync_log.committed_chunks
+        skip_records = resumed_from * chunk_size
+        track_changes = mode != 'FULL'
+        seen_keys = set()
+
+        totals = {'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'deactivated': 0}
+        errors: List[Dict] = []
+
+        try:
+            chunk_no = 0
+            for chunk in iter_chunks(records, chunk_size):
+                chunk_no += 1
+                if chunk_no * chunk_size <= skip_records:
+                    if mode == 'SNAPSHOT':
+                        seen_keys.update(upserter.keys_of(chunk))
+                    continue
+
+                with transaction.atomic():
+                    chunk_result = upserter.upsert(chunk)
+                    if track_changes:
+                        record_changes(
+                            sync_log, spec,
+                            created=chunk_result['created_keys'],
+                            updated=chunk_result['updated_keys'],
+                        )
+                    # 진행상황은 청크와 같은 트랜잭션에서 커밋 → 재개 지점이 항상 일치
+                    sync_log.committed_chunks = chunk_no
+                    sync_log.records_total += len(chunk)
+                    sync_log.records_success += len(chunk) - chunk_result['failed']
+                    sync_log.records_failed += chunk_result['failed']
+                    sync_log.records_created += chunk_result['created']
+                    sync_log.records_updated += chunk_result['updated']
+                    sync_log.records_unchanged += chunk_result['unchanged']
+                    sync_log.progress_ts = timezone.now()
+                    sync_log.save(update_fields=[
+                        'committed_chunks', 'records_total', 'records_success', 'records_failed',
+                        'records_created', 'records_updated', 'records_unchanged', 'progress_ts',
+                    ])
+
+                if mode == 'SNAPSHOT':
+                    seen_keys.update(chunk_result['seen_keys'])
+                for k in ('created', 'updated', 'unchanged', 'skipped'):
+                    totals[k] += chunk_result[k]
+                if len(errors) < MAX_LOGGED_ERRORS:
+                    errors.extend(chunk_result['errors'][:MAX_LOGGED_ERRORS - len(errors)])
+
+            # 빈 스냅샷으로 전체가 비활성화되는 사고 방지
+            if mode == 'SNAPSHOT' and seen_keys:
+                totals['deactivated'] = deactivate_missing(spec, seen_keys, sync_log)
+                sync_log.records_deactivated = totals['deactivated']
+
+            sync_log.sync_status = 'SUCCESS' if sync_log.records_failed == 0 else 'PARTIAL'
+            if errors:
+                sync_log.error_message = '\n'.join(
+                    f"line {e.get('line')}: {e['error']}" for e in errors
+                )
+            sync_log.save(update_fields=['sync_status', 'error_message', 'records_deactivated'])
+
+        except Exception as e:
+            # 커밋된 청크는 유지, 다음 요청에서 resume_sync_id 로 재개
+            sync_log.refresh_from_db()
+            sync_log.sync_status = 'FAILED'
+            sync_log.error_message = f'청크 {sync_log.committed_chunks + 1} 처리 중 오류: {e}'
+            sync_log.save(update_fields=['sync_status', 'error_message'])
+
+        return {
+            'sync_id': sync_log.sync_id,
+            'mode': mode,
+            'status': sync_log.sync_status,
+            'total': sync_log.records_total,
+            'success': sync_log.records_success,
+            'failed': sync_log.records_failed,
+            'created': totals['created'],
+            'updated': totals['updated'],
+            'unchanged': totals['unchanged'],
+            'skipped': totals['skipped'],
+            'deactivated': totals['deactivated'],
+            'committed_chunks': sync_log.committed_chunks,
+            'chunk_size': chunk_size,
+            'resumed_from_chunk': resumed_from,
+            'errors': errors,
+            'error_message': sync_log.error_message if sync_log.sync_status == 'FAILED' else None,
+        }
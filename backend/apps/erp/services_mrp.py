@@ -0,0 +1,546 @@
+"""
+MRP 엔진
+다단계 BOM 전개(캐시) + 미완료 작업지시 소요량의 재고 차감
+
+1. BOM 전개: 사용중 MasterBOM 을 한 번 읽어 LLC(Low Level Code) 계산과 순환 검출을 하고
+   모품목별 하위 전 단계 누적 소요량을 BOMExplosion 에 캐시
+2. 증분 재전개: updated_at 이 마지막 전개 이후인 BOM 행의 모품목과 그 상위 모품목만 재전개
+   (물리 삭제된 BOM 행은 감지하지 못하므로 rebuild() 로 전체 재전개)
+3. 소요량 계산: LLC 단계 순으로 (품목, 공장)별 총소요량을 모아 가용재고 + 입고예정(미완료 작업지시)을
+   납기 → 우선순위 순으로 차감하고, 남은 순소요량만 다음 단계 자품목으로 전개 (단계 안은 NumPy 일괄 처리)
+   → MaterialRequirement 일괄 생성
+"""
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from .models import BOMExplosion, ERPWorkOrder, ItemInventory, MasterBOM, MaterialRequirement
+
+logger = logging.getLogger(__name__)
+
+
+OPEN_WO_STATUSES = ('CREATED', 'RELEASED', 'RUNNING')
+BULK_BATCH_SIZE = 1000
+QTY_DECIMALS = 4
+
+
+class BOMCycleError(ValueError):
+    """BOM 순환 참조"""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"BOM 순환 참조가 있습니다: {' > '.join(cycle)}")
+
+
+# ============================================================================
+# BOM 그래프 / 전개
+# ============================================================================
+
+class BOMGraph:
+    """
+    사용중(active_yn='Y') BOM 인접 리스트
+
+    생성 시 위상 정렬(순환 검출)과 LLC 를 한 번만 계산한다.
+    """
+
+    def __init__(self, edges: Iterable[Tuple[str, str, Decimal]]):
+        self.children: Dict[str, List[Tuple[str, Decimal]]] = defaultdict(list)
+        self.parents: Dict[str, Set[str]] = defaultdict(set)
+        for parent, child, qty in edges:
+            self.children[parent].append((child, qty))
+            self.parents[child].add(parent)
+
+        self.order = self._topological_order()
+        self.low_level_codes = self._low_level_codes()
+
+    @classmethod
+    def load(cls) -> 'BOMGraph':
+        edges = (
+            MasterBOM.objects.filter(active_yn='Y')
+            .values_list('parent_item_id', 'child_item_id', 'quantity')
+            .iterator(chunk_size=5000)
+        )
+        return cls(edges)
+
+    @property
+    def max_level(self) -> int:
+        return max(self.low_level_codes.values(), default=0)
+
+    def _topological_order(self) -> List[str]:
+        """모품목 → 자품목 순 위상 정렬 (Kahn)"""
+        items = set(self.children) | set(self.parents)
+        indegree = {item: len(self.parents.get(item, ())) for item in items}
+        queue = deque(sorted(item for item, degree in indegree.items() if degree == 0))
+
+        order = []
+        while queue:
+            item = queue.popleft()
+            order.append(item)
+            for child, _ in self.children.get(item, ()):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+
+        if len(order) < len(indegree):
+            remaining = {item for item, degree in indegree.items() if degree > 0}
+            raise BOMCycleError(self._find_cycle(remaining))
+        return order
+
+    def _find_cycle(self, remaining: Set[str]) -> List[str]:
+        """
+        정렬되지 않고 남은 품목에서 순환 경로 1개 추출
+
+        남은 품목은 모두 남은 품목 중에 모품목이 있으므로 모품목 방향으로 따라가면 반드시 되돌아온다.
+        """
+        path: List[str] = []
+        visited: Dict[str, int] = {}
+        item = min(remaining)
+        while item not in visited:
+            visited[item] = len(path)
+            path.append(item)
+            item = min(p for p in self.parents[item] if p in remaining)
+        cycle = path[visited[item]:] + [item]
+        return cycle[::-1]
+
+    def _low_level_codes(self) -> Dict[str, int]:
+        """LLC = 품목이 등장하는 가장 깊은 BOM 단계 (최상위 0)"""
+        codes = dict.fromkeys(self.order, 0)
+        for item in self.order:
+            for child, _ in self.children.get(item, ()):
+                codes[child] = max(codes[child], codes[item] + 1)
+        return codes
+
+    def descendants(self, items: Iterable[str]) -> Set[str]:
+        """지정 품목의 하위 전 단계 자품목 (지정 품목 제외)"""
+        found: Set[str] = set()
+        queue = deque(items)
+        while queue:
+            for child, _ in self.children.get(queue.popleft(), ()):
+                if child not in found:
+                    found.add(child)
+                    queue.append(child)
+        return found
+
+    def ancestors(self, items: Iterable[str]) -> Set[str]:
+        """지정 품목과 그 상위 전 단계 모품목"""
+        found = set(items)
+        queue = deque(found)
+        while queue:
+            for parent in self.parents.get(queue.popleft(), ()):
+                if parent not in found:
+                    found.add(parent)
+                    queue.append(parent)
+        return found
+
+    def explode(self, roots: Iterable[str]) -> Dict[str, Dict[str, list]]:
+        """
+        모품목 1단위 기준 하위 전 단계 전개
+
+        자품목 → 모품목 순(역위상순)으로 처리하며 하위 전개 결과를 재사용한다.
+
+        Returns:
+            {root: {component: [누적소요량, 최소단계, 최대단계]}}
+        """
+        roots = {root for root in roots if root in self.children}
+        needed = set(roots)
+        queue = deque(roots)
+        while queue:
+            for child, _ in self.children.get(queue.popleft(), ()):
+                if child not in needed and child in self.children:
+                    needed.add(child)
+                    queue.append(child)
+
+        memo: Dict[str, Dict[str, list]] = {}
+        for item in reversed(self.order):
+            if item not in needed:
+                continue
+            acc: Dict[str, list] = {}
+            for child, qty in self.children[item]:
+                _merge(acc, child, qty, 1, 1)
+                for component, (sub_qty, min_depth, max_depth) in memo.get(child, {}).items():
+                    _merge(acc, component, qty * sub_qty, min_depth + 1, max_depth + 1)
+            memo[item] = acc
+
+        return {root: memo[root] for root in roots}
+
+
+def _merge(acc: Dict[str, list], component: str, qty: Decimal, min_depth: int, max_depth: int):
+    entry = acc.get(component)
+    if entry is None:
+        acc[component] = [qty, min_depth, max_depth]
+    else:
+        entry[0] += qty
+        entry[1] = min(entry[1], min_depth)
+        entry[2] = max(entry[2], max_depth)
+
+
+class BOMExplosionService:
+    """BOMExplosion 캐시 관리"""
+
+    @staticmethod
+    def rebuild(parent_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        전개표 재생성
+
+        Args:
+            parent_ids: None 이면 전체 재전개, 지정하면 해당 모품목과 상위 모품목만 재전개
+                        (전개표가 비어 있으면 전체 재전개)
+
+        Raises:
+            BOMCycleError: BOM 순환 참조
+        """
+        started = time.monotonic()
+        exploded_at = timezone.now()
+        graph = BOMGraph.load()
+
+        full = parent_ids is None or not BOMExplosion.objects.exists()
+        if full:
+            stale = None
+            roots = set(graph.children)
+        else:
+            stale = graph.ancestors(parent_ids)
+            roots = {item for item in stale if item in graph.children}
+
+        explosions = graph.explode(roots)
+        rows = [
+            BOMExplosion(
+                root_item_id=root,
+                component_item_id=component,
+                extended_qty=qty,
+                min_depth=min_depth,
+                max_depth=max_depth,
+                low_level_code=graph.low_level_codes[component],
+                exploded_at=exploded_at,
+            )
+            for root in sorted(explosions)
+            for component, (qty, min_depth, max_depth) in sorted(explosions[root].items())
+        ]
+
+        with transaction.atomic():
+            if full:
+                BOMExplosion.objects.all().delete()
+            else:
+                BOMExplosion.objects.filter(root_item_id__in=stale).delete()
+            BOMExplosion.objects.bulk_create(rows, batch_size=BULK_BATCH_SIZE)
+            relabelled = 0 if full else _sync_low_level_codes(graph)
+
+        result = {
+            'mode': 'FULL' if full else 'INCREMENTAL',
+            'roots': len(explosions),
+            'rows': len(rows),
+            'max_level': graph.max_level,
+            'relabelled': relabelled,
+            'elapsed_sec': round(time.monotonic() - started, 3),
+        }
+        logger.info("BOM explosion rebuilt: %s", result)
+        return result
+
+    @classmethod
+    def refresh(cls) -> Dict[str, Any]:
+        """마지막 전개 이후 변경된 BOM 만 감지하여 재전개"""
+        last = BOMExplosion.objects.aggregate(last=Max('exploded_at'))['last']
+        if last is None:
+            return cls.rebuild()
+
+        dirty = set(
+            MasterBOM.objects.filter(updated_at__gt=last).values_list('parent_item_id', flat=True)
+        )
+        if not dirty:
+            return {'mode': 'NONE', 'roots': 0, 'rows': 0, 'max_level': None, 'relabelled': 0,
+                    'elapsed_sec': 0.0}
+        return cls.rebuild(dirty)
+
+
+def _sync_low_level_codes(graph: BOMGraph) -> int:
+    """증분 재전개 후 다른 모품목 전개행의 LLC 보정 (LLC 값별 UPDATE 1회)"""
+    current = BOMExplosion.objects.values_list('component_item_id', 'low_level_code').distinct()
+    moved: Dict[int, List[str]] = defaultdict(list)
+    for component, code in current:
+        new_code = graph.low_level_codes.get(component, 0)
+        if new_code != code:
+            moved[new_code].append(component)
+
+    updated = 0
+    for code, components in moved.items():
+        updated += BOMExplosion.objects.filter(component_item_id__in=components).update(
+            low_level_code=code
+        )
+    return updated
+
+
+# ============================================================================
+# 소요량 계산 (벡터화)
+# ============================================================================
+
+@dataclass
+class RequirementPlan:
+    """작업지시 × 자품목 소요량 (행 단위 병렬 배열)"""
+    wo_index: np.ndarray     # work_orders 인덱스
+    component: np.ndarray    # 자품목 코드 (object)
+    required: np.ndarray     # 총소요량
+    allocated: np.ndarray    # 가용재고 할당량
+
+    def __len__(self):
+        return len(self.wo_index)
+
+
+class _EdgeTable:
+    """단일 단계 BOM 을 모품목별 연속 구간 배열로 변환 (단계별 일괄 전개용)"""
+
+    def __init__(self, graph: BOMGraph):
+        children, quantities, self.spans = [], [], {}
+        for parent in sorted(graph.children):
+            self.spans[parent] = (len(children), len(graph.children[parent]))
+            for child, qty in graph.children[parent]:
+                children.append(child)
+                quantities.append(float(qty))
+        self.child = np.array(children, dtype=object)
+        self.qty = np.array(quantities)
+        self.level = np.array([graph.low_level_codes[c] for c in children], dtype=np.int64)
+
+    def explode(self, wo_index: np.ndarray, items: np.ndarray, qty: np.ndarray):
+        """(작업지시, 품목, 수량) 행을 직속 자품목 행으로 펼침 → (작업지시, 자품목, 수량, 자품목 LLC)"""
+        spans = [self.spans.get(item, (0, 0)) for item in items.tolist()]
+        starts = np.array([span[0] for span in spans], dtype=np.int64)
+        counts = np.array([span[1] for span in spans], dtype=np.int64)
+        total = int(counts.sum())
+        if total == 0:
+            return None
+        row = np.repeat(np.arange(len(items)), counts)
+        positions = np.repeat(starts, counts) + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return (
+            wo_index[row],
+            self.child[positions],
+            np.round(qty[row] * self.qty[positions], QTY_DECIMALS),
+            self.level[positions],
+        )
+
+
+def _allocate(
+    component: np.ndarray,
+    wo_index: np.ndarray,
+    required: np.ndarray,
+    plants: np.ndarray,
+    wo_rank: np.ndarray,
+    available: Dict[Tuple[str, str], float],
+) -> np.ndarray:
+    """(품목, 공장) 그룹별로 가용수량을 작업지시 할당 순서대로 차감한 할당량"""
+    group_keys = component + '\x1f' + plants[wo_index]
+    groups, group_of_row = np.unique(group_keys, return_inverse=True)
+    group_available = np.array([
+        max(0.0, available.get(tuple(key.split('\x1f', 1)), 0.0)) for key in groups
+    ])
+
+    sort = np.lexsort((wo_rank[wo_index], group_of_row))
+    req_sorted = required[sort]
+    group_sorted = group_of_row[sort]
+
+    # 그룹별 누적 소요량 (그룹 시작 위치의 누적값을 빼서 구간 합으로 변환)
+    consumed_before = np.cumsum(req_sorted) - req_sorted
+    group_first = np.searchsorted(group_sorted, np.arange(len(groups)))
+    consumed_before -= consumed_before[group_first][group_sorted]
+
+    allocated = np.empty_like(required)
+    allocated[sort] = np.clip(group_available[group_sorted] - consumed_before, 0.0, req_sorted)
+    return np.round(allocated, QTY_DECIMALS)
+
+
+def net_requirements(
+    work_orders: List[Tuple],
+    graph: BOMGraph,
+    available: Dict[Tuple[str, str], float],
+) -> RequirementPlan:
+    """
+    LLC 단계 순 다단계 순소요량 계산
+
+    Args:
+        work_orders: [(wo_no, item_id, order_qty, due_date, priority, plant_cd)]
+        graph: 사용중 BOM (직속 자품목 + LLC)
+        available: {(item_id, plant_cd): 가용수량 (재고 + 입고예정)}
+
+    작업지시 품목의 직속 자품목부터 LLC 1, 2, ... 단계 순으로 처리한다.
+    LLC 는 품목이 쓰이는 가장 깊은 단계이므로 품목을 처리할 때는 모든 모품목의 소요가 이미 모여 있다.
+    같은 (품목, 공장) 안에서는 납기 → 우선순위(높은 값 우선) → 작업지시번호 순으로 가용수량을 할당하고,
+    할당하고 남은 순소요량만 자품목으로 전개한다 (중간 조립품 재고만큼 하위 자재 소요 감소).
+    """
+    empty = RequirementPlan(
+        np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0), np.empty(0)
+    )
+    if not work_orders or not graph.children:
+        return empty
+
+    edges = _EdgeTable(graph)
+    plants = np.array([wo[5] for wo in work_orders], dtype=object)
+    wo_rank = np.empty(len(work_orders), dtype=np.int64)
+    wo_rank[sorted(
+        range(len(work_orders)),
+        key=lambda i: (work_orders[i][3], -work_orders[i][4], work_orders[i][0]),
+    )] = np.arange(len(work_orders))
+
+    # LLC 단계별 대기 소요 (작업지시, 품목, 수량)
+    pending: Dict[int, List[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = defaultdict(list)
+
+    def push(exploded):
+        if exploded is None:
+            return
+        wo_index, component, qty, level = exploded
+        for code in np.unique(level).tolist():
+            mask = (level == code) & (qty > 0)
+            pending[code].append((wo_index[mask], component[mask], qty[mask]))
+
+    # 작업지시 품목 자체는 생산 대상이므로 차감하지 않고 지시수량 그대로 전개
+    push(edges.explode(
+        np.arange(len(work_orders)),
+        np.array([wo[1] for wo in work_orders], dtype=object),
+        np.array([float(wo[2]) for wo in work_orders]),
+    ))
+
+    plan = []
+    for level in range(1, graph.max_level + 1):
+        chunks = pending.pop(level, None)
+        if not chunks:
+            continue
+        wo_index = np.concatenate([c[0] for c in chunks])
+        component = np.concatenate([c[1] for c in chunks])
+        qty = np.concatenate([c[2] for c in chunks])
+        if not len(qty):
+            continue
+
+        # 여러 모품목에서 온 같은 (작업지시, 품목) 소요 합산
+        component_keys, component_idx = np.unique(component, return_inverse=True)
+        combined = component_idx * len(work_orders) + wo_index
+        keys, inverse = np.unique(combined, return_inverse=True)
+        required = np.round(np.bincount(inverse, weights=qty), QTY_DECIMALS)
+        wo_index = keys % len(work_orders)
+        component = component_keys[keys // len(work_orders)]
+
+        allocated = _allocate(component, wo_index, required, plants, wo_rank, available)
+        plan.append((wo_index, component, required, allocated))
+
+        net = np.round(required - allocated, QTY_DECIMALS)
+        short = net > 0
+        push(edges.explode(wo_index[short], component[short], net[short]))
+
+    if not plan:
+        return empty
+    return RequirementPlan(*(np.concatenate([part[i] for part in plan]) for i in range(4)))
+
+
+class MRPEngine:
+    """작업지시 자재소요량 계산"""
+
+    @classmethod
+    def run(cls, wo_nos: Optional[Iterable[str]] = None, refresh_explosion: bool = True) -> Dict[str, Any]:
+        """
+        MRP 실행
+
+        소요량은 사용중 BOM 을 LLC 단계 순으로 순소요량 전개하고 (refresh_explosion 은 전개표 캐시 갱신),
+        가용재고는 항상 전체 미완료 작업지시 기준으로 차감하고,
+        wo_nos 를 지정하면 해당 작업지시의 소요량만 다시 기록한다.
+        출고완료(ISSUED) 소요량은 유지하며 같은 (작업지시, 품목)은 다시 만들지 않는다.
+
+        Returns:
+            {
+                'success': True,
+                'work_orders': 120,
+                'requirements': 1850,
+                'shortages': 42,
+                'shortage_items': 9,
+                'explosion': {...},
+                'elapsed_sec': 0.8
+            }
+        """
+        started = time.monotonic()
+        explosion_result = BOMExplosionService.refresh() if refresh_explosion else None
+
+        work_orders = list(
+            ERPWorkOrder.objects.filter(status__in=OPEN_WO_STATUSES)
+            .values_list('wo_no', 'item_id', 'order_qty', 'due_date', 'priority', 'plant_cd')
+        )
+        graph = BOMGraph.load()
+        components = graph.descendants({wo[1] for wo in work_orders})
+        available = cls._available_stock(components)
+        for key, qty in cls._scheduled_receipts(work_orders, components).items():
+            available[key] = available.get(key, 0.0) + qty
+        plan = net_requirements(work_orders, graph, available)
+
+        targets = {wo[0] for wo in work_orders}
+        if wo_nos is not None:
+            targets &= set(wo_nos)
+
+        requirements = cls._write(work_orders, plan, targets)
+        shortages = [r for r in requirements if r.shortage_qty > 0]
+
+        return {
+            'success': True,
+            'work_orders': len(targets),
+            'requirements': len(requirements),
+            'shortages': len(shortages),
+            'shortage_items': len({r.item_id for r in shortages}),
+            'explosion': explosion_result,
+            'elapsed_sec': round(time.monotonic() - started, 3),
+        }
+
+    @staticmethod
+    def _available_stock(item_ids: Set[str]) -> Dict[Tuple[str, str], float]:
+        """(품목, 공장)별 가용재고 - 안전재고 (창고 합산)"""
+        if not item_ids:
+            return {}
+        rows = (
+            ItemInventory.objects.filter(item_id__in=item_ids)
+            .values('item_id', 'plant_cd')
+            .annotate(available=Sum('available_qty'), safety=Sum('safety_stock'))
+        )
+        return {
+            (row['item_id'], row['plant_cd']): float(row['available'] - row['safety'])
+            for row in rows
+        }
+
+    @staticmethod
+    def _scheduled_receipts(work_orders: List[Tuple], components: Set[str]) -> Dict[Tuple[str, str], float]:
+        """(품목, 공장)별 입고예정 = 중간 조립품 미완료 작업지시 수량 (납기 시점 구분 없음)"""
+        receipts: Dict[Tuple[str, str], float] = defaultdict(float)
+        for _, item_id, order_qty, _, _, plant_cd in work_orders:
+            if item_id in components:
+                receipts[(item_id, plant_cd)] += float(order_qty)
+        return receipts
+
+    @staticmethod
+    def _write(work_orders: List[Tuple], plan: RequirementPlan, targets: Set[str]) -> List[MaterialRequirement]:
+        with transaction.atomic():
+            existing = MaterialRequirement.objects.filter(wo_no__in=targets)
+            issued = set(existing.filter(status='ISSUED').values_list('wo_no', 'item_id'))
+            existing.exclude(status='ISSUED').delete()
+
+            requirements = []
+            for wo_idx, component, required, allocated in zip(
+                plan.wo_index.tolist(), plan.component.tolist(),
+                plan.required.tolist(), plan.allocated.tolist(),
+            ):
+                wo_no, _, _, due_date, _, _ = work_orders[wo_idx]
+                if wo_no not in targets or (wo_no, component) in issued:
+                    continue
+                requirement = MaterialRequirement(
+                    wo_no=wo_no,
+                    item_id=component,
+                    required_qty=_to_decimal(required),
+                    required_dt=due_date,
+                    allocated_qty=_to_decimal(allocated),
+                )
+                requirement.compute_derived()
+                requirements.append(requirement)
+
+            MaterialRequirement.objects.bulk_create(requirements, batch_size=BULK_BATCH_SIZE)
+        return requirements
+
+
+def _to_decimal(value: float) -> Decimal:
+    return Decimal(f"{value:.{QTY_DECIMALS}f}")
@@ -0,0 +1,251 @@
+"""
+ERP 기준정보 동기화 오케스트레이터
+엔티티 간 참조 관계(DAG)에 따라 독립 분기를 병렬로 동기화
+
+참조 관계 (선행 → 후행):
+    WORKCENTER → MACHINE → MACHINE_WORKTIME
+    WORKCENTER, ITEM → ROUTING
+    ITEM → BOM, INVENTORY
+    WORKCENTER, SHIFT → WORKER → WORKER_SKILL
+    PLANT_CALENDAR (독립)
+
+- 각 유형은 StreamingImportService(청크 bulk 업서트)로 적재
+- 워커 스레드마다 별도 DB 커넥션을 사용하고 종료 시 닫는다
+- 호출자가 트랜잭션(atomic) 안에 있으면 다른 스레드에서 미커밋 데이터를 볼 수 없으므로
+  그런 경우 max_workers=1 (직렬 실행)로 호출해야 한다
+- SQLite 는 쓰기 잠금이 DB 전체 단위라 병렬 적재가 'database is locked' 로 실패하므로 항상 직렬 실행
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .services_import import IMPORT_SPECS, StreamingImportService, iter_payload
+
+logger = logging.getLogger(__name__)
+
+
+# sync_all_master_data 가 다루는 기준정보 유형 (작업지시는 트랜잭션 데이터이므로 제외)
+MASTER_SYNC_TYPES = (
+    'WORKCENTER',
+    'ITEM',
+    'MACHINE',
+    'BOM',
+    'ROUTING',
+    'PLANT_CALENDAR',
+    'MACHINE_WORKTIME',
+    'INVENTORY',
+    'SHIFT',
+    'WORKER',
+    'WORKER_SKILL',
+)
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def sync_dependencies(sync_type: str) -> Set[str]:
+    """유형별 선행 유형 = FK 참조 모델의 유형 + 명시적 depends_on"""
+    spec = IMPORT_SPECS[sync_type]
+    model_types = {s.model: s.sync_type for s in IMPORT_SPECS.values()}
+    deps = {model_types[m] for m in spec.references.values() if m in model_types}
+    deps.update(spec.depends_on)
+    deps.discard(sync_type)
+    return deps
+
+
+def build_sync_graph(sync_types) -> Dict[str, Set[str]]:
+    """
+    요청에 포함된 유형만으로 의존 그래프 구성 (없는 유형에 대한 의존은 무시)
+
+    Raises:
+        ValueError: 순환 의존이 있는 경우
+    """
+    sync_types = set(sync_types)
+    graph = {t: sync_dependencies(t) & sync_types for t in sync_types}
+    topological_levels(graph)
+    return graph
+
+
+def topological_levels(graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """위상 정렬 단계 (같은 단계의 유형은 서로 독립)"""
+    remaining = {t: set(deps) for t, deps in graph.items()}
+    levels = []
+    while remaining:
+        ready = sorted(t for t, deps in remaining.items() if not deps)
+        if not ready:
+            raise ValueError(f"동기화 유형 간 순환 의존이 있습니다: {', '.join(sorted(remaining))}")
+        levels.append(ready)
+        for t in ready:
+            del remaining[t]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return levels
+
+
+class MasterSyncOrchestrator:
+    """DAG 기반 기준정보 동기화 (독립 분기 병렬 실행)"""
+
+    def __init__(self, emax_data: Dict[str, List[Dict]], mode: str = 'FULL',
+                 max_workers: int = DEFAULT_MAX_WORKERS):
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.payloads = {
+            sync_type: emax_data[IMPORT_SPECS[sync_type].payload_key]
+            for sync_type in MASTER_SYNC_TYPES
+            if IMPORT_SPECS[sync_type].payload_key in emax_data
+        }
+        self.graph = build_sync_graph(self.payloads)
+
+    def sync_one(self, sync_type: str) -> Dict[str, Any]:
+        """유형 1개 동기화 (호출 스레드의 DB 커넥션 사용)"""
+        rows = self.payloads[sync_type]
+        mode = self.mode
+        if mode == 'SNAPSHOT' and not IMPORT_SPECS[sync_type].supports_snapshot:
+            # 캘린더/가동시간/재고는 비활성화 개념이 없으므로 변경분만 반영
+            mode = 'DELTA'
+        started = time.monotonic()
+        run = StreamingImportService.run(iter_payload(rows), sync_type, fmt='json', mode=mode)
+        return {
+            'success': run['status'] == 'SUCCESS',
+            'status': run['status'],
+            'sync_id': run['sync_id'],
+            'total': len(rows),
+            'created': run['created'],
+            'updated': run['updated'],
+            'unchanged': run['unchanged'],
+            'deactivated': run['deactivated'],
+            'failed': run['failed'],
+            'errors': run['errors'] or ([{'error': run['error_message']}] if run['error_message'] else []),
+            'elapsed_sec': round(time.monotonic() - started, 3),
+        }
+
+    def uses_threads(self) -> bool:
+        """병렬 실행 여부 (SQLite 는 동시 쓰기 트랜잭션을 지원하지 않으므로 직렬)"""
+        return self.max_workers > 1 and connections[DEFAULT_DB_ALIAS].vendor != 'sqlite'
+
+    def _sync_in_worker(self, sync_type: str) -> Dict[str, Any]:
+        """워커 스레드 실행: 스레드 전용 커넥션을 작업 종료 시 반환"""
+        try:
+            return self.sync_one(sync_type)
+        finally:
+            connections.close_all()
+
+    def _skipped(self, sync_type: str, failed_deps: Set[str]) -> Dict[str, Any]:
+        total = len(self.payloads[sync_type])
+        return {
+            'success': False,
+            'status': 'SKIPPED',
+            'sync_id': None,
+            'total': total,
+            'created': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'deactivated': 0,
+            'failed': total,
+            'errors': [{'error': f"선행 동기화 실패로 건너뜀: {', '.join(sorted(failed_deps))}"}],
+            'elapsed_sec': 0.0,
+        }
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        의존 관계를 지키며 실행
+
+        선행 유형이 중단(FAILED/SKIPPED)되면 후행 유형은 실행하지 않는다.
+        (PARTIAL 은 행 단위 실패이므로 후행 유형은 정상 실행, 참조 없는 행만 실패)
+        """
+        if not self.uses_threads():
+            return self._run_serial()
+
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = {t: set(deps) for t, deps in self.graph.items()}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='erp-sync') as pool:
+            while pending or running:
+                for sync_type in sorted(t for t, deps in pending.items() if not deps):
+                    del pending[sync_type]
+                    failed_deps = self._failed_deps(sync_type, results)
+                    if failed_deps:
+                        results[sync_type] = self._skipped(sync_type, failed_deps)
+                        self._release(sync_type, pending)
+                        continue
+                    running[pool.submit(self._sync_in_worker, sync_type)] = sync_type
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sync_type = running.pop(future)
+                    try:
+                        results[sync_type] = future.result()
+                    except Exception as e:
+                        logger.exception("ERP sync failed: %s", sync_type)
+                        results[sync_type] = self._skipped(sync_type, set())
+                        results[sync_type].update(status='FAILED', errors=[{'error': str(e)}])
+                    self._release(sync_type, pending)
+
+        return results
+
+    def _run_serial(self) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        for level in topological_levels(self.graph):
+            for sync_type in level:
+                failed_deps = self._failed_deps(sync_type, results)
+                results[sync_type] = (
+                    self._skipped(sync_type, failed_deps) if failed_deps else self.sync_one(sync_type)
+                )
+        return results
+
+    def _failed_deps(self, sync_type: str, results: Dict[str, Dict[str, Any]]) -> Set[str]:
+        return {
+            dep for dep in self.graph[sync_type]
+            if results.get(dep, {}).get('status') in ('FAILED', 'SKIPPED')
+        }
+
+    @staticmethod
+    def _release(sync_type: str, pending: Dict[str, Set[str]]):
+        for deps in pending.values():
+            deps.discard(sync_type)
+
+
+def sync_master_data(emax_data: Dict[str, List[Dict]], mode: str = 'FULL',
+                     max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    기준정보 전체 동기화 (sync_all_master_data 결과 형태 유지)
+
+    Returns:
+        {
+            'success': True,
+            'mode': 'FULL',
+            'results': {'items': {...}, 'workcenters': {...}, ...},
+            'total_records': 500,
+            'total_created': 250,
+            'total_updated': 200,
+            'total_failed': 50,
+            'total_unchanged': 0,
+            'total_deactivated': 0,
+            'elapsed_sec': 3.2
+        }
+    """
+    started = time.monotonic()
+    orchestrator = MasterSyncOrchestrator(
+        emax_data, mode=mode, max_workers=max_workers or DEFAULT_MAX_WORKERS
+    )
+    by_type = orchestrator.run()
+    results = {IMPORT_SPECS[t].payload_key: by_type[t] for t in MASTER_SYNC_TYPES if t in by_type}
+
+    return {
+        'success': all(r['success'] for r in results.values()),
+        'mode': mode,
+        'results': results,
+        'total_records': sum(r['total'] for r in results.values()),
+        'total_created': sum(r['created'] for r in results.values()),
+        'total_updated': sum(r['updated'] for r in results.values()),
+        'total_failed': sum(r['failed'] for r in results.values()),
+        'total_unchanged': sum(r['unchanged'] for r in results.values()),
+        'total_deactivated': sum(r['deactivated'] for r in results.values()),
+        'elapsed_sec': round(time.monotonic() - started, 3),
+    }
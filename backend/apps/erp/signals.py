@@ -0,0 +1,11 @@
+"""
+ERP Signals
+마스터 데이터 변경 피드 (증분/스냅샷 동기화)
+"""
+from django.dispatch import Signal
+
+
+# 청크 커밋 후 발송
+# sender: 마스터 모델 클래스
+# kwargs: sync_type, sync_id, created, updated, deactivated (엔티티 키 문자열 리스트)
+master_data_changed = Signal()
@@ -0,0 +1 @@
+# ERP app tests
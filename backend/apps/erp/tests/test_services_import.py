@@ -0,0 +1,153 @@
+"""
+Unit tests for ERP streaming import
+"""
+import gzip
+import io
+import json
+import pytest
+from decimal import Decimal
+from apps.erp.models import MasterItem, MasterBOM, ItemInventory, ERPSyncLog
+from apps.erp.services_import import (
+    StreamingImportService,
+    detect_format,
+    iter_records,
+)
+
+
+def _ndjson(rows):
+    return ('\n'.join(json.dumps(r) for r in rows) + '\n').encode('utf-8')
+
+
+class TestRecordParsing:
+    """Tests for NDJSON / CSV parsing"""
+
+    def test_ndjson_skips_blank_lines_and_reports_bad_lines(self):
+        body = b'{"itm_id": "A"}\n\nnot-json\n[1, 2]\n{"itm_id": "B"}\n'
+        records = list(iter_records(io.BytesIO(body), 'ndjson'))
+        assert [r.data for r in records if r.data] == [{'itm_id': 'A'}, {'itm_id': 'B'}]
+        assert [r.line_no for r in records if r.error] == [3, 4]
+
+    def test_csv_gzip_with_bom_drops_empty_values(self):
+        body = '﻿itm_id,itm_nm,std_ct\nA,품목A,\nB,품목B,30\n'.encode('utf-8')
+        records = list(iter_records(io.BytesIO(gzip.compress(body)), 'csv', compressed=True))
+        assert records[0].data == {'itm_id': 'A', 'itm_nm': '품목A'}
+        assert records[1].data == {'itm_id': 'B', 'itm_nm': '품목B', 'std_ct': '30'}
+
+    def test_detect_format(self):
+        assert detect_format('application/x-ndjson; charset=utf-8') == 'ndjson'
+        assert detect_format('text/csv') == 'csv'
+        assert detect_format('application/json', 'jsonl') == 'ndjson'
+        assert detect_format('application/json') is None
+
+
+@pytest.mark.django_db
+class TestStreamingImportService:
+    """Tests for chunked upsert, progress and resume"""
+
+    def _run(self, rows, sync_type='ITEM', chunk_size=10, **kwargs):
+        records = iter_records(io.BytesIO(_ndjson(rows)), 'ndjson')
+        return StreamingImportService.run(records, sync_type, 'ndjson', chunk_size=chunk_size, **kwargs)
+
+    def test_commits_in_chunks_and_records_progress(self):
+        rows = [{'itm_id': f'I{i:03d}', 'itm_nm': f'품목{i}', 'std_ct': i} for i in range(25)]
+        result = self._run(rows)
+
+        assert result['status'] == 'SUCCESS'
+        assert result['created'] == 25
+        assert result['committed_chunks'] == 3
+        log = ERPSyncLog.objects.get(sync_id=result['sync_id'])
+        assert (log.records_total, log.records_success, log.committed_chunks) == (25, 25, 3)
+        assert MasterItem.objects.get(itm_id='I007').std_cycle_time == 7
+
+    def test_second_run_updates_existing_rows(self):
+        self._run([{'itm_id': 'A', 'itm_nm': 'old'}])
+        result = self._run([{'itm_id': 'A', 'itm_nm': 'new'}])
+        assert (result['created'], result['updated']) == (0, 1)
+        assert MasterItem.objects.get(itm_id='A').itm_nm == 'new'
+
+    def test_missing_reference_fails_row_not_chunk(self):
+        self._run([{'itm_id': 'P', 'itm_nm': 'P'}, {'itm_id': 'C', 'itm_nm': 'C'}])
+        result = self._run(
+            [
+                {'parent_itm_id': 'P', 'child_itm_id': 'C', 'quantity': '2.5'},
+                {'parent_itm_id': 'P', 'child_itm_id': 'NOPE'},
+            ],
+            sync_type='BOM',
+        )
+        assert (result['created'], result['failed']) == (1, 1)
+        assert MasterBOM.objects.get().quantity == Decimal('2.5')
+
+    def test_derived_fields_are_computed_in_bulk_path(self):
+        self._run([{'itm_id': 'A', 'itm_nm': 'A'}])
+        self._run([{'itm_id': 'A', 'on_hand_qty': 10, 'allocated_qty': 4, 'unit_cost': 3}], sync_type='INVENTORY')
+        inventory = ItemInventory.objects.get()
+        assert inventory.available_qty == Decimal('6')
+        assert inventory.inventory_value == Decimal('30')
+
+    def test_resume_skips_committed_chunks(self):
+        log = ERPSyncLog.objects.create(
+            sync_type='ITEM', sync_status='FAILED', chunk_size=10, committed_chunks=2
+        )
+        rows = [{'itm_id': f'I{i:03d}', 'itm_nm': f'품목{i}'} for i in range(25)]
+        result = self._run(rows, resume_sync_id=log.sync_id)
+
+        assert result['resumed_from_chunk'] == 2
+        assert result['created'] == 5
+        assert MasterItem.objects.count() == 5
+
+
+@pytest.mark.django_db
+class TestDeltaSync:
+    """Tests for row_hash based delta / snapshot sync"""
+
+    def _sync(self, items, mode):
+        from apps.erp.services import ERPDataService
+        return ERPDataService.sync_all_master_data({'items': items}, mode=mode, max_workers=1)
+
+    def test_unchanged_rows_are_skipped(self):
+        items = [{'itm_id': 'A', 'itm_nm': 'A', 'std_ct': 30}, {'itm_id': 'B', 'itm_nm': 'B'}]
+        first = self._sync(items, 'DELTA')
+        assert first['total_created'] == 2
+
+        items[1]['itm_nm'] = 'B2'
+        items[0]['std_ct'] = '30'  # 같은 값 (CSV 문자열)
+        second = self._sync(items, 'DELTA')
+        assert (second['total_updated'], second['total_unchanged']) == (1, 1)
+
+        log = ERPSyncLog.objects.get(sync_id=second['results']['items']['sync_id'])
+        assert (log.sync_mode, log.records_updated, log.records_unchanged) == ('DELTA', 1, 1)
+
+    def test_snapshot_deactivates_missing_rows_and_feeds_changes(self, django_capture_on_commit_callbacks):
+        from apps.erp.models import MasterDataChange
+        from apps.erp.signals import master_data_changed
+
+        self._sync([{'itm_id': 'A', 'itm_nm': 'A'}, {'itm_id': 'B', 'itm_nm': 'B'}], 'SNAPSHOT')
+        received = []
+        handler = lambda sender, **kwargs: received.append(kwargs)  # noqa: E731
+        master_data_changed.connect(handler)
+        try:
+            with django_capture_on_commit_callbacks(execute=True):
+                result = self._sync([{'itm_id': 'A', 'itm_nm': 'A'}], 'SNAPSHOT')
+        finally:
+            master_data_changed.disconnect(handler)
+
+        assert result['total_deactivated'] == 1
+        assert [r['deactivated'] for r in received] == [['B']]
+        assert MasterItem.objects.get(itm_id='B').active_yn == 'N'
+        assert MasterDataChange.objects.filter(change_type='DEACTIVATED').get().entity_key == 'B'
+
+        # 비활성화된 행이 같은 내용으로 돌아오면 재활성화
+        result = self._sync([{'itm_id': 'A', 'itm_nm': 'A'}, {'itm_id': 'B', 'itm_nm': 'B'}], 'SNAPSHOT')
+        assert result['total_updated'] == 1
+        assert MasterItem.objects.get(itm_id='B').active_yn == 'Y'
+
+    def test_snapshot_keeps_rows_that_fail_validation(self):
+        self._sync([{'itm_id': 'A', 'itm_nm': 'A'}, {'itm_id': 'B', 'itm_nm': 'B'}], 'SNAPSHOT')
+
+        # B 는 입력에 있지만 값 오류로 실패 → 기존 행은 비활성화하지 않음
+        result = self._sync([{'itm_id': 'A', 'itm_nm': 'A'}, {'itm_id': 'B', 'itm_nm': 'B', 'std_ct': 'abc'}], 'SNAPSHOT')
+        items = result['results']['items']
+
+        assert (items['status'], items['failed'], items['deactivated']) == ('PARTIAL', 1, 0)
+        assert items['errors'][0]['key'] == ['B']
+        assert MasterItem.objects.get(itm_id='B').active_yn == 'Y'
@@ -0,0 +1,207 @@
+"""
+Unit tests for the MRP engine and BOM explosion cache
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.erp.models import (
+    BOMExplosion,
+    ERPWorkOrder,
+    ItemInventory,
+    MasterBOM,
+    MasterItem,
+    MaterialRequirement,
+)
+from apps.erp.services_mrp import BOMCycleError, BOMExplosionService, BOMGraph, MRPEngine
+
+
+def _items(*codes):
+    for code in codes:
+        MasterItem.objects.create(itm_id=code, itm_nm=code, itm_type='FG')
+
+
+def _bom(parent, child, qty):
+    return MasterBOM.objects.create(parent_item_id=parent, child_item_id=child, quantity=Decimal(qty))
+
+
+def _explosion(root):
+    return {
+        row.component_item_id: row
+        for row in BOMExplosion.objects.filter(root_item_id=root)
+    }
+
+
+class TestBOMGraph:
+    """Tests for level codes and cycle detection"""
+
+    def test_low_level_code_uses_deepest_usage(self):
+        graph = BOMGraph([
+            ('FG', 'SUB', Decimal('1')),
+            ('SUB', 'RM', Decimal('2')),
+            ('FG', 'RM', Decimal('1')),
+        ])
+
+        assert graph.low_level_codes == {'FG': 0, 'SUB': 1, 'RM': 2}
+
+    def test_cycle_is_reported_with_path(self):
+        with pytest.raises(BOMCycleError) as exc:
+            BOMGraph([
+                ('A', 'B', Decimal('1')),
+                ('B', 'C', Decimal('1')),
+                ('C', 'A', Decimal('1')),
+            ])
+
+        assert exc.value.cycle[0] == exc.value.cycle[-1]
+        assert set(exc.value.cycle) == {'A', 'B', 'C'}
+
+
+@pytest.mark.django_db
+class TestBOMExplosionService:
+    """Tests for the cached explosion table"""
+
+    def test_shared_component_quantities_are_summed(self):
+        _items('FG', 'SUB', 'RM')
+        _bom('FG', 'SUB', '2')
+        _bom('SUB', 'RM', '3')
+        _bom('FG', 'RM', '1')
+
+        result = BOMExplosionService.rebuild()
+        rows = _explosion('FG')
+
+        assert result['mode'] == 'FULL'
+        assert rows['RM'].extended_qty == Decimal('7')
+        assert (rows['RM'].min_depth, rows['RM'].max_depth, rows['RM'].low_level_code) == (1, 2, 2)
+        assert _explosion('SUB')['RM'].extended_qty == Decimal('3')
+
+    def test_refresh_reexplodes_only_changed_branch(self):
+        _items('FG', 'SUB', 'RM', 'OTHER', 'RM2')
+        _bom('FG', 'SUB', '2')
+        bom = _bom('SUB', 'RM', '3')
+        _bom('OTHER', 'RM2', '1')
+        BOMExplosionService.rebuild()
+        untouched = _explosion('OTHER')['RM2'].exploded_at
+
+        bom.quantity = Decimal('5')
+        bom.save()
+        result = BOMExplosionService.refresh()
+
+        assert result['mode'] == 'INCREMENTAL'
+        assert result['roots'] == 2
+        assert _explosion('FG')['RM'].extended_qty == Decimal('10')
+        assert _explosion('OTHER')['RM2'].exploded_at == untouched
+        assert BOMExplosionService.refresh()['mode'] == 'NONE'
+
+
+
+@pytest.mark.django_db
+class TestBOMExplodeView:
+    """Tests for the read-only explode endpoint"""
+
+    def test_explode_reads_stored_explosion_until_rebuild(self, authenticated_client):
+        _items('FG', 'SUB', 'RM')
+        _bom('FG', 'SUB', '2')
+        bom = _bom('SUB', 'RM', '3')
+        BOMExplosionService.rebuild()
+        exploded_at = _explosion('FG')['RM'].exploded_at
+
+        bom.quantity = Decimal('5')
+        bom.save()
+        url = reverse('master-bom-explode')
+        response = authenticated_client.get(url, {'item_id': 'FG', 'qty': '2'})
+
+        assert response.status_code == 200
+        rows = {row['component_item']: row for row in response.data}
+        assert Decimal(rows['RM']['extended_qty']) == Decimal('6')
+        assert Decimal(rows['RM']['required_qty']) == Decimal('12')
+        assert _explosion('FG')['RM'].exploded_at == exploded_at
+
+        authenticated_client.post(reverse('erp-mrp-rebuild-explosion'))
+        response = authenticated_client.get(url, {'item_id': 'FG', 'qty': '2'})
+
+        rows = {row['component_item']: row for row in response.data}
+        assert Decimal(rows['RM']['required_qty']) == Decimal('20')
+
+    def test_explode_requires_item_id(self, authenticated_client):
+        assert authenticated_client.get(reverse('master-bom-explode')).status_code == 400
+
+@pytest.mark.django_db
+class TestMRPEngine:
+    """Tests for requirement netting against inventory"""
+
+    def test_stock_is_allocated_by_due_date(self):
+        _items('FG', 'RM')
+        _bom('FG', 'RM', '2')
+        ItemInventory.objects.create(item_id='RM', plant_cd='P1', on_hand_qty=Decimal('25'))
+        now = timezone.now()
+        for wo_no, days in (('WO2', 2), ('WO1', 1), ('WO3', 3)):
+            ERPWorkOrder.objects.create(
+                wo_no=wo_no, item_id='FG', order_qty=Decimal('10'),
+                due_date=now + timedelta(days=days), plant_cd='P1',
+            )
+        ERPWorkOrder.objects.create(
+            wo_no='WO9', item_id='FG', order_qty=Decimal('10'),
+            due_date=now, plant_cd='P1', status='COMPLETED',
+        )
+
+        result = MRPEngine.run()
+        reqs = {r.wo_no: r for r in MaterialRequirement.objects.all()}
+
+        assert result['requirements'] == 3
+        assert result['shortages'] == 2
+        assert reqs['WO1'].allocated_qty == Decimal('20') and reqs['WO1'].status == 'ALLOCATED'
+        assert reqs['WO2'].allocated_qty == Decimal('5') and reqs['WO2'].shortage_qty == Decimal('15')
+        assert reqs['WO3'].status == 'PENDING'
+
+        # 부분 재계산도 전체 작업지시 기준으로 차감
+        MRPEngine.run(wo_nos=['WO2'])
+        assert MaterialRequirement.objects.count() == 3
+        assert MaterialRequirement.objects.get(wo_no='WO2').allocated_qty == Decimal('5')
+
+    def test_intermediate_stock_and_receipts_are_netted_per_level(self):
+        _items('FG', 'SUB', 'RM')
+        _bom('FG', 'SUB', '2')
+        _bom('SUB', 'RM', '3')
+        _bom('FG', 'RM', '1')
+        ItemInventory.objects.create(item_id='SUB', plant_cd='P1', on_hand_qty=Decimal('5'))
+        ItemInventory.objects.create(item_id='RM', plant_cd='P1', on_hand_qty=Decimal('20'))
+        now = timezone.now()
+        # 중간 조립품 작업지시: SUB 입고예정 5 + 자체 RM 소요 15
+        ERPWorkOrder.objects.create(
+            wo_no='WO-SUB', item_id='SUB', order_qty=Decimal('5'),
+            due_date=now + timedelta(days=1), plant_cd='P1',
+        )
+        ERPWorkOrder.objects.create(
+            wo_no='WO-FG', item_id='FG', order_qty=Decimal('10'),
+            due_date=now + timedelta(days=2), plant_cd='P1',
+        )
+
+        MRPEngine.run()
+        reqs = {(r.wo_no, r.item_id): r for r in MaterialRequirement.objects.all()}
+
+        # SUB 총소요 20 - (재고 5 + 입고예정 5) → 순소요 10 만 RM 으로 전개
+        sub = reqs[('WO-FG', 'SUB')]
+        assert (sub.required_qty, sub.allocated_qty, sub.shortage_qty) == (Decimal('20'), Decimal('10'), Decimal('10'))
+        # RM: FG 직접 10 + SUB 순소요 10 × 3 = 40, 먼저 납기인 WO-SUB 가 15 를 할당받고 남은 5
+        rm = reqs[('WO-FG', 'RM')]
+        assert (rm.required_qty, rm.allocated_qty, rm.shortage_qty) == (Decimal('40'), Decimal('5'), Decimal('35'))
+        assert reqs[('WO-SUB', 'RM')].allocated_qty == Decimal('15')
+        assert set(reqs) == {('WO-FG', 'SUB'), ('WO-FG', 'RM'), ('WO-SUB', 'RM')}
+
+    def test_covered_subassembly_does_not_explode(self):
+        _items('FG', 'SUB', 'RM')
+        _bom('FG', 'SUB', '1')
+        _bom('SUB', 'RM', '2')
+        ItemInventory.objects.create(item_id='SUB', plant_cd='P1', on_hand_qty=Decimal('10'))
+        ERPWorkOrder.objects.create(
+            wo_no='WO1', item_id='FG', order_qty=Decimal('10'),
+            due_date=timezone.now(), plant_cd='P1',
+        )
+
+        result = MRPEngine.run()
+
+        assert result['shortages'] == 0
+        assert list(MaterialRequirement.objects.values_list('item_id', 'allocated_qty')) == [('SUB', Decimal('10'))]
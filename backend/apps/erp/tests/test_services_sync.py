@@ -0,0 +1,114 @@
+"""
+Unit tests for the ERP master sync orchestrator
+"""
+import threading
+import time
+import pytest
+from apps.erp.models import MasterWorker, WorkerSkill
+from apps.erp.services import ERPDataService
+from apps.erp.services_sync import (
+    MasterSyncOrchestrator, build_sync_graph, topological_levels, MASTER_SYNC_TYPES,
+)
+
+
+def _payload():
+    return {
+        'worker_skills': [{'worker_cd': 'W1', 'operation_nm': '인쇄', 'skill_level': 5}],
+        'workers': [{'worker_cd': 'W1', 'worker_nm': '홍길동', 'wc_cd': 'WC1', 'shift_cd': 'DAY'}],
+        'shifts': [{'shift_cd': 'DAY', 'shift_nm': '주간', 'start_time': '08:00', 'end_time': '17:00'}],
+        'bom': [{'parent_itm_id': 'P', 'child_itm_id': 'C', 'quantity': 2}],
+        'items': [{'itm_id': 'P', 'itm_nm': '제품'}, {'itm_id': 'C', 'itm_nm': '부품'}],
+        'workcenters': [{'wc_cd': 'WC1', 'wc_nm': 'SMT'}],
+        'plant_calendars': [{'work_date': '2026-01-05'}],
+    }
+
+
+class TestSyncGraph:
+    """Tests for dependency graph construction"""
+
+    def test_levels_respect_references(self):
+        levels = topological_levels(build_sync_graph(MASTER_SYNC_TYPES))
+        position = {t: i for i, level in enumerate(levels) for t in level}
+
+        assert {'ITEM', 'WORKCENTER', 'SHIFT', 'PLANT_CALENDAR'} <= set(levels[0])
+        assert position['BOM'] > position['ITEM']
+        assert position['ROUTING'] > max(position['ITEM'], position['WORKCENTER'])
+        assert position['MACHINE_WORKTIME'] > position['MACHINE'] > position['WORKCENTER']
+        assert position['WORKER_SKILL'] > position['WORKER'] > position['SHIFT']
+
+    def test_dependencies_on_absent_types_are_ignored(self):
+        assert build_sync_graph(['BOM']) == {'BOM': set()}
+
+    def test_cycle_is_rejected(self):
+        with pytest.raises(ValueError):
+            topological_levels({'A': {'B'}, 'B': {'A'}})
+
+
+@pytest.mark.django_db
+class TestSyncAllMasterData:
+    """Tests for sync_all_master_data aggregate results"""
+
+    def test_serial_sync_includes_phase_types(self):
+        result = ERPDataService.sync_all_master_data(_payload(), max_workers=1)
+
+        assert result['success'], result
+        assert result['total_records'] == 8
+        assert result['total_created'] == 8
+        assert set(result['results']) == {
+            'worker_skills', 'workers', 'shifts', 'bom', 'items', 'workcenters', 'plant_calendars'
+        }
+        assert MasterWorker.objects.get().shift_id == 'DAY'
+        assert WorkerSkill.objects.get().efficiency_rate == 130
+
+    def test_sqlite_falls_back_to_serial(self):
+        orchestrator = MasterSyncOrchestrator(_payload(), max_workers=4)
+        assert not orchestrator.uses_threads()
+
+        result = ERPDataService.sync_all_master_data(_payload())
+        assert result['success'], result
+        assert result['total_created'] == 8
+
+
+class TestParallelRun:
+    """Tests for the threaded DAG scheduler (DB 접근 없이 sync_one 대체)"""
+
+    @pytest.fixture
+    def orchestrator(self, monkeypatch):
+        orchestrator = MasterSyncOrchestrator(_payload(), max_workers=3)
+        monkeypatch.setattr(orchestrator, 'uses_threads', lambda: True)
+        orchestrator.events = []
+        orchestrator.fail = set()
+        lock = threading.Lock()
+
+        def sync_one(sync_type):
+            with lock:
+                orchestrator.events.append(('start', sync_type, threading.current_thread().name))
+            time.sleep(0.01)
+            with lock:
+                orchestrator.events.append(('end', sync_type, None))
+            status = 'FAILED' if sync_type in orchestrator.fail else 'SUCCESS'
+            return {'success': status == 'SUCCESS', 'status': status}
+
+        monkeypatch.setattr(orchestrator, 'sync_one', sync_one)
+        return orchestrator
+
+    def test_runs_in_worker_threads_after_dependencies(self, orchestrator):
+        results = orchestrator.run()
+
+        assert set(results) == set(orchestrator.graph)
+        assert all(r['status'] == 'SUCCESS' for r in results.values())
+        position = {(kind, t): i for i, (kind, t, _) in enumerate(orchestrator.events)}
+        for sync_type, deps in orchestrator.graph.items():
+            for dep in deps:
+                assert position[('end', dep)] < position[('start', sync_type)]
+        assert all(name.startswith('erp-sync') for kind, _, name in orchestrator.events if kind == 'start')
+
+    def test_failed_dependency_skips_descendants(self, orchestrator):
+        orchestrator.fail = {'SHIFT'}
+        results = orchestrator.run()
+
+        assert results['SHIFT']['status'] == 'FAILED'
+        assert results['WORKER']['status'] == 'SKIPPED'
+        assert results['WORKER_SKILL']['status'] == 'SKIPPED'
+        assert results['BOM']['status'] == 'SUCCESS'
+        assert ('start', 'WORKER') not in {(kind, t) for kind, t, _ in orchestrator.events}
@@ -12,6 +12,8 @@ from .views import (
     ERPWorkOrderViewSet,
     ERPSyncLogViewSet,
     ERPDataImportViewSet,
+    MasterDataChangeViewSet,
+    MRPViewSet,
 )
 
 router = DefaultRouter()
@@ -22,7 +24,9 @@ router.register(r"bom", MasterBOMViewSet, basename="master-bom")
 router.register(r"routing", MasterRoutingViewSet, basename="master-routing")
 router.register(r"workorders", ERPWorkOrderViewSet, basename="erp-workorder")
 router.register(r"sync-logs", ERPSyncLogViewSet, basename="erp-sync-log")
+router.register(r"changes", MasterDataChangeViewSet, basename="erp-master-change")
 router.register(r"import", ERPDataImportViewSet, basename="erp-import")
+router.register(r"mrp", MRPViewSet, basename="erp-mrp")
 
 urlpatterns = [
     path("", include(router.urls)),
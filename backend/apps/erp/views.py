@@ -5,6 +5,7 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
+from decimal import Decimal, InvalidOperation
 from .models import (
     MasterItem,
     MasterMachine,
@@ -13,6 +14,8 @@ from .models import (
     MasterRouting,
     ERPWorkOrder,
     ERPSyncLog,
+    MasterDataChange,
+    BOMExplosion,
 )
 from .serializers import (
     MasterItemSerializer,
@@ -23,8 +26,22 @@ from .serializers import (
     ERPWorkOrderSerializer,
     ERPSyncLogSerializer,
     ERPDataImportSerializer,
+    MasterDataChangeSerializer,
+    BOMExplosionSerializer,
 )
 from .services import ERPDataService
+from .services_mrp import BOMCycleError, BOMExplosionService, MRPEngine
+from .services_sync import DEFAULT_MAX_WORKERS
+from .services_import import (
+    IMPORT_SPECS,
+    DEFAULT_CHUNK_SIZE,
+    MAX_CHUNK_SIZE,
+    SUPPORTED_FORMATS,
+    SYNC_MODES,
+    StreamingImportService,
+    detect_format,
+    iter_records,
+)
 
 
 class MasterItemViewSet(viewsets.ModelViewSet):
@@ -76,6 +93,37 @@ class MasterBOMViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(boms, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def explode(self, request):
+        """
+        다단계 BOM 전개 (저장된 전개표 조회, 읽기 전용)
+
+        전개표 갱신은 POST /api/erp/mrp/rebuild_explosion/ 또는 MRP 실행 (mrp/run/) 에서 수행
+
+        Query Params:
+            item_id: 모품목 코드 (필수)
+            qty: 모품목 수량 (기본 1)
+        """
+        item_id = request.query_params.get("item_id")
+        if not item_id:
+            return Response(
+                {"error": "item_id parameter is required"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            qty = Decimal(request.query_params.get("qty", "1"))
+        except InvalidOperation:
+            return Response({"error": "qty must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = (
+            BOMExplosion.objects.filter(root_item_id=item_id)
+            .select_related("component_item")
+            .order_by("low_level_code", "component_item_id")
+        )
+        data = BOMExplosionSerializer(rows, many=True).data
+        for row in data:
+            row["required_qty"] = str(Decimal(row["extended_qty"]) * qty)
+        return Response(data)
+
 
 class MasterRoutingViewSet(viewsets.ModelViewSet):
     """라우팅 API"""
@@ -132,6 +180,37 @@ class ERPSyncLogViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ERPSyncLogSerializer
 
 
+class MasterDataChangeViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    마스터 데이터 변경 피드 API
+
+    GET /api/erp/changes/?since=<change_id>&sync_type=ITEM&limit=1000
+    응답의 마지막 change_id 를 다음 요청의 since 로 사용 (APS 캐시 선택적 무효화)
+    """
+
+    serializer_class = MasterDataChangeSerializer
+    max_limit = 5000
+
+    def get_queryset(self):
+        qs = MasterDataChange.objects.all().order_by("change_id")
+        if self.action != "list":
+            return qs
+
+        since = self.request.query_params.get("since")
+        if since:
+            qs = qs.filter(change_id__gt=since)
+
+        sync_type = self.request.query_params.get("sync_type")
+        if sync_type:
+            qs = qs.filter(sync_type=sync_type.upper())
+
+        try:
+            limit = min(int(self.request.query_params.get("limit", 1000)), self.max_limit)
+        except ValueError:
+            limit = 1000
+        return qs[:limit]
+
+
 class ERPDataImportViewSet(viewsets.ViewSet):
     """
     ERP 데이터 일괄 Import API (EMAX → APS DB 저장)
@@ -143,6 +222,7 @@ class ERPDataImportViewSet(viewsets.ViewSet):
     POST /api/erp/import/routing/      - 라우팅 일괄 저장
     POST /api/erp/import/workorders/   - 작업지시 일괄 저장
     POST /api/erp/import/all/          - 전체 기준정보 일괄 저장
+    POST /api/erp/import/stream/       - 대용량 스트리밍 Import (NDJSON/CSV, gzip)
     """
 
     @action(detail=False, methods=["post"])
@@ -279,15 +359,27 @@ class ERPDataImportViewSet(viewsets.ViewSet):
         """
         전체 기준정보 일괄 저장 (EMAX → APS DB)
 
+        Query Params:
+            mode: FULL(기본) / DELTA(변경분만 반영) / SNAPSHOT(변경분 + 누락 행 비활성화)
+            max_workers: 병렬 동기화 스레드 수 (1 이면 직렬)
+
         Request Body:
         {
             "workcenters": [...],
             "items": [...],
             "machines": [...],
             "bom": [...],
-            "routing": [...]
+            "routing": [...],
+            "plant_calendars": [...],
+            "machine_worktimes": [...],
+            "inventory": [...],
+            "shifts": [...],
+            "workers": [...],
+            "worker_skills": [...]
         }
 
+        참조 관계가 없는 유형은 병렬로 동기화됩니다
+
         Response:
         {
             "success": true,
@@ -309,7 +401,24 @@ class ERPDataImportViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        result = ERPDataService.sync_all_master_data(emax_data)
+        mode = request.query_params.get('mode', 'FULL').upper()
+        if mode not in SYNC_MODES:
+            return Response(
+                {'success': False, 'message': f"mode 는 {', '.join(SYNC_MODES)} 중 하나여야 합니다"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            max_workers = int(request.query_params.get('max_workers', DEFAULT_MAX_WORKERS))
+        except ValueError:
+            max_workers = 0
+        if not 1 <= max_workers <= 16:
+            return Response(
+                {'success': False, 'message': 'max_workers 는 1~16 사이여야 합니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = ERPDataService.sync_all_master_data(emax_data, mode=mode, max_workers=max_workers)
 
         message = (
             f"전체 동기화 완료: 총 {result['total_records']}건 "
@@ -317,6 +426,11 @@ class ERPDataImportViewSet(viewsets.ViewSet):
             f"업데이트 {result['total_updated']}건, "
             f"실패 {result['total_failed']}건)"
         )
+        if mode != 'FULL':
+            message += (
+                f" / 미변경 {result['total_unchanged']}건, "
+                f"비활성화 {result['total_deactivated']}건"
+            )
 
         return Response({
             'success': result['success'],
@@ -324,6 +438,102 @@ class ERPDataImportViewSet(viewsets.ViewSet):
             'data': result
         })
 
+    @action(detail=False, methods=["post"])
+    def stream(self, request):
+        """
+        대용량 스트리밍 Import (청크 단위 커밋, 재개 가능)
+
+        Query Params:
+            sync_type: ITEM / MACHINE / WORKCENTER / BOM / ROUTING / WORKORDER /
+                       PLANT_CALENDAR / MACHINE_WORKTIME / INVENTORY / SHIFT / WORKER / WORKER_SKILL
+            input_format: ndjson | csv (생략 시 Content-Type 으로 판단)
+            chunk_size: 청크당 레코드 수 (기본 1000)
+            overwrite: true | false (기본 true)
+            mode: FULL / DELTA / SNAPSHOT (기본 FULL)
+            resume_sync_id: 실패한 동기화 재개 시 sync_id (본문은 처음부터 다시 전송)
+
+        Headers:
+            Content-Type: application/x-ndjson | text/csv
+            Content-Encoding: gzip (선택)
+
+        Body: EMAX 형식 레코드 (NDJSON 한 줄 = 1건, CSV 첫 행 = 헤더)
+        """
+        params = request.query_params
+
+        sync_type = (params.get('sync_type') or '').upper()
+        if sync_type not in IMPORT_SPECS:
+            return Response(
+                {'success': False, 'message': f"sync_type 은 {', '.join(IMPORT_SPECS)} 중 하나여야 합니다"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fmt = detect_format(request.content_type, params.get('input_format'))
+        if fmt not in SUPPORTED_FORMATS:
+            return Response(
+                {'success': False, 'message': '입력 형식은 ndjson 또는 csv 여야 합니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            chunk_size = int(params.get('chunk_size', DEFAULT_CHUNK_SIZE))
+            resume_sync_id = int(params['resume_sync_id']) if params.get('resume_sync_id') else None
+        except ValueError:
+            return Response(
+                {'success': False, 'message': 'chunk_size / resume_sync_id 는 정수여야 합니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+            return Response(
+                {'success': False, 'message': f'chunk_size 는 1~{MAX_CHUNK_SIZE} 범위여야 합니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.stream is None:
+            return Response(
+                {'success': False, 'message': 'Import 할 데이터가 없습니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        compressed = (
+            request.META.get('HTTP_CONTENT_ENCODING', '').lower() == 'gzip'
+            or params.get('compression') == 'gzip'
+        )
+        overwrite = params.get('overwrite', 'true').lower() != 'false'
+        mode = params.get('mode', 'FULL').upper()
+
+        try:
+            result = StreamingImportService.run(
+                iter_records(request.stream, fmt, compressed=compressed),
+                sync_type=sync_type,
+                fmt=fmt,
+                chunk_size=chunk_size,
+                overwrite=overwrite,
+                resume_sync_id=resume_sync_id,
+                mode=mode,
+            )
+        except ValueError as e:
+            return Response({'success': False, 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if result['status'] == 'FAILED':
+            message = (
+                f"{result['committed_chunks']}개 청크 커밋 후 중단: {result['error_message']} "
+                f"(resume_sync_id={result['sync_id']} 로 재개 가능)"
+            )
+        else:
+            message = (
+                f"{sync_type} {result['total']}건 처리 완료 "
+                f"(생성 {result['created']}건, 업데이트 {result['updated']}건, 실패 {result['failed']}건)"
+            )
+
+        return Response(
+            {
+                'success': result['status'] in ('SUCCESS', 'PARTIAL'),
+                'message': message,
+                'data': result,
+            },
+            status=status.HTTP_200_OK if result['status'] != 'FAILED' else status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
     # ==========================================================================
     # Phase 1: 긴급 조치 - 공장 캘린더, 설비 가동시간, 재고 관리
     # ==========================================================================
@@ -722,3 +932,62 @@ class ERPDataImportViewSet(viewsets.ViewSet):
                 operation_nm=operation_nm,
                 defaults=data
             )
+
+
+class MRPViewSet(viewsets.ViewSet):
+    """
+    MRP API
+
+    POST /api/erp/mrp/run/              - 자재소요량 계산 (MaterialRequirement 재생성)
+    POST /api/erp/mrp/rebuild_explosion/ - BOM 전개표 전체 재생성
+    """
+
+    @action(detail=False, methods=["post"])
+    def run(self, request):
+        """
+        자재소요량 계산
+
+        Request Body (선택):
+        {
+            "wo_nos": ["WO001", "WO002"]   // 미지정 시 전체 미완료 작업지시
+        }
+        """
+        wo_nos = request.data.get("wo_nos") if hasattr(request.data, "get") else None
+        if wo_nos is not None and not isinstance(wo_nos, list):
+            return Response(
+                {"success": False, "message": "wo_nos 는 배열이어야 합니다"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            result = MRPEngine.run(wo_nos=wo_nos)
+        except BOMCycleError as e:
+            return Response(
+                {"success": False, "message": str(e), "cycle": e.cycle},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response({
+            "success": True,
+            "message": (
+                f"MRP 완료: 작업지시 {result['work_orders']}건, "
+                f"소요량 {result['requirements']}건 (부족 {result['shortages']}건)"
+            ),
+            "data": result,
+        })
+
+    @action(detail=False, methods=["post"])
+    def rebuild_explosion(self, request):
+        """BOM 전개표 전체 재생성 (BOM 행을 물리 삭제한 경우)"""
+        try:
+            result = BOMExplosionService.rebuild()
+        except BOMCycleError as e:
+            return Response(
+                {"success": False, "message": str(e), "cycle": e.cycle},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response({
+            "success": True,
+            "message": f"BOM 전개 완료: 모품목 {result['roots']}건, 전개행 {result['rows']}건",
+            "data": result,
+        })
@@ -2,7 +2,9 @@
 SPC WebSocket Consumers
 실시간 품질 알림 및 데이터 업데이트
 """
+import asyncio
 import json
+import logging
 from datetime import datetime
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
@@ -10,6 +12,8 @@ from django.db.models import Q
 
 from .models import QualityAlert, QualityMeasurement, Product
 
+logger = logging.getLogger(__name__)
+
 
 class SPCNotificationConsumer(AsyncWebsocketConsumer):
     """SPC 실시간 알림 Consumer"""
@@ -202,3 +206,101 @@ class ProductDataConsumer(AsyncWebsocketConsumer):
             }
             for m in measurements
         ]
+
+
+class ChatbotStreamConsumer(AsyncWebsocketConsumer):
+    """
+    AI 챗봇 토큰 스트리밍 Consumer
+
+    수신: {"type": "chat", "message": "...", "product_id": 1, "session_id": "..."} / {"type": "cancel"}
+    송신: {"type": "token", "content": "..."} ... {"type": "done", ...} 또는 {"type": "error", ...}
+    """
+
+    async def connect(self):
+        """WebSocket 연결"""
+        self.stream_task = None
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        """WebSocket 연결 해제 (진행 중인 생성 취소)"""
+        await self.cancel_stream()
+
+    async def receive(self, text_data):
+        """클라이언트로부터 메시지 수신"""
+        try:
+            data = json.loads(text_data)
+            message_type = data.get("type")
+
+            if message_type == "chat":
+                if not data.get("message"):
+                    raise ValueError("message 가 필요합니다")
+                # 연결당 한 번에 하나의 응답만 생성
+                await self.cancel_stream()
+                self.stream_task = asyncio.ensure_future(self.stream_chat(
+                    data["message"], data.get("product_id"), data.get("session_id")
+                ))
+
+            elif message_type == "cancel":
+                await self.cancel_stream()
+
+        except Exception as e:
+            await self.send(text_data=json.dumps({
+                "type": "error",
+                "message": str(e)
+            }))
+
+    async def cancel_stream(self):
+        task = getattr(self, "stream_task", None)
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.stream_task = None
+
+    async def stream_chat(self, message, product_id, session_id):
+        """
+        LLM 응답 토큰을 생성되는 대로 전송
+
+        백그라운드 태스크로 실행되므로 예외는 여기서 처리: error 프레임 후 done 프레임으로 종료
+        """
+        from .services.llm_service import get_spc_chatbot_service
+
+        intent = None
+        try:
+            intent, context_data, history = await self.prepare_chat(message, product_id, session_id)
+            parts = []
+            async for event in get_spc_chatbot_service().astream_chat(
+                message, intent, context_data, history, product_id
+            ):
+                if event.type == "token":
+                    parts.append(event.content)
+                    await self.send(text_data=json.dumps(
+                        {"type": "token", "content": event.content}, ensure_ascii=False
+                    ))
+                    continue
+
+                payload = {"type": event.type, **event.data, "intent": intent, "session_id": session_id}
+                if session_id:
+                    await self.save_message(session_id, message, "".join(parts) or event.data.get("message", ""))
+                await self.send(text_data=json.dumps(payload, ensure_ascii=False))
+        except Exception as e:
+            logger.exception("Chatbot stream failed (session=%s)", session_id)
+            await self.send(text_data=json.dumps({"type": "error", "message": str(e)}, ensure_ascii=False))
+            await self.send(text_data=json.dumps(
+                {"type": "done", "intent": intent, "session_id": session_id}, ensure_ascii=False
+            ))
+
+    @database_sync_to_async
+    def prepare_chat(self, message, product_id, session_id):
+        """의도 / 컨텍스트 / 대화 이력 (ChatbotViewSet 과 동일)"""
+        from .views import ChatbotViewSet
+
+        return ChatbotViewSet()._prepare_chat(message, product_id, session_id)
+
+    @database_sync_to_async
+    def save_message(self, session_id, message, response):
+        from .views import ChatbotViewSet
+
+        ChatbotViewSet()._save_conversation_message(session_id, message, response)
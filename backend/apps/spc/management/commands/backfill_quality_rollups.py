@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.spc.services.quality_rollups import completed_days, compute_daily_rollup
+
+
+class Command(BaseCommand):
+    help = '제품별 일일 품질 집계 (QualityDailyRollup) 백필'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='시작 일자 (YYYY-MM-DD)')
+        parser.add_argument('--end', help='종료 일자 (YYYY-MM-DD, 포함, 기본: 어제)')
+        parser.add_argument('--days', type=int, default=90, help='--start 미지정 시 종료 일자 기준 일수')
+        parser.add_argument('--force', action='store_true', help='이미 집계된 일자도 다시 계산')
+
+    def handle(self, *args, **options):
+        try:
+            end = date.fromisoformat(options['end']) if options['end'] else timezone.localdate() - timedelta(days=1)
+            start = (
+                date.fromisoformat(options['start']) if options['start']
+                else end - timedelta(days=options['days'] - 1)
+            )
+        except ValueError as e:
+            raise CommandError(f'잘못된 날짜 형식: {e}')
+        if start > end:
+            raise CommandError('--start 가 --end 보다 늦습니다')
+        if end >= timezone.localdate():
+            self.stdout.write(self.style.WARNING('오늘 이후 일자는 완료된 집계로 사용되지 않습니다'))
+
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        done = set() if options['force'] else completed_days(days)
+
+        computed = 0
+        for day in days:
+            if day in done:
+                continue
+            marker = compute_daily_rollup(day)
+            computed += 1
+            self.stdout.write(f'  {day}: {marker.product_count}개 제품, {marker.measurement_count}건')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'일일 집계 백필 완료: {computed}일 계산, {len(days) - computed}일 건너뜀 ({start} ~ {end})'
+        ))
@@ -0,0 +1,130 @@
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from scipy import stats
+
+from apps.spc.services.gage_rr import analyze_studies, anova_gage_rr
+from apps.spc.services.six_sigma_tools import SixSigmaAnalyzer
+
+
+def reference_components(frame: pd.DataFrame, alpha: float) -> dict:
+    """연구 하나의 교차 이원분산분석 분산 성분 (groupby 기반 교과서 계산, 검증용)"""
+    grand = frame['measurement'].mean()
+    p, o = frame['part'].nunique(), frame['operator'].nunique()
+    r = len(frame) // (p * o)
+    ss_total = ((frame['measurement'] - grand) ** 2).sum()
+    ss_part = o * r * ((frame.groupby('part')['measurement'].mean() - grand) ** 2).sum()
+    ss_operator = p * r * ((frame.groupby('operator')['measurement'].mean() - grand) ** 2).sum()
+    ss_cell = r * ((frame.groupby(['part', 'operator'])['measurement'].mean() - grand) ** 2).sum()
+    ss_interaction = ss_cell - ss_part - ss_operator
+    ss_error = ss_total - ss_cell
+
+    df_part, df_operator, df_interaction, df_error = p - 1, o - 1, (p - 1) * (o - 1), p * o * (r - 1)
+    ms_part, ms_operator = ss_part / df_part, ss_operator / df_operator
+    ms_interaction, ms_error = ss_interaction / df_interaction, ss_error / df_error
+    if stats.f.sf(ms_interaction / ms_error, df_interaction, df_error) > alpha:
+        ms_pooled = (ss_interaction + ss_error) / (df_interaction + df_error)
+        repeatability, interaction, denominator = ms_pooled, 0.0, ms_pooled
+    else:
+        repeatability, interaction, denominator = ms_error, max((ms_interaction - ms_error) / r, 0.0), ms_interaction
+    operator = max((ms_operator - denominator) / (p * r), 0.0)
+    part = max((ms_part - denominator) / (o * r), 0.0)
+    return {
+        'repeatability': repeatability,
+        'reproducibility': operator + interaction,
+        'part_to_part': part,
+        'gage_rr': repeatability + operator + interaction,
+    }
+
+
+class Command(BaseCommand):
+    help = '가상 Gage R&R 연구로 일괄 분석 엔진 성능 측정 및 검증'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--studies', type=int, default=5000, help='연구 수')
+        parser.add_argument('--parts', type=int, default=10, help='연구당 부품 수')
+        parser.add_argument('--operators', type=int, default=3, help='연구당 측정자 수')
+        parser.add_argument('--trials', type=int, default=3, help='반복 측정 횟수')
+        parser.add_argument('--verify', type=int, default=200, help='groupby 기준 계산과 비교할 연구 수')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        studies, parts, operators, trials = (
+            options['studies'], options['parts'], options['operators'], options['trials']
+        )
+        if min(studies, parts, operators, trials) < 1 or min(parts, operators, trials) < 2:
+            raise CommandError('parts / operators / trials 는 2 이상, studies 는 1 이상이어야 합니다')
+
+        rng = np.random.default_rng(options['seed'])
+        per_study = parts * operators * trials
+        study = np.repeat(np.arange(studies), per_study)
+        part = np.tile(np.repeat(np.arange(parts), operators * trials), studies)
+        operator = np.tile(np.repeat(np.arange(operators), trials), studies * parts)
+
+        # 연구마다 다른 부품 / 측정자 / 교호작용 / 반복성 표준편차
+        sigma = rng.uniform([0.5, 0.0, 0.0, 0.05], [2.0, 0.3, 0.2, 0.5], size=(studies, 4))
+        part_effect = rng.normal(size=(studies, parts)) * sigma[:, [0]]
+        operator_effect = rng.normal(size=(studies, operators)) * sigma[:, [1]]
+        interaction_effect = rng.normal(size=(studies, parts, operators)) * sigma[:, 2, None, None]
+        values = (
+            10.0 + part_effect[study, part] + operator_effect[study, operator]
+            + interaction_effect[study, part, operator] + rng.normal(size=len(study)) * sigma[study, 3]
+        )
+        self.stdout.write(f'{studies}개 연구, 측정값 {len(values):,}개 ({parts} 부품 × {operators} 측정자 × {trials} 회)')
+
+        started = time.perf_counter()
+        arrays = anova_gage_rr(study, part, operator, values, studies)
+        engine_seconds = time.perf_counter() - started
+        self.stdout.write(f'벡터화 엔진 (배열): {engine_seconds * 1000:.1f} ms')
+
+        payload = [
+            {
+                'key': index,
+                'measurements': [
+                    {'part': f'P{p}', 'operator': f'O{o}', 'measurement': v}
+                    for p, o, v in zip(
+                        part[index * per_study:(index + 1) * per_study].tolist(),
+                        operator[index * per_study:(index + 1) * per_study].tolist(),
+                        values[index * per_study:(index + 1) * per_study].tolist(),
+                    )
+                ],
+            }
+            for index in range(studies)
+        ]
+        started = time.perf_counter()
+        results = analyze_studies(payload, tolerance=6.0)
+        batch_seconds = time.perf_counter() - started
+        self.stdout.write(
+            f'일괄 API (입력 변환 + 결과 dict 포함): {batch_seconds:.2f} s '
+            f'({studies / batch_seconds:,.0f} 연구/s)'
+        )
+
+        sample = min(studies, 200)
+        started = time.perf_counter()
+        for item in payload[:sample]:
+            SixSigmaAnalyzer.gage_rr(item['measurements'], tolerance=6.0)
+        single_seconds = (time.perf_counter() - started) / sample
+        self.stdout.write(
+            f'연구별 호출: {single_seconds * 1000:.2f} ms/연구 → {studies}개 약 {single_seconds * studies:.1f} s'
+        )
+
+        failed = [item for item in results if 'error' in item]
+        if failed:
+            raise CommandError(f'분석 실패 {len(failed)}건: {failed[0]["error"]}')
+
+        worst = 0.0
+        for index in range(min(options['verify'], studies)):
+            frame = pd.DataFrame(payload[index]['measurements'])
+            expected = reference_components(frame, alpha=0.05)
+            for name, value in expected.items():
+                worst = max(worst, abs(arrays[name][index] - value) / max(abs(value), 1e-12))
+        if worst > 1e-6:
+            raise CommandError(f'기준 계산과 불일치: 최대 상대 오차 {worst:.2e}')
+
+        grr = np.array([item['result']['percent_study_variation']['%GRR'] for item in results])
+        self.stdout.write(self.style.SUCCESS(
+            f"검증 완료 (최대 상대 오차 {worst:.1e}), %GRR 중앙값 {np.median(grr):.1f}%, "
+            f"적합 {np.sum(grr < 10)} / 조건부 {np.sum((grr >= 10) & (grr < 30))} / 부적합 {np.sum(grr >= 30)}"
+        ))
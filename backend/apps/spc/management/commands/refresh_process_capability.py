@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.spc.services.capability_batch import NORMALITY_MODES, refresh_capabilities
+
+
+class Command(BaseCommand):
+    help = '활성 제품 / 품질특성 전체 공정능력 일괄 갱신 (야간 배치)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='분석 기간 (일, 기본: CAPABILITY_REFRESH_DAYS)')
+        parser.add_argument('--product', type=int, action='append', dest='products', help='제품 ID (여러 번 지정 가능)')
+        parser.add_argument('--normality', choices=NORMALITY_MODES, default='sampled', help='정규성 검정 방식')
+        parser.add_argument('--sample-size', type=int, help='정규성 검정 그룹당 최대 표본 수')
+        parser.add_argument('--skip-characteristics', action='store_true', help='품질특성 마스터 분석 생략')
+        parser.add_argument('--dry-run', action='store_true', help='ProcessCapability 저장하지 않음')
+
+    def handle(self, *args, **options):
+        if options['days'] is not None and options['days'] < 1:
+            raise CommandError('--days 는 1 이상이어야 합니다')
+        end = timezone.now()
+        start = end - timedelta(days=options['days']) if options['days'] else None
+
+        summary = refresh_capabilities(
+            start=start,
+            end=end,
+            product_ids=options['products'],
+            include_characteristics=not options['skip_characteristics'],
+            normality=options['normality'],
+            sample_size=options['sample_size'],
+            save=not options['dry_run'],
+        )
+
+        products = summary['products']
+        for product_id, error in products['errors'].items():
+            self.stdout.write(self.style.WARNING(f'  제품 {product_id}: {error}'))
+        characteristics = summary['characteristics']
+        if characteristics:
+            for code in characteristics['below_minimum']:
+                self.stdout.write(self.style.WARNING(
+                    f"  {code}: Cpk {characteristics['results'][code]['cpk']:.2f} (최소 기준 미달)"
+                ))
+            self.stdout.write(
+                f"품질특성 {characteristics['analyzed']}개 분석, 목표 미달 {len(characteristics['below_target'])}, "
+                f"최소 미달 {len(characteristics['below_minimum'])}, 데이터 부족 {len(characteristics['errors'])}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"공정능력 갱신 완료: 측정값 {summary['measurements']:,}건, 제품 {products['analyzed']}개 "
+            f"(저장 {products['saved']}), {summary['elapsed_ms']} ms "
+            f"({summary['period']['start']} ~ {summary['period']['end']})"
+        ))
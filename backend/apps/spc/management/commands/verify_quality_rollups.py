@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.spc.models import QualityRollupDay
+from apps.spc.services.quality_rollups import compute_daily_rollup, verify_day
+
+
+class Command(BaseCommand):
+    help = '저장된 일일 품질 집계를 원본 데이터 재계산 결과와 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='시작 일자 (YYYY-MM-DD)')
+        parser.add_argument('--end', help='종료 일자 (YYYY-MM-DD, 포함, 기본: 어제)')
+        parser.add_argument('--days', type=int, default=35, help='--start 미지정 시 종료 일자 기준 일수')
+        parser.add_argument('--tolerance', type=float, default=1e-9, help='합 / 편차 제곱합 상대 허용 오차')
+        parser.add_argument('--fix', action='store_true', help='불일치 일자 다시 계산')
+
+    def handle(self, *args, **options):
+        try:
+            end = date.fromisoformat(options['end']) if options['end'] else timezone.localdate() - timedelta(days=1)
+            start = (
+                date.fromisoformat(options['start']) if options['start']
+                else end - timedelta(days=options['days'] - 1)
+            )
+        except ValueError as e:
+            raise CommandError(f'잘못된 날짜 형식: {e}')
+
+        days = list(QualityRollupDay.objects.filter(
+            rollup_date__gte=start, rollup_date__lte=end
+        ).order_by('rollup_date').values_list('rollup_date', flat=True))
+
+        mismatched = 0
+        for day in days:
+            mismatches = verify_day(day, options['tolerance'])
+            if not mismatches:
+                continue
+            mismatched += 1
+            self.stdout.write(self.style.WARNING(f'{day}: 불일치 {len(mismatches)}건'))
+            for item in mismatches[:10]:
+                self.stdout.write(
+                    f"  product={item['product_id']} {item['field']}: rollup={item['rollup']} raw={item['raw']}"
+                )
+            if options['fix']:
+                compute_daily_rollup(day)
+                self.stdout.write(f'  {day} 다시 계산')
+
+        missing = (end - start).days + 1 - len(days)
+        summary = f'검증 완료: {len(days)}일 중 불일치 {mismatched}일, 미집계 {missing}일 ({start} ~ {end})'
+        if mismatched and not options['fix']:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
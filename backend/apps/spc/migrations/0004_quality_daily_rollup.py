@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-19 07:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("spc", "0003_add_qcost_inspection_spc_qa_models"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QualityRollupDay",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("rollup_date", models.DateField(unique=True)),
+                ("product_count", models.IntegerField(default=0)),
+                ("measurement_count", models.IntegerField(default=0)),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "spc_quality_rollup_day",
+                "ordering": ["-rollup_date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="QualityDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("rollup_date", models.DateField(help_text="집계 일자 (TIME_ZONE 기준)")),
+                ("measurement_count", models.IntegerField(default=0)),
+                ("value_sum", models.FloatField(default=0)),
+                ("value_m2", models.FloatField(default=0, help_text="일자 평균 기준 편차 제곱합")),
+                ("min_value", models.FloatField(blank=True, null=True)),
+                ("max_value", models.FloatField(blank=True, null=True)),
+                ("out_of_spec_count", models.IntegerField(default=0)),
+                ("out_of_control_count", models.IntegerField(default=0)),
+                ("alert_count", models.IntegerField(default=0)),
+                ("alert_priority_counts", models.JSONField(blank=True, default=dict)),
+                ("alert_status_counts", models.JSONField(blank=True, default=dict)),
+                ("alert_type_counts", models.JSONField(blank=True, default=dict)),
+                ("computed_at", models.DateTimeField(auto_now=True)),
+                ("product", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="daily_rollups", to="spc.product")),
+            ],
+            options={
+                "db_table": "spc_quality_daily_rollup",
+                "ordering": ["-rollup_date", "product"],
+                "indexes": [models.Index(fields=["rollup_date"], name="spc_quality_rollup__fe0478_idx")],
+                "constraints": [models.UniqueConstraint(fields=("product", "rollup_date"), name="uq_spc_rollup_product_date")],
+            },
+        ),
+    ]
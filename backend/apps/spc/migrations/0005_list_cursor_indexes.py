@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-19 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spc', '0004_quality_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='qualitymeasurement',
+            index=models.Index(fields=['measured_at'], name='spc_quality_measure_fec540_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runruleviolation',
+            index=models.Index(fields=['detected_at'], name='spc_run_rul_detecte_a166f3_idx'),
+        ),
+    ]
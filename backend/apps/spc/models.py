@@ -102,6 +102,7 @@ class QualityMeasurement(models.Model):
         indexes = [
             models.Index(fields=['product', 'measured_at']),
             models.Index(fields=['subgroup_number']),
+            models.Index(fields=['measured_at']),  # 목록 커서 페이지네이션
         ]
 
     def __str__(self):
@@ -240,6 +241,9 @@ class RunRuleViolation(models.Model):
     class Meta:
         db_table = 'spc_run_rule_violation'
         ordering = ['-detected_at']
+        indexes = [
+            models.Index(fields=['detected_at']),  # 목록 커서 페이지네이션
+        ]
 
     def __str__(self):
         return f"{self.rule_type} - {self.measurement.product.product_code}"
@@ -360,6 +364,66 @@ class QualityReport(models.Model):
         return f"{self.title} ({self.start_date.date()} ~ {self.end_date.date()})"
 
 
+class QualityDailyRollup(models.Model):
+    """
+    제품별 일일 품질 집계 (주간 / 월간 / 사용자 정의 보고서 병합용)
+
+    분산은 일자 평균 기준 편차 제곱합 (value_m2) 으로 저장해 기간 병합 시 합동 분산을 정확히 계산
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_rollups')
+    rollup_date = models.DateField(help_text='집계 일자 (TIME_ZONE 기준)')
+
+    # 측정 통계
+    measurement_count = models.IntegerField(default=0)
+    value_sum = models.FloatField(default=0)
+    value_m2 = models.FloatField(default=0, help_text='일자 평균 기준 편차 제곱합')
+    min_value = models.FloatField(null=True, blank=True)
+    max_value = models.FloatField(null=True, blank=True)
+    out_of_spec_count = models.IntegerField(default=0)
+    out_of_control_count = models.IntegerField(default=0)
+
+    # 경고 건수 (집계 시점 상태 기준)
+    alert_count = models.IntegerField(default=0)
+    alert_priority_counts = models.JSONField(default=dict, blank=True)
+    alert_status_counts = models.JSONField(default=dict, blank=True)
+    alert_type_counts = models.JSONField(default=dict, blank=True)
+
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'spc_quality_daily_rollup'
+        ordering = ['-rollup_date', 'product']
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'rollup_date'], name='uq_spc_rollup_product_date'),
+        ]
+        indexes = [
+            models.Index(fields=['rollup_date']),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} {self.rollup_date} ({self.measurement_count})"
+
+
+class QualityRollupDay(models.Model):
+    """
+    일일 집계 완료 일자
+
+    computed_at 이 해당 일자 종료 이후인 경우에만 보고서에서 집계를 사용하며,
+    과거 일자의 측정 / 경고가 변경되면 signals.py 에서 삭제되어 원본 데이터로 계산된다.
+    """
+    rollup_date = models.DateField(unique=True)
+    product_count = models.IntegerField(default=0)
+    measurement_count = models.IntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'spc_quality_rollup_day'
+        ordering = ['-rollup_date']
+
+    def __str__(self):
+        return f"{self.rollup_date} ({self.product_count} products)"
+
+
 # Import Six Sigma DMAIC Models - Temporarily disabled due to encoding issues
 # from apps.spc.models_six_sigma import (
 #     DMAICProject, DefinePhase, MeasurePhase, AnalyzePhase,
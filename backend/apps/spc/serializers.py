@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from smart_spc.api_mixins import SparseFieldsetMixin
 from .models import (
     Product, InspectionPlan, QualityMeasurement, ControlChart,
     ProcessCapability, RunRuleViolation, QualityAlert, QualityReport
@@ -20,7 +22,7 @@ class InspectionPlanSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class QualityMeasurementSerializer(serializers.ModelSerializer):
+class QualityMeasurementSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.product_name', read_only=True)
     product_code = serializers.CharField(source='product.product_code', read_only=True)
 
@@ -67,7 +69,7 @@ class ProcessCapabilitySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class RunRuleViolationSerializer(serializers.ModelSerializer):
+class RunRuleViolationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     product_code = serializers.CharField(source='measurement.product.product_code', read_only=True)
     chart_type = serializers.CharField(source='control_chart.chart_type', read_only=True)
     measurement_value = serializers.FloatField(source='measurement.measurement_value', read_only=True)
@@ -130,6 +132,49 @@ class ProcessCapabilityAnalysisSerializer(serializers.Serializer):
     chart_type = serializers.ChoiceField(choices=['XBAR_R', 'XBAR_S', 'I_MR'])
 
 
+class ProcessCapabilityBatchSerializer(serializers.Serializer):
+    """공정능력 일괄 분석 요청 Serializer (datasets 또는 product_ids 중 하나)"""
+    datasets = serializers.ListField(
+        child=serializers.DictField(),
+        required=False,
+        allow_empty=False,
+        help_text="[{key, data: [...], usl, lsl, target?, subgroups?: [...]}]"
+    )
+    product_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        help_text="DB 측정 데이터로 분석할 제품 ID 목록"
+    )
+    start_date = serializers.DateTimeField(required=False)
+    end_date = serializers.DateTimeField(required=False)
+    normality = serializers.ChoiceField(choices=['none', 'sampled'], default='sampled')
+    sample_size = serializers.IntegerField(required=False, min_value=3, help_text="정규성 검정 최대 표본 수")
+    save = serializers.BooleanField(default=False, help_text="product_ids 결과를 ProcessCapability 로 저장")
+
+    def validate_datasets(self, value):
+        invalid = []
+        for index, dataset in enumerate(value):
+            data, subgroups = dataset.get('data'), dataset.get('subgroups')
+            try:
+                float(dataset['usl']), float(dataset['lsl'])
+                valid = isinstance(data, list) and (subgroups is None or len(subgroups) == len(data))
+            except (KeyError, TypeError, ValueError):
+                valid = False
+            if not valid:
+                invalid.append(index)
+        if invalid:
+            raise serializers.ValidationError(
+                f"data (list), usl, lsl are required and subgroups must match data length (datasets {invalid[:10]})"
+            )
+        return value
+
+    def validate(self, attrs):
+        if ('datasets' in attrs) == ('product_ids' in attrs):
+            raise serializers.ValidationError("datasets 또는 product_ids 중 하나만 지정해야 합니다")
+        return attrs
+
+
 class ChatRequestSerializer(serializers.Serializer):
     """AI 챗봇 요청 Serializer"""
     message = serializers.CharField(help_text="사용자 메시지")
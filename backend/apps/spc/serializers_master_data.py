@@ -523,3 +523,22 @@ class MESProcessBatchImportSerializer(serializers.Serializer):
     """MES 공정 일괄 Import 시리얼라이저"""
 
     processes = MESProcessImportSerializer(many=True, help_text="공정 데이터 리스트")
+
+
+class GageRRBatchSerializer(serializers.Serializer):
+    """Gage R&R 일괄 분석 시리얼라이저"""
+
+    studies = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        help_text="[{instrument_cd, measurements: [{operator, part, measurement}], tolerance}]"
+    )
+    tolerance = serializers.FloatField(required=False, min_value=0, help_text="기본 공차 (USL - LSL)")
+    alpha = serializers.FloatField(required=False, default=0.05, min_value=0, max_value=1, help_text="교호작용 제거 유의수준")
+    apply = serializers.BooleanField(required=False, default=True, help_text="기구 Gage R&R 결과 / 구성 EV 기여도 반영 여부")
+
+    def validate_studies(self, value):
+        missing = [index for index, study in enumerate(value) if not study.get('instrument_cd')]
+        if missing:
+            raise serializers.ValidationError(f"instrument_cd is required (studies {missing[:10]})")
+        return value
@@ -0,0 +1,393 @@
+"""
+공정능력 일괄 분석 (여러 제품 / 품질특성을 한 번에)
+
+- 입력: 그룹 키 (제품 ID / 품질특성 ID) + 측정값 (+ 부분군 번호) 배열과 그룹별 규격
+- (그룹, 부분군) 순으로 한 번 정렬한 뒤 np.add.reduceat 으로 그룹 / 부분군 구간의 합과 편차 제곱합을 구하고
+  Cp/Cpk/Pp/Ppk, 부분군 내 표준편차 (합동 분산), 예상 PPM 을 그룹 배열 연산으로 계산 (그룹 수만큼 반복하지 않음)
+- 지수는 ProcessCapabilityAnalyzer.analyze 와 같음 (크기 2 이상인 부분군이 없으면 전체 표준편차 사용)
+- 정규성 검정은 선택: 'none' (생략) / 'sampled' (그룹당 최대 N 개 등간격 표본으로 Shapiro-Wilk, 표본 해시 키로 캐시)
+- 야간 갱신 (refresh_capabilities): 기간 내 측정 데이터를 한 번 조회해 활성 제품 전체와 활성 품질특성 전체를 계산,
+  제품 결과는 ProcessCapability 로 bulk_create
+"""
+import hashlib
+import logging
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from scipy import stats
+
+from apps.spc.models import ProcessCapability, Product, QualityMeasurement
+from apps.spc.models_master_data import QualityCharacteristicMaster
+from apps.spc.services.chatbot_cache import get_chatbot_cache
+from apps.spc.services.context_snapshot import invalidate_product_context
+from apps.spc.services.process_capability import ProcessCapabilityResult, strided_sample
+
+logger = logging.getLogger(__name__)
+
+
+NORMALITY_MODES = ('none', 'sampled')
+DEFAULT_NORMALITY_SAMPLE_SIZE = 500
+DEFAULT_REFRESH_DAYS = 30
+NORMALITY_CACHE_PREFIX = 'spc_capability_normality'
+
+Spec = Tuple[float, float, Optional[float]]  # (usl, lsl, target)
+
+
+def normality_sample_size_default() -> int:
+    return getattr(settings, 'CAPABILITY_NORMALITY_SAMPLE_SIZE', DEFAULT_NORMALITY_SAMPLE_SIZE)
+
+
+def _segment_stats(values: np.ndarray, starts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """정렬된 배열의 구간별 (건수, 평균, 편차 제곱합)"""
+    counts = np.diff(np.r_[starts, len(values)])
+    means = np.add.reduceat(values, starts) / counts
+    deviations = values - np.repeat(means, counts)
+    return counts, means, np.add.reduceat(deviations * deviations, starts)
+
+
+def _normality(values: np.ndarray, starts: np.ndarray, counts: np.ndarray, groups: np.ndarray,
+               sample_size: int) -> Dict[int, Tuple[float, float]]:
+    """그룹별 Shapiro-Wilk (등간격 표본), 같은 표본은 캐시 결과 재사용"""
+    timeout = getattr(settings, 'CAPABILITY_NORMALITY_CACHE_TIMEOUT', 0)
+    samples, keys = {}, {}
+    for group in groups:
+        sample = strided_sample(values[starts[group]:starts[group] + counts[group]], sample_size)
+        if len(sample) < 3 or np.ptp(sample) == 0:
+            continue
+        samples[group] = sample
+        keys[group] = f'{NORMALITY_CACHE_PREFIX}:{hashlib.sha1(sample.tobytes()).hexdigest()}'
+
+    cached = cache.get_many(list(keys.values())) if timeout and keys else {}
+    tested, fresh = {}, {}
+    for group, sample in samples.items():
+        outcome = cached.get(keys[group])
+        if outcome is None:
+            statistic, p_value = stats.shapiro(sample)
+            outcome = fresh[keys[group]] = (float(statistic), float(p_value))
+        tested[group] = tuple(outcome)
+    if timeout and fresh:
+        cache.set_many(fresh, timeout)
+    return tested
+
+
+def capability_batch(
+    keys: Sequence,
+    values: Sequence[float],
+    specs: Dict[Any, Spec],
+    subgroups: Optional[Sequence] = None,
+    normality: str = 'sampled',
+    sample_size: Optional[int] = None,
+    alpha: float = 0.05,
+) -> Tuple[Dict[Any, ProcessCapabilityResult], Dict[Any, str]]:
+    """
+    그룹별 공정능력 일괄 계산
+
+    Args:
+        keys: 측정값별 그룹 키 (스칼라: 제품 ID, 품질특성 코드 등)
+        values: 측정값
+        specs: {그룹 키: (usl, lsl, target)}, target 이 None 이면 규격 중심
+        subgroups: 측정값별 부분군 번호 (그룹 안에서 같은 번호끼리 부분군, 없으면 전체 표준편차 사용)
+        normality: 'none' | 'sampled'
+        sample_size: 정규성 검정 표본 수 상한 (기본 CAPABILITY_NORMALITY_SAMPLE_SIZE)
+
+    Returns:
+        (results, errors) - {그룹 키: ProcessCapabilityResult}, {그룹 키: 계산하지 못한 이유}
+    """
+    if normality not in NORMALITY_MODES:
+        raise ValueError(f"normality 는 {', '.join(NORMALITY_MODES)} 중 하나여야 합니다")
+
+    values = np.asarray(values, dtype=float)
+    codes, uniques = pd.factorize(np.asarray(keys))
+    if len(codes) != len(values):
+        raise ValueError("keys 와 values 의 길이가 다릅니다")
+    if subgroups is None:
+        subgroup_codes = np.zeros(len(values), dtype=np.int64)
+    else:
+        subgroup_codes = pd.factorize(np.asarray(subgroups))[0]
+        if len(subgroup_codes) != len(values):
+            raise ValueError("subgroups 와 values 의 길이가 다릅니다")
+
+    finite = np.isfinite(values) & (codes >= 0)
+    codes, subgroup_codes, values = codes[finite], subgroup_codes[finite], values[finite]
+    order = np.lexsort((subgroup_codes, codes))
+    codes, subgroup_codes, values = codes[order], subgroup_codes[order], values[order]
+
+    errors = {key: "최소 2개의 데이터가 필요합니다" for key in specs}
+    if not len(values):
+        return {}, errors
+
+    # 그룹 구간: 평균 / 전체 표준편차 (ddof=1)
+    new_group = np.r_[True, codes[1:] != codes[:-1]]
+    group_starts = np.flatnonzero(new_group)
+    unique_keys = uniques.tolist()  # 결과 dict 키는 numpy 스칼라가 아닌 파이썬 값
+    group_keys = [unique_keys[code] for code in codes[group_starts]]
+    counts, means, m2 = _segment_stats(values, group_starts)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std_overall = np.sqrt(m2 / (counts - 1))
+
+        # 부분군 구간: 그룹별 합동 분산 (크기 1 부분군은 자유도 0 이라 자동 제외)
+        if subgroups is not None:
+            subgroup_starts = np.flatnonzero(new_group | np.r_[True, subgroup_codes[1:] != subgroup_codes[:-1]])
+            subgroup_counts, _, subgroup_m2 = _segment_stats(values, subgroup_starts)
+            owner = np.searchsorted(group_starts, subgroup_starts, side='right') - 1
+            pooled_m2 = np.bincount(owner, weights=subgroup_m2, minlength=len(group_starts))
+            pooled_df = np.bincount(owner, weights=subgroup_counts - 1, minlength=len(group_starts))
+            std_within = np.where(pooled_df > 0, np.sqrt(pooled_m2 / pooled_df), std_overall)
+        else:
+            std_within = std_overall
+
+    spec = np.array(
+        [specs.get(key, (np.nan, np.nan, np.nan)) for key in group_keys], dtype=float
+    ).reshape(-1, 3)
+    usl, lsl, target = spec[:, 0], spec[:, 1], spec[:, 2]
+    target = np.where(np.isnan(target), (usl + lsl) / 2, target)
+
+    has_spec = np.array([key in specs for key in group_keys], dtype=bool)
+    valid = has_spec & (counts >= 2) & (usl > lsl) & (std_overall > 0) & (std_within > 0)
+    for index in np.flatnonzero(~valid):
+        key = group_keys[index]
+        if not has_spec[index]:
+            errors[key] = "규격 (USL / LSL) 이 없습니다"
+        elif counts[index] < 2:
+            errors[key] = "최소 2개의 데이터가 필요합니다"
+        elif not usl[index] > lsl[index]:
+            errors[key] = "USL은 LSL보다 커야 합니다"
+        else:
+            errors[key] = "표준편차가 0입니다 (측정값이 모두 같음)"
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cp = (usl - lsl) / (6 * std_within)
+        cpu = (usl - means) / (3 * std_within)
+        cpl = (means - lsl) / (3 * std_within)
+        cpk = np.minimum(cpu, cpl)
+        pp = (usl - lsl) / (6 * std_overall)
+        ppk = np.minimum((usl - means) / (3 * std_overall), (means - lsl) / (3 * std_overall))
+        ppm_above = stats.norm.sf((usl - means) / std_within) * 1_000_000
+        ppm_below = stats.norm.cdf((lsl - means) / std_within) * 1_000_000
+
+    tested = {}
+    if normality == 'sampled':
+        tested = _normality(
+            values, group_starts, counts, np.flatnonzero(valid), sample_size or normality_sample_size_default()
+        )
+
+    results = {}
+    for index in np.flatnonzero(valid):
+        key = group_keys[index]
+        errors.pop(key, None)
+        statistic, p_value = tested.get(index, (0.0, 1.0))
+        results[key] = ProcessCapabilityResult(
+            cp=float(cp[index]),
+            cpk=float(cpk[index]),
+            cpu=float(cpu[index]),
+            cpl=float(cpl[index]),
+            pp=float(pp[index]),
+            ppk=float(ppk[index]),
+            mean=float(means[index]),
+            std_dev=float(std_within[index]),
+            std_dev_within=float(std_within[index]),
+            std_dev_overall=float(std_overall[index]),
+            sample_size=int(counts[index]),
+            is_normal=bool(p_value > alpha),
+            normality_test='Shapiro-Wilk' if index in tested else '미실시',
+            test_statistic=statistic,
+            p_value=p_value,
+            usl=float(usl[index]),
+            lsl=float(lsl[index]),
+            target=float(target[index]),
+            expected_ppm_above_usl=float(ppm_above[index]),
+            expected_ppm_below_lsl=float(ppm_below[index]),
+            expected_ppm_total=float(ppm_above[index] + ppm_below[index]),
+        )
+    return results, errors
+
+
+def analyze_datasets(datasets: Iterable[Dict], normality: str = 'sampled',
+                     sample_size: Optional[int] = None) -> List[Dict]:
+    """
+    데이터셋 목록 일괄 분석 (API 입력 형식)
+
+    Args:
+        datasets: [{'key', 'data': [...], 'usl', 'lsl', 'target'?, 'subgroups'?: [...]}]
+            subgroups 는 data 와 같은 길이의 부분군 번호
+
+    Returns:
+        [{'key', 'result': {...}} | {'key', 'error': '...'}] (입력 순서)
+    """
+    datasets = list(datasets)
+    keys, values, subgroups, specs = [], [], [], {}
+    for index, dataset in enumerate(datasets):
+        data = dataset['data']
+        keys.append(np.full(len(data), index))
+        values.append(np.asarray(data, dtype=float))
+        subgroups.append(dataset.get('subgroups') or np.arange(len(data)))
+        specs[index] = (dataset['usl'], dataset['lsl'], dataset.get('target'))
+
+    if not datasets:
+        return []
+    results, errors = capability_batch(
+        np.concatenate(keys), np.concatenate(values), specs,
+        subgroups=np.concatenate(subgroups), normality=normality, sample_size=sample_size,
+    )
+    return [
+        {'key': dataset.get('key', index), 'result': asdict(results[index])}
+        if index in results else {'key': dataset.get('key', index), 'error': errors[index]}
+        for index, dataset in enumerate(datasets)
+    ]
+
+
+# ----------------------------------------------------------------------
+# 야간 일괄 갱신 (제품 / 품질특성 전체)
+# ----------------------------------------------------------------------
+
+def _load_measurements(start: datetime, end: datetime, product_ids: Optional[List[int]]) -> pd.DataFrame:
+    rows = QualityMeasurement.objects.filter(
+        measured_at__gte=start, measured_at__lt=end, product__is_active=True
+    )
+    if product_ids:
+        rows = rows.filter(product_id__in=product_ids)
+    return pd.DataFrame.from_records(
+        rows.order_by().values_list(
+            'product_id', 'product__product_code', 'inspection_plan__characteristic',
+            'subgroup_number', 'measurement_value',
+        ).iterator(chunk_size=10000),
+        columns=['product_id', 'product_code', 'characteristic_nm', 'subgroup_number', 'value'],
+    )
+
+
+def _save_product_results(results: Dict[int, ProcessCapabilityResult], start: datetime, end: datetime) -> int:
+    """제품 결과 ProcessCapability 일괄 저장 (bulk_create 는 시그널이 없으므로 챗봇 캐시 직접 무효화)"""
+    ProcessCapability.objects.bulk_create([
+        ProcessCapability(
+            product_id=product_id,
+            cp=result.cp,
+            cpk=result.cpk,
+            cpu=result.cpu,
+            cpl=result.cpl,
+            pp=result.pp,
+            ppk=result.ppk,
+            mean=result.mean,
+            std_deviation=result.std_dev,
+            sample_size=result.sample_size,
+            is_normal=result.is_normal,
+            normality_test_statistic=result.test_statistic if result.normality_test != '미실시' else None,
+            normality_test_p_value=result.p_value if result.normality_test != '미실시' else None,
+            analysis_start=start,
+            analysis_end=end,
+            notes='일괄 갱신',
+        )
+        for product_id, result in results.items()
+    ], batch_size=1000)
+    chatbot_cache = get_chatbot_cache()
+    for product_id in results:
+        invalidate_product_context(product_id)
+        chatbot_cache.invalidate_product(product_id)
+    return len(results)
+
+
+def _characteristic_report(frame: pd.DataFrame, normality: str, sample_size: Optional[int]) -> Dict:
+    """
+    활성 품질특성 전체 공정능력 (규격: 품질특성 마스터, Cpk 목표 / 최소와 비교)
+
+    측정 데이터 연결: 품목 코드 (itm_id) = 제품 코드, 특성명 = 검사 계획의 검사 특성
+    """
+    characteristics = pd.DataFrame.from_records(
+        QualityCharacteristicMaster.objects.filter(
+            active_yn='Y', data_type='CONTINUOUS', item__isnull=False, lsl__isnull=False, usl__isnull=False,
+        ).values_list(
+            'characteristic_cd', 'characteristic_nm', 'item__itm_id', 'lsl', 'usl', 'target',
+            'cpk_target', 'cpk_minimum',
+        ),
+        columns=['characteristic_cd', 'characteristic_nm', 'product_code', 'lsl', 'usl', 'target',
+                 'cpk_target', 'cpk_minimum'],
+    )
+    report = {'analyzed': 0, 'below_target': [], 'below_minimum': [], 'results': {}, 'errors': {}}
+    if characteristics.empty:
+        return report
+
+    specs = {
+        row.characteristic_cd: (float(row.usl), float(row.lsl), float(row.target) if pd.notna(row.target) else None)
+        for row in characteristics.itertuples()
+    }
+    joined = frame.merge(characteristics[['characteristic_cd', 'characteristic_nm', 'product_code']],
+                         on=['product_code', 'characteristic_nm'])
+    results, errors = capability_batch(
+        joined['characteristic_cd'].to_numpy(), joined['value'].to_numpy(), specs,
+        subgroups=joined['subgroup_number'].to_numpy(), normality=normality, sample_size=sample_size,
+    )
+
+    goals = characteristics.set_index('characteristic_cd')[['cpk_target', 'cpk_minimum']]
+    for code, result in results.items():
+        if result.cpk < float(goals.at[code, 'cpk_minimum']):
+            report['below_minimum'].append(code)
+        elif result.cpk < float(goals.at[code, 'cpk_target']):
+            report['below_target'].append(code)
+        report['results'][code] = asdict(result)
+    report['analyzed'] = len(results)
+    report['errors'] = errors
+    return report
+
+
+def refresh_capabilities(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    product_ids: Optional[List[int]] = None,
+    include_characteristics: bool = True,
+    normality: str = 'sampled',
+    sample_size: Optional[int] = None,
+    save: bool = True,
+) -> Dict:
+    """
+    제품 / 품질특성 공정능력 일괄 갱신 (측정 데이터 조회 한 번)
+
+    Args:
+        start, end: 분석 기간 (기본: 최근 CAPABILITY_REFRESH_DAYS 일)
+        product_ids: 지정하면 해당 제품만
+        save: 제품 결과를 ProcessCapability 로 저장
+
+    Returns:
+        {'period', 'measurements', 'products': {...}, 'characteristics': {...}, 'elapsed_ms'}
+    """
+    started = time.perf_counter()
+    end = end or timezone.now()
+    start = start or end - timedelta(days=getattr(settings, 'CAPABILITY_REFRESH_DAYS', DEFAULT_REFRESH_DAYS))
+
+    frame = _load_measurements(start, end, product_ids)
+    products = Product.objects.filter(pk__in=frame['product_id'].unique().tolist())
+    specs = {pk: (usl, lsl, target) for pk, usl, lsl, target in products.values_list('id', 'usl', 'lsl', 'target_value')}
+    results, errors = capability_batch(
+        frame['product_id'].to_numpy(), frame['value'].to_numpy(), specs,
+        subgroups=frame['subgroup_number'].to_numpy(), normality=normality, sample_size=sample_size,
+    )
+    saved = _save_product_results(results, start, end) if save and results else 0
+
+    summary = {
+        'period': {'start': start.isoformat(), 'end': end.isoformat()},
+        'measurements': len(frame),
+        'products': {
+            'analyzed': len(results),
+            'saved': saved,
+            'results': {product_id: asdict(result) for product_id, result in results.items()},
+            'errors': errors,
+        },
+        'characteristics': (
+            _characteristic_report(frame, normality, sample_size) if include_characteristics else None
+        ),
+    }
+    summary['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    characteristics = summary['characteristics'] or {}
+    logger.info(
+        f"공정능력 일괄 갱신: 측정값 {len(frame)}, 제품 {len(results)} (저장 {saved}, 실패 {len(errors)}), "
+        f"품질특성 {characteristics.get('analyzed', 0)} (Cpk 최소 미달 {len(characteristics.get('below_minimum', []))}), "
+        f"{summary['elapsed_ms']} ms"
+    )
+    return summary
@@ -0,0 +1,215 @@
+"""
+SPC 챗봇 응답 캐시
+
+키: (의도, 제품, 정규화된 컨텍스트 지문, 정규화된 질문)
+- 컨텍스트 수치는 유효숫자 CHATBOT_CACHE_SIGNIFICANT_DIGITS 자리로 반올림 → 측정값이 조금 늘어도 같은 키
+- 대화 이력은 키에 포함하지 않음 (이력이 있는 후속 질문은 캐시를 사용하지 않음)
+- 제품별 버전 카운터를 키에 포함, 공정능력 / 경고 / Run Rule 위반 변경 시 버전 증가 (signals.py)
+- 프로세스 내 LRU (L1) → Django cache (L2) 순으로 조회, 적중률 통계 제공
+"""
+import hashlib
+import json
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+KEY_PREFIX = 'spc_chatbot'
+VERSION_TTL = 5.0  # 다른 워커의 버전 증가를 반영하기까지 최대 지연 (초)
+
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_PUNCT = re.compile(r'[\s?!.。？！]+$')
+
+
+def normalize_question(question: str) -> str:
+    """대소문자 / 공백 / 끝 문장부호 차이를 제거한 질문"""
+    text = unicodedata.normalize('NFKC', question or '').lower()
+    text = _WHITESPACE.sub(' ', text).strip()
+    return _TRAILING_PUNCT.sub('', text)
+
+
+def round_significant(value: float, digits: int) -> float:
+    if not value or not math.isfinite(value):
+        return value
+    return round(value, digits - 1 - int(math.floor(math.log10(abs(value)))))
+
+
+def context_fingerprint(context_data: Dict[str, Any], digits: int = 3) -> Dict[str, Any]:
+    """컨텍스트 dict 의 수치를 유효숫자로 반올림한 정렬 가능 사본"""
+    fingerprint = {}
+    for key, value in context_data.items():
+        if isinstance(value, bool) or value is None or isinstance(value, str):
+            fingerprint[key] = value
+        elif isinstance(value, (int, float)) or hasattr(value, '__float__'):
+            fingerprint[key] = round_significant(float(value), digits)
+        else:
+            fingerprint[key] = str(value)
+    return fingerprint
+
+
+class ChatbotResponseCache:
+    """2단계 (LRU → Django cache) 챗봇 응답 캐시"""
+
+    def __init__(
+        self,
+        timeout: Optional[int] = None,
+        lru_size: Optional[int] = None,
+        significant_digits: Optional[int] = None
+    ):
+        self.timeout = timeout or getattr(settings, 'CHATBOT_CACHE_TIMEOUT', 3600)
+        self.lru_size = lru_size or getattr(settings, 'CHATBOT_CACHE_LRU_SIZE', 256)
+        self.digits = significant_digits or getattr(settings, 'CHATBOT_CACHE_SIGNIFICANT_DIGITS', 3)
+
+        self._lru: 'OrderedDict[str, tuple]' = OrderedDict()  # key → (expires_at, entry)
+        self._versions: Dict[Any, tuple] = {}  # product_id → (version, fetched_at)
+        self._lock = threading.Lock()
+
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+    # ------------------------------------------------------------------
+    # 키 / 버전
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _version_key(product_id) -> str:
+        return f"{KEY_PREFIX}:version:{product_id or 0}"
+
+    def version(self, product_id) -> int:
+        """제품 캐시 버전 (짧게 로컬 보관)"""
+        now = time.monotonic()
+        cached = self._versions.get(product_id)
+        if cached and now - cached[1] < VERSION_TTL:
+            return cached[0]
+
+        version = cache.get(self._version_key(product_id))
+        if version is None:
+            # 버전 키가 축출된 경우에도 이전 항목이 되살아나지 않도록 시각 기반 값 사용
+            version = time.time_ns()
+            cache.add(self._version_key(product_id), version, None)
+            version = cache.get(self._version_key(product_id), version)
+        self._versions[product_id] = (version, now)
+        return version
+
+    def make_key(self, intent: str, product_id, context_data: Dict[str, Any], question: str) -> str:
+        payload = json.dumps(
+            [intent, normalize_question(question), context_fingerprint(context_data, self.digits)],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        digest = hashlib.sha1(payload.encode()).hexdigest()
+        return f"{KEY_PREFIX}:{product_id or 0}:{self.version(product_id)}:{intent}:{digest}"
+
+    def invalidate_product(self, product_id):
+        """제품 관련 캐시 무효화 (버전 증가 + 로컬 LRU 정리)"""
+        version = time.time_ns()
+        cache.set(self._version_key(product_id), version, None)
+        prefix = f"{KEY_PREFIX}:{product_id or 0}:"
+        with self._lock:
+            self._versions[product_id] = (version, time.monotonic())
+            for key in [key for key in self._lru if key.startswith(prefix)]:
+                del self._lru[key]
+            self.invalidations += 1
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+
+    def _l1_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._lru.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            self.l1_hits += 1
+            return item[1]
+
+    def _l1_set(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._lru[key] = (time.monotonic() + self.timeout, entry)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def _record_l2(self, key: str, entry: Optional[Dict[str, Any]]):
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return
+        self._l1_set(key, entry)
+        with self._lock:
+            self.l2_hits += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._l1_get(key)
+        if entry is None:
+            entry = cache.get(key)
+            self._record_l2(key, entry)
+        return entry
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._l1_get(key)
+        if entry is None:
+            entry = await cache.aget(key)
+            self._record_l2(key, entry)
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any]):
+        self._l1_set(key, entry)
+        cache.set(key, entry, self.timeout)
+        with self._lock:
+            self.stores += 1
+
+    async def aset(self, key: str, entry: Dict[str, Any]):
+        self._l1_set(key, entry)
+        await cache.aset(key, entry, self.timeout)
+        with self._lock:
+            self.stores += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.l1_hits + self.l2_hits + self.misses
+            return {
+                'lookups': lookups,
+                'l1_hits': self.l1_hits,
+                'l2_hits': self.l2_hits,
+                'misses': self.misses,
+                'hit_rate': (self.l1_hits + self.l2_hits) / lookups if lookups else 0.0,
+                'stores': self.stores,
+                'invalidations': self.invalidations,
+                'l1_size': len(self._lru),
+            }
+
+    def clear_local(self):
+        with self._lock:
+            self._lru.clear()
+            self._versions.clear()
+
+
+_chatbot_cache = None
+_chatbot_cache_lock = threading.Lock()
+
+
+def get_chatbot_cache() -> ChatbotResponseCache:
+    """프로세스 공유 챗봇 캐시"""
+    global _chatbot_cache
+    if _chatbot_cache is None:
+        with _chatbot_cache_lock:
+            if _chatbot_cache is None:
+                _chatbot_cache = ChatbotResponseCache()
+    return _chatbot_cache
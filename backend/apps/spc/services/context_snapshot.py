@@ -0,0 +1,325 @@
+"""
+제품별 챗봇 컨텍스트 스냅샷
+
+챗봇 (LLM / 규칙 기반) 과 AI 프롬프트 실행이 공통으로 쓰는 제품 데이터 묶음을 한 번에 조회해 보관
+- 제품 규격, 최신 공정능력, 최근 7일 경고 / Run Rule 위반 요약, 최근 30일 측정 통계
+- Django cache 에 CHATBOT_SNAPSHOT_TTL 초 동안 보관
+- 공정능력 / 경고 / 위반 변경 시 signals.py 에서 즉시 무효화, 측정 데이터는 TTL 로 반영
+"""
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from apps.spc.models import (
+    Product, QualityMeasurement, ProcessCapability, RunRuleViolation, QualityAlert
+)
+
+logger = logging.getLogger(__name__)
+
+
+ISSUE_WINDOW_DAYS = 7
+MEASUREMENT_WINDOW_DAYS = 30
+RECENT_ITEM_LIMIT = 5
+MIN_TREND_SAMPLES = 30
+DEFAULT_CPK_TARGET = 1.33
+
+_PRIORITY_LABELS = dict(QualityAlert.PRIORITY_CHOICES)
+
+
+@dataclass
+class CapabilitySnapshot:
+    """최신 공정능력 분석 결과"""
+    cp: float
+    cpk: float
+    cpu: float
+    cpl: float
+    pp: Optional[float]
+    ppk: Optional[float]
+    mean: float
+    std_deviation: float
+    sample_size: int
+    is_normal: bool
+    analyzed_at: datetime
+
+
+@dataclass
+class MeasurementStats:
+    """측정 구간 기초 통계 / 추세"""
+    data_count: int = 0
+    mean: float = 0.0
+    std_dev: float = 0.0
+    min_val: float = 0.0
+    max_val: float = 0.0
+    cv: float = 0.0
+    slope: float = 0.0
+    mid_value: float = 0.0
+    oos_count: int = 0
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, within_spec: np.ndarray) -> 'MeasurementStats':
+        n = len(values)
+        if n == 0:
+            return cls()
+        mean = float(values.mean())
+        std = float(values.std())
+        slope = float(np.polyfit(np.arange(n), values, 1)[0]) if n >= 2 else 0.0
+        return cls(
+            data_count=n,
+            mean=mean,
+            std_dev=std,
+            min_val=float(values.min()),
+            max_val=float(values.max()),
+            cv=(std / mean) * 100 if mean != 0 else 0.0,
+            slope=slope,
+            mid_value=float(values[n // 2]),
+            oos_count=int(n - within_spec.sum()),
+        )
+
+
+@dataclass
+class ProductContextSnapshot:
+    """제품 컨텍스트 묶음"""
+    product_id: int
+    product_code: str
+    product_name: str
+    usl: float
+    lsl: float
+    target_value: Optional[float]
+    unit: str
+    capability: Optional[CapabilitySnapshot] = None
+    measurements: MeasurementStats = field(default_factory=MeasurementStats)
+
+    alert_count: int = 0
+    alert_high_priority_count: int = 0
+    alert_type_counts: Dict[str, int] = field(default_factory=dict)
+    recent_alerts: List[Dict[str, Any]] = field(default_factory=list)
+
+    violation_count: int = 0
+    violation_unresolved_count: int = 0
+    violation_type_counts: Dict[str, int] = field(default_factory=dict)
+    recent_violations: List[Dict[str, Any]] = field(default_factory=list)
+
+    min_cpk_target: float = DEFAULT_CPK_TARGET
+    built_at: Optional[datetime] = None
+
+    @property
+    def target(self) -> float:
+        return self.target_value if self.target_value is not None else (self.usl + self.lsl) / 2
+
+    @property
+    def oos_rate(self) -> float:
+        m = self.measurements
+        return m.oos_count / m.data_count if m.data_count else 0.0
+
+    # ------------------------------------------------------------------
+    # LLM 프롬프트 컨텍스트 (PromptTemplates 변수)
+    # ------------------------------------------------------------------
+
+    def llm_context(self, intent: str) -> Dict[str, Any]:
+        """의도별 LLM 프롬프트 템플릿 변수"""
+        context = {
+            'product_name': self.product_name,
+            'product_code': self.product_code,
+        }
+        capability = self.capability
+
+        if intent == 'capability_analysis':
+            if capability:
+                context.update({
+                    'cp': capability.cp,
+                    'cpk': capability.cpk,
+                    'usl': self.usl,
+                    'lsl': self.lsl,
+                    'target': self.target,
+                    'mean': capability.mean,
+                    'std_dev': capability.std_deviation,
+                    'sample_size': capability.sample_size,
+                    'is_normal': 'Yes' if capability.is_normal else 'No',
+                    'oos_rate': self.oos_rate,
+                })
+
+        elif intent == 'troubleshooting':
+            context['alert_count'] = self.alert_count
+            context['violation_count'] = self.violation_count
+            alert_details = [
+                f"- {alert['alert_type']}: {alert['description']} (Priority: {alert['priority_display']})"
+                for alert in self.recent_alerts
+            ]
+            context['alert_details'] = '\n'.join(alert_details) if alert_details else 'No recent alerts'
+            violation_details = [
+                f"- {violation['rule_type']}: {violation['description']}"
+                for violation in self.recent_violations
+            ]
+            context['violation_details'] = (
+                '\n'.join(violation_details) if violation_details else 'No recent violations'
+            )
+
+        elif intent == 'trend_analysis':
+            m = self.measurements
+            if m.data_count >= MIN_TREND_SAMPLES:
+                if abs(m.slope) < 0.0001:
+                    trend, trend_desc = "Stable", "Process is stable"
+                elif m.slope > 0:
+                    trend, trend_desc = "Increasing", f"Measurements trending upward (slope: {m.slope:.6f})"
+                else:
+                    trend, trend_desc = "Decreasing", f"Measurements trending downward (slope: {m.slope:.6f})"
+                context.update({
+                    'data_count': m.data_count,
+                    'mean': m.mean,
+                    'std_dev': m.std_dev,
+                    'min_val': m.min_val,
+                    'max_val': m.max_val,
+                    'cv': m.cv,
+                    'trend': trend,
+                    'slope': m.slope,
+                    'trend_desc': trend_desc,
+                })
+            else:
+                context.update({'data_count': m.data_count, 'mean': 0, 'std_dev': 0})
+
+        elif intent == 'root_cause':
+            context['alert_count'] = self.alert_count
+            issue_patterns = [
+                f"- {alert_type}: {count} occurrences"
+                for alert_type, count in self.alert_type_counts.items()
+            ]
+            context['issue_patterns'] = '\n'.join(issue_patterns) if issue_patterns else 'No patterns identified'
+
+        elif intent == 'improvement':
+            if capability:
+                context.update({
+                    'current_cpk': capability.cpk,
+                    'target_cpk': self.min_cpk_target,
+                    'cpk_gap': self.min_cpk_target - capability.cpk,
+                    'current_ppm': cpk_to_ppm(capability.cpk),
+                    'target_ppm': cpk_to_ppm(self.min_cpk_target),
+                })
+
+        return context
+
+    def prompt_context(self) -> Dict[str, Any]:
+        """AI 프롬프트 입력용 요약 (JSON 직렬화 가능, 조회 시각 제외)"""
+        data = asdict(self)
+        data.pop('built_at')
+        if data['capability']:
+            data['capability']['analyzed_at'] = self.capability.analyzed_at.isoformat()
+        for item in data['recent_alerts'] + data['recent_violations']:
+            for key, value in item.items():
+                if isinstance(value, datetime):
+                    item[key] = value.isoformat()
+        data['oos_rate'] = self.oos_rate
+        return data
+
+
+def cpk_to_ppm(cpk: float) -> float:
+    """Cpk → 양측 불량률 PPM (3σ 가정)"""
+    from scipy.stats import norm
+    return float((1 - norm.cdf(cpk * 3)) * 2 * 1_000_000)
+
+
+# ----------------------------------------------------------------------
+# 스냅샷 생성 / 캐시
+# ----------------------------------------------------------------------
+
+def _snapshot_key(product_id) -> str:
+    return f"spc_chatbot:snapshot:{product_id}"
+
+
+def build_product_context(product_id) -> Optional[ProductContextSnapshot]:
+    """DB 에서 스냅샷 생성 (제품이 없으면 None)"""
+    product = Product.objects.filter(pk=product_id).values(
+        'id', 'product_code', 'product_name', 'usl', 'lsl', 'target_value', 'unit'
+    ).first()
+    if product is None:
+        return None
+
+    now = timezone.now()
+    issue_since = now - timedelta(days=ISSUE_WINDOW_DAYS)
+    snapshot = ProductContextSnapshot(
+        product_id=product['id'],
+        product_code=product['product_code'],
+        product_name=product['product_name'],
+        usl=product['usl'],
+        lsl=product['lsl'],
+        target_value=product['target_value'],
+        unit=product['unit'],
+        min_cpk_target=getattr(settings, 'SPC_MIN_CPK_TARGET', DEFAULT_CPK_TARGET),
+        built_at=now,
+    )
+
+    capability = ProcessCapability.objects.filter(product_id=product_id).order_by('-analyzed_at').values(
+        'cp', 'cpk', 'cpu', 'cpl', 'pp', 'ppk', 'mean', 'std_deviation',
+        'sample_size', 'is_normal', 'analyzed_at'
+    ).first()
+    if capability:
+        snapshot.capability = CapabilitySnapshot(**capability)
+
+    # 경고: 유형별 / 우선순위별 건수 1회 + 최근 목록
+    alerts = QualityAlert.objects.filter(product_id=product_id, created_at__gte=issue_since)
+    for row in alerts.values('alert_type').annotate(
+        count=Count('id'), high=Count('id', filter=Q(priority__gte=3))
+    ).order_by('-count'):
+        snapshot.alert_type_counts[row['alert_type']] = row['count']
+        snapshot.alert_count += row['count']
+        snapshot.alert_high_priority_count += row['high']
+    if snapshot.alert_count:
+        snapshot.recent_alerts = [
+            {**alert, 'priority_display': _PRIORITY_LABELS.get(alert['priority'], alert['priority'])}
+            for alert in alerts.order_by('-created_at').values(
+                'alert_type', 'title', 'description', 'priority', 'status', 'created_at'
+            )[:RECENT_ITEM_LIMIT]
+        ]
+
+    # Run Rule 위반: 규칙별 / 미해결 건수 1회 + 최근 목록
+    violations = RunRuleViolation.objects.filter(
+        control_chart__product_id=product_id, detected_at__gte=issue_since
+    )
+    for row in violations.values('rule_type').annotate(
+        count=Count('id'), unresolved=Count('id', filter=Q(is_resolved=False))
+    ).order_by('-count'):
+        snapshot.violation_type_counts[row['rule_type']] = row['count']
+        snapshot.violation_count += row['count']
+        snapshot.violation_unresolved_count += row['unresolved']
+    if snapshot.violation_count:
+        snapshot.recent_violations = list(violations.order_by('-detected_at').values(
+            'rule_type', 'description', 'severity', 'is_resolved', 'detected_at'
+        )[:RECENT_ITEM_LIMIT])
+
+    # 측정 데이터: 값 / 규격 여부 2열만 조회
+    rows = np.array(
+        QualityMeasurement.objects.filter(
+            product_id=product_id, measured_at__gte=now - timedelta(days=MEASUREMENT_WINDOW_DAYS)
+        ).order_by('measured_at').values_list('measurement_value', 'is_within_spec'),
+        dtype=float,
+    ).reshape(-1, 2)
+    snapshot.measurements = MeasurementStats.from_values(rows[:, 0], rows[:, 1].astype(bool))
+
+    return snapshot
+
+
+def get_product_context(product_id, refresh: bool = False) -> Optional[ProductContextSnapshot]:
+    """캐시된 제품 스냅샷 (없거나 만료 시 생성)"""
+    if not product_id:
+        return None
+    key = _snapshot_key(product_id)
+    if not refresh:
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            return snapshot
+
+    snapshot = build_product_context(product_id)
+    if snapshot is not None:
+        cache.set(key, snapshot, getattr(settings, 'CHATBOT_SNAPSHOT_TTL', 60))
+    return snapshot
+
+
+def invalidate_product_context(product_id):
+    """제품 스냅샷 삭제 (다음 조회 시 재생성)"""
+    cache.delete(_snapshot_key(product_id))
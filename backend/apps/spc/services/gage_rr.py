@@ -0,0 +1,341 @@
+"""
+Gage R&R (교차 이원분산분석, ANOVA 방법)
+
+- 부품 × 측정자 교차 설계 (각 측정자가 각 부품을 r 회 반복 측정, 모든 셀의 반복 수가 같아야 함)
+- 여러 연구 (study) 를 한 번에 계산: 모든 측정값을 (연구, 부품) / (연구, 측정자) / (연구, 부품, 측정자)
+  그룹 코드로 인수분해하고 np.bincount 로 제곱합을 구하므로 연구 수만큼 반복하지 않음
+- 교호작용 p-값이 alpha 보다 크면 교호작용을 반복성 (오차) 에 합쳐서 (pooling) 분산 성분을 다시 계산
+- 판정은 AIAG MSA 기준 %Study Variation (GRR < 10% 적합, < 30% 조건부 적합)
+"""
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from django.utils import timezone
+from scipy import stats
+
+from apps.spc.models_master_data import MeasurementInstrumentMaster, MeasurementSystemComponent
+from apps.spc.services.six_sigma_tools import SixSigmaAnalyzer
+
+
+DEFAULT_INTERACTION_ALPHA = 0.05
+STUDY_VARIATION_SIGMA = 6.0
+ACCEPTABLE_PERCENT = 10.0
+MARGINAL_PERCENT = 30.0
+
+COMPONENTS = ['gage_rr', 'repeatability', 'reproducibility', 'operator', 'interaction', 'part_to_part', 'total']
+PERCENT_LABELS = {
+    'gage_rr': '%GRR',
+    'repeatability': '%Repeatability',
+    'reproducibility': '%Reproducibility',
+    'part_to_part': '%Part-to-Part',
+}
+
+
+class GageStudyError(ValueError):
+    """분석할 수 없는 Gage R&R 연구 데이터"""
+
+
+def acceptance_of(percent_grr: float) -> str:
+    if percent_grr < ACCEPTABLE_PERCENT:
+        return 'Acceptable'
+    if percent_grr < MARGINAL_PERCENT:
+        return 'Marginally Acceptable'
+    return 'Not Acceptable'
+
+
+# ----------------------------------------------------------------------
+# 벡터화 계산
+# ----------------------------------------------------------------------
+
+def _combine(major: np.ndarray, minor: np.ndarray) -> np.ndarray:
+    """(major, minor) 쌍의 그룹 코드 (0 부터 연속)"""
+    minor_codes, minor_uniques = pd.factorize(minor)
+    return pd.factorize(major.astype(np.int64) * len(minor_uniques) + minor_codes)[0]
+
+
+def _group_sums(codes: np.ndarray, deviations: np.ndarray, owners: np.ndarray, n_studies: int):
+    """그룹별 (합², / 건수) 를 연구별로 합산 → Σ n_g (mean_g - mean)², 그룹 수"""
+    counts = np.bincount(codes)
+    sums = np.bincount(codes, weights=deviations)
+    ss = np.bincount(owners, weights=sums ** 2 / counts, minlength=n_studies)
+    groups = np.bincount(owners, minlength=n_studies)
+    return ss, groups, counts
+
+
+def _f_test(ms_num, ms_den, df_num, df_den):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f = np.where(ms_den > 0, ms_num / ms_den, np.where(ms_num > 0, np.inf, np.nan))
+    p = np.where(np.isnan(f), 1.0, stats.f.sf(np.nan_to_num(f, nan=0.0, posinf=1e300), df_num, np.maximum(df_den, 1)))
+    return f, p
+
+
+def anova_gage_rr(study: np.ndarray, part: np.ndarray, operator: np.ndarray, values: np.ndarray,
+                  n_studies: int, alpha: float = DEFAULT_INTERACTION_ALPHA) -> Dict[str, np.ndarray]:
+    """
+    여러 연구의 교차 이원분산분석 Gage R&R
+
+    Args:
+        study: 측정값별 연구 번호 (0 ~ n_studies - 1)
+        part / operator: 측정값별 부품 / 측정자 식별자 (연구 안에서만 의미)
+        values: 측정값
+
+    Returns:
+        연구별 배열 dict (건수, 제곱합 / 자유도 / 평균제곱, F / p, 분산 성분, balanced 여부)
+    """
+    part_code = _combine(study, part)
+    operator_code = _combine(study, operator)
+    cell_code = _combine(part_code, operator_code)
+    part_owner = np.zeros(part_code.max() + 1, dtype=np.int64)
+    part_owner[part_code] = study
+    operator_owner = np.zeros(operator_code.max() + 1, dtype=np.int64)
+    operator_owner[operator_code] = study
+    cell_owner = np.zeros(cell_code.max() + 1, dtype=np.int64)
+    cell_owner[cell_code] = study
+
+    n = np.bincount(study, minlength=n_studies).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.bincount(study, weights=values, minlength=n_studies) / n
+    deviations = values - mean[study]
+
+    ss_total = np.bincount(study, weights=deviations ** 2, minlength=n_studies)
+    ss_part, parts, _ = _group_sums(part_code, deviations, part_owner, n_studies)
+    ss_operator, operators, _ = _group_sums(operator_code, deviations, operator_owner, n_studies)
+    ss_cell, cells, cell_counts = _group_sums(cell_code, deviations, cell_owner, n_studies)
+
+    # 균형 설계: 모든 부품 × 측정자 셀이 있고 반복 수가 같으며 2 이상
+    replicates_min = np.full(n_studies, np.iinfo(np.int64).max)
+    replicates_max = np.zeros(n_studies, dtype=np.int64)
+    np.minimum.at(replicates_min, cell_owner, cell_counts)
+    np.maximum.at(replicates_max, cell_owner, cell_counts)
+    balanced = (
+        (cells == parts * operators) & (replicates_min == replicates_max)
+        & (replicates_min >= 2) & (parts >= 2) & (operators >= 2)
+    )
+    replicates = np.where(balanced, replicates_max, 0).astype(float)
+    p, o, r = parts.astype(float), operators.astype(float), replicates
+
+    ss_interaction = np.maximum(ss_cell - ss_part - ss_operator, 0.0)
+    ss_error = np.maximum(ss_total - ss_cell, 0.0)
+    df_part, df_operator = p - 1, o - 1
+    df_interaction = df_part * df_operator
+    df_error = p * o * (r - 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ms_part = ss_part / df_part
+        ms_operator = ss_operator / df_operator
+        ms_interaction = ss_interaction / df_interaction
+        ms_error = ss_error / df_error
+        f_interaction, p_interaction = _f_test(ms_interaction, ms_error, df_interaction, df_error)
+
+        # 교호작용이 유의하지 않으면 오차항에 합침
+        pooled = p_interaction > alpha
+        df_pooled = df_error + df_interaction
+        ms_pooled = (ss_error + ss_interaction) / df_pooled
+        ms_denominator = np.where(pooled, ms_pooled, ms_interaction)
+        df_denominator = np.where(pooled, df_pooled, df_interaction)
+        f_part, p_part = _f_test(ms_part, ms_denominator, df_part, df_denominator)
+        f_operator, p_operator = _f_test(ms_operator, ms_denominator, df_operator, df_denominator)
+
+        repeatability = np.where(pooled, ms_pooled, ms_error)
+        interaction = np.where(pooled, 0.0, np.maximum((ms_interaction - ms_error) / r, 0.0))
+        operator_var = np.maximum((ms_operator - ms_denominator) / (p * r), 0.0)
+        part_var = np.maximum((ms_part - ms_denominator) / (o * r), 0.0)
+
+    reproducibility = operator_var + interaction
+    gage_rr = repeatability + reproducibility
+    return {
+        'n': n, 'parts': parts, 'operators': operators, 'replicates': replicates, 'balanced': balanced,
+        'ss_part': ss_part, 'ss_operator': ss_operator, 'ss_interaction': ss_interaction,
+        'ss_error': ss_error, 'ss_total': ss_total,
+        'df_part': df_part, 'df_operator': df_operator, 'df_interaction': df_interaction,
+        'df_error': df_error, 'df_pooled': df_pooled,
+        'ms_part': ms_part, 'ms_operator': ms_operator, 'ms_interaction': ms_interaction,
+        'ms_error': ms_error, 'ms_pooled': ms_pooled,
+        'f_part': f_part, 'p_part': p_part, 'f_operator': f_operator, 'p_operator': p_operator,
+        'f_interaction': f_interaction, 'p_interaction': p_interaction, 'pooled': pooled,
+        'gage_rr': gage_rr, 'repeatability': repeatability, 'reproducibility': reproducibility,
+        'operator': operator_var, 'interaction': interaction, 'part_to_part': part_var,
+        'total': gage_rr + part_var,
+    }
+
+
+# ----------------------------------------------------------------------
+# 연구 단위 입출력
+# ----------------------------------------------------------------------
+
+def _finite(value) -> Optional[float]:
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _anova_table(a: Dict[str, np.ndarray], i: int) -> List[Dict]:
+    rows = [
+        ('Part', 'part', a['f_part'][i], a['p_part'][i]),
+        ('Operator', 'operator', a['f_operator'][i], a['p_operator'][i]),
+    ]
+    if a['pooled'][i]:
+        rows.append(('Repeatability', 'pooled', None, None))
+    else:
+        rows.append(('Part * Operator', 'interaction', a['f_interaction'][i], a['p_interaction'][i]))
+        rows.append(('Repeatability', 'error', None, None))
+
+    table = [
+        {
+            'source': source,
+            'df': int(a[f'df_{key}'][i]),
+            'ss': float(a['ss_error'][i] + a['ss_interaction'][i]) if key == 'pooled' else float(a[f'ss_{key}'][i]),
+            'ms': _finite(a[f'ms_{key}'][i]),
+            'f': None if f is None else _finite(f),
+            'p': None if p is None else float(p),
+        }
+        for source, key, f, p in rows
+    ]
+    table.append({'source': 'Total', 'df': int(a['n'][i] - 1), 'ss': float(a['ss_total'][i]),
+                  'ms': None, 'f': None, 'p': None})
+    return table
+
+
+def study_result(a: Dict[str, np.ndarray], i: int, tolerance: Optional[float] = None) -> Dict:
+    """연구 i 의 분석 결과 dict"""
+    variance = {name: float(a[name][i]) for name in COMPONENTS}
+    sigma = {name: float(np.sqrt(value)) for name, value in variance.items()}
+    total, total_sigma = variance['total'], sigma['total']
+
+    def percent(values: Dict[str, float], base: float) -> Dict[str, float]:
+        return {label: round(values[name] / base * 100, 2) if base > 0 else 0.0 for name, label in PERCENT_LABELS.items()}
+
+    percent_study_variation = percent(sigma, total_sigma)
+    percent_grr = percent_study_variation['%GRR']
+    ndc = int(max(1, np.floor(np.sqrt(2) * sigma['part_to_part'] / sigma['gage_rr']))) if sigma['gage_rr'] > 0 else None
+
+    return {
+        'measurement_count': int(a['n'][i]),
+        'operators_count': int(a['operators'][i]),
+        'parts_count': int(a['parts'][i]),
+        'replicates': int(a['replicates'][i]),
+        'interaction_pooled': bool(a['pooled'][i]),
+        'interaction_p_value': float(a['p_interaction'][i]),
+        'anova_table': _anova_table(a, i),
+        'variance_components': {
+            'total_variance': total,
+            'equipment_variation': variance['repeatability'],
+            'appraiser_variation': variance['reproducibility'],
+            'operator_variation': variance['operator'],
+            'interaction_variation': variance['interaction'],
+            'part_to_part_variation': variance['part_to_part'],
+            'gage_rr': variance['gage_rr'],
+        },
+        'study_variation': {name: STUDY_VARIATION_SIGMA * value for name, value in sigma.items()},
+        'percent_contribution': percent(variance, total),
+        'percent_study_variation': percent_study_variation,
+        'percent_tolerance': (
+            percent({name: STUDY_VARIATION_SIGMA * value for name, value in sigma.items()}, tolerance)
+            if tolerance else None
+        ),
+        'ndc': ndc,
+        'acceptance': acceptance_of(percent_grr),
+        'interpretation': SixSigmaAnalyzer._interpret_gage_rr(percent_grr),
+    }
+
+
+def analyze_studies(studies: List[Dict], tolerance: Optional[float] = None,
+                    alpha: float = DEFAULT_INTERACTION_ALPHA) -> List[Dict]:
+    """
+    여러 Gage R&R 연구를 한 번에 분석
+
+    Args:
+        studies: [{'key': ..., 'measurements': [{'operator', 'part', 'measurement'}, ...], 'tolerance': ...}, ...]
+        tolerance: 연구에 tolerance 가 없을 때 적용할 공차 (USL - LSL)
+
+    Returns:
+        studies 순서대로 {'key', 'result'} 또는 {'key', 'error'}
+    """
+    study_codes, parts, operators, values = [], [], [], []
+    errors: Dict[int, str] = {}
+    for index, study in enumerate(studies):
+        try:
+            rows = [(m['part'], m['operator'], float(m['measurement'])) for m in study.get('measurements') or []]
+        except (KeyError, TypeError, ValueError) as e:
+            errors[index] = f'invalid measurement: {e}'
+            continue
+        if not rows:
+            errors[index] = 'no measurements'
+            continue
+        study_codes.extend([index] * len(rows))
+        for part, operator, value in rows:
+            parts.append(str(part))
+            operators.append(str(operator))
+            values.append(value)
+
+    analysis = None
+    if values:
+        values = np.asarray(values, dtype=float)
+        if not np.all(np.isfinite(values)):
+            bad = np.unique(np.asarray(study_codes)[~np.isfinite(values)])
+            errors.update({int(index): 'measurements must be finite numbers' for index in bad})
+            keep = ~np.isin(study_codes, bad)
+            study_codes = np.asarray(study_codes)[keep].tolist()
+            parts = np.asarray(parts, dtype=object)[keep]
+            operators = np.asarray(operators, dtype=object)[keep]
+            values = values[keep]
+        if len(values):
+            analysis = anova_gage_rr(
+                np.asarray(study_codes, dtype=np.int64), np.asarray(parts, dtype=object),
+                np.asarray(operators, dtype=object), values, len(studies), alpha,
+            )
+
+    results = []
+    for index, study in enumerate(studies):
+        key = study.get('key', index)
+        if index in errors:
+            results.append({'key': key, 'error': errors[index]})
+        elif not analysis['balanced'][index]:
+            results.append({
+                'key': key,
+                'error': 'study must be a balanced crossed design: every operator measures every part '
+                         'the same number of times (at least 2 parts, 2 operators, 2 trials)',
+            })
+        else:
+            results.append({'key': key, 'result': study_result(analysis, index, study.get('tolerance') or tolerance)})
+    return results
+
+
+def apply_instrument_results(results: List[Dict], studied_on: Optional[date] = None) -> Dict:
+    """
+    instrument_cd 를 key 로 한 연구 결과를 측정기구 / 측정 시스템 구성에 반영
+
+    - MeasurementInstrumentMaster: gage_rr_last_date, gage_rr_result (%GRR < 30% → PASS)
+    - MeasurementSystemComponent: ev_contribution (반복성 %Contribution)
+    """
+    studied_on = studied_on or timezone.localdate()
+    now = timezone.now()
+    by_code = {item['key']: item['result'] for item in results if 'result' in item}
+    instruments = MeasurementInstrumentMaster.objects.in_bulk(list(by_code), field_name='instrument_cd')
+
+    for code, instrument in instruments.items():
+        result = by_code[code]
+        instrument.gage_rr_last_date = studied_on
+        instrument.updated_at = now
+        instrument.gage_rr_result = (
+            'PASS' if result['percent_study_variation']['%GRR'] < MARGINAL_PERCENT else 'FAIL'
+        )
+    MeasurementInstrumentMaster.objects.bulk_update(
+        list(instruments.values()), ['gage_rr_last_date', 'gage_rr_result', 'updated_at'], batch_size=500
+    )
+
+    ev_by_instrument = {
+        instrument.pk: by_code[code]['percent_contribution']['%Repeatability']
+        for code, instrument in instruments.items()
+    }
+    components = list(MeasurementSystemComponent.objects.filter(instrument_id__in=list(ev_by_instrument)))
+    for component in components:
+        component.ev_contribution = round(ev_by_instrument[component.instrument_id], 2)
+    MeasurementSystemComponent.objects.bulk_update(components, ['ev_contribution'], batch_size=500)
+
+    return {
+        'instruments_updated': len(instruments),
+        'components_updated': len(components),
+        'unknown_instruments': sorted(set(by_code) - set(instruments)),
+    }
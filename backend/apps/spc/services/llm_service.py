@@ -1,18 +1,28 @@
 """
 LLM Service for SPC AI Chatbot
 Supports OpenAI and Anthropic Claude API integrations
+
+Streaming mode runs provider calls on a single background event loop that owns a
+pooled httpx.AsyncClient and a per-provider concurrency limit, and exposes the token
+stream as sync (WSGI) or async (ASGI / Channels) iterators.
 """
 import os
 import json
+import time
+import queue
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Literal
+import threading
+from typing import Dict, List, Any, Optional, Literal, AsyncIterator, Callable, Iterator
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+import httpx
 import requests
 from django.conf import settings
-from django.core.cache import cache
+
+from .chatbot_cache import get_chatbot_cache
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +54,19 @@ class LLMResponse:
     error: Optional[str] = None
 
 
+@dataclass
+class LLMStreamEvent:
+    """Streaming event: 'token' (content delta), 'done' (metadata) or 'error'"""
+    type: Literal["token", "done", "error"]
+    content: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def to_sse(self) -> str:
+        """Format as a server-sent event"""
+        payload = {'content': self.content} if self.type == 'token' else self.data
+        return f"event: {self.type}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
 class PromptTemplates:
     """SPC Chatbot Prompt Templates"""
 
@@ -208,6 +231,132 @@ Provide helpful guidance on statistical process control, quality management, or
 If the question requires specific product data, ask the user to select a product first."""
 
 
+class LLMBusyError(Exception):
+    """Raised when no provider slot frees up within LLM_QUEUE_TIMEOUT"""
+
+
+_STREAM_END = object()
+
+
+class AsyncLLMRunner:
+    """
+    Background event loop for streaming LLM calls
+
+    One daemon thread per process owns the event loop, a pooled httpx.AsyncClient
+    and a semaphore per provider, so concurrent chat streams share keep-alive
+    connections and a provider never sees more than LLM_MAX_CONCURRENCY calls
+    from this process. Async generators run on this loop and are consumed through
+    iterate_sync (WSGI) or iterate_async (ASGI / Channels).
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(
+                        target=loop.run_forever, name="llm-stream-loop", daemon=True
+                    )
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client (only touch from the runner loop)"""
+        if self._client is None:
+            max_connections = getattr(settings, 'LLM_HTTP_MAX_CONNECTIONS', 20)
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(getattr(settings, 'LLM_STREAM_TIMEOUT', 60.0), connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+            )
+        return self._client
+
+    def semaphore(self, provider: str) -> asyncio.Semaphore:
+        """Per-provider concurrency limiter (only touch from the runner loop)"""
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            limits = getattr(settings, 'LLM_MAX_CONCURRENCY', {}) or {}
+            semaphore = asyncio.Semaphore(max(1, int(limits.get(provider, 8))))
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            provider: {'available_slots': semaphore._value}
+            for provider, semaphore in self._semaphores.items()
+        }
+
+    async def _pump(self, agen: AsyncIterator, emit: Callable[[Any], None]):
+        try:
+            async for item in agen:
+                emit(item)
+        except BaseException as e:  # noqa: B036 - forwarded to the consumer
+            if not isinstance(e, asyncio.CancelledError):
+                emit(e)
+            raise
+        finally:
+            await agen.aclose()
+            emit(_STREAM_END)
+
+    def iterate_sync(self, agen: AsyncIterator) -> Iterator:
+        """Consume an async generator from a regular (WSGI) thread"""
+        items: queue.Queue = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._pump(agen, items.put), self.loop)
+        try:
+            while True:
+                item = items.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Client disconnected / generator closed early: stop the provider call
+            if not future.done():
+                future.cancel()
+
+    async def iterate_async(self, agen: AsyncIterator) -> AsyncIterator:
+        """Consume an async generator from another event loop (ASGI / Channels)"""
+        caller_loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+
+        def emit(item):
+            caller_loop.call_soon_threadsafe(items.put_nowait, item)
+
+        future = asyncio.run_coroutine_threadsafe(self._pump(agen, emit), self.loop)
+        try:
+            while True:
+                item = await items.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+
+
+_runner = AsyncLLMRunner()
+
+
+def get_llm_runner() -> AsyncLLMRunner:
+    """Process-wide streaming runner"""
+    return _runner
+
+
 class LLMService:
     """
     Main LLM Service with provider switching
@@ -218,7 +367,8 @@ class LLMService:
         self.provider = self._get_provider()
         self.api_key = self._get_api_key()
         self.model = self._get_model()
-        self.cache_timeout = 3600  # 1 hour
+        self.openai_base = getattr(settings, 'OPENAI_API_BASE', 'https://api.openai.com/v1').rstrip('/')
+        self.anthropic_base = getattr(settings, 'ANTHROPIC_API_BASE', 'https://api.anthropic.com/v1').rstrip('/')
 
     def _get_provider(self) -> LLMProvider:
         """Determine LLM provider from settings"""
@@ -248,7 +398,6 @@ class LLMService:
     def generate_response(
         self,
         messages: List[LLMMessage],
-        use_cache: bool = True,
         temperature: float = 0.7,
         max_tokens: int = 2000
     ) -> LLMResponse:
@@ -257,21 +406,12 @@ class LLMService:
 
         Args:
             messages: List of conversation messages
-            use_cache: Whether to use cached responses
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens to generate
 
         Returns:
             LLMResponse with generated content
         """
-        # Check cache
-        if use_cache and self.provider != LLMProvider.DEMO:
-            cache_key = self._generate_cache_key(messages)
-            cached_response = cache.get(cache_key)
-            if cached_response:
-                logger.info(f"Using cached LLM response for key: {cache_key[:20]}...")
-                return LLMResponse(**cached_response, cached=True)
-
         # Generate response based on provider
         try:
             if self.provider == LLMProvider.OPENAI:
@@ -281,17 +421,6 @@ class LLMService:
             else:
                 response = self._demo_response(messages)
 
-            # Cache successful responses
-            if use_cache and self.provider != LLMProvider.DEMO and not response.error:
-                cache_key = self._generate_cache_key(messages)
-                cache.set(cache_key, {
-                    'content': response.content,
-                    'provider': response.provider.value,
-                    'model': response.model,
-                    'tokens_used': response.tokens_used,
-                    'cost_estimate': response.cost_estimate,
-                }, self.cache_timeout)
-
             return response
 
         except Exception as e:
@@ -313,7 +442,7 @@ class LLMService:
         if not self.api_key:
             raise ValueError("OpenAI API key not configured")
 
-        url = "https://api.openai.com/v1/chat/completions"
+        url = f"{self.openai_base}/chat/completions"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -360,7 +489,7 @@ class LLMService:
         if not self.api_key:
             raise ValueError("Anthropic API key not configured")
 
-        url = "https://api.anthropic.com/v1/messages"
+        url = f"{self.anthropic_base}/messages"
         headers = {
             "x-api-key": self.api_key,
             "Content-Type": "application/json",
@@ -517,11 +646,197 @@ Configure your API key now for intelligent, AI-powered quality management!
             cost_estimate=0.0
         )
 
-    def _generate_cache_key(self, messages: List[LLMMessage]) -> str:
-        """Generate cache key from messages"""
-        import hashlib
-        message_str = json.dumps([{"role": m.role, "content": m.content} for m in messages])
-        return hashlib.md5(message_str.encode()).hexdigest()
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+
+    def stream_response(
+        self,
+        messages: List[LLMMessage],
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Iterator[LLMStreamEvent]:
+        """
+        Stream LLM response tokens (sync iterator for WSGI views)
+
+        Yields 'token' events as the provider produces them, then one 'done'
+        event (provider, model, tokens_used, cost_estimate, cached, ttft_ms,
+        elapsed_ms) or an 'error' event. The provider call runs on the shared
+        runner loop, so the calling thread only relays chunks.
+        """
+        return get_llm_runner().iterate_sync(self._stream_events(messages, temperature, max_tokens))
+
+    def astream_response(
+        self,
+        messages: List[LLMMessage],
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Async variant of stream_response (ASGI views / Channels consumers)"""
+        return get_llm_runner().iterate_async(self._stream_events(messages, temperature, max_tokens))
+
+    async def _stream_events(
+        self,
+        messages: List[LLMMessage],
+        temperature: float,
+        max_tokens: int
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Provider stream → LLMStreamEvent (runs on the runner loop)"""
+        started = time.monotonic()
+        first_token_at = None
+        usage = {'tokens_used': 0, 'cost_estimate': 0.0}
+
+        try:
+            if self.provider == LLMProvider.DEMO:
+                chunks = self._stream_demo(messages, usage)
+            else:
+                semaphore = get_llm_runner().semaphore(self.provider.value)
+                try:
+                    await asyncio.wait_for(
+                        semaphore.acquire(), timeout=getattr(settings, 'LLM_QUEUE_TIMEOUT', 10.0)
+                    )
+                except asyncio.TimeoutError:
+                    raise LLMBusyError(f"{self.provider.value} concurrency limit reached") from None
+                if self.provider == LLMProvider.OPENAI:
+                    chunks = self._stream_openai(messages, temperature, max_tokens, usage)
+                else:
+                    chunks = self._stream_anthropic(messages, temperature, max_tokens, usage)
+
+            try:
+                async for chunk in chunks:
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                    yield LLMStreamEvent('token', chunk)
+            finally:
+                await chunks.aclose()
+                if self.provider != LLMProvider.DEMO:
+                    semaphore.release()
+
+        except Exception as e:
+            logger.error(f"LLM streaming error: {str(e)}")
+            yield LLMStreamEvent('error', data={
+                'error': str(e),
+                'busy': isinstance(e, LLMBusyError),
+                'message': "I apologize, but I'm having trouble connecting to my AI service. Please try again later.",
+            })
+            return
+
+        elapsed = time.monotonic() - started
+        yield LLMStreamEvent('done', data={
+            'provider': self.provider.value,
+            'model': self.model,
+            'tokens_used': usage['tokens_used'],
+            'cost_estimate': usage['cost_estimate'],
+            'cached': False,
+            'ttft_ms': round(((first_token_at or time.monotonic()) - started) * 1000, 1),
+            'elapsed_ms': round(elapsed * 1000, 1),
+        })
+
+    @staticmethod
+    async def _sse_data(response: httpx.Response) -> AsyncIterator[str]:
+        """'data:' payloads of a server-sent-events response"""
+        async for line in response.aiter_lines():
+            if line.startswith('data:'):
+                yield line[5:].strip()
+
+    async def _stream_openai(
+        self,
+        messages: List[LLMMessage],
+        temperature: float,
+        max_tokens: int,
+        usage: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream OpenAI chat completion deltas"""
+        if not self.api_key:
+            raise ValueError("OpenAI API key not configured")
+
+        payload = {
+            "model": self.model,
+            "messages": [{"role": m.role, "content": m.content} for m in messages],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+
+        async with get_llm_runner().client.stream(
+            "POST", f"{self.openai_base}/chat/completions", headers=headers, json=payload
+        ) as response:
+            response.raise_for_status()
+            async for data in self._sse_data(response):
+                if data == '[DONE]':
+                    break
+                chunk = json.loads(data)
+                if chunk.get('usage'):
+                    usage['tokens_used'] = chunk['usage'].get('total_tokens', 0)
+                    usage['cost_estimate'] = (usage['tokens_used'] / 1_000_000) * 0.5
+                for choice in chunk.get('choices') or []:
+                    content = (choice.get('delta') or {}).get('content')
+                    if content:
+                        yield content
+
+    async def _stream_anthropic(
+        self,
+        messages: List[LLMMessage],
+        temperature: float,
+        max_tokens: int,
+        usage: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream Anthropic message text deltas"""
+        if not self.api_key:
+            raise ValueError("Anthropic API key not configured")
+
+        system_message = ""
+        chat_messages = []
+        for msg in messages:
+            if msg.role == "system":
+                system_message = msg.content
+            else:
+                chat_messages.append({"role": msg.role, "content": msg.content})
+
+        payload = {
+            "model": self.model,
+            "messages": chat_messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+        }
+        if system_message:
+            payload["system"] = system_message
+        headers = {"x-api-key": self.api_key, "anthropic-version": "2023-06-01"}
+
+        input_tokens = output_tokens = 0
+        async with get_llm_runner().client.stream(
+            "POST", f"{self.anthropic_base}/messages", headers=headers, json=payload
+        ) as response:
+            response.raise_for_status()
+            async for data in self._sse_data(response):
+                event = json.loads(data)
+                event_type = event.get('type')
+                if event_type == 'content_block_delta':
+                    text = event.get('delta', {}).get('text')
+                    if text:
+                        yield text
+                elif event_type == 'message_start':
+                    input_tokens = event.get('message', {}).get('usage', {}).get('input_tokens', 0)
+                elif event_type == 'message_delta':
+                    output_tokens = event.get('usage', {}).get('output_tokens', output_tokens)
+                elif event_type == 'message_stop':
+                    break
+                elif event_type == 'error':
+                    raise RuntimeError(event.get('error', {}).get('message', 'Anthropic stream error'))
+
+        usage['tokens_used'] = input_tokens + output_tokens
+        usage['cost_estimate'] = (usage['tokens_used'] / 1_000_000) * 9
+
+    async def _stream_demo(self, messages: List[LLMMessage], usage: Dict[str, Any]) -> AsyncIterator[str]:
+        """Replay the demo response in small chunks"""
+        content = self._demo_response(messages).content
+        words = content.split(' ')
+        for i in range(0, len(words), 8):
+            yield ' '.join(words[i:i + 8]) + (' ' if i + 8 < len(words) else '')
+            await asyncio.sleep(0)
 
     def build_messages(
         self,
@@ -574,13 +889,15 @@ class SPCChatbotService:
 
     def __init__(self):
         self.llm_service = LLMService()
+        self.cache = get_chatbot_cache()
 
     def chat(
         self,
         user_message: str,
         intent: str,
         context_data: Dict[str, Any],
-        conversation_history: List[Dict[str, str]] = None
+        conversation_history: List[Dict[str, str]] = None,
+        product_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Generate chatbot response
@@ -590,10 +907,146 @@ class SPCChatbotService:
             intent: Detected intent (capability_analysis, troubleshooting, etc.)
             context_data: SPC data context (product info, statistics, etc.)
             conversation_history: Optional conversation history
+            product_id: Product the context was built for (cache scope)
 
         Returns:
             Response dict with content and metadata
         """
+        cache_key = self._cache_key(user_message, intent, context_data, conversation_history, product_id)
+        if cache_key:
+            cached_response = self.cache.get(cache_key)
+            if cached_response:
+                return {**self._result_from_cache(cached_response), 'error': None}
+
+        messages = self._build_chat_messages(user_message, intent, context_data, conversation_history)
+
+        # Generate response
+        llm_response = self.llm_service.generate_response(messages)
+
+        if cache_key and not llm_response.error:
+            self.cache.set(cache_key, {
+                'content': llm_response.content,
+                'provider': llm_response.provider.value,
+                'model': llm_response.model,
+                'tokens_used': llm_response.tokens_used,
+                'cost_estimate': llm_response.cost_estimate,
+            })
+
+        return {
+            'response': llm_response.content,
+            'provider': llm_response.provider.value,
+            'model': llm_response.model,
+            'tokens_used': llm_response.tokens_used,
+            'cost_estimate': llm_response.cost_estimate,
+            'cached': llm_response.cached,
+            'error': llm_response.error,
+        }
+
+    def stream_chat(
+        self,
+        user_message: str,
+        intent: str,
+        context_data: Dict[str, Any],
+        conversation_history: List[Dict[str, str]] = None,
+        product_id: Optional[int] = None
+    ) -> Iterator[LLMStreamEvent]:
+        """Stream chatbot response events (see LLMService.stream_response)"""
+        cache_key = self._cache_key(user_message, intent, context_data, conversation_history, product_id)
+        if cache_key:
+            cached_response = self.cache.get(cache_key)
+            if cached_response:
+                yield from self._cached_events(cached_response)
+                return
+
+        messages = self._build_chat_messages(user_message, intent, context_data, conversation_history)
+        parts = []
+        for event in self.llm_service.stream_response(messages):
+            if event.type == 'token':
+                parts.append(event.content)
+            elif event.type == 'done' and cache_key:
+                self.cache.set(cache_key, self._cache_entry(''.join(parts), event.data))
+            yield event
+
+    async def astream_chat(
+        self,
+        user_message: str,
+        intent: str,
+        context_data: Dict[str, Any],
+        conversation_history: List[Dict[str, str]] = None,
+        product_id: Optional[int] = None
+    ) -> AsyncIterator[LLMStreamEvent]:
+        """Async variant of stream_chat"""
+        cache_key = self._cache_key(user_message, intent, context_data, conversation_history, product_id)
+        if cache_key:
+            cached_response = await self.cache.aget(cache_key)
+            if cached_response:
+                for event in self._cached_events(cached_response):
+                    yield event
+                return
+
+        messages = self._build_chat_messages(user_message, intent, context_data, conversation_history)
+        parts = []
+        async for event in self.llm_service.astream_response(messages):
+            if event.type == 'token':
+                parts.append(event.content)
+            elif event.type == 'done' and cache_key:
+                await self.cache.aset(cache_key, self._cache_entry(''.join(parts), event.data))
+            yield event
+
+    def _cache_key(
+        self,
+        user_message: str,
+        intent: str,
+        context_data: Dict[str, Any],
+        conversation_history: Optional[List[Dict[str, str]]],
+        product_id: Optional[int]
+    ) -> Optional[str]:
+        """
+        Normalized cache key, or None when the response should not be cached
+
+        Demo responses are free, and follow-up questions depend on the conversation
+        history, which is deliberately not part of the key.
+        """
+        if (self.llm_service.provider == LLMProvider.DEMO or conversation_history
+                or not getattr(settings, 'CHATBOT_CACHE_ENABLED', True)):
+            return None
+        return self.cache.make_key(intent, product_id, context_data, user_message)
+
+    @staticmethod
+    def _cache_entry(content: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'content': content,
+            'provider': data['provider'],
+            'model': data['model'],
+            'tokens_used': data['tokens_used'],
+            'cost_estimate': data['cost_estimate'],
+        }
+
+    @staticmethod
+    def _result_from_cache(cached_response: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'response': cached_response['content'],
+            'provider': cached_response['provider'],
+            'model': cached_response['model'],
+            'tokens_used': cached_response['tokens_used'],
+            'cost_estimate': cached_response['cost_estimate'],
+            'cached': True,
+        }
+
+    @classmethod
+    def _cached_events(cls, cached_response: Dict[str, Any]) -> Iterator[LLMStreamEvent]:
+        result = cls._result_from_cache(cached_response)
+        yield LLMStreamEvent('token', result.pop('response'))
+        yield LLMStreamEvent('done', data={**result, 'ttft_ms': 0.0, 'elapsed_ms': 0.0})
+
+    def _build_chat_messages(
+        self,
+        user_message: str,
+        intent: str,
+        context_data: Dict[str, Any],
+        conversation_history: List[Dict[str, str]] = None
+    ) -> List[LLMMessage]:
+        """Select the intent template and build the prompt messages"""
         # Select template based on intent
         template_map = {
             'capability_analysis': PromptTemplates.CAPABILITY_ANALYSIS_TEMPLATE,
@@ -613,25 +1066,12 @@ class SPCChatbotService:
         }
 
         # Build messages
-        messages = self.llm_service.build_messages(
+        return self.llm_service.build_messages(
             template=template,
             context=context,
             conversation_history=conversation_history
         )
 
-        # Generate response
-        llm_response = self.llm_service.generate_response(messages)
-
-        return {
-            'response': llm_response.content,
-            'provider': llm_response.provider.value,
-            'model': llm_response.model,
-            'tokens_used': llm_response.tokens_used,
-            'cost_estimate': llm_response.cost_estimate,
-            'cached': llm_response.cached,
-            'error': llm_response.error,
-        }
-
     def get_provider_status(self) -> Dict[str, Any]:
         """Get current LLM provider status"""
         return {
@@ -641,6 +1081,10 @@ class SPCChatbotService:
             'api_key_set': bool(self.llm_service.api_key),
         }
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Response cache hit-rate metrics (this process)"""
+        return self.cache.stats()
+
 
 # Singleton instance
 _spc_chatbot_service = None
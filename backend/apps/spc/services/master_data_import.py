@@ -0,0 +1,209 @@
+"""
+ERP / MES 기준정보 일괄 Import (set 기반 upsert)
+
+- 키 (itm_id / process_cd) 를 청크 단위로 한 번에 조회해 신규 / 변경 / 변경 없음으로 분류
+- 신규는 bulk_create, 변경된 행은 바뀐 필드만 bulk_update, 변경 없는 행은 동기화 시각만 UPDATE 한 번
+- 청크마다 별도 트랜잭션으로 커밋하고 진행 상황을 QualitySyncLog.sync_details 에 기록
+- 청크가 실패하면 그 청크만 행 단위 (savepoint) 로 다시 처리해 잘못된 행만 제외하고 키별 오류를 기록 (→ PARTIAL)
+- 결과 건수는 update_or_create 를 순서대로 호출했을 때와 같음 (같은 키가 여러 번 오면 마지막 값 적용)
+"""
+import logging
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.spc.models_master_data import QualitySyncLog
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def chunk_size_default() -> int:
+    return getattr(settings, 'MASTER_DATA_IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def _upsert_chunk(model, key_field: str, rows: Dict[str, dict], sync_ts_field: str, now) -> Dict:
+    """한 청크 upsert (호출자가 트랜잭션 관리)"""
+    existing = model.objects.in_bulk(list(rows), field_name=key_field)
+
+    to_create, to_update, unchanged = [], [], []
+    changed_fields = set()
+    for key, data in rows.items():
+        values = {**data, 'active_yn': 'Y'}
+        instance = existing.get(key)
+        if instance is None:
+            to_create.append(model(**values, **{sync_ts_field: now}))
+            continue
+
+        changed = [name for name, value in values.items() if getattr(instance, name) != value]
+        if not changed:
+            unchanged.append(instance.pk)
+            continue
+        for name in changed:
+            setattr(instance, name, values[name])
+        setattr(instance, sync_ts_field, now)
+        instance.updated_at = now
+        changed_fields.update(changed)
+        to_update.append(instance)
+
+    if to_create:
+        model.objects.bulk_create(to_create)
+    if to_update:
+        model.objects.bulk_update(to_update, sorted(changed_fields) + [sync_ts_field, 'updated_at'])
+    if unchanged:
+        model.objects.filter(pk__in=unchanged).update(**{sync_ts_field: now})
+
+    return {'created': len(to_create), 'changed': len(to_update), 'unchanged': len(unchanged)}
+
+
+def _try_upsert(model, key_field: str, rows: Dict[str, dict], sync_ts_field: str, now,
+                label: str) -> Tuple[Optional[Dict], Optional[Exception]]:
+    """
+    _upsert_chunk 를 트랜잭션 (외부 트랜잭션 안이면 savepoint) 으로 실행 → (건수, 오류)
+
+    다른 Import 가 같은 키를 먼저 생성하면 유니크 제약 위반 → 한 번 더 시도
+    """
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                return _upsert_chunk(model, key_field, rows, sync_ts_field, now), None
+        except IntegrityError as e:
+            if attempt:
+                return None, e
+            logger.info(f"{model.__name__} Import {label} 키 충돌, 재시도")
+        except Exception as e:
+            return None, e
+    return None, None
+
+
+def bulk_upsert(model, key_field: str, records: List[dict], sync_log: QualitySyncLog,
+                sync_ts_field: str, chunk_size: Optional[int] = None) -> Dict:
+    """
+    기준정보 일괄 upsert
+
+    Args:
+        model: QualityItemMaster / QualityProcessMaster
+        key_field: 업무 키 필드 (itm_id / process_cd)
+        records: 검증된 레코드 목록
+        sync_log: 진행 상황을 기록할 동기화 로그 (생성된 상태)
+        sync_ts_field: 동기화 시각 필드 (erp_sync_ts / mes_sync_ts)
+
+    Returns:
+        {'total', 'created', 'updated', 'unchanged', 'failed', 'errors', 'chunks'}
+        updated 는 기존 행 수 (변경 없음 포함), unchanged 는 그중 값이 같았던 행 수,
+        errors 는 실패한 키별 {'chunk', 'key', 'records', 'error'}
+    """
+    chunk_size = chunk_size or chunk_size_default()
+
+    # 입력 순서를 유지하며 키별 마지막 값으로 병합
+    merged: Dict[str, dict] = {}
+    for record in records:
+        merged[record[key_field]] = {**merged.get(record[key_field], {}), **record}
+    keys = list(merged)
+    occurrences = Counter(record[key_field] for record in records)
+
+    result = {
+        'total': len(records),
+        'created': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'failed': 0,
+        'errors': [],
+        'chunks': [],
+    }
+    for index, start in enumerate(range(0, len(keys), chunk_size)):
+        chunk_keys = keys[start:start + chunk_size]
+        started = time.perf_counter()
+        now = timezone.now()
+        counts, error = _try_upsert(
+            model, key_field, {key: merged[key] for key in chunk_keys}, sync_ts_field, now, f"청크 {index}"
+        )
+
+        if counts is None:
+            # 청크 전체가 롤백됨 → 행 단위로 다시 처리해 실패한 키만 제외
+            logger.warning(f"{model.__name__} Import 청크 {index} 실패, 행 단위 재처리: {error}")
+            counts = {'created': 0, 'changed': 0, 'unchanged': 0}
+            succeeded_keys, failed_keys = [], []
+            for key in chunk_keys:
+                row_counts, row_error = _try_upsert(model, key_field, {key: merged[key]}, sync_ts_field, now, key)
+                if row_counts is None:
+                    failed_keys.append(key)
+                    result['errors'].append({
+                        'chunk': index,
+                        'key': key,
+                        'records': occurrences[key],
+                        'error': str(row_error),
+                    })
+                    logger.error(f"{model.__name__} Import {key_field}={key} 실패: {row_error}")
+                    continue
+                succeeded_keys.append(key)
+                for name in counts:
+                    counts[name] += row_counts[name]
+        else:
+            succeeded_keys, failed_keys = chunk_keys, []
+
+        # 같은 키가 여러 번 온 경우 update_or_create 순차 호출과 같이 두 번째부터는 갱신으로 집계
+        repeated = sum(occurrences[key] for key in succeeded_keys) - len(succeeded_keys)
+        counts['failed'] = sum(occurrences[key] for key in failed_keys)
+        result['created'] += counts['created']
+        result['updated'] += counts['changed'] + counts['unchanged'] + repeated
+        result['unchanged'] += counts['unchanged']
+        result['failed'] += counts['failed']
+
+        result['chunks'].append({
+            'chunk': index,
+            'records': len(chunk_keys),
+            **counts,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        })
+        sync_log.records_success = result['created'] + result['updated']
+        sync_log.records_failed = result['failed']
+        sync_log.sync_details = {**result, 'processed': start + len(chunk_keys), 'unique_keys': len(keys)}
+        sync_log.save(update_fields=['records_success', 'records_failed', 'sync_details'])
+
+    return result
+
+
+def run_import(model, key_field: str, records: List[dict], sync_type: str, sync_source: str,
+               sync_ts_field: str) -> Dict:
+    """동기화 로그를 만들고 bulk_upsert 실행 후 최종 상태 기록"""
+    sync_log = QualitySyncLog.objects.create(
+        sync_type=sync_type,
+        sync_source=sync_source,
+        sync_status='SUCCESS',
+        records_total=len(records),
+        sync_start_ts=timezone.now(),
+    )
+
+    try:
+        result = bulk_upsert(model, key_field, records, sync_log, sync_ts_field)
+    except Exception as e:
+        sync_log.sync_status = 'FAILED'
+        sync_log.error_message = str(e)
+        sync_log.sync_end_ts = timezone.now()
+        sync_log.save()
+        raise
+
+    succeeded = result['created'] + result['updated']
+    if not result['failed']:
+        sync_log.sync_status = 'SUCCESS'
+    else:
+        sync_log.sync_status = 'PARTIAL' if succeeded else 'FAILED'
+        sync_log.error_message = '; '.join(f"{error['key']}: {error['error']}" for error in result['errors'][:5])
+    sync_log.records_success = succeeded
+    sync_log.records_failed = result['failed']
+    sync_log.sync_end_ts = timezone.now()
+    sync_log.sync_details = result
+    sync_log.save()
+
+    logger.info(
+        f"{sync_source} {sync_type} Import: 신규 {result['created']}, 갱신 {result['updated']} "
+        f"(변경 없음 {result['unchanged']}), 실패 {result['failed']} / {result['total']}"
+    )
+    return result
@@ -8,6 +8,18 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 
+# Shapiro-Wilk p-값이 정확한 최대 표본 수 (scipy), 초과 시 등간격 표본으로 검정
+NORMALITY_MAX_SAMPLES = 5000
+
+
+def strided_sample(data, max_samples: int) -> np.ndarray:
+    """등간격 표본 추출 (결정적: 같은 데이터면 같은 표본)"""
+    values = np.asarray(data, dtype=float)
+    if max_samples <= 0 or len(values) <= max_samples:
+        return values
+    return values[(np.arange(max_samples) * len(values)) // max_samples]
+
+
 @dataclass
 class ProcessCapabilityResult:
     """공정능력 분석 결과"""
@@ -57,7 +69,8 @@ class ProcessCapabilityAnalyzer:
         usl: float,
         lsl: float,
         target: Optional[float] = None,
-        subgroup_data: Optional[List[List[float]]] = None
+        subgroup_data: Optional[List[List[float]]] = None,
+        check_normality: bool = True
     ) -> ProcessCapabilityResult:
         """
         공정능력 분석 수행
@@ -68,6 +81,7 @@ class ProcessCapabilityAnalyzer:
             lsl: Lower Specification Limit
             target: 목표값 (없으면 규격 중심값)
             subgroup_data: 부분군 데이터 (Cp/Cpk 계산용)
+            check_normality: False 면 정규성 검정 생략 (is_normal=True, p_value=1.0)
 
         Returns:
             ProcessCapabilityResult
@@ -104,8 +118,11 @@ class ProcessCapabilityAnalyzer:
         ppl = (mean - lsl) / (3 * std_overall)
         ppk = min(ppu, ppl)
 
-        # 정규성 검정
-        is_normal, test_stat, p_value = self.normality_test(data)
+        # 정규성 검정 (표본이 많으면 등간격 표본으로)
+        if check_normality:
+            is_normal, test_stat, p_value = self.normality_test(data, max_samples=NORMALITY_MAX_SAMPLES)
+        else:
+            is_normal, test_stat, p_value = True, 0.0, 1.0
 
         # 불량률 추정 (정규분포 가정)
         ppm_above, ppm_below, ppm_total = self._estimate_defect_rate(
@@ -169,7 +186,8 @@ class ProcessCapabilityAnalyzer:
     def normality_test(
         self,
         data: List[float],
-        method: str = 'shapiro'
+        method: str = 'shapiro',
+        max_samples: Optional[int] = None
     ) -> Tuple[bool, float, float]:
         """
         정규성 검정
@@ -177,6 +195,7 @@ class ProcessCapabilityAnalyzer:
         Args:
             data: 측정 데이터
             method: 'shapiro' (Shapiro-Wilk) 또는 'anderson' (Anderson-Darling)
+            max_samples: 지정하면 데이터가 이보다 많을 때 등간격 표본으로 검정
 
         Returns:
             (is_normal, test_statistic, p_value)
@@ -184,6 +203,9 @@ class ProcessCapabilityAnalyzer:
         if len(data) < 3:
             return True, 0.0, 1.0
 
+        if max_samples:
+            data = strided_sample(data, max_samples)
+
         if method == 'shapiro':
             statistic, p_value = stats.shapiro(data)
             is_normal = p_value > self.alpha
@@ -0,0 +1,330 @@
+"""
+제품별 일일 품질 집계 (Daily Rollup)
+
+- 일일 보고서 작업에서 전날 (및 누락된 최근 일자) 집계를 QualityDailyRollup 에 기록
+- 주간 / 월간 / 사용자 정의 보고서는 집계 완료 일자는 롤업을 병합하고,
+  나머지 구간 (오늘, 일자 경계가 아닌 시작 / 종료, 미집계 일자) 만 원본 데이터로 계산
+- 평균 / 분산은 (건수, 합, 편차 제곱합) 으로 병합 → 원본 재계산과 같은 결과 (합동 분산)
+"""
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum, Variance
+from django.utils import timezone
+
+from apps.spc.models import QualityAlert, QualityDailyRollup, QualityMeasurement, QualityRollupDay
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_LOOKBACK_DAYS = 35
+
+
+@dataclass
+class RollupStats:
+    """병합 가능한 제품 품질 집계"""
+    measurement_count: int = 0
+    value_sum: float = 0.0
+    value_m2: float = 0.0
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    out_of_spec_count: int = 0
+    out_of_control_count: int = 0
+    alert_count: int = 0
+    alert_priority_counts: Counter = field(default_factory=Counter)
+    alert_status_counts: Counter = field(default_factory=Counter)
+    alert_type_counts: Counter = field(default_factory=Counter)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.value_sum / self.measurement_count if self.measurement_count else None
+
+    @property
+    def variance(self) -> Optional[float]:
+        """모분산 (StdDev / Variance 집계와 동일)"""
+        return max(self.value_m2, 0.0) / self.measurement_count if self.measurement_count else None
+
+    @property
+    def std_dev(self) -> Optional[float]:
+        variance = self.variance
+        return variance ** 0.5 if variance is not None else None
+
+    def merge(self, other: 'RollupStats') -> 'RollupStats':
+        """다른 구간 집계 병합 (Chan 병렬 분산 공식)"""
+        n_a, n_b = self.measurement_count, other.measurement_count
+        if n_b:
+            if n_a:
+                delta = other.value_sum / n_b - self.value_sum / n_a
+                self.value_m2 += other.value_m2 + delta * delta * n_a * n_b / (n_a + n_b)
+            else:
+                self.value_m2 = other.value_m2
+            self.measurement_count = n_a + n_b
+            self.value_sum += other.value_sum
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+            self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+            self.out_of_spec_count += other.out_of_spec_count
+            self.out_of_control_count += other.out_of_control_count
+
+        self.alert_count += other.alert_count
+        self.alert_priority_counts.update(other.alert_priority_counts)
+        self.alert_status_counts.update(other.alert_status_counts)
+        self.alert_type_counts.update(other.alert_type_counts)
+        return self
+
+    @classmethod
+    def from_rollup(cls, rollup: QualityDailyRollup) -> 'RollupStats':
+        return cls(
+            measurement_count=rollup.measurement_count,
+            value_sum=rollup.value_sum,
+            value_m2=rollup.value_m2,
+            min_value=rollup.min_value,
+            max_value=rollup.max_value,
+            out_of_spec_count=rollup.out_of_spec_count,
+            out_of_control_count=rollup.out_of_control_count,
+            alert_count=rollup.alert_count,
+            # JSON 키는 문자열이므로 우선순위는 정수로 복원
+            alert_priority_counts=Counter({int(k): v for k, v in rollup.alert_priority_counts.items()}),
+            alert_status_counts=Counter(rollup.alert_status_counts),
+            alert_type_counts=Counter(rollup.alert_type_counts),
+        )
+
+    def to_rollup(self, product_id: int, rollup_date: date) -> QualityDailyRollup:
+        return QualityDailyRollup(
+            product_id=product_id,
+            rollup_date=rollup_date,
+            measurement_count=self.measurement_count,
+            value_sum=self.value_sum,
+            value_m2=self.value_m2,
+            min_value=self.min_value,
+            max_value=self.max_value,
+            out_of_spec_count=self.out_of_spec_count,
+            out_of_control_count=self.out_of_control_count,
+            alert_count=self.alert_count,
+            alert_priority_counts={str(k): v for k, v in self.alert_priority_counts.items()},
+            alert_status_counts=dict(self.alert_status_counts),
+            alert_type_counts=dict(self.alert_type_counts),
+        )
+
+
+# ----------------------------------------------------------------------
+# 일자 경계
+# ----------------------------------------------------------------------
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """TIME_ZONE 기준 일자 [시작, 다음날 시작)"""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+
+def local_date(value: datetime) -> date:
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def full_days(start: datetime, end: datetime) -> List[date]:
+    """[start, end) 에 온전히 포함되는 일자"""
+    day = local_date(start)
+    if day_bounds(day)[0] < start:
+        day += timedelta(days=1)
+    days = []
+    while day_bounds(day)[1] <= end:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+# ----------------------------------------------------------------------
+# 원본 데이터 집계
+# ----------------------------------------------------------------------
+
+def aggregate_raw(start: datetime, end: datetime, product_ids=None) -> Dict[int, RollupStats]:
+    """
+    원본 측정 / 경고 데이터 제품별 집계 (쿼리 2회)
+
+    Args:
+        product_ids: 제품 ID 목록 또는 서브쿼리 (None 이면 전체 제품)
+    """
+    stats: Dict[int, RollupStats] = {}
+    product_filter = Q(product_id__in=product_ids) if product_ids is not None else Q()
+
+    for row in QualityMeasurement.objects.filter(
+        product_filter, measured_at__gte=start, measured_at__lt=end
+    ).values('product_id').annotate(
+        count=Count('id'),
+        total=Sum('measurement_value'),
+        variance=Variance('measurement_value'),
+        min_value=Min('measurement_value'),
+        max_value=Max('measurement_value'),
+        out_of_spec=Count('id', filter=Q(is_within_spec=False)),
+        out_of_control=Count('id', filter=Q(is_within_control=False))
+    ).order_by():
+        stats[row['product_id']] = RollupStats(
+            measurement_count=row['count'],
+            value_sum=row['total'] or 0.0,
+            value_m2=(row['variance'] or 0.0) * row['count'],
+            min_value=row['min_value'],
+            max_value=row['max_value'],
+            out_of_spec_count=row['out_of_spec'],
+            out_of_control_count=row['out_of_control'],
+        )
+
+    for row in QualityAlert.objects.filter(
+        product_filter, created_at__gte=start, created_at__lt=end
+    ).values('product_id', 'alert_type', 'priority', 'status').annotate(count=Count('id')).order_by():
+        item = stats.setdefault(row['product_id'], RollupStats())
+        item.alert_count += row['count']
+        item.alert_priority_counts[row['priority']] += row['count']
+        item.alert_status_counts[row['status']] += row['count']
+        item.alert_type_counts[row['alert_type']] += row['count']
+
+    return stats
+
+
+# ----------------------------------------------------------------------
+# 롤업 기록
+# ----------------------------------------------------------------------
+
+def compute_daily_rollup(day: date) -> QualityRollupDay:
+    """일자 집계를 다시 계산해 저장 (해당 일자 기존 집계 교체)"""
+    start, end = day_bounds(day)
+    stats = aggregate_raw(start, end)
+
+    with transaction.atomic():
+        QualityDailyRollup.objects.filter(rollup_date=day).delete()
+        QualityDailyRollup.objects.bulk_create(
+            [item.to_rollup(product_id, day) for product_id, item in stats.items()],
+            batch_size=1000
+        )
+        marker, _ = QualityRollupDay.objects.update_or_create(
+            rollup_date=day,
+            defaults={
+                'product_count': len(stats),
+                'measurement_count': sum(item.measurement_count for item in stats.values()),
+                'computed_at': timezone.now(),
+            }
+        )
+
+    logger.info(f"일일 집계 완료: {day} ({marker.product_count}개 제품, {marker.measurement_count}건)")
+    return marker
+
+
+def completed_days(days: Iterable[date]) -> Set[date]:
+    """집계가 완료된 일자 (일자 종료 이후 계산된 경우만)"""
+    days = list(days)
+    if not days:
+        return set()
+    completed = set()
+    for rollup_date, computed_at in QualityRollupDay.objects.filter(
+        rollup_date__gte=min(days), rollup_date__lte=max(days)
+    ).values_list('rollup_date', 'computed_at'):
+        if computed_at >= day_bounds(rollup_date)[1]:
+            completed.add(rollup_date)
+    return completed & set(days)
+
+
+def rollup_missing_days(lookback_days: int = DEFAULT_LOOKBACK_DAYS, force: bool = False) -> List[date]:
+    """
+    최근 lookback_days 일 (오늘 제외) 중 집계가 없거나 무효화된 일자 계산
+
+    Returns:
+        새로 집계한 일자 목록
+    """
+    today = timezone.localdate()
+    days = [today - timedelta(days=offset) for offset in range(lookback_days, 0, -1)]
+    done = set() if force else completed_days(days)
+    computed = []
+    for day in days:
+        if day not in done:
+            compute_daily_rollup(day)
+            computed.append(day)
+    return computed
+
+
+def invalidate_day(value: datetime):
+    """과거 일자 데이터 변경 시 집계 완료 표시 삭제 (오늘 데이터는 쿼리 없음)"""
+    day = local_date(value)
+    if day < timezone.localdate():
+        QualityRollupDay.objects.filter(rollup_date=day).delete()
+
+
+# ----------------------------------------------------------------------
+# 보고서 기간 집계
+# ----------------------------------------------------------------------
+
+def _raw_ranges(start: datetime, end: datetime, covered: List[date]) -> List[Tuple[datetime, datetime]]:
+    """covered 일자를 제외한 [start, end) 의 연속 구간"""
+    ranges = []
+    cursor = start
+    for day in covered:
+        day_start, day_end = day_bounds(day)
+        if cursor < day_start:
+            ranges.append((cursor, day_start))
+        cursor = day_end
+    if cursor < end:
+        ranges.append((cursor, end))
+    return ranges
+
+
+def collect_period(start: datetime, end: datetime, product_ids=None,
+                   use_rollups: bool = True) -> Dict[int, RollupStats]:
+    """
+    기간 [start, end) 의 제품별 집계
+
+    집계 완료 일자는 QualityDailyRollup 병합, 나머지 구간은 원본 데이터 집계
+    """
+    if not use_rollups:
+        return aggregate_raw(start, end, product_ids)
+
+    covered = sorted(completed_days(full_days(start, end)))
+    stats: Dict[int, RollupStats] = {}
+
+    if covered:
+        rollups = QualityDailyRollup.objects.filter(rollup_date__in=covered)
+        if product_ids is not None:
+            rollups = rollups.filter(product_id__in=product_ids)
+        for rollup in rollups:
+            stats.setdefault(rollup.product_id, RollupStats()).merge(RollupStats.from_rollup(rollup))
+
+    for range_start, range_end in _raw_ranges(start, end, covered):
+        for product_id, item in aggregate_raw(range_start, range_end, product_ids).items():
+            stats.setdefault(product_id, RollupStats()).merge(item)
+
+    return stats
+
+
+# ----------------------------------------------------------------------
+# 검증
+# ----------------------------------------------------------------------
+
+def verify_day(day: date, rel_tol: float = 1e-9) -> List[Dict]:
+    """
+    저장된 일자 집계와 원본 재계산 비교
+
+    Returns:
+        불일치 목록 [{product_id, field, rollup, raw}]
+    """
+    start, end = day_bounds(day)
+    raw = aggregate_raw(start, end)
+    stored = {
+        rollup.product_id: RollupStats.from_rollup(rollup)
+        for rollup in QualityDailyRollup.objects.filter(rollup_date=day)
+    }
+
+    mismatches = []
+    for product_id in sorted(set(raw) | set(stored)):
+        expected = raw.get(product_id, RollupStats())
+        actual = stored.get(product_id, RollupStats())
+        for name in ('measurement_count', 'out_of_spec_count', 'out_of_control_count', 'alert_count',
+                     'alert_priority_counts', 'alert_status_counts', 'alert_type_counts',
+                     'min_value', 'max_value'):
+            if getattr(expected, name) != getattr(actual, name):
+                mismatches.append({'product_id': product_id, 'field': name,
+                                   'rollup': getattr(actual, name), 'raw': getattr(expected, name)})
+        for name in ('value_sum', 'value_m2'):
+            a, b = getattr(actual, name), getattr(expected, name)
+            if abs(a - b) > rel_tol * max(abs(a), abs(b), 1.0):
+                mismatches.append({'product_id': product_id, 'field': name, 'rollup': a, 'raw': b})
+    return mismatches
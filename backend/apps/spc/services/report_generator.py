@@ -1,44 +1,97 @@
 """
 SPC 품질 보고서 생성 서비스
+
+보고서 데이터는 테이블별 그룹 집계 1회로 수집한 뒤 (ReportData) 모든 섹션이 공유
+- 측정 / 경고 건수: 제품별 일일 집계 병합 + 미집계 구간 원본 GROUP BY (quality_rollups.collect_period)
+- 미해결 경고: 제품별 GROUP BY + 최근 10건
+- Run Rule 위반: (규칙, 해결 여부) GROUP BY + 최근 10건
+- 공정능력: 제품별 최신 1건 (ROW_NUMBER 윈도 함수)
+제품 수와 무관하게 쿼리 수 일정
 """
-from datetime import datetime, timedelta
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
 from typing import Dict, List, Any
-from django.db.models import Avg, StdDev, Count, Q, Max, Min
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 
 from apps.spc.models import (
     Product, QualityMeasurement, ProcessCapability,
     QualityAlert, RunRuleViolation, ControlChart
 )
+from apps.spc.services.quality_rollups import RollupStats, collect_period
+
+
+UNRESOLVED_ALERT_STATUSES = ('NEW', 'ACKNOWLEDGED', 'INVESTIGATING')
+RECENT_ITEM_LIMIT = 10
+
+
+@dataclass
+class ReportData:
+    """보고서 섹션이 공유하는 집계 결과"""
+    products: List[Product]
+    # 제품 ID → 기간 측정 / 경고 집계
+    period_stats: Dict[int, RollupStats] = field(default_factory=dict)
+    # 제품 ID → 최신 공정능력
+    latest_capability: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    # 보고 기간 경고 건수 (전체 제품 합)
+    alert_priority_counts: Counter = field(default_factory=Counter)
+    alert_status_counts: Counter = field(default_factory=Counter)
+    alert_type_counts: Counter = field(default_factory=Counter)
+    # 제품 ID → 기간 시작 이후 미해결 경고 수 (종료일 제한 없음)
+    unresolved_alerts: Dict[int, int] = field(default_factory=dict)
+    recent_alerts: List[Dict[str, Any]] = field(default_factory=list)
+    # (rule_type, is_resolved, count)
+    violation_groups: List[Dict[str, Any]] = field(default_factory=list)
+    recent_violations: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _local_midnight(value) -> datetime:
+    """date / datetime → TIME_ZONE 기준 해당 일자 0시 (aware)"""
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        value = value.date()
+    return timezone.make_aware(datetime.combine(value, time.min))
 
 
 class QualityReportGenerator:
-    """품질 보고서 생성기"""
+    """
+    품질 보고서 생성기
+
+    use_rollups=True 이면 집계 완료 일자는 QualityDailyRollup 을 병합 (원본 재조회 없음)
+    """
+
+    def __init__(self, use_rollups: bool = True):
+        self.use_rollups = use_rollups
 
     def generate_daily_report(self, date: datetime) -> Dict[str, Any]:
         """일일 보고서 생성"""
-        start_date = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = start_date + timedelta(days=1)
+        start_date = _local_midnight(date)
+        end_date = _local_midnight(start_date.date() + timedelta(days=1))
 
         return self._generate_report('DAILY', start_date, end_date)
 
     def generate_weekly_report(self, date: datetime) -> Dict[str, Any]:
         """주간 보고서 생성"""
         # 해당 주의 월요일 찾기
-        start_date = date - timedelta(days=date.weekday())
-        start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = start_date + timedelta(days=7)
+        day = _local_midnight(date).date()
+        monday = day - timedelta(days=day.weekday())
+        start_date = _local_midnight(monday)
+        end_date = _local_midnight(monday + timedelta(days=7))
 
         return self._generate_report('WEEKLY', start_date, end_date)
 
     def generate_monthly_report(self, date: datetime) -> Dict[str, Any]:
         """월간 보고서 생성"""
-        start_date = date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        first = _local_midnight(date).date().replace(day=1)
+        start_date = _local_midnight(first)
         # 다음 달 1일
-        if date.month == 12:
-            end_date = date.replace(year=date.year + 1, month=1, day=1)
+        if first.month == 12:
+            end_date = _local_midnight(first.replace(year=first.year + 1, month=1))
         else:
-            end_date = date.replace(month=date.month + 1, day=1)
+            end_date = _local_midnight(first.replace(month=first.month + 1))
 
         return self._generate_report('MONTHLY', start_date, end_date)
 
@@ -50,21 +103,26 @@ class QualityReportGenerator:
     def _generate_report(self, report_type: str, start_date: datetime,
                         end_date: datetime, product_ids: List[int] = None) -> Dict[str, Any]:
         """보고서 공통 생성 로직"""
+        if timezone.is_naive(start_date):
+            start_date = timezone.make_aware(start_date)
+        if timezone.is_naive(end_date):
+            end_date = timezone.make_aware(end_date)
 
         # 제품 필터링
         products = Product.objects.filter(is_active=True)
         if product_ids:
             products = products.filter(id__in=product_ids)
 
-        products = list(products)
+        # 테이블별 집계 1회
+        data = self._collect_report_data(products, start_date, end_date)
 
-        # 섹션별 데이터 수집
-        summary = self._generate_summary(products, start_date, end_date)
-        product_details = self._generate_product_details(products, start_date, end_date)
-        alerts_summary = self._generate_alerts_summary(products, start_date, end_date)
-        capability_analysis = self._generate_capability_analysis(products, end_date)
-        violations_summary = self._generate_violations_summary(products, start_date, end_date)
-        recommendations = self._generate_recommendations(products, start_date, end_date)
+        # 섹션별 데이터 구성 (추가 쿼리 없음)
+        summary = self._generate_summary(data)
+        product_details = self._generate_product_details(data)
+        alerts_summary = self._generate_alerts_summary(data)
+        capability_analysis = self._generate_capability_analysis(data)
+        violations_summary = self._generate_violations_summary(data)
+        recommendations = self._generate_recommendations(data)
 
         return {
             'report_type': report_type,
@@ -82,32 +140,103 @@ class QualityReportGenerator:
             'recommendations': recommendations
         }
 
-    def _generate_summary(self, products: List[Product],
-                         start_date: datetime, end_date: datetime) -> Dict[str, Any]:
-        """요약 통계 생성"""
-        total_products = len(products)
+    # ------------------------------------------------------------------
+    # 데이터 수집
+    # ------------------------------------------------------------------
+
+    def _collect_report_data(self, products, start_date: datetime, end_date: datetime) -> ReportData:
+        """보고서 집계 (제품 목록은 서브쿼리로 전달)"""
+        product_ids = products.values('id')
+        data = ReportData(products=list(products))
+
+        # 측정 / 경고 건수: 일일 집계 병합 + 미집계 구간 원본 집계
+        data.period_stats = collect_period(start_date, end_date, product_ids, self.use_rollups)
+        for item in data.period_stats.values():
+            data.alert_priority_counts.update(item.alert_priority_counts)
+            data.alert_status_counts.update(item.alert_status_counts)
+            data.alert_type_counts.update(item.alert_type_counts)
+
+        data.latest_capability = self._latest_capabilities(product_ids)
+
+        # 미해결 경고: 기간 시작 이후 현재 상태 기준 (종료일 제한 없음)
+        alerts = QualityAlert.objects.filter(product_id__in=product_ids, created_at__gte=start_date)
+        data.unresolved_alerts = dict(
+            alerts.filter(status__in=UNRESOLVED_ALERT_STATUSES).values('product_id').annotate(
+                count=Count('id')
+            ).order_by().values_list('product_id', 'count')
+        )
 
-        # 전체 측정 데이터
-        measurements = QualityMeasurement.objects.filter(
-            product__in=products,
-            measured_at__gte=start_date,
-            measured_at__lt=end_date
+        data.recent_alerts = [
+            {
+                'id': alert['id'],
+                'product_code': alert['product__product_code'],
+                'alert_type': alert['alert_type'],
+                'priority': alert['priority'],
+                'status': alert['status'],
+                'message': alert['title'],
+                'created_at': alert['created_at'].isoformat()
+            }
+            for alert in alerts.filter(created_at__lt=end_date).order_by('-created_at').values(
+                'id', 'product__product_code', 'alert_type', 'priority', 'status', 'title', 'created_at'
+            )[:RECENT_ITEM_LIMIT]
+        ]
+
+        # Run Rule 위반: 규칙 / 해결 여부별 건수
+        violations = RunRuleViolation.objects.filter(
+            control_chart__product_id__in=product_ids,
+            detected_at__gte=start_date,
+            detected_at__lt=end_date
+        )
+        data.violation_groups = list(
+            violations.values('rule_type', 'is_resolved').annotate(count=Count('id')).order_by()
         )
+        rule_labels = dict(RunRuleViolation.RULE_CHOICES)
+        data.recent_violations = [
+            {
+                'id': violation['id'],
+                'product_code': violation['control_chart__product__product_code'],
+                'rule_type': violation['rule_type'],
+                'description': rule_labels.get(violation['rule_type'], violation['rule_type']),
+                'is_resolved': violation['is_resolved'],
+                'detected_at': violation['detected_at'].isoformat()
+            }
+            for violation in violations.order_by('-detected_at').values(
+                'id', 'control_chart__product__product_code', 'rule_type', 'is_resolved', 'detected_at'
+            )[:RECENT_ITEM_LIMIT]
+        ]
+
+        return data
 
-        total_measurements = measurements.count()
-        out_of_spec = measurements.filter(is_within_spec=False).count()
-        out_of_control = measurements.filter(is_within_control=False).count()
+    @staticmethod
+    def _latest_capabilities(product_ids) -> Dict[int, Dict[str, Any]]:
+        """제품별 최신 공정능력 1건 (쿼리 1회)"""
+        rows = ProcessCapability.objects.filter(product_id__in=product_ids).annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F('product_id')],
+                order_by=[F('analyzed_at').desc(), F('id').desc()]
+            )
+        ).filter(row_number=1).values('product_id', 'cp', 'cpk', 'pp', 'ppk', 'analyzed_at')
+        return {row.pop('product_id'): row for row in rows}
 
-        # 전체 경고
-        alerts = QualityAlert.objects.filter(
-            product__in=products,
-            created_at__gte=start_date,
-            created_at__lt=end_date
-        )
+    # ------------------------------------------------------------------
+    # 섹션
+    # ------------------------------------------------------------------
 
-        total_alerts = alerts.count()
-        critical_alerts = alerts.filter(priority=4).count()
-        resolved_alerts = alerts.filter(status='RESOLVED').count()
+    def _generate_summary(self, data: ReportData) -> Dict[str, Any]:
+        """요약 통계 생성"""
+        total_products = len(data.products)
+
+        # 전체 측정 데이터
+        stats = data.period_stats.values()
+        total_measurements = sum(s.measurement_count for s in stats)
+        out_of_spec = sum(s.out_of_spec_count for s in stats)
+        out_of_control = sum(s.out_of_control_count for s in stats)
+
+        # 전체 경고
+        total_alerts = sum(data.alert_priority_counts.values())
+        critical_alerts = data.alert_priority_counts[4]
+        resolved_alerts = data.alert_status_counts['RESOLVED']
 
         return {
             'total_products': total_products,
@@ -122,35 +251,20 @@ class QualityReportGenerator:
             'resolution_rate': round(resolved_alerts / total_alerts * 100, 2) if total_alerts > 0 else 0
         }
 
-    def _generate_product_details(self, products: List[Product],
-                                  start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+    def _generate_product_details(self, data: ReportData) -> List[Dict[str, Any]]:
         """제품별 상세 정보 생성"""
         product_details = []
 
-        for product in products:
-            measurements = QualityMeasurement.objects.filter(
-                product=product,
-                measured_at__gte=start_date,
-                measured_at__lt=end_date
-            )
-
-            if measurements.count() == 0:
+        for product in data.products:
+            stats = data.period_stats.get(product.id)
+            if not stats or stats.measurement_count == 0:
                 continue
 
-            # 통계 계산
-            stats = measurements.aggregate(
-                avg_value=Avg('measurement_value'),
-                std_dev=StdDev('measurement_value'),
-                min_value=Min('measurement_value'),
-                max_value=Max('measurement_value'),
-                total_count=Count('id'),
-                out_of_spec_count=Count('id', filter=Q(is_within_spec=False))
-            )
+            average, std_dev = stats.mean, stats.std_dev
+            min_value, max_value = stats.min_value, stats.max_value
 
             # 최신 공정능력
-            latest_capability = ProcessCapability.objects.filter(
-                product=product
-            ).order_by('-analyzed_at').first()
+            latest_capability = data.latest_capability.get(product.id)
 
             product_details.append({
                 'product_id': product.id,
@@ -163,93 +277,74 @@ class QualityReportGenerator:
                     'unit': product.unit
                 },
                 'statistics': {
-                    'total_measurements': stats['total_count'],
-                    'average': round(stats['avg_value'], 4) if stats['avg_value'] else None,
-                    'std_dev': round(stats['std_dev'], 4) if stats['std_dev'] else None,
-                    'min_value': round(stats['min_value'], 4) if stats['min_value'] else None,
-                    'max_value': round(stats['max_value'], 4) if stats['max_value'] else None,
-                    'range': round(stats['max_value'] - stats['min_value'], 4) if stats['max_value'] and stats['min_value'] else None,
-                    'out_of_spec_count': stats['out_of_spec_count'],
-                    'out_of_spec_rate': round(stats['out_of_spec_count'] / stats['total_count'] * 100, 2) if stats['total_count'] > 0 else 0
+                    'total_measurements': stats.measurement_count,
+                    'average': round(average, 4) if average else None,
+                    'std_dev': round(std_dev, 4) if std_dev else None,
+                    'min_value': round(min_value, 4) if min_value else None,
+                    'max_value': round(max_value, 4) if max_value else None,
+                    'range': round(max_value - min_value, 4) if max_value and min_value else None,
+                    'out_of_spec_count': stats.out_of_spec_count,
+                    'out_of_spec_rate': round(stats.out_of_spec_count / stats.measurement_count * 100, 2)
                 },
                 'capability': {
-                    'cp': latest_capability.cp if latest_capability else None,
-                    'cpk': latest_capability.cpk if latest_capability else None,
-                    'pp': latest_capability.pp if latest_capability else None,
-                    'ppk': latest_capability.ppk if latest_capability else None,
-                    'analyzed_at': latest_capability.analyzed_at.isoformat() if latest_capability else None
+                    'cp': latest_capability['cp'] if latest_capability else None,
+                    'cpk': latest_capability['cpk'] if latest_capability else None,
+                    'pp': latest_capability['pp'] if latest_capability else None,
+                    'ppk': latest_capability['ppk'] if latest_capability else None,
+                    'analyzed_at': latest_capability['analyzed_at'].isoformat() if latest_capability else None
                 }
             })
 
         return product_details
 
-    def _generate_alerts_summary(self, products: List[Product],
-                                start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    def _generate_alerts_summary(self, data: ReportData) -> Dict[str, Any]:
         """경고 요약 생성"""
-        alerts = QualityAlert.objects.filter(
-            product__in=products,
-            created_at__gte=start_date,
-            created_at__lt=end_date
-        )
+        priority_counts = data.alert_priority_counts
+        type_counts = data.alert_type_counts
+        status_counts = data.alert_status_counts
 
         # 우선순위별 분류
         by_priority = {
-            'urgent': alerts.filter(priority=4).count(),
-            'high': alerts.filter(priority=3).count(),
-            'medium': alerts.filter(priority=2).count(),
-            'low': alerts.filter(priority=1).count()
+            'urgent': priority_counts[4],
+            'high': priority_counts[3],
+            'medium': priority_counts[2],
+            'low': priority_counts[1]
         }
 
         # 타입별 분류
         by_type = {}
         for alert_type, _ in QualityAlert.ALERT_TYPE_CHOICES:
-            by_type[alert_type] = alerts.filter(alert_type=alert_type).count()
+            by_type[alert_type] = type_counts[alert_type]
 
         # 상태별 분류
         by_status = {
-            'new': alerts.filter(status='NEW').count(),
-            'acknowledged': alerts.filter(status='ACKNOWLEDGED').count(),
-            'investigating': alerts.filter(status='INVESTIGATING').count(),
-            'resolved': alerts.filter(status='RESOLVED').count(),
-            'closed': alerts.filter(status='CLOSED').count()
+            'new': status_counts['NEW'],
+            'acknowledged': status_counts['ACKNOWLEDGED'],
+            'investigating': status_counts['INVESTIGATING'],
+            'resolved': status_counts['RESOLVED'],
+            'closed': status_counts['CLOSED']
         }
 
-        # 최근 경고 목록
-        recent_alerts = []
-        for alert in alerts.order_by('-created_at')[:10]:
-            recent_alerts.append({
-                'id': alert.id,
-                'product_code': alert.product.product_code,
-                'alert_type': alert.alert_type,
-                'priority': alert.priority,
-                'status': alert.status,
-                'message': alert.message,
-                'created_at': alert.created_at.isoformat()
-            })
-
         return {
-            'total': alerts.count(),
+            'total': sum(priority_counts.values()),
             'by_priority': by_priority,
             'by_type': by_type,
             'by_status': by_status,
-            'recent_alerts': recent_alerts
+            'recent_alerts': data.recent_alerts
         }
 
-    def _generate_capability_analysis(self, products: List[Product],
-                                     date: datetime) -> Dict[str, Any]:
+    def _generate_capability_analysis(self, data: ReportData) -> Dict[str, Any]:
         """공정능력 분석 생성"""
         capability_data = []
 
-        for product in products:
-            latest = ProcessCapability.objects.filter(
-                product=product
-            ).order_by('-analyzed_at').first()
+        for product in data.products:
+            latest = data.latest_capability.get(product.id)
 
             if not latest:
                 continue
 
             # Cpk 등급 판정
-            cpk = latest.cpk if latest.cpk else 0
+            cpk = latest['cpk'] if latest['cpk'] else 0
             if cpk >= 2.0:
                 grade = 'Superior'
                 grade_color = '#10B981'  # green
@@ -269,13 +364,13 @@ class QualityReportGenerator:
             capability_data.append({
                 'product_code': product.product_code,
                 'product_name': product.product_name,
-                'cp': round(latest.cp, 3) if latest.cp else None,
-                'cpk': round(latest.cpk, 3) if latest.cpk else None,
-                'pp': round(latest.pp, 3) if latest.pp else None,
-                'ppk': round(latest.ppk, 3) if latest.ppk else None,
+                'cp': round(latest['cp'], 3) if latest['cp'] else None,
+                'cpk': round(latest['cpk'], 3) if latest['cpk'] else None,
+                'pp': round(latest['pp'], 3) if latest['pp'] else None,
+                'ppk': round(latest['ppk'], 3) if latest['ppk'] else None,
                 'grade': grade,
                 'grade_color': grade_color,
-                'analyzed_at': latest.analyzed_at.isoformat()
+                'analyzed_at': latest['analyzed_at'].isoformat()
             })
 
         # 등급별 그룹화
@@ -290,62 +385,45 @@ class QualityReportGenerator:
             'products': capability_data
         }
 
-    def _generate_violations_summary(self, products: List[Product],
-                                    start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    def _generate_violations_summary(self, data: ReportData) -> Dict[str, Any]:
         """Run Rule 위반 요약 생성"""
-        violations = RunRuleViolation.objects.filter(
-            control_chart__product__in=products,
-            detected_at__gte=start_date,
-            detected_at__lt=end_date
-        )
+        rule_counts = Counter()
+        for group in data.violation_groups:
+            rule_counts[group['rule_type']] += group['count']
 
         # Rule 타입별 분류
         by_rule = {}
         for i in range(1, 9):
-            rule_count = violations.filter(rule_type=f'RULE_{i}').count()
+            rule_count = rule_counts[f'RULE_{i}']
             if rule_count > 0:
                 by_rule[f'RULE_{i}'] = rule_count
 
         # 해결되지 않은 위반
-        unresolved = violations.filter(is_resolved=False).count()
-
-        # 최근 위반 목록
-        recent_violations = []
-        for violation in violations.order_by('-detected_at')[:10]:
-            recent_violations.append({
-                'id': violation.id,
-                'product_code': violation.control_chart.product.product_code,
-                'rule_type': violation.rule_type,
-                'description': violation.get_rule_type_display(),
-                'is_resolved': violation.is_resolved,
-                'detected_at': violation.detected_at.isoformat()
-            })
+        unresolved = sum(g['count'] for g in data.violation_groups if not g['is_resolved'])
 
         return {
-            'total': violations.count(),
+            'total': sum(g['count'] for g in data.violation_groups),
             'unresolved': unresolved,
             'by_rule_type': by_rule,
-            'recent_violations': recent_violations
+            'recent_violations': data.recent_violations
         }
 
-    def _generate_recommendations(self, products: List[Product],
-                                 start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+    def _generate_recommendations(self, data: ReportData) -> List[Dict[str, Any]]:
         """개선 권장사항 생성"""
         recommendations = []
 
-        for product in products:
+        for product in data.products:
             product_recommendations = []
 
             # 공정능력 기반 권장사항
-            latest_capability = ProcessCapability.objects.filter(
-                product=product
-            ).order_by('-analyzed_at').first()
+            latest_capability = data.latest_capability.get(product.id)
+            cpk = latest_capability['cpk'] if latest_capability else None
 
-            if latest_capability and latest_capability.cpk and latest_capability.cpk < 1.33:
+            if cpk and cpk < 1.33:
                 product_recommendations.append({
                     'type': 'capability',
-                    'priority': 'high' if latest_capability.cpk < 1.0 else 'medium',
-                    'message': f'Cpk가 {latest_capability.cpk:.2f}로 낮습니다. 공정능력 개선이 필요합니다.',
+                    'priority': 'high' if cpk < 1.0 else 'medium',
+                    'message': f'Cpk가 {cpk:.2f}로 낮습니다. 공정능력 개선이 필요합니다.',
                     'actions': [
                         '공정 평균을 목표값에 맞추세요',
                         '공정 산포를 줄이세요',
@@ -354,14 +432,10 @@ class QualityReportGenerator:
                 })
 
             # 불량률 기반 권장사항
-            measurements = QualityMeasurement.objects.filter(
-                product=product,
-                measured_at__gte=start_date,
-                measured_at__lt=end_date
-            )
+            stats = data.period_stats.get(product.id)
 
-            if measurements.count() > 0:
-                out_of_spec_rate = measurements.filter(is_within_spec=False).count() / measurements.count() * 100
+            if stats and stats.measurement_count > 0:
+                out_of_spec_rate = stats.out_of_spec_count / stats.measurement_count * 100
 
                 if out_of_spec_rate > 1.0:
                     product_recommendations.append({
@@ -376,11 +450,7 @@ class QualityReportGenerator:
                     })
 
             # 미해결 경고 기반 권장사항
-            unresolved_alerts = QualityAlert.objects.filter(
-                product=product,
-                created_at__gte=start_date,
-                status__in=['NEW', 'ACKNOWLEDGED', 'INVESTIGATING']
-            ).count()
+            unresolved_alerts = data.unresolved_alerts.get(product.id, 0)
 
             if unresolved_alerts > 5:
                 product_recommendations.append({
@@ -382,78 +382,20 @@ class SixSigmaAnalyzer:
             return "Process is not capable. Immediate improvement required."
 
     @staticmethod
-    def gage_rr(measurements: List[Dict]) -> Dict:
-        """Gage R&R 분석 (측정 시스템 분석)"""
-        # 데이터 파싱: {operator: str, part: str, measurement: float}
-        # 각 연산자가 각 부품을 여러 번 측정
-
-        import pandas as pd
-        df = pd.DataFrame(measurements)
-
-        # 기본 통계
-        operators = df['operator'].unique()
-        parts = df['part'].unique()
-
-        # 이원분산분석 (Two-Way ANOVA) 사용
-        # %Contribution, %Study Variation, %Tolerance 계산
-
-        total_variance = df['measurement'].var()
-
-        # Operator 간 분산 (Repeatability)
-        operator_means = df.groupby('operator')['measurement'].mean()
-        operator_variance = operator_means.var()
-
-        # Part 간 분산 (Reproducibility)
-        part_means = df.groupby('part')['measurement'].mean()
-        part_variance = part_means.var()
-
-        # Gage R&R
-        # EV (Equipment Variation) = Repeatability
-        # AV (Appraiser Variation) = Reproducibility
-        # GRR = √(EV² + AV²)
-
-        # 간단 계산 (실제로는 ANOVA 기반 계산이 더 정확함)
-        ev = total_variance * 0.3  # Equipment Variation (추정)
-        av = total_variance * 0.2  # Appraiser Variation (추정)
-        grr = np.sqrt(ev**2 + av**2)
-
-        pv = total_variance * 0.5  # Part-to-Part Variation
-
-        tv = grr + pv  # Total Variation
-
-        # % Gage R&R
-        percent_grr = (grr / tv) * 100 if tv > 0 else 0
-
-        # NDC (Number of Distinct Categories)
-        ndc = 1.41 * (pv / grr) if grr > 0 else 0
-
-        # 판정
-        if percent_grr < 10:
-            acceptance = "Acceptable"
-        elif percent_grr < 30:
-            acceptance = "Marginally Acceptable"
-        else:
-            acceptance = "Not Acceptable"
-
-        return {
-            'measurement_count': len(measurements),
-            'operators_count': len(operators),
-            'parts_count': len(parts),
-            'variance_components': {
-                'total_variance': float(total_variance),
-                'equipment_variation': float(ev),
-                'appraiser_variation': float(av),
-                'part_to_part_variation': float(pv),
-                'gage_rr': float(grr),
-            },
-            'percent_contribution': {
-                '%%GRR': float((grr / tv) * 100) if tv > 0 else 0,
-                '%%Part-to-Part': float((pv / tv) * 100) if tv > 0 else 0,
-            },
-            'ndc': float(ndc),
-            'acceptance': acceptance,
-            'interpretation': SixSigmaAnalyzer._interpret_gage_rr(percent_grr),
-        }
+    def gage_rr(measurements: List[Dict], tolerance: Optional[float] = None) -> Dict:
+        """
+        Gage R&R 분석 (측정 시스템 분석, 교차 이원분산분석 방법)
+
+        데이터: [{operator: str, part: str, measurement: float}, ...]
+        각 측정자가 각 부품을 같은 횟수 (2회 이상) 반복 측정한 균형 설계여야 함.
+        여러 연구를 한 번에 계산하려면 gage_rr.analyze_studies() 사용.
+        """
+        from apps.spc.services.gage_rr import GageStudyError, analyze_studies
+
+        outcome = analyze_studies([{'measurements': measurements}], tolerance=tolerance)[0]
+        if 'error' in outcome:
+            raise GageStudyError(outcome['error'])
+        return outcome['result']
 
     @staticmethod
     def _interpret_gage_rr(percent_grr: float) -> str:
@@ -5,14 +5,12 @@ SPC 품질 관리 전용 AI 챗봇 서비스
 import os
 import json
 from typing import List, Dict, Any
-from datetime import datetime, timedelta
-import numpy as np
 
 from django.conf import settings
 from apps.aps.ai_llm_models import PredictiveModel, AIInsight, KnowledgeBase
-from apps.spc.models import (
-    Product, QualityMeasurement, ControlChart,
-    ProcessCapability, RunRuleViolation, QualityAlert
+from apps.spc.models import Product, ControlChart
+from apps.spc.services.context_snapshot import (
+    CapabilitySnapshot, ProductContextSnapshot, MIN_TREND_SAMPLES, cpk_to_ppm, get_product_context
 )
 
 
@@ -80,10 +78,9 @@ class SPCQualityChatbot:
             }
 
         try:
-            # 최신 공정능력 데이터 조회
-            capability = ProcessCapability.objects.filter(
-                product_id=product_id
-            ).order_by('-analyzed_at').first()
+            # 최신 공정능력 데이터 (제품 스냅샷)
+            snapshot = get_product_context(product_id)
+            capability = snapshot.capability if snapshot else None
 
             if not capability:
                 return {
@@ -92,7 +89,6 @@ class SPCQualityChatbot:
                     'suggestions': ['공정능력 분석 실행하기']
                 }
 
-            product = capability.product
             cpk = capability.cpk
             cp = capability.cp
 
@@ -118,7 +114,7 @@ class SPCQualityChatbot:
 
             return {
                 'response': f'''
-## {product.product_name} 공정능력 분석 결과
+## {snapshot.product_name} 공정능력 분석 결과
 
 **공정능력 지수:**
 - Cp (잠재 능력): {cp:.3f}
@@ -157,19 +153,10 @@ class SPCQualityChatbot:
             }
 
         try:
-            # 최근 품질 경고 조회
-            recent_alerts = QualityAlert.objects.filter(
-                product_id=product_id,
-                created_at__gte=datetime.now() - timedelta(days=7)
-            ).order_by('-created_at')[:5]
-
-            # 최근 Run Rule 위반 조회
-            recent_violations = RunRuleViolation.objects.filter(
-                control_chart__product_id=product_id,
-                detected_at__gte=datetime.now() - timedelta(days=7)
-            ).order_by('-detected_at')[:5]
-
-            if not recent_alerts and not recent_violations:
+            # 최근 7일 경고 / Run Rule 위반 요약 (제품 스냅샷)
+            snapshot = get_product_context(product_id)
+
+            if not snapshot or (not snapshot.alert_count and not snapshot.violation_count):
                 return {
                     'response': '최근 7일간 특별한 문제가 감지되지 않았습니다. 정상적인 공정 운영 상태입니다.',
                     'context': {},
@@ -177,7 +164,7 @@ class SPCQualityChatbot:
                 }
 
             # 문제 분석 및 해결책 제안
-            diagnosis = self._diagnose_quality_issues(recent_alerts, recent_violations)
+            diagnosis = self._diagnose_quality_issues(snapshot)
 
             return {
                 'response': f'''
@@ -202,8 +189,8 @@ class SPCQualityChatbot:
 - 통계적 공정 관리 (SPC) 강화
                 '''.strip(),
                 'context': {
-                    'alert_count': len(recent_alerts),
-                    'violation_count': len(recent_violations)
+                    'alert_count': snapshot.alert_count,
+                    'violation_count': snapshot.violation_count
                 },
                 'suggestions': [
                     '상세 경고 확인',
@@ -230,35 +217,23 @@ class SPCQualityChatbot:
             }
 
         try:
-            # 최근 30일 데이터 조회
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            measurements = QualityMeasurement.objects.filter(
-                product_id=product_id,
-                measured_at__gte=thirty_days_ago
-            ).order_by('measured_at')
-
-            if measurements.count() < 30:
+            # 최근 30일 측정 통계 (제품 스냅샷)
+            snapshot = get_product_context(product_id)
+            stats = snapshot.measurements if snapshot else None
+
+            if stats is None or stats.data_count < MIN_TREND_SAMPLES:
                 return {
                     'response': '데이터가 부족하여 추세 분석이 불가능합니다. 최소 30개 이상의 측정 데이터가 필요합니다.',
-                    'context': {'data_count': measurements.count()},
+                    'context': {'data_count': stats.data_count if stats else 0},
                     'suggestions': ['데이터 수집 후 재요청']
                 }
 
-            # 추세 분석
-            values = list(measurements.values_list('measurement_value', flat=True))
-            measurements_array = np.array(values)
-
             # 기초 통계
-            mean = np.mean(measurements_array)
-            std = np.std(measurements_array)
-            min_val = np.min(measurements_array)
-            max_val = np.max(measurements_array)
-
-            # 추세 분석 (단순 회귀)
-            x = np.arange(len(measurements_array))
-            z = np.polyfit(x, measurements_array, 1)
-            p = np.poly1d(z)
-            slope = z[0]
+            mean = stats.mean
+            std = stats.std_dev
+            min_val = stats.min_val
+            max_val = stats.max_val
+            slope = stats.slope
 
             # 추세 판정
             if abs(slope) < 0.0001:
@@ -267,20 +242,20 @@ class SPCQualityChatbot:
             elif slope > 0:
                 trend = "상승"
                 trend_desc = f"측정값이 상승 추세입니다. (기울기: {slope:.6f})"
-                if mean > measurements_array[len(measurements_array)//2]:
+                if mean > stats.mid_value:
                     trend_desc += " 상한선(UCL) 근접 가능성이 있으니 주의가 필요합니다."
             else:
                 trend = "하락"
                 trend_desc = f"측정값이 하락 추세입니다. (기울기: {slope:.6f})"
-                if mean < measurements_array[len(measurements_array)//2]:
+                if mean < stats.mid_value:
                     trend_desc += " 하한선(LCL) 근접 가능성이 있으니 주의가 필요합니다."
 
             # 변동성 분석
-            cv = (std / mean) * 100  # 변동 계수
+            cv = stats.cv  # 변동 계수
 
             return {
                 'response': f'''
-## 📈 {measurements.first().product.product_name} 추세 분석
+## 📈 {snapshot.product_name} 추세 분석
 
 ### 기초 통계 (최근 30일)
 - 평균: {mean:.4f}
@@ -302,7 +277,7 @@ class SPCQualityChatbot:
                     'trend': trend,
                     'slope': slope,
                     'cv': cv,
-                    'data_count': len(values)
+                    'data_count': stats.data_count
                 },
                 'suggestions': [
                     '관리도 실시간 모니터링',
@@ -320,13 +295,10 @@ class SPCQualityChatbot:
 
     def _handle_root_cause_analysis(self, message: str, product_id: int) -> Dict[str, Any]:
         """근본 원인 분석 처리"""
-        # 최근 문제 데이터 분석
-        recent_alerts = QualityAlert.objects.filter(
-            product_id=product_id,
-            created_at__gte=datetime.now() - timedelta(days=7)
-        ).order_by('-created_at')
+        # 최근 7일 경고 요약 (제품 스냅샷)
+        snapshot = get_product_context(product_id)
 
-        if not recent_alerts.exists():
+        if not snapshot or not snapshot.alert_count:
             return {
                 'response': '최근 문제 이력이 없습니다. 정상적인 공정 운영 상태입니다.',
                 'context': {},
@@ -334,14 +306,14 @@ class SPCQualityChatbot:
             }
 
         # 4M1E 기반 원인 분석
-        analysis = self._perform_4m1e_analysis(recent_alerts)
+        analysis = self._perform_4m1e_analysis(snapshot)
 
         return {
             'response': f'''
 ## 🔍 근본 원인 분석 결과
 
 ### 문제 개요
-최근 {recent_alerts.count()}건의 품질 문제가 발생했습니다.
+최근 {snapshot.alert_count}건의 품질 문제가 발생했습니다.
 
 ### 4M1E 원인 분석
 {analysis}
@@ -353,15 +325,14 @@ class SPCQualityChatbot:
 4. 방법적 요인: 작업 표준서 개선
 5. 환경적 요인: 작업 환경 최적화
             '''.strip(),
-            'context': {'alert_count': recent_alerts.count()},
+            'context': {'alert_count': snapshot.alert_count},
             'suggestions': ['상세 분석 보고서 생성', '전문가 상담', '개선行动计划 수립']
         }
 
     def _handle_improvement_recommendation(self, message: str, product_id: int) -> Dict[str, Any]:
         """개선 방안 제안"""
-        capability = ProcessCapability.objects.filter(
-            product_id=product_id
-        ).order_by('-analyzed_at').first()
+        snapshot = get_product_context(product_id)
+        capability = snapshot.capability if snapshot else None
 
         if not capability:
             return {
@@ -379,7 +350,7 @@ class SPCQualityChatbot:
 
 ### 현재 상황
 - 현재 Cpk: {capability.cpk:.3f}
-- 목표 Cpk: {capability.product.min_cpk_target or 1.33}
+- 목표 Cpk: {snapshot.min_cpk_target}
 
 ### 📋 단계별 개선 계획
 {recommendations}
@@ -421,7 +392,7 @@ class SPCQualityChatbot:
             'suggestions': []
         }
 
-    def _generate_capability_insights(self, capability: ProcessCapability) -> str:
+    def _generate_capability_insights(self, capability: CapabilitySnapshot) -> str:
         """공정능력 AI 인사이트 생성"""
         insights = []
 
@@ -467,29 +438,25 @@ class SPCQualityChatbot:
                 '작업자 재교육'
             ]
 
-    def _diagnose_quality_issues(self, alerts, violations) -> str:
+    def _diagnose_quality_issues(self, snapshot: ProductContextSnapshot) -> str:
         """품질 문제 진단"""
         diagnosis = []
 
-        if alerts:
-            high_priority = alerts.filter(priority__gte=3).count()
-            diagnosis.append(f"- 긴급/높음 우선순위 경고: {high_priority}건")
-
-        if violations:
-            unresolved = violations.filter(is_resolved=False).count()
-            diagnosis.append(f"- 미해결 Run Rule 위반: {unresolved}건")
+        if snapshot.alert_count:
+            diagnosis.append(f"- 긴급/높음 우선순위 경고: {snapshot.alert_high_priority_count}건")
 
-        # 발생 빈도별 위반 유형
-        violation_types = violations.values_list('rule_type').annotate(count=Count('rule_type'))
-        most_common = violation_types.order_by('-count').first()
+        if snapshot.violation_count:
+            diagnosis.append(f"- 미해결 Run Rule 위반: {snapshot.violation_unresolved_count}건")
 
-        if most_common:
+        # 발생 빈도별 위반 유형 (건수 내림차순)
+        if snapshot.violation_type_counts:
+            rule_type, count = next(iter(snapshot.violation_type_counts.items()))
             diagnosis.append(f"\n**가장 빈번한 위반 유형:**")
-            diagnosis.append(f"- {most_common.rule_type}: {most_common.count}회")
+            diagnosis.append(f"- {rule_type}: {count}회")
 
         return "\n".join(diagnosis)
 
-    def _perform_4m1e_analysis(self, alerts) -> str:
+    def _perform_4m1e_analysis(self, snapshot: ProductContextSnapshot) -> str:
         """4M1E 원인 분석"""
         analysis = """
 **Man (인적 요인)**
@@ -543,15 +510,8 @@ class SPCQualityChatbot:
         return "\n".join(plan)
 
     def _calculate_ppm(self, cpk: float) -> float:
-        """Cpk로 PPM 계산"""
-        from scipy.stats import norm
-        # Cpk를 Z-score로 변환 (편의상 3σ 가정)
-        z = cpk * 3
-        # 한쪽 불량률 계산
-        one_tail = 1 - norm.cdf(z)
-        # 양쪽 불량률 (PPM)
-        ppm = one_tail * 2 * 1_000_000
-        return ppm
+        """Cpk로 PPM 계산 (양측, 3σ 가정)"""
+        return cpk_to_ppm(cpk)
 
 
 # 싱글톤 클래스
@@ -1,10 +1,14 @@
 """
 SPC Signals
-모델 변경 시 WebSocket 알림 전송
+모델 변경 시 WebSocket 알림 전송 / 챗봇 컨텍스트·응답 캐시 무효화 / 일일 집계 무효화 / 대시보드 리소스 버전 증가
 """
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
+from smart_spc.resource_versions import track
 from .models import QualityAlert, QualityMeasurement, ProcessCapability, RunRuleViolation
+from .services.chatbot_cache import get_chatbot_cache
+from .services.context_snapshot import invalidate_product_context
+from .services.quality_rollups import invalidate_day
 from .services.websocket_notifier import WebSocketNotifier
 
 
@@ -44,3 +48,70 @@ def violation_detected(sender, instance, created, **kwargs):
     """Run Rule 위반 감지 시 알림"""
     if created:
         WebSocketNotifier.notify_run_rule_violation(instance)
+
+
+# ----------------------------------------------------------------------
+# 챗봇 컨텍스트 스냅샷 / 응답 캐시 무효화 (공정능력 / 경고 / Run Rule 위반 변경)
+# ----------------------------------------------------------------------
+
+def _invalidate_chatbot_product(product_id):
+    invalidate_product_context(product_id)
+    get_chatbot_cache().invalidate_product(product_id)
+
+
+@receiver(post_save, sender=ProcessCapability)
+@receiver(post_delete, sender=ProcessCapability)
+@receiver(post_save, sender=QualityAlert)
+@receiver(post_delete, sender=QualityAlert)
+def invalidate_chatbot_cache(sender, instance, **kwargs):
+    """제품 컨텍스트 스냅샷 삭제 + 챗봇 캐시 버전 증가"""
+    _invalidate_chatbot_product(instance.product_id)
+
+
+@receiver(post_save, sender=RunRuleViolation)
+@receiver(post_delete, sender=RunRuleViolation)
+def invalidate_chatbot_cache_for_violation(sender, instance, **kwargs):
+    """Run Rule 위반 변경 시 제품 컨텍스트 / 챗봇 캐시 무효화"""
+    try:
+        product_id = instance.measurement.product_id
+    except QualityMeasurement.DoesNotExist:  # 측정 데이터와 함께 삭제되는 경우
+        return
+    _invalidate_chatbot_product(product_id)
+
+
+# ----------------------------------------------------------------------
+# 일일 집계 무효화 (과거 일자의 측정 / 경고 변경 → 해당 일자는 원본 데이터로 계산)
+# ----------------------------------------------------------------------
+
+@receiver(pre_save, sender=QualityMeasurement)
+def remember_measured_at(sender, instance, **kwargs):
+    """수정 전 측정 시각 보관 (측정 일자가 바뀌면 이전 일자 집계도 무효화)"""
+    instance._previous_measured_at = None if instance._state.adding else (
+        sender.objects.filter(pk=instance.pk).values_list('measured_at', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=QualityMeasurement)
+@receiver(post_delete, sender=QualityMeasurement)
+def invalidate_rollup_for_measurement(sender, instance, **kwargs):
+    """과거 측정 데이터 추가 / 수정 / 삭제 시 해당 일자 (및 이동 전 일자) 집계 무효화"""
+    previous = getattr(instance, '_previous_measured_at', None)
+    if previous and previous != instance.measured_at:
+        invalidate_day(previous)
+    if instance.measured_at:
+        invalidate_day(instance.measured_at)
+
+
+@receiver(post_save, sender=QualityAlert)
+@receiver(post_delete, sender=QualityAlert)
+def invalidate_rollup_for_alert(sender, instance, **kwargs):
+    """과거 경고 상태 변경 / 삭제 시 해당 일자 집계 무효화"""
+    if instance.created_at:
+        invalidate_day(instance.created_at)
+
+
+# ----------------------------------------------------------------------
+# 리소스 버전 (smart_spc/resource_versions.py: 대시보드 HTTP 캐시)
+# ----------------------------------------------------------------------
+
+track(QualityAlert, 'quality_alert', scope='product_id')
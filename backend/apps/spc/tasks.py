@@ -20,19 +20,48 @@ from .models import (
     Product, QualityMeasurement, QualityAlert, QualityReport
 )
 from .services.report_generator import QualityReportGenerator, ReportExporter
+from .services.quality_rollups import rollup_missing_days
 from .services.time_series_analysis import TimeSeriesService, AnomalyDetector
 
 logger = get_task_logger(__name__)
 
 
+def _save_report(report_type: str, title: str, report_data: dict) -> QualityReport:
+    """보고서 데이터를 QualityReport 로 저장"""
+    summary = report_data['summary']
+    report = QualityReport.objects.create(
+        report_type=report_type,
+        title=title,
+        start_date=datetime.fromisoformat(report_data['period']['start']),
+        end_date=datetime.fromisoformat(report_data['period']['end']),
+        summary=ReportExporter.export_to_markdown(report_data),
+        recommendations=report_data['recommendations'],
+        total_measurements=summary['total_measurements'],
+        out_of_spec_count=summary['out_of_spec_count'],
+        out_of_control_count=summary['out_of_control_count'],
+        alert_count=summary['total_alerts'],
+        generated_by='system'
+    )
+    report.products.set([detail['product_id'] for detail in report_data['product_details']])
+    return report
+
+
 @shared_task(bind=True, name='apps.spc.tasks.generate_daily_report')
 def generate_daily_report(self, report_date: str = None):
     """
     일일 보고서 생성 (비동기)
+
+    보고서 생성 전에 전날 및 누락된 최근 일자의 제품별 일일 집계 (QualityDailyRollup) 를 기록
     """
     try:
         logger.info(f"일일 보고서 생성 시작: {report_date}")
 
+        rolled_up = rollup_missing_days(
+            getattr(settings, 'QUALITY_ROLLUP_LOOKBACK_DAYS', 35)
+        )
+        if rolled_up:
+            logger.info(f"일일 집계 기록: {len(rolled_up)}일 ({rolled_up[0]} ~ {rolled_up[-1]})")
+
         if report_date:
             date = datetime.fromisoformat(report_date)
         else:
@@ -42,16 +71,10 @@ def generate_daily_report(self, report_date: str = None):
         report_data = generator.generate_daily_report(date)
 
         # 보고서 저장
-        report = QualityReport.objects.create(
-            report_type='DAILY',
-            title=f"{date.strftime('%Y-%m-%d')} 일일 보고서",
-            description=date.strftime('%Y년 %m월 %d일 일일 보고서'),
-            products_data=report_data,
-            generated_by='system'
-        )
+        report = _save_report('DAILY', f"{date.strftime('%Y-%m-%d')} 일일 보고서", report_data)
 
         logger.info(f"일일 보고서 생성 완료: {report.id}")
-        return {'report_id': report.id, 'status': 'success'}
+        return {'report_id': report.id, 'status': 'success', 'rolled_up_days': len(rolled_up)}
 
     except Exception as e:
         logger.error(f"일일 보고서 생성 실패: {str(e)}")
@@ -61,7 +84,7 @@ def generate_daily_report(self, report_date: str = None):
 @shared_task(bind=True, name='apps.spc.tasks.generate_weekly_report')
 def generate_weekly_report(self, report_date: str = None):
     """
-    주간 보고서 생성 (비동기)
+    주간 보고서 생성 (비동기, 일일 집계 병합)
     """
     try:
         logger.info(f"주간 보고서 생성 시작: {report_date}")
@@ -75,13 +98,7 @@ def generate_weekly_report(self, report_date: str = None):
         report_data = generator.generate_weekly_report(date)
 
         # 보고서 저장
-        report = QualityReport.objects.create(
-            report_type='WEEKLY',
-            title=f"{date.strftime('%Y-W%U')} 주간 보고서",
-            description=date.strftime('%Y년 %U주 주간 보고서'),
-            products_data=report_data,
-            generated_by='system'
-        )
+        report = _save_report('WEEKLY', f"{date.strftime('%Y-W%U')} 주간 보고서", report_data)
 
         logger.info(f"주간 보고서 생성 완료: {report.id}")
         return {'report_id': report.id, 'status': 'success'}
@@ -94,7 +111,7 @@ def generate_weekly_report(self, report_date: str = None):
 @shared_task(bind=True, name='apps.spc.tasks.generate_monthly_report')
 def generate_monthly_report(self, report_date: str = None):
     """
-    월간 보고서 생성 (비동기)
+    월간 보고서 생성 (비동기, 일일 집계 병합)
     """
     try:
         logger.info(f"월간 보고서 생성 시작: {report_date}")
@@ -108,13 +125,7 @@ def generate_monthly_report(self, report_date: str = None):
         report_data = generator.generate_monthly_report(date)
 
         # 보고서 저장
-        report = QualityReport.objects.create(
-            report_type='MONTHLY',
-            title=f"{date.strftime('%Y-%m')} 월간 보고서",
-            description=date.strftime('%Y년 %m월 월간 보고서'),
-            products_data=report_data,
-            generated_by='system'
-        )
+        report = _save_report('MONTHLY', f"{date.strftime('%Y-%m')} 월간 보고서", report_data)
 
         logger.info(f"월간 보고서 생성 완료: {report.id}")
         return {'report_id': report.id, 'status': 'success'}
@@ -331,6 +342,31 @@ def cleanup_old_data(days_to_keep: int = 90):
         raise
 
 
+@shared_task(name='apps.spc.tasks.refresh_all_process_capability')
+def refresh_all_process_capability():
+    """
+    야간 공정능력 일괄 갱신
+    - 활성 제품 전체 ProcessCapability 저장
+    - 활성 품질특성 전체 Cpk 목표 / 최소 기준 비교
+    """
+    try:
+        from .services.capability_batch import refresh_capabilities
+
+        summary = refresh_capabilities()
+        characteristics = summary['characteristics']
+        return {
+            'products_analyzed': summary['products']['analyzed'],
+            'products_saved': summary['products']['saved'],
+            'characteristics_analyzed': characteristics['analyzed'],
+            'characteristics_below_minimum': characteristics['below_minimum'],
+            'elapsed_ms': summary['elapsed_ms'],
+        }
+
+    except Exception as e:
+        logger.error(f"공정능력 일괄 갱신 실패: {str(e)}")
+        raise
+
+
 @shared_task(name='apps.spc.tasks.batch_import_measurements')
 def batch_import_measurements(data_list: list):
     """
@@ -405,10 +441,12 @@ def detect_anomalies_for_product(product_id: int, days: int = 7):
 def calculate_process_capability(product_id: int):
     """특정 제품의 공정능력 계산"""
     try:
-        from .services.process_capability import ProcessCapabilityAnalyzer
+        from .services.capability_batch import refresh_capabilities
 
-        analyzer = ProcessCapabilityAnalyzer()
-        # ... 공정능력 계산 로직
+        summary = refresh_capabilities(product_ids=[product_id], include_characteristics=False)
+        error = summary['products']['errors'].get(product_id)
+        if error:
+            return {'product_id': product_id, 'status': 'skipped', 'reason': error}
 
         return {'product_id': product_id, 'status': 'calculated'}
 
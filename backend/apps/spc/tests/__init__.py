@@ -0,0 +1 @@
+# SPC app tests
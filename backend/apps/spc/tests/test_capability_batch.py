@@ -0,0 +1,85 @@
+"""
+Tests for batched process capability (apps/spc/services/capability_batch.py)
+
+일괄 계산 결과는 그룹별 ProcessCapabilityAnalyzer.analyze 와 같아야 한다
+"""
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from apps.spc.services.capability_batch import capability_batch
+from apps.spc.services.process_capability import ProcessCapabilityAnalyzer
+
+
+GROUPS = {
+    # 키: (평균, 표준편차, 부분군 수, 부분군 크기, (usl, lsl, target))
+    'P-100': (10.0, 0.05, 20, 5, (10.2, 9.8, None)),
+    'P-200': (25.3, 0.4, 12, 4, (27.0, 24.0, 25.5)),
+    'P-300': (0.51, 0.002, 30, 3, (0.52, 0.50, None)),
+    7: (100.0, 3.0, 8, 2, (110.0, 85.0, 100.0)),
+}
+
+
+@pytest.fixture
+def measurements():
+    """그룹 / 부분군이 섞인 입력 배열과 그룹별 부분군 데이터"""
+    rng = np.random.default_rng(42)
+    keys, values, subgroups, by_group = [], [], [], {}
+    for key, (mean, std, count, size, _) in GROUPS.items():
+        data = rng.normal(mean, std, (count, size)) + rng.normal(0, std / 2, (count, 1))
+        by_group[key] = data
+        for number, subgroup in enumerate(data, start=1):
+            keys.extend([key] * size)
+            values.extend(subgroup.tolist())
+            subgroups.extend([number] * size)
+    order = rng.permutation(len(values))
+    return (
+        np.array(keys, dtype=object)[order], np.array(values)[order], np.array(subgroups)[order], by_group,
+    )
+
+
+class TestCapabilityBatch:
+    """capability_batch vs ProcessCapabilityAnalyzer.analyze"""
+
+    @pytest.mark.parametrize('normality', ['none', 'sampled'])
+    def test_matches_per_group_analyze(self, measurements, normality):
+        keys, values, subgroups, by_group = measurements
+        specs = {key: spec for key, (*_, spec) in GROUPS.items()}
+
+        results, errors = capability_batch(
+            keys, values, specs, subgroups=subgroups, normality=normality, sample_size=10_000,
+        )
+
+        assert errors == {}
+        assert set(results) == set(GROUPS)
+        analyzer = ProcessCapabilityAnalyzer()
+        for key, data in by_group.items():
+            usl, lsl, target = specs[key]
+            expected = asdict(analyzer.analyze(
+                data.ravel().tolist(), usl, lsl, target,
+                subgroup_data=data.tolist(), check_normality=normality == 'sampled',
+            ))
+            actual = asdict(results[key])
+            for name, value in expected.items():
+                if name == 'normality_test':
+                    continue
+                if isinstance(value, (bool, np.bool_, str)):
+                    assert actual[name] == value, (key, name)
+                else:
+                    assert actual[name] == pytest.approx(float(value), rel=1e-9, abs=1e-9), (key, name)
+
+    def test_invalid_groups_reported(self):
+        results, errors = capability_batch(
+            ['A', 'A', 'B', 'B', 'C', 'D'], [1.0, 2.0, 3.0, 3.0, 1.0, 5.0],
+            {'A': (5.0, 0.0, None), 'B': (4.0, 2.0, None), 'C': (2.0, 0.0, None), 'E': (1.0, 0.0, None)},
+            normality='none',
+        )
+
+        assert set(results) == {'A'}
+        assert errors == {
+            'B': '표준편차가 0입니다 (측정값이 모두 같음)',
+            'C': '최소 2개의 데이터가 필요합니다',
+            'D': '규격 (USL / LSL) 이 없습니다',
+            'E': '최소 2개의 데이터가 필요합니다',
+        }
@@ -0,0 +1,107 @@
+"""
+Tests for the chatbot response cache (apps/spc/services/chatbot_cache.py)
+"""
+import pytest
+from django.core.cache import cache
+
+from apps.spc.models import Product, QualityAlert
+from apps.spc.services import chatbot_cache
+from apps.spc.services.chatbot_cache import ChatbotResponseCache, normalize_question
+
+CONTEXT = {'cpk': 1.33333, 'mean': 10.0021, 'sample_count': 125, 'status': 'OK'}
+ENTRY = {'response': 'Cpk 는 1.33 입니다', 'provider': 'test'}
+
+
+@pytest.fixture
+def response_cache():
+    cache.clear()
+    return ChatbotResponseCache(timeout=60, lru_size=8)
+
+
+class TestQuestionNormalization:
+    """대소문자 / 공백 / 끝 문장부호"""
+
+    @pytest.mark.parametrize('question', [
+        'Cpk 값은?', 'cpk 값은', '  CPK   값은 ? ', 'Cpk\t값은!!', 'Cpk 값은？', 'Ｃｐｋ 값은.',
+    ])
+    def test_variants_share_one_key(self, response_cache, question):
+        assert normalize_question(question) == 'cpk 값은'
+        assert response_cache.make_key('capability', 1, CONTEXT, question) == \
+               response_cache.make_key('capability', 1, CONTEXT, 'Cpk 값은?')
+
+    def test_different_question_intent_or_context_change_key(self, response_cache):
+        key = response_cache.make_key('capability', 1, CONTEXT, 'Cpk 값은?')
+
+        assert response_cache.make_key('capability', 1, CONTEXT, 'Cp 값은?') != key
+        assert response_cache.make_key('trend', 1, CONTEXT, 'Cpk 값은?') != key
+        assert response_cache.make_key('capability', 2, CONTEXT, 'Cpk 값은?') != key
+        assert response_cache.make_key('capability', 1, {**CONTEXT, 'cpk': 0.9}, 'Cpk 값은?') != key
+        # 유효숫자 3자리 이하의 변화는 같은 키
+        assert response_cache.make_key('capability', 1, {**CONTEXT, 'cpk': 1.33341}, 'Cpk 값은?') == key
+
+
+class TestInvalidation:
+    """제품 데이터 버전 증가"""
+
+    def test_invalidate_product_changes_key_and_drops_l1(self, response_cache):
+        key = response_cache.make_key('capability', 1, CONTEXT, 'Cpk 값은?')
+        other = response_cache.make_key('capability', 2, CONTEXT, 'Cpk 값은?')
+        response_cache.set(key, ENTRY)
+        response_cache.set(other, ENTRY)
+
+        response_cache.invalidate_product(1)
+
+        new_key = response_cache.make_key('capability', 1, CONTEXT, 'Cpk 값은?')
+        assert new_key != key
+        assert response_cache.get(new_key) is None
+        assert response_cache.make_key('capability', 2, CONTEXT, 'Cpk 값은?') == other
+        assert response_cache.stats()['l1_size'] == 1
+        assert response_cache.stats()['invalidations'] == 1
+
+    def test_other_worker_sees_bump_after_version_ttl(self, response_cache, monkeypatch):
+        worker = ChatbotResponseCache(timeout=60)
+        key = worker.make_key('capability', 1, CONTEXT, 'Cpk 값은?')
+
+        response_cache.invalidate_product(1)
+        assert worker.make_key('capability', 1, CONTEXT, 'Cpk 값은?') == key  # 로컬 버전 보관 중
+
+        monkeypatch.setattr(chatbot_cache, 'VERSION_TTL', 0.0)
+        assert worker.make_key('capability', 1, CONTEXT, 'Cpk 값은?') != key
+
+    @pytest.mark.django_db
+    def test_alert_save_bumps_product_version(self, response_cache, monkeypatch):
+        monkeypatch.setattr(chatbot_cache, '_chatbot_cache', response_cache)
+        product = Product.objects.create(product_code='P1', product_name='제품', usl=12.0, lsl=8.0)
+        key = response_cache.make_key('capability', product.id, CONTEXT, 'Cpk 값은?')
+
+        QualityAlert.objects.create(product=product, alert_type='CAPABILITY', title='Cpk 저하', description='')
+
+        assert response_cache.make_key('capability', product.id, CONTEXT, 'Cpk 값은?') != key
+
+
+class TestStats:
+    """L1 / L2 적중 / 미스 통계"""
+
+    def test_l1_l2_hits_and_misses(self, response_cache):
+        key = response_cache.make_key('capability', 1, CONTEXT, 'Cpk 값은?')
+
+        assert response_cache.get(key) is None            # miss
+        response_cache.set(key, ENTRY)
+        assert response_cache.get(key) == ENTRY           # L1
+        response_cache.clear_local()
+        assert response_cache.get(key) == ENTRY           # L2 → L1 채움
+        assert response_cache.get(key) == ENTRY           # L1
+
+        stats = response_cache.stats()
+        assert (stats['l1_hits'], stats['l2_hits'], stats['misses'], stats['stores']) == (2, 1, 1, 1)
+        assert stats['lookups'] == 4
+        assert stats['hit_rate'] == pytest.approx(0.75)
+
+    def test_lru_evicts_oldest(self, response_cache):
+        keys = [response_cache.make_key('capability', 1, CONTEXT, f'질문 {i}') for i in range(10)]
+        for key in keys:
+            response_cache.set(key, ENTRY)
+
+        assert response_cache.stats()['l1_size'] == 8
+        response_cache.get(keys[0])  # L1 에서 축출 → L2 적중
+        assert response_cache.stats()['l2_hits'] == 1
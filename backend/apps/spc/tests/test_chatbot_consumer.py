@@ -0,0 +1,96 @@
+"""
+Tests for the chatbot WebSocket consumer (apps/spc/consumers.py)
+
+백그라운드 스트림 태스크의 예외는 error 프레임 + done 프레임으로 끝나야 한다
+"""
+import asyncio
+import json
+
+import pytest
+
+from apps.spc import consumers
+from apps.spc.services import llm_service
+from apps.spc.services.llm_service import LLMStreamEvent
+
+
+class _FailingChatbot:
+    """토큰 1개 후 예외를 던지는 챗봇 서비스"""
+
+    async def astream_chat(self, message, intent, context_data, history, product_id):
+        yield LLMStreamEvent('token', content='공정')
+        raise RuntimeError('provider disconnected')
+
+
+class _Chatbot:
+    async def astream_chat(self, message, intent, context_data, history, product_id):
+        yield LLMStreamEvent('token', content='양호')
+        yield LLMStreamEvent('done', data={'provider': 'test'})
+
+
+def _run(service, monkeypatch, message='공정능력은?'):
+    """receive → stream_task 완료까지 실행하고 송신 프레임 반환"""
+    frames = []
+
+    async def prepare_chat(self, message, product_id, session_id):
+        return 'capability', {}, []
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        frames.append(json.loads(text_data))
+
+    monkeypatch.setattr(consumers.ChatbotStreamConsumer, 'prepare_chat', prepare_chat)
+    monkeypatch.setattr(consumers.ChatbotStreamConsumer, 'send', send)
+    monkeypatch.setattr(llm_service, 'get_spc_chatbot_service', lambda: service)
+
+    async def scenario():
+        consumer = consumers.ChatbotStreamConsumer()
+        consumer.stream_task = None
+        await consumer.receive(json.dumps({'type': 'chat', 'message': message}))
+        await consumer.stream_task
+
+    asyncio.run(scenario())
+    return frames
+
+
+class TestChatbotStreamConsumer:
+    """ws/spc/chatbot/"""
+
+    def test_stream_failure_sends_error_then_done(self, monkeypatch, caplog):
+        # LOGGING 설정의 propagate=False 로거에도 기록이 잡히도록 직접 연결
+        consumers.logger.addHandler(caplog.handler)
+        try:
+            frames = _run(_FailingChatbot(), monkeypatch)
+        finally:
+            consumers.logger.removeHandler(caplog.handler)
+
+        assert [frame['type'] for frame in frames] == ['token', 'error', 'done']
+        assert frames[1]['message'] == 'provider disconnected'
+        assert frames[2] == {'type': 'done', 'intent': 'capability', 'session_id': None}
+        assert 'Chatbot stream failed' in caplog.text
+
+    def test_prepare_failure_is_reported(self, monkeypatch):
+        async def broken_prepare(self, message, product_id, session_id):
+            raise ValueError('product not found')
+
+        frames = []
+
+        async def send(self, text_data=None, bytes_data=None, close=False):
+            frames.append(json.loads(text_data))
+
+        monkeypatch.setattr(consumers.ChatbotStreamConsumer, 'prepare_chat', broken_prepare)
+        monkeypatch.setattr(consumers.ChatbotStreamConsumer, 'send', send)
+
+        consumer = consumers.ChatbotStreamConsumer()
+        asyncio.run(consumer.stream_chat('질문', None, 's-1'))
+
+        assert frames == [
+            {'type': 'error', 'message': 'product not found'},
+            {'type': 'done', 'intent': None, 'session_id': 's-1'},
+        ]
+
+    def test_successful_stream_is_unchanged(self, monkeypatch):
+        frames = _run(_Chatbot(), monkeypatch)
+
+        assert frames == [
+            {'type': 'token', 'content': '양호'},
+            {'type': 'done', 'provider': 'test', 'intent': 'capability', 'session_id': None},
+        ]
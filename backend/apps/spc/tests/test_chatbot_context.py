@@ -0,0 +1,168 @@
+"""
+Tests for the chatbot product context snapshot (apps/spc/services/context_snapshot.py)
+
+스냅샷 값은 챗봇 핸들러가 예전에 쿼리마다 직접 계산하던 값과 같아야 한다
+"""
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.spc.models import (
+    ControlChart, InspectionPlan, ProcessCapability, Product, QualityAlert, QualityMeasurement, RunRuleViolation,
+)
+from apps.spc.services.context_snapshot import build_product_context, get_product_context
+from apps.spc.services.spc_chatbot import SPCQualityChatbot
+
+
+def _make_product(code, now, rng):
+    product = Product.objects.create(product_code=code, product_name=f'샤프트 {code}', usl=10.2, lsl=9.8)
+    plan = InspectionPlan.objects.create(
+        product=product, plan_name='외경', frequency='HOURLY', sampling_method='RANDOM', characteristic='외경',
+    )
+    chart = ControlChart.objects.create(product=product, inspection_plan=plan, chart_type='XBAR_R')
+
+    # 30일 구간 40건 + 구간 밖 5건 (상승 추세, 일부 규격 이탈)
+    values = 10.0 + np.linspace(0, 0.15, 45) + rng.normal(0, 0.05, 45)
+    measurements = QualityMeasurement.objects.bulk_create([
+        QualityMeasurement(
+            product=product, measurement_value=float(value), sample_number=i % 5 + 1, subgroup_number=i // 5 + 1,
+            measured_at=now - timedelta(days=35) + timedelta(hours=i) if i < 5 else now - timedelta(hours=45 - i),
+            measured_by='tester', is_within_spec=bool(9.8 <= value <= 10.2),
+        )
+        for i, value in enumerate(values)
+    ])
+
+    old = ProcessCapability.objects.create(
+        product=product, control_chart=chart, cp=0.9, cpk=0.7, cpu=0.7, cpl=1.1, mean=10.05, std_deviation=0.07,
+        sample_size=25, analysis_start=now - timedelta(days=60), analysis_end=now - timedelta(days=30),
+    )
+    ProcessCapability.objects.filter(pk=old.pk).update(analyzed_at=now - timedelta(days=30))
+    ProcessCapability.objects.create(
+        product=product, control_chart=chart, cp=1.4, cpk=1.21, cpu=1.21, cpl=1.59, pp=1.35, ppk=1.18,
+        mean=10.03, std_deviation=0.048, sample_size=125, is_normal=False,
+        analysis_start=now - timedelta(days=30), analysis_end=now,
+    )
+
+    for i, (alert_type, priority) in enumerate([
+        ('OUT_OF_SPEC', 4), ('RUN_RULE', 2), ('OUT_OF_SPEC', 3), ('CAPABILITY', 1), ('RUN_RULE', 2),
+        ('OUT_OF_SPEC', 3), ('RUN_RULE', 1),
+    ]):
+        QualityAlert.objects.create(
+            product=product, measurement=measurements[-1 - i], alert_type=alert_type, priority=priority,
+            title=f'경고 {i}', description=f'설명 {i}',
+        )
+    stale = QualityAlert.objects.create(product=product, alert_type='OUT_OF_SPEC', title='오래된 경고', description='')
+    QualityAlert.objects.filter(pk=stale.pk).update(created_at=now - timedelta(days=8))
+
+    for i, (rule_type, resolved) in enumerate([
+        ('RULE_1', False), ('RULE_2', True), ('RULE_1', False), ('RULE_3', False), ('RULE_1', True), ('RULE_2', False),
+    ]):
+        RunRuleViolation.objects.create(
+            control_chart=chart, measurement=measurements[-1 - i], rule_type=rule_type,
+            description=f'위반 {i}', severity=i % 4 + 1, is_resolved=resolved,
+        )
+    stale = RunRuleViolation.objects.create(
+        control_chart=chart, measurement=measurements[-1], rule_type='RULE_3', description='오래된 위반',
+    )
+    RunRuleViolation.objects.filter(pk=stale.pk).update(detected_at=now - timedelta(days=8))
+    return product
+
+
+@pytest.fixture
+def product():
+    cache.clear()
+    now = timezone.now()
+    rng = np.random.default_rng(7)
+    _make_product('P-OTHER', now, rng)  # 다른 제품 데이터는 섞이지 않아야 함
+    return _make_product('P-100', now, rng)
+
+
+def _per_query_context(product_id):
+    """예전 핸들러의 쿼리별 계산 (비교 기준)"""
+    since = timezone.now() - timedelta(days=7)
+    capability = ProcessCapability.objects.filter(product_id=product_id).order_by('-analyzed_at').first()
+    alerts = QualityAlert.objects.filter(product_id=product_id, created_at__gte=since)
+    violations = RunRuleViolation.objects.filter(control_chart__product_id=product_id, detected_at__gte=since)
+    measurements = QualityMeasurement.objects.filter(
+        product_id=product_id, measured_at__gte=timezone.now() - timedelta(days=30)
+    ).order_by('measured_at')
+    values = np.array(list(measurements.values_list('measurement_value', flat=True)))
+    most_common = violations.values('rule_type').annotate(count=Count('rule_type')).order_by('-count').first()
+    return {
+        'capability': capability,
+        'alert_count': alerts.count(),
+        'alert_high_priority_count': alerts.filter(priority__gte=3).count(),
+        'recent_alerts': list(alerts.order_by('-created_at').values_list('title', flat=True)[:5]),
+        'violation_count': violations.count(),
+        'violation_unresolved_count': violations.filter(is_resolved=False).count(),
+        'recent_violations': list(violations.order_by('-detected_at').values_list('description', flat=True)[:5]),
+        'most_common_violation': (most_common['rule_type'], most_common['count']),
+        'values': values,
+        'oos_count': measurements.filter(is_within_spec=False).count(),
+    }
+
+
+@pytest.mark.django_db
+class TestSnapshotParity:
+    """스냅샷 ↔ 쿼리별 계산"""
+
+    def test_snapshot_matches_per_query_context(self, product):
+        expected = _per_query_context(product.id)
+        snapshot = build_product_context(product.id)
+
+        capability = expected['capability']
+        for name in ('cp', 'cpk', 'cpu', 'cpl', 'pp', 'ppk', 'mean', 'std_deviation', 'sample_size', 'is_normal'):
+            assert getattr(snapshot.capability, name) == getattr(capability, name), name
+        assert snapshot.capability.analyzed_at == capability.analyzed_at
+
+        assert snapshot.alert_count == expected['alert_count'] == 7
+        assert snapshot.alert_high_priority_count == expected['alert_high_priority_count']
+        assert [a['title'] for a in snapshot.recent_alerts] == expected['recent_alerts']
+        assert sum(snapshot.alert_type_counts.values()) == snapshot.alert_count
+
+        assert snapshot.violation_count == expected['violation_count'] == 6
+        assert snapshot.violation_unresolved_count == expected['violation_unresolved_count']
+        assert [v['description'] for v in snapshot.recent_violations] == expected['recent_violations']
+        assert next(iter(snapshot.violation_type_counts.items())) == expected['most_common_violation']
+
+        values, stats = expected['values'], snapshot.measurements
+        assert stats.data_count == len(values) == 40
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.std_dev == pytest.approx(np.std(values))
+        assert (stats.min_val, stats.max_val) == (values.min(), values.max())
+        assert stats.slope == pytest.approx(np.polyfit(np.arange(len(values)), values, 1)[0])
+        assert stats.mid_value == values[len(values) // 2]
+        assert stats.cv == pytest.approx(np.std(values) / np.mean(values) * 100)
+        assert stats.oos_count == expected['oos_count']
+
+    def test_snapshot_is_built_in_fixed_queries(self, product, django_assert_num_queries):
+        with django_assert_num_queries(7):
+            build_product_context(product.id)
+
+    def test_handlers_report_per_query_values(self, product):
+        expected = _per_query_context(product.id)
+        chatbot = SPCQualityChatbot()
+
+        troubleshooting = chatbot._handle_troubleshooting('문제', product.id)
+        assert troubleshooting['context'] == {
+            'alert_count': expected['alert_count'], 'violation_count': expected['violation_count'],
+        }
+        assert f"- 긴급/높음 우선순위 경고: {expected['alert_high_priority_count']}건" in troubleshooting['response']
+        assert f"- 미해결 Run Rule 위반: {expected['violation_unresolved_count']}건" in troubleshooting['response']
+
+        trend = chatbot._handle_trend_analysis('추세', product.id)
+        values = expected['values']
+        assert trend['context']['data_count'] == len(values)
+        assert trend['context']['slope'] == pytest.approx(np.polyfit(np.arange(len(values)), values, 1)[0])
+
+        assert chatbot._handle_root_cause_analysis('원인', product.id)['context'] == {
+            'alert_count': expected['alert_count'],
+        }
+
+    def test_missing_product_has_no_snapshot(self, db):
+        assert get_product_context(999999) is None
+        assert get_product_context(None) is None
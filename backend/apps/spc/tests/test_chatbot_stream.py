@@ -0,0 +1,93 @@
+"""
+Tests for the chatbot SSE endpoint against a local fake OpenAI-compatible provider
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from apps.spc.services import llm_service
+
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """/v1/chat/completions 스트리밍 응답 (토큰 2개 + usage + [DONE])"""
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.requests.append((self.path, body))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for text in ('공정능력', '은 양호합니다'):
+            chunk = {'choices': [{'delta': {'content': text}}]}
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+        self.wfile.write(b'data: {"choices": [], "usage": {"total_tokens": 12}}\n\n')
+        self.wfile.write(b'data: [DONE]\n\n')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_provider(settings, monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FakeOpenAIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    settings.LLM_PROVIDER = 'openai'
+    settings.OPENAI_API_KEY = 'test-key'
+    settings.OPENAI_MODEL = 'gpt-test'
+    settings.OPENAI_API_BASE = f'http://127.0.0.1:{server.server_port}/v1'
+    settings.CHATBOT_CACHE_ENABLED = False
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.setattr(llm_service, '_spc_chatbot_service', None)
+    _FakeOpenAIHandler.requests = []
+    yield _FakeOpenAIHandler.requests
+
+    server.shutdown()
+    server.server_close()
+
+
+def _events(body: bytes):
+    events = []
+    for frame in body.decode('utf-8').strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in frame.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+@pytest.mark.django_db
+class TestChatbotStream:
+    """POST /api/spc/chatbot/stream/"""
+
+    url = '/api/spc/chatbot/stream/'
+
+    def test_event_stream_accept_header_streams_tokens(self, api_client, fake_provider):
+        response = api_client.post(
+            self.url, {'message': '안녕하세요'}, format='json', HTTP_ACCEPT='text/event-stream',
+        )
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/event-stream')
+        events = _events(b''.join(response.streaming_content))
+
+        assert [e for e in events if e[0] == 'token'] == [
+            ('token', {'content': '공정능력'}), ('token', {'content': '은 양호합니다'}),
+        ]
+        done = events[-1]
+        assert done[0] == 'done'
+        assert (done[1]['provider'], done[1]['model'], done[1]['tokens_used']) == ('openai', 'gpt-test', 12)
+
+        path, body = fake_provider[0]
+        assert path == '/v1/chat/completions'
+        assert body['stream'] is True and body['model'] == 'gpt-test'
+
+    def test_invalid_request_is_an_error_event(self, api_client, fake_provider):
+        response = api_client.post(self.url, {}, format='json', HTTP_ACCEPT='text/event-stream')
+
+        assert response.status_code == 400
+        event, data = _events(response.content)[0]
+        assert event == 'error' and 'message' in data
+        assert fake_provider == []
@@ -0,0 +1,118 @@
+"""
+Tests for POST /api/spc/master-data/instruments/gage_rr_batch/
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from apps.spc.models_master_data import (
+    MeasurementInstrumentMaster, MeasurementSystemComponent, MeasurementSystemMaster,
+)
+
+
+def _study(seed, parts=5, operators=3, replicates=2):
+    rng = np.random.default_rng(seed)
+    part_effect = rng.normal(0, 0.05, parts)
+    operator_effect = rng.normal(0, 0.01, operators)
+    return [
+        {'part': str(p), 'operator': chr(65 + o),
+         'measurement': float(10 + part_effect[p] + operator_effect[o] + rng.normal(0, 0.005))}
+        for p in range(parts) for o in range(operators) for _ in range(replicates)
+    ]
+
+
+def _reference_components(measurements):
+    """교호작용 포함 교차 이원분산분석 (groupby 참조 구현)"""
+    df = pd.DataFrame(measurements)
+    p, o = df['part'].nunique(), df['operator'].nunique()
+    r = len(df) // (p * o)
+    grand = df['measurement'].mean()
+    part_mean = df.groupby('part')['measurement'].transform('mean')
+    operator_mean = df.groupby('operator')['measurement'].transform('mean')
+    cell_mean = df.groupby(['part', 'operator'])['measurement'].transform('mean')
+
+    ms_part = ((part_mean - grand) ** 2).sum() / (p - 1)
+    ms_operator = ((operator_mean - grand) ** 2).sum() / (o - 1)
+    ms_interaction = ((cell_mean - part_mean - operator_mean + grand) ** 2).sum() / ((p - 1) * (o - 1))
+    ms_error = ((df['measurement'] - cell_mean) ** 2).sum() / (p * o * (r - 1))
+
+    interaction = max((ms_interaction - ms_error) / r, 0.0)
+    return {
+        'equipment_variation': ms_error,
+        'appraiser_variation': max((ms_operator - ms_interaction) / (p * r), 0.0) + interaction,
+        'part_to_part_variation': max((ms_part - ms_interaction) / (o * r), 0.0),
+    }
+
+
+@pytest.fixture
+def instruments():
+    system = MeasurementSystemMaster.objects.create(
+        system_cd='MS-01', system_nm='외경 측정', measurement_process='외경 측정 절차',
+        system_manager='홍길동', location='검사실',
+    )
+    created = []
+    for code in ('INST-001', 'INST-002'):
+        instrument = MeasurementInstrumentMaster.objects.create(
+            instrument_cd=code, instrument_nm=f'마이크로미터 {code}', instrument_type='MICROMETER', unit='mm',
+        )
+        MeasurementSystemComponent.objects.create(system=system, instrument=instrument, component_role='주측정기')
+        created.append(instrument)
+    return created
+
+
+@pytest.mark.django_db
+class TestGageRRBatch:
+    """여러 기구 Gage R&R 일괄 분석 API"""
+
+    url = '/api/spc/master-data/instruments/gage_rr_batch/'
+
+    def test_batch_matches_reference_and_applies_results(self, api_client, instruments):
+        studies = {'INST-001': _study(1), 'INST-002': _study(2, parts=4, operators=2, replicates=3)}
+        response = api_client.post(self.url, {
+            'studies': [
+                *({'instrument_cd': code, 'measurements': data} for code, data in studies.items()),
+                {'instrument_cd': 'INST-999', 'measurements': _study(3)},
+                {'instrument_cd': 'INST-001', 'measurements': []},
+            ],
+            'tolerance': 0.3,
+            'alpha': 1.0,  # 교호작용 항 유지 (참조 구현과 같은 모형)
+        }, format='json')
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body['studies'], body['analyzed'], body['failed']) == (4, 3, 1)
+        assert body['results'][3] == {'key': 'INST-001', 'error': 'no measurements'}
+        assert body['applied']['unknown_instruments'] == ['INST-999']
+
+        for item in body['results'][:2]:
+            expected = _reference_components(studies[item['key']])
+            components = item['result']['variance_components']
+            for name, value in expected.items():
+                assert components[name] == pytest.approx(value, rel=1e-9, abs=1e-15)
+            assert item['result']['percent_tolerance'] is not None
+
+        for instrument in instruments:
+            instrument.refresh_from_db()
+            result = next(item['result'] for item in body['results'] if item['key'] == instrument.instrument_cd)
+            assert instrument.gage_rr_last_date is not None
+            assert instrument.gage_rr_result == (
+                'PASS' if result['percent_study_variation']['%GRR'] < 30 else 'FAIL'
+            )
+            component = MeasurementSystemComponent.objects.get(instrument=instrument)
+            assert float(component.ev_contribution) == pytest.approx(
+                round(result['percent_contribution']['%Repeatability'], 2)
+            )
+
+    def test_apply_false_leaves_instruments_unchanged(self, api_client, instruments):
+        response = api_client.post(self.url, {
+            'studies': [{'instrument_cd': 'INST-001', 'measurements': _study(4)}], 'apply': False,
+        }, format='json')
+
+        assert response.status_code == 200
+        assert response.json()['applied'] is None
+        instruments[0].refresh_from_db()
+        assert instruments[0].gage_rr_last_date is None
+
+    def test_missing_instrument_code_is_rejected(self, api_client):
+        response = api_client.post(self.url, {'studies': [{'measurements': _study(5)}]}, format='json')
+        assert response.status_code == 400
@@ -0,0 +1,81 @@
+"""
+Tests for version-keyed ETag / response cache (smart_spc/resource_versions.py)
+"""
+import pytest
+from django.core.cache import cache
+
+from apps.spc.models import Product, QualityAlert
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def product():
+    return Product.objects.create(product_code='P-100', product_name='샤프트', usl=10.2, lsl=9.8)
+
+
+def _alert(product, **kwargs):
+    return QualityAlert.objects.create(
+        product=product, alert_type='OUT_OF_SPEC', title='규격 이탈', description='USL 초과', **kwargs
+    )
+
+
+@pytest.mark.django_db
+class TestAlertDashboardCache:
+    """GET /api/spc/alerts/dashboard/ (quality_alert 리소스 버전)"""
+
+    url = '/api/spc/alerts/dashboard/'
+
+    def test_etag_and_not_modified(self, api_client, product):
+        _alert(product)
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        etag = response['ETag']
+        assert etag.startswith('"') and etag.endswith('"')
+        assert 'no-cache' in response['Cache-Control'] and 'private' in response['Cache-Control']
+
+        not_modified = api_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert not_modified.status_code == 304
+        assert not_modified['ETag'] == etag
+        assert api_client.get(self.url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}').status_code == 304
+
+    def test_cached_response_skips_queries(self, api_client, product, django_assert_num_queries):
+        _alert(product)
+        first = api_client.get(self.url)
+
+        with django_assert_num_queries(0):
+            second = api_client.get(self.url)
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert second['ETag'] == first['ETag']
+
+    def test_alert_save_bumps_version(self, api_client, product, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            alert = _alert(product)
+        first = api_client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            alert.priority = 4
+            alert.save()
+        assert callbacks
+
+        response = api_client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == 200
+        assert response['ETag'] != first['ETag']
+        assert response.json()['by_priority']['urgent'] == 1
+
+    def test_disabled_cache_falls_back_to_conditional_get(self, api_client, product, settings):
+        """HTTP_CACHE_ENABLED=False: 버전 ETag 대신 ConditionalGetMiddleware 의 본문 해시 ETag"""
+        settings.HTTP_CACHE_ENABLED = False
+        _alert(product)
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        assert 'private' not in response.get('Cache-Control', '')
+        assert api_client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
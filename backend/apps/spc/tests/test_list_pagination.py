@@ -0,0 +1,101 @@
+"""
+Tests for cursor-paginated list endpoints (smart_spc/pagination.py, smart_spc/api_mixins.py)
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.spc.models import Product, QualityMeasurement
+from apps.spc.serializers import QualityMeasurementSerializer
+
+
+@pytest.fixture
+def measurements():
+    product = Product.objects.create(product_code='P-100', product_name='샤프트', usl=10.2, lsl=9.8)
+    base = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+    # 같은 측정 시각이 여러 건 (pk 로 순서 고정)
+    return QualityMeasurement.objects.bulk_create([
+        QualityMeasurement(
+            product=product, measurement_value=10.0 + i * 0.001, sample_number=i % 5 + 1,
+            subgroup_number=i // 5 + 1, measured_at=base + timedelta(minutes=i // 3), measured_by='tester',
+        )
+        for i in range(25)
+    ])
+
+
+def _walk(client, url):
+    """next 링크를 따라 전체 페이지 순회 → (id 목록, 페이지 수)"""
+    ids, pages = [], 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        body = response.json()
+        ids.extend(row['id'] for row in body['results'])
+        url, pages = body['next'], pages + 1
+    return ids, pages
+
+
+@pytest.mark.django_db
+class TestMeasurementList:
+    """GET /api/spc/measurements/"""
+
+    url = '/api/spc/measurements/'
+
+    def test_cursor_pages_cover_all_rows_in_order(self, api_client, measurements):
+        ids, pages = _walk(api_client, f'{self.url}?page_size=7')
+
+        expected = list(
+            QualityMeasurement.objects.order_by('-measured_at', '-id').values_list('id', flat=True)
+        )
+        assert ids == expected
+        assert pages == 4
+
+    def test_cursor_is_stable_when_rows_are_added(self, api_client, measurements):
+        first = api_client.get(f'{self.url}?page_size=10').json()
+        # 첫 페이지 이후 최신 측정값 추가 → 다음 페이지가 밀리지 않아야 함
+        QualityMeasurement.objects.create(
+            product=measurements[0].product, measurement_value=10.0, sample_number=1, subgroup_number=99,
+            measured_at=timezone.now(), measured_by='tester',
+        )
+        rest, _ = _walk(api_client, first['next'])
+
+        ids = [row['id'] for row in first['results']] + rest
+        assert sorted(ids) == sorted(m.id for m in measurements)
+
+    def test_rows_match_serializer_output(self, api_client, measurements):
+        rows = api_client.get(f'{self.url}?page_size=25').json()['results']
+
+        queryset = QualityMeasurement.objects.select_related('product').order_by('-measured_at', '-id')
+        assert rows == [dict(item) for item in QualityMeasurementSerializer(queryset, many=True).data]
+
+    def test_fields_selects_columns(self, api_client, measurements):
+        body = api_client.get(f'{self.url}?fields=id,measured_at,product_code&page_size=5').json()
+
+        assert [list(row) for row in body['results']] == [['id', 'product_code', 'measured_at']] * 5
+        assert body['next']
+        # 정렬 컬럼 (measured_at / id) 을 요청하지 않아도 커서로 전체 행을 순회
+        values, url = [], f'{self.url}?fields=measurement_value&page_size=10'
+        while url:
+            body = api_client.get(url).json()
+            assert all(list(row) == ['measurement_value'] for row in body['results'])
+            values.extend(row['measurement_value'] for row in body['results'])
+            url = body['next']
+        assert values == list(
+            QualityMeasurement.objects.order_by('-measured_at', '-id').values_list('measurement_value', flat=True)
+        )
+
+    def test_unknown_fields_fall_back_to_all_columns(self, api_client, measurements):
+        row = api_client.get(f'{self.url}?fields=nope&page_size=1').json()['results'][0]
+        assert set(row) == set(QualityMeasurementSerializer().fields)
+
+    def test_invalid_cursor_returns_404(self, api_client, measurements):
+        response = api_client.get(f'{self.url}?cursor=not-a-cursor')
+        assert response.status_code == 404
+
+    def test_page_size_is_capped(self, api_client, measurements, settings):
+        from smart_spc.pagination import KeysetCursorPagination
+
+        assert KeysetCursorPagination.max_page_size == settings.API_MAX_PAGE_SIZE
+        body = api_client.get(f'{self.url}?page_size=100000').json()
+        assert len(body['results']) == 25
@@ -0,0 +1,103 @@
+"""
+Tests for the master data bulk import (apps/spc/services/master_data_import.py)
+
+신규 / 변경 / 변경 없음 건수는 update_or_create 순차 호출과 같아야 하고, 청크 안의 잘못된 행은 그 키만 실패해야 한다
+"""
+import pytest
+from django.utils import timezone
+
+from apps.spc.models_master_data import QualityItemMaster, QualitySyncLog
+from apps.spc.services.master_data_import import bulk_upsert, run_import
+
+
+def _item(itm_id, itm_nm=None, itm_type='COMPONENT', **extra):
+    return {'itm_id': itm_id, 'itm_nm': itm_nm or f'품목 {itm_id}', 'itm_type': itm_type, **extra}
+
+
+def _sync_log():
+    return QualitySyncLog.objects.create(
+        sync_type='ITEM', sync_source='ERP', sync_status='SUCCESS', records_total=0, sync_start_ts=timezone.now(),
+    )
+
+
+def _import(records, chunk_size=2):
+    return bulk_upsert(QualityItemMaster, 'itm_id', records, _sync_log(), 'erp_sync_ts', chunk_size=chunk_size)
+
+
+@pytest.mark.django_db
+class TestBulkUpsertCounts:
+    """신규 / 변경 / 변경 없음 집계"""
+
+    def test_first_import_creates_with_repeated_keys_as_updates(self):
+        result = _import([_item('A'), _item('B'), _item('A', '품목 A2'), _item('C'), _item('D')])
+
+        # A 두 번째는 update_or_create 순차 호출과 같이 갱신으로 집계, 값은 마지막 것
+        assert {k: result[k] for k in ('total', 'created', 'updated', 'unchanged', 'failed')} == {
+            'total': 5, 'created': 4, 'updated': 1, 'unchanged': 0, 'failed': 0,
+        }
+        assert result['errors'] == []
+        assert [chunk['records'] for chunk in result['chunks']] == [2, 2]
+        assert QualityItemMaster.objects.get(itm_id='A').itm_nm == '품목 A2'
+        assert QualityItemMaster.objects.filter(active_yn='Y').count() == 4
+
+    def test_second_import_splits_changed_and_unchanged(self):
+        _import([_item('A'), _item('B'), _item('C')])
+        QualityItemMaster.objects.filter(itm_id='C').update(active_yn='N')
+        before = dict(QualityItemMaster.objects.values_list('itm_id', 'updated_at'))
+        synced = QualityItemMaster.objects.get(itm_id='A').erp_sync_ts
+
+        result = _import([_item('A'), _item('B', itm_type='WIP'), _item('C'), _item('D')])
+
+        # C 는 값은 같지만 비활성 → 다시 활성화되므로 변경
+        assert {k: result[k] for k in ('created', 'updated', 'unchanged', 'failed')} == {
+            'created': 1, 'updated': 3, 'unchanged': 1, 'failed': 0,
+        }
+        assert sum(chunk['changed'] for chunk in result['chunks']) == 2
+        items = {item.itm_id: item for item in QualityItemMaster.objects.all()}
+        assert items['B'].itm_type == 'WIP' and items['C'].active_yn == 'Y'
+        assert items['A'].updated_at == before['A'] and items['B'].updated_at > before['B']
+        # 변경 없는 행도 동기화 시각은 갱신 (같은 청크의 변경 행과 같은 시각)
+        assert items['A'].erp_sync_ts == items['B'].erp_sync_ts > synced
+
+
+@pytest.mark.django_db
+class TestBulkUpsertFailures:
+    """청크 실패 → 행 단위 재처리"""
+
+    def test_bad_row_fails_only_its_key(self):
+        _import([_item('B')])
+        records = [_item('A'), _item('B', '품목 B2'), _item('BAD'), _item('BAD'), _item('C'), _item('D')]
+        records[2]['itm_nm'] = None  # NOT NULL 위반
+        records[3]['itm_nm'] = None
+
+        result = _import(records, chunk_size=3)
+
+        # 첫 청크 (A, B, BAD) 만 행 단위로 재처리, BAD 두 건만 실패
+        assert {k: result[k] for k in ('created', 'updated', 'unchanged', 'failed')} == {
+            'created': 3, 'updated': 1, 'unchanged': 0, 'failed': 2,
+        }
+        assert [(e['chunk'], e['key'], e['records']) for e in result['errors']] == [(0, 'BAD', 2)]
+        assert result['chunks'][0] == {**result['chunks'][0], 'created': 1, 'changed': 1, 'failed': 2}
+        assert result['chunks'][1]['failed'] == 0
+        assert set(QualityItemMaster.objects.values_list('itm_id', flat=True)) == {'A', 'B', 'C', 'D'}
+        assert QualityItemMaster.objects.get(itm_id='B').itm_nm == '품목 B2'
+
+    def test_bad_value_on_existing_row_is_rolled_back(self):
+        _import([_item('A'), _item('B')])
+
+        result = _import([_item('A', '품목 A2'), _item('B', sample_size='abc')])
+
+        assert (result['updated'], result['failed']) == (1, 1)
+        assert [e['key'] for e in result['errors']] == ['B']
+        assert QualityItemMaster.objects.get(itm_id='A').itm_nm == '품목 A2'
+
+    def test_run_import_records_partial_status(self):
+        result = run_import(
+            QualityItemMaster, 'itm_id', [_item('A'), _item('BAD', itm_type=None)], 'ITEM', 'ERP', 'erp_sync_ts',
+        )
+
+        log = QualitySyncLog.objects.latest('sync_id')
+        assert (result['created'], result['failed']) == (1, 1)
+        assert (log.sync_status, log.records_success, log.records_failed) == ('PARTIAL', 1, 1)
+        assert log.error_message.startswith('BAD: ')
+        assert log.sync_details['errors'][0]['key'] == 'BAD'
@@ -0,0 +1,78 @@
+"""
+Tests for daily quality rollups (apps/spc/services/quality_rollups.py)
+
+롤업 병합 결과는 원본 재계산과 같아야 한다 (측정 일자가 바뀐 경우 포함)
+"""
+from datetime import datetime, time, timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.spc.models import Product, QualityMeasurement, QualityRollupDay
+from apps.spc.services.quality_rollups import (
+    aggregate_raw, collect_period, completed_days, compute_daily_rollup, day_bounds,
+)
+
+
+def _at(day, hour):
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+def _assert_same(pooled, raw):
+    assert set(pooled) == set(raw)
+    for product_id, expected in raw.items():
+        actual = pooled[product_id]
+        assert actual.measurement_count == expected.measurement_count
+        assert actual.out_of_spec_count == expected.out_of_spec_count
+        assert actual.min_value == expected.min_value
+        assert actual.max_value == expected.max_value
+        assert actual.mean == pytest.approx(expected.mean)
+        assert actual.variance == pytest.approx(expected.variance)
+
+
+@pytest.fixture
+def measurements():
+    today = timezone.localdate()
+    products = [
+        Product.objects.create(product_code=f'P{i}', product_name=f'제품 {i}', usl=12.0, lsl=8.0)
+        for i in range(2)
+    ]
+    created = []
+    for offset in range(1, 5):
+        day = today - timedelta(days=offset)
+        for hour, value in ((3, 9.5 + offset * 0.1), (11, 10.2), (20, 12.5 - offset * 0.3)):
+            for product in products:
+                created.append(QualityMeasurement.objects.create(
+                    product=product, measurement_value=value + product.pk * 0.01,
+                    sample_number=1, subgroup_number=offset, measured_by='tester',
+                    measured_at=_at(day, hour), is_within_spec=8.0 <= value <= 12.0,
+                ))
+    for offset in range(1, 5):
+        compute_daily_rollup(today - timedelta(days=offset))
+    return today, created
+
+
+@pytest.mark.django_db
+class TestQualityRollups:
+    """롤업 병합 vs 원본 재계산"""
+
+    def test_pooled_rollups_match_raw(self, measurements):
+        today, _ = measurements
+        # 일자 경계가 아닌 시작 / 종료 → 양끝은 원본, 가운데는 롤업
+        start = _at(today - timedelta(days=4), 10)
+        end = _at(today - timedelta(days=1), 12)
+
+        _assert_same(collect_period(start, end), aggregate_raw(start, end))
+        assert len(completed_days([today - timedelta(days=d) for d in (2, 3)])) == 2
+
+    def test_moving_measurement_invalidates_both_days(self, measurements):
+        today, created = measurements
+        old_day, new_day = today - timedelta(days=3), today - timedelta(days=2)
+        moved = next(m for m in created if timezone.localtime(m.measured_at).date() == old_day)
+
+        moved.measured_at = _at(new_day, 15)
+        moved.save()
+
+        assert not QualityRollupDay.objects.filter(rollup_date__in=[old_day, new_day]).exists()
+        start, end = day_bounds(today - timedelta(days=4))[0], day_bounds(today)[0]
+        _assert_same(collect_period(start, end), aggregate_raw(start, end))
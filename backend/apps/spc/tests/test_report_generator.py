@@ -0,0 +1,235 @@
+"""
+Tests for the quality report generator (apps/spc/services/report_generator.py)
+
+공유 집계로 만든 섹션은 예전 섹션별 원본 쿼리 결과와 같아야 하고, 쿼리 수는 제품 수와 무관해야 한다
+"""
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pytest
+from django.utils import timezone
+
+from apps.spc.models import (
+    ControlChart, InspectionPlan, ProcessCapability, Product, QualityAlert, QualityMeasurement, RunRuleViolation,
+)
+from apps.spc.services.quality_rollups import compute_daily_rollup
+from apps.spc.services.report_generator import QualityReportGenerator
+
+ALERT_TYPES = ['OUT_OF_SPEC', 'RUN_RULE', 'TREND', 'CAPABILITY']
+ALERT_STATUSES = ['NEW', 'ACKNOWLEDGED', 'INVESTIGATING', 'RESOLVED', 'CLOSED']
+UNRESOLVED = ['NEW', 'ACKNOWLEDGED', 'INVESTIGATING']
+
+
+def _at(day, hour, minute=0):
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+def _seed_product(index, today, rng, is_active=True, cpks=()):
+    product = Product.objects.create(
+        product_code=f'P-{index}', product_name=f'제품 {index}', usl=10.5, lsl=9.5, target_value=10.0,
+        is_active=is_active,
+    )
+    plan = InspectionPlan.objects.create(
+        product=product, plan_name='외경', frequency='HOURLY', sampling_method='RANDOM', characteristic='외경',
+    )
+    chart = ControlChart.objects.create(product=product, inspection_plan=plan, chart_type='XBAR_R')
+
+    measurements = []
+    for offset in range(0, 7):
+        day = today - timedelta(days=offset)
+        for hour in (3, 11, 20):
+            for sample in range(3):
+                value = float(rng.normal(10.0, 0.2 + 0.1 * index))
+                measurements.append(QualityMeasurement(
+                    product=product, measurement_value=value, sample_number=sample + 1, subgroup_number=offset,
+                    measured_at=_at(day, hour, sample), measured_by='tester',
+                    is_within_spec=9.5 <= value <= 10.5, is_within_control=abs(value - 10.0) < 0.45,
+                ))
+    measurements = QualityMeasurement.objects.bulk_create(measurements)
+
+    for i, cpk in enumerate(cpks):
+        capability = ProcessCapability.objects.create(
+            product=product, control_chart=chart, cp=cpk + 0.2, cpk=cpk, cpu=cpk, cpl=cpk + 0.4,
+            pp=cpk + 0.1 if i % 2 else None, ppk=cpk - 0.05, mean=10.0, std_deviation=0.1, sample_size=50,
+            analysis_start=_at(today - timedelta(days=30), 0), analysis_end=_at(today, 0),
+        )
+        ProcessCapability.objects.filter(pk=capability.pk).update(analyzed_at=_at(today - timedelta(days=10 - i), 9))
+
+    # 경고: 기간 전 / 기간 중 (일자 · 우선순위 · 유형 · 상태 순환) / 기간 후
+    for i in range(14 + 3 * index):
+        alert = QualityAlert.objects.create(
+            product=product, measurement=measurements[i], alert_type=ALERT_TYPES[i % 4],
+            priority=i % 4 + 1, status=ALERT_STATUSES[(i + index) % 5], title=f'{product.product_code} 경고 {i}',
+            description='',
+        )
+        created_at = _at(today - timedelta(days=7 - i % 8), (5 * i) % 24, i)
+        QualityAlert.objects.filter(pk=alert.pk).update(created_at=min(created_at, timezone.now()))
+
+    for i in range(9 + index):
+        violation = RunRuleViolation.objects.create(
+            control_chart=chart, measurement=measurements[i], rule_type=f'RULE_{i % 4 + 1}',
+            description='', is_resolved=i % 3 == 0,
+        )
+        RunRuleViolation.objects.filter(pk=violation.pk).update(
+            detected_at=_at(today - timedelta(days=6 - i % 7), (7 * i) % 24, i)
+        )
+    return product
+
+
+@pytest.fixture
+def period():
+    today = timezone.localdate()
+    rng = np.random.default_rng(11)
+    _seed_product(0, today, rng, cpks=(1.5, 0.9))
+    _seed_product(1, today, rng, cpks=(1.1, 1.2, 1.7))
+    _seed_product(2, today, rng)
+    _seed_product(3, today, rng, is_active=False, cpks=(0.5,))
+    for offset in range(1, 7):
+        compute_daily_rollup(today - timedelta(days=offset))
+    # 일자 경계가 아닌 시작 / 종료 (양끝 원본 + 가운데 롤업)
+    return _at(today - timedelta(days=5), 10), _at(today - timedelta(days=1), 12)
+
+
+def _per_query_report(start, end):
+    """예전 섹션별 원본 쿼리 계산 (비교 기준)"""
+    products = list(Product.objects.filter(is_active=True))
+    measurements = QualityMeasurement.objects.filter(product__in=products, measured_at__gte=start, measured_at__lt=end)
+    alerts = QualityAlert.objects.filter(product__in=products, created_at__gte=start, created_at__lt=end)
+    violations = RunRuleViolation.objects.filter(
+        control_chart__product__in=products, detected_at__gte=start, detected_at__lt=end
+    )
+
+    def latest(product):
+        return ProcessCapability.objects.filter(product=product).order_by('-analyzed_at').first()
+
+    details, recommendations = {}, {}
+    for product in products:
+        values = np.array(measurements.filter(product=product).values_list('measurement_value', flat=True))
+        out_of_spec = measurements.filter(product=product, is_within_spec=False).count()
+        capability = latest(product)
+        if len(values):
+            details[product.product_code] = {
+                'total_measurements': len(values),
+                'average': values.mean(),
+                'std_dev': values.std(),
+                'min_value': values.min(),
+                'max_value': values.max(),
+                'out_of_spec_count': out_of_spec,
+                'out_of_spec_rate': round(out_of_spec / len(values) * 100, 2),
+                'cpk': capability.cpk if capability else None,
+            }
+        kinds = []
+        if capability and capability.cpk < 1.33:
+            kinds.append(('capability', 'high' if capability.cpk < 1.0 else 'medium'))
+        if len(values) and out_of_spec / len(values) * 100 > 1.0:
+            kinds.append(('defect_rate', 'urgent' if out_of_spec / len(values) * 100 > 5.0 else 'high'))
+        if QualityAlert.objects.filter(product=product, created_at__gte=start, status__in=UNRESOLVED).count() > 5:
+            kinds.append(('alerts', 'high'))
+        if kinds:
+            recommendations[product.product_code] = kinds
+
+    total = measurements.count()
+    return {
+        'summary': {
+            'total_products': len(products),
+            'total_measurements': total,
+            'out_of_spec_count': measurements.filter(is_within_spec=False).count(),
+            'out_of_control_count': measurements.filter(is_within_control=False).count(),
+            'total_alerts': alerts.count(),
+            'critical_alerts': alerts.filter(priority=4).count(),
+            'resolved_alerts': alerts.filter(status='RESOLVED').count(),
+        },
+        'details': details,
+        'alerts': {
+            'total': alerts.count(),
+            'by_priority': {
+                name: alerts.filter(priority=p).count()
+                for name, p in (('urgent', 4), ('high', 3), ('medium', 2), ('low', 1))
+            },
+            'by_type': {t: alerts.filter(alert_type=t).count() for t, _ in QualityAlert.ALERT_TYPE_CHOICES},
+            'by_status': {s.lower(): alerts.filter(status=s).count() for s in ALERT_STATUSES},
+            'recent_ids': list(alerts.order_by('-created_at').values_list('id', flat=True)[:10]),
+        },
+        'capability': {
+            product.product_code: (latest(product).cp, latest(product).cpk, latest(product).analyzed_at.isoformat())
+            for product in products if latest(product)
+        },
+        'violations': {
+            'total': violations.count(),
+            'unresolved': violations.filter(is_resolved=False).count(),
+            'by_rule_type': {
+                f'RULE_{i}': violations.filter(rule_type=f'RULE_{i}').count()
+                for i in range(1, 9) if violations.filter(rule_type=f'RULE_{i}').exists()
+            },
+            'recent_ids': list(violations.order_by('-detected_at').values_list('id', flat=True)[:10]),
+        },
+        'recommendations': recommendations,
+    }
+
+
+@pytest.mark.django_db
+class TestReportParity:
+    """공유 집계 섹션 ↔ 섹션별 원본 쿼리"""
+
+    @pytest.mark.parametrize('use_rollups', [True, False])
+    def test_sections_match_per_query_computation(self, period, use_rollups):
+        start, end = period
+        expected = _per_query_report(start, end)
+        report = QualityReportGenerator(use_rollups=use_rollups).generate_custom_report(start, end)
+
+        summary = report['summary']
+        for key, value in expected['summary'].items():
+            assert summary[key] == value, key
+        assert expected['summary']['total_measurements'] > 0 and expected['summary']['total_alerts'] > 0
+
+        details = {d['product_code']: d for d in report['product_details']}
+        assert set(details) == set(expected['details']) == {'P-0', 'P-1', 'P-2'}
+        for code, stats in expected['details'].items():
+            actual = details[code]['statistics']
+            for key in ('average', 'std_dev', 'min_value', 'max_value'):
+                assert actual[key] == pytest.approx(stats[key], abs=1e-4), (code, key)
+            for key in ('total_measurements', 'out_of_spec_count', 'out_of_spec_rate'):
+                assert actual[key] == stats[key], (code, key)
+            assert details[code]['capability']['cpk'] == stats['cpk']
+
+        alerts = report['alerts_summary']
+        for key in ('total', 'by_priority', 'by_type', 'by_status'):
+            assert alerts[key] == expected['alerts'][key], key
+        assert [a['id'] for a in alerts['recent_alerts']] == expected['alerts']['recent_ids']
+
+        capability = {
+            item['product_code']: (item['cp'], item['cpk'], item['analyzed_at'])
+            for item in report['capability_analysis']['products']
+        }
+        assert capability == {
+            code: (round(cp, 3), round(cpk, 3), analyzed_at)
+            for code, (cp, cpk, analyzed_at) in expected['capability'].items()
+        }
+        assert report['capability_analysis']['grade_distribution'] == {'Inadequate': 1, 'Excellent': 1}
+
+        violations = report['violations_summary']
+        for key in ('total', 'unresolved', 'by_rule_type'):
+            assert violations[key] == expected['violations'][key], key
+        assert [v['id'] for v in violations['recent_violations']] == expected['violations']['recent_ids']
+
+        assert {
+            rec['product_code']: [(item['type'], item['priority']) for item in rec['recommendations']]
+            for rec in report['recommendations']
+        } == expected['recommendations']
+
+    def test_query_count_does_not_grow_with_products(self, period, django_assert_num_queries):
+        start, end = period
+        generator = QualityReportGenerator()
+
+        # 제품 · 롤업 일자 조회 / 롤업 병합 / 양끝 원본 측정 · 경고 (2구간 × 2) /
+        # 최신 공정능력 / 미해결 경고 / 최근 경고 / 위반 그룹 / 최근 위반
+        with django_assert_num_queries(12):
+            generator.generate_custom_report(start, end)
+
+        today = timezone.localdate()
+        _seed_product(4, today, np.random.default_rng(5), cpks=(1.4,))
+        for offset in range(1, 7):
+            compute_daily_rollup(today - timedelta(days=offset))
+        with django_assert_num_queries(12):
+            report = generator.generate_custom_report(start, end)
+        assert report['summary']['total_products'] == 4
@@ -0,0 +1,191 @@
+"""
+Tests for the SPC recalculation engine (app/services/spc_recalc.py)
+
+청크 경계에서 잘린 부분군은 다음 청크로 이어져야 하고, 결과는 청크 크기와 무관해야 한다
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.spc import (
+    inspection_result, inspection_run, metadata, qc_characteristic, spc_chart_def, spc_chart_point, spc_event,
+)
+from app.services.spc_recalc import (
+    SubgroupAccumulator, fetch_points, recalc_chart_points, run_rule_flags,
+)
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+TABLES = [qc_characteristic, inspection_run, inspection_result, spc_chart_def, spc_chart_point, spc_event]
+
+
+def _rows(samples_per_run, runs, seed=0):
+    """(run_id, run_dt, value, is_out_of_spec) rows sorted by (run_dt, run_id)"""
+    rng = np.random.default_rng(seed)
+    return [
+        (run_id, START + timedelta(hours=run_id), float(rng.normal(10.0, 1.0)), sample == 0 and run_id % 3 == 0)
+        for run_id in range(1, runs + 1)
+        for sample in range(samples_per_run)
+    ]
+
+
+def _aggregate(rows, chunk_size, individual=False):
+    accumulator = SubgroupAccumulator(individual=individual)
+    for start in range(0, len(rows), chunk_size):
+        accumulator.add(rows[start:start + chunk_size])
+    return accumulator.finish()
+
+
+class TestSubgroupAccumulator:
+    """청크 분할 / 부분군 이월"""
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 4, 7])
+    def test_chunk_boundaries_carry_over(self, chunk_size):
+        rows = _rows(samples_per_run=4, runs=10)
+
+        sg = _aggregate(rows, chunk_size)
+        whole = _aggregate(rows, len(rows))
+
+        assert sg.run_id.tolist() == list(range(1, 11))
+        assert sg.n.tolist() == [4] * 10
+        for name in ('mean', 'range', 'std'):
+            np.testing.assert_allclose(getattr(sg, name), getattr(whole, name))
+        assert sg.defects.tolist() == whole.defects.tolist()
+
+        values = np.array([row[2] for row in rows]).reshape(10, 4)
+        np.testing.assert_allclose(sg.mean, values.mean(axis=1))
+        np.testing.assert_allclose(sg.range, values.max(axis=1) - values.min(axis=1))
+        np.testing.assert_allclose(sg.std, values.std(axis=1, ddof=1))
+        assert sg.point_dt.tolist() == [START + timedelta(hours=i) for i in range(1, 11)]
+
+    def test_individual_points_are_not_grouped(self):
+        rows = _rows(samples_per_run=2, runs=3)
+        sg = _aggregate(rows, 4, individual=True)
+
+        assert len(sg) == 6
+        assert sg.n.tolist() == [1] * 6
+        assert np.isnan(sg.range).all()
+
+
+class TestRunRules:
+    """WECO 규칙 (패턴을 완성하는 점에 표시)"""
+
+    @staticmethod
+    def _limits(size):
+        return np.full(size, 13.0), np.full(size, 10.0), np.full(size, 7.0)
+
+    def _flagged(self, x, code):
+        x = np.asarray(x, dtype=float)
+        return np.flatnonzero(run_rule_flags(x, *self._limits(len(x)), enabled=(code,))[code]).tolist()
+
+    def test_rule_1_beyond_limits(self):
+        assert self._flagged([10, 14, 10, 6, 10], 'RULE_1') == [1, 3]
+
+    def test_rule_2_nine_on_one_side(self):
+        assert self._flagged([9] + [10.5] * 9 + [9], 'RULE_2') == [9]
+
+    def test_rule_3_six_point_trend(self):
+        assert self._flagged([10, 10.1, 10.2, 10.3, 10.4, 10.5, 10.0], 'RULE_3') == [5]
+
+    def test_rule_5_two_of_three_beyond_two_sigma(self):
+        assert self._flagged([10, 12.5, 10, 12.5, 10], 'RULE_5') == [3]
+
+    def test_disabled_rules_are_not_evaluated(self):
+        flags = run_rule_flags(np.array([20.0]), *self._limits(1), enabled=('RULE_1',))
+        assert list(flags) == ['RULE_1']
+
+
+@pytest.fixture
+def sessionmaker():
+    engine = create_async_engine('sqlite+aiosqlite://')
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all, tables=TABLES)
+
+    asyncio.run(create())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def _seed(sessionmaker, rows, chart_type='XBAR_R'):
+    async def seed():
+        async with sessionmaker() as session, session.begin():
+            await session.execute(insert(qc_characteristic), [
+                {'char_id': 1, 'site_id': 1, 'char_name': '외경', 'char_type': 'VARIABLE', 'lsl': 6.0, 'usl': 14.0},
+            ])
+            await session.execute(insert(inspection_run), [
+                {'run_id': run_id, 'site_id': 1, 'run_dt': run_dt} for run_id, run_dt in sorted({r[:2] for r in rows})
+            ])
+            await session.execute(insert(inspection_result), [
+                {'run_id': run_id, 'char_id': 1, 'sample_no': i, 'value_num': value, 'is_out_of_spec': oos}
+                for i, (run_id, _, value, oos) in enumerate(rows)
+            ])
+            await session.execute(insert(spc_chart_def), [{
+                'chart_def_id': 1, 'site_id': 1, 'char_id': 1, 'chart_type': chart_type, 'calc_method': 'STANDARD',
+                'subgroup_size': 4, 'rule_set': {}, 'baseline_from_dt': START, 'baseline_to_dt': START,
+                'status': 'ACTIVE', 'created_at': START, 'updated_at': START,
+            }])
+
+    asyncio.run(seed())
+
+
+def _recalc(sessionmaker, chunk_size):
+    async def recalc():
+        async with sessionmaker() as session:
+            result = await recalc_chart_points(session, 1, START, START + timedelta(days=30), chunk_size=chunk_size)
+        async with sessionmaker() as session:
+            page = await fetch_points(session, 1, None, None, None, 1000)
+        return result, page['points']
+
+    return asyncio.run(recalc())
+
+
+def _page_through(sessionmaker, limit):
+    async def pages():
+        points, cursor = [], None
+        async with sessionmaker() as session:
+            while True:
+                page = await fetch_points(session, 1, None, None, cursor, limit)
+                points.extend(page['points'])
+                if not page['has_more']:
+                    return points
+                cursor = page['next_cursor']
+
+    return asyncio.run(pages())
+
+
+class TestRecalcChartPoints:
+    """DB 스트리밍 재계산 / 키셋 페이지"""
+
+    def test_points_do_not_depend_on_chunk_size(self, sessionmaker):
+        rows = _rows(samples_per_run=4, runs=12)
+        _seed(sessionmaker, rows)
+
+        result, small = _recalc(sessionmaker, chunk_size=3)
+        _, large = _recalc(sessionmaker, chunk_size=1000)
+
+        assert result['measurements'] == 48
+        assert result['points_created'] == 12
+        assert result['limits_source'] == 'RANGE'
+        skip = {'point_id', 'created_at'}
+        assert [{k: v for k, v in p.items() if k not in skip} for p in small] == \
+               [{k: v for k, v in p.items() if k not in skip} for p in large]
+
+        values = np.array([row[2] for row in rows]).reshape(12, 4)
+        np.testing.assert_allclose([p['xbar'] for p in small], values.mean(axis=1))
+        np.testing.assert_allclose([p['r'] for p in small], np.ptp(values, axis=1))
+
+    def test_keyset_pages_cover_all_points_once(self, sessionmaker):
+        # 개별 차트는 측정마다 점이 되므로 같은 point_dt 가 두 개씩 생김 (point_id 로 구분)
+        _seed(sessionmaker, _rows(samples_per_run=2, runs=5), chart_type='I_MR')
+        _, points = _recalc(sessionmaker, chunk_size=3)
+
+        paged = _page_through(sessionmaker, limit=3)
+
+        assert len(points) == 10
+        assert [p['point_id'] for p in paged] == [p['point_id'] for p in points]
+        assert [p['point_dt'] for p in paged] == sorted(p['point_dt'] for p in points)
@@ -1,6 +1,8 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django.utils import timezone
 from django.db.models import Avg, StdDev, Count, Q
 from datetime import timedelta
@@ -8,6 +10,11 @@ from typing import Dict, List, Any
 import os
 import logging
 
+from smart_spc.api_mixins import ValuesListMixin
+from smart_spc.pagination import KeysetCursorPagination
+from smart_spc.renderers import EventStreamRenderer, ORJSONRenderer
+from smart_spc.resource_versions import versioned_response
+
 from .models import (
     Product, InspectionPlan, QualityMeasurement, ControlChart,
     ProcessCapability, RunRuleViolation, QualityAlert, QualityReport
@@ -18,7 +25,7 @@ from .serializers import (
     ProcessCapabilitySerializer, RunRuleViolationSerializer,
     QualityAlertSerializer, QualityAlertUpdateSerializer,
     QualityReportSerializer, ControlChartDataSerializer,
-    ProcessCapabilityAnalysisSerializer, ChatRequestSerializer,
+    ProcessCapabilityAnalysisSerializer, ProcessCapabilityBatchSerializer, ChatRequestSerializer,
     ChatResponseSerializer, TimeSeriesAnalysisRequestSerializer,
     TimeSeriesAnalysisResponseSerializer, ForecastRequestSerializer,
     ForecastResponseSerializer, PredictiveMaintenanceRequestSerializer,
@@ -101,12 +108,37 @@ class InspectionPlanViewSet(viewsets.ModelViewSet):
     filterset_fields = ['product', 'frequency', 'is_active']
 
 
-class QualityMeasurementViewSet(viewsets.ModelViewSet):
+class QualityMeasurementViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """품질 측정 데이터 API"""
     queryset = QualityMeasurement.objects.all()
     filterset_fields = ['product', 'is_within_spec', 'is_within_control', 'measured_by']
     search_fields = ['lot_number', 'machine_id']
 
+    # 목록: 측정 시각 커서 페이지네이션 + values() 응답 (QualityMeasurementSerializer 와 같은 필드)
+    pagination_class = KeysetCursorPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    paginate_always = True
+    cursor_ordering = ('-measured_at', '-id')
+    list_values = {
+        'id': 'id',
+        'product_name': 'product__product_name',
+        'product_code': 'product__product_code',
+        'product': 'product',
+        'inspection_plan': 'inspection_plan',
+        'measurement_value': 'measurement_value',
+        'sample_number': 'sample_number',
+        'subgroup_number': 'subgroup_number',
+        'measured_at': 'measured_at',
+        'measured_by': 'measured_by',
+        'machine_id': 'machine_id',
+        'lot_number': 'lot_number',
+        'is_within_spec': 'is_within_spec',
+        'is_within_control': 'is_within_control',
+        'remarks': 'remarks',
+        'metadata': 'metadata',
+        'created_at': 'created_at',
+    }
+
     def get_queryset(self):
         """Optimize queryset with select_related for ForeignKeys"""
         queryset = super().get_queryset()
@@ -273,13 +305,73 @@ class ProcessCapabilityViewSet(viewsets.ModelViewSet):
             'period': f"{data['start_date']} ~ {data['end_date']}"
         })
 
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        공정능력 일괄 분석
+
+        - datasets: 요청에 포함된 데이터셋 여러 개를 한 번에 분석
+        - product_ids: 기간 내 DB 측정 데이터로 제품 여러 개를 분석 (save=true 면 ProcessCapability 저장)
+        """
+        from apps.spc.services.capability_batch import analyze_datasets, refresh_capabilities
+
+        serializer = ProcessCapabilityBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
 
-class RunRuleViolationViewSet(viewsets.ReadOnlyModelViewSet):
+        if 'datasets' in data:
+            results = analyze_datasets(
+                data['datasets'], normality=data['normality'], sample_size=data.get('sample_size')
+            )
+            return Response({'results': results})
+
+        summary = refresh_capabilities(
+            start=data.get('start_date'),
+            end=data.get('end_date'),
+            product_ids=data['product_ids'],
+            include_characteristics=False,
+            normality=data['normality'],
+            sample_size=data.get('sample_size'),
+            save=data['save'],
+        )
+        return Response({
+            'period': summary['period'],
+            'measurements': summary['measurements'],
+            'results': summary['products']['results'],
+            'errors': summary['products']['errors'],
+            'saved': summary['products']['saved'],
+        })
+
+
+class RunRuleViolationViewSet(ValuesListMixin, viewsets.ReadOnlyModelViewSet):
     """Run Rule 위반 기록 API (읽기 전용)"""
     queryset = RunRuleViolation.objects.all()
     serializer_class = RunRuleViolationSerializer
     filterset_fields = ['control_chart', 'rule_type', 'is_resolved']
 
+    # 목록: 감지 시각 커서 페이지네이션 + values() 응답 (RunRuleViolationSerializer 와 같은 필드)
+    pagination_class = KeysetCursorPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    paginate_always = True
+    cursor_ordering = ('-detected_at', '-id')
+    list_values = {
+        'id': 'id',
+        'product_code': 'measurement__product__product_code',
+        'chart_type': 'control_chart__chart_type',
+        'measurement_value': 'measurement__measurement_value',
+        'control_chart': 'control_chart',
+        'measurement': 'measurement',
+        'rule_type': 'rule_type',
+        'description': 'description',
+        'severity': 'severity',
+        'violation_data': 'violation_data',
+        'is_resolved': 'is_resolved',
+        'resolved_at': 'resolved_at',
+        'resolution_notes': 'resolution_notes',
+        'detected_at': 'detected_at',
+    }
+
     @action(detail=True, methods=['post'])
     def resolve(self, request, pk=None):
         """위반 해결 처리"""
@@ -368,6 +460,7 @@ class QualityAlertViewSet(viewsets.ModelViewSet):
         return Response({'status': 'resolved'})
 
     @action(detail=False, methods=['get'])
+    @versioned_response('quality_alert')
     def dashboard(self, request):
         """경고 대시보드 요약"""
         today = timezone.now()
@@ -510,19 +603,9 @@ class ChatbotViewSet(viewsets.GenericViewSet):
         product_id = serializer.validated_data.get('product_id')
         session_id = serializer.validated_data.get('session_id')
 
-        # Import LLM-integrated chatbot service
-        from .services.spc_chatbot import SPCQualityChatbot
         from .services.llm_service import get_spc_chatbot_service
 
-        # Get intent using original chatbot
-        original_chatbot = SPCQualityChatbot()
-        intent = original_chatbot._detect_intent(message)
-
-        # Prepare context data
-        context_data = self._prepare_context_data(intent, product_id, message)
-
-        # Get conversation history (if session_id provided)
-        conversation_history = self._get_conversation_history(session_id) if session_id else None
+        intent, context_data, conversation_history = self._prepare_chat(message, product_id, session_id)
 
         # Use LLM service for response generation
         llm_chatbot = get_spc_chatbot_service()
@@ -530,7 +613,8 @@ class ChatbotViewSet(viewsets.GenericViewSet):
             user_message=message,
             intent=intent,
             context_data=context_data,
-            conversation_history=conversation_history
+            conversation_history=conversation_history,
+            product_id=product_id
         )
 
         # Save message to history if session provided
@@ -543,178 +627,102 @@ class ChatbotViewSet(viewsets.GenericViewSet):
 
         return Response(result)
 
-    def _prepare_context_data(self, intent: str, product_id: int, message: str) -> Dict[str, Any]:
-        """Prepare context data for LLM prompt based on intent"""
-        context = {}
-
-        if not product_id:
-            return context
-
-        try:
-            product = Product.objects.get(id=product_id)
-            context['product_name'] = product.product_name
-            context['product_code'] = product.product_code
-        except Product.DoesNotExist:
-            return context
-
-        # Intent-specific context preparation
-        if intent == 'capability_analysis':
-            capability = ProcessCapability.objects.filter(
-                product_id=product_id
-            ).order_by('-analyzed_at').first()
-
-            if capability:
-                context.update({
-                    'cp': capability.cp,
-                    'cpk': capability.cpk,
-                    'usl': capability.usl,
-                    'lsl': capability.lsl,
-                    'target': capability.target_value,
-                    'mean': capability.mean,
-                    'std_dev': capability.std_dev,
-                    'sample_size': capability.sample_size,
-                    'is_normal': 'Yes' if capability.is_normal else 'No',
-                    'oos_rate': (capability.out_of_spec_count / capability.sample_size
-                                if capability.sample_size > 0 else 0),
-                })
-
-        elif intent == 'troubleshooting':
-            from datetime import timedelta
-            from django.utils import timezone
+    @action(
+        detail=False, methods=['post'],
+        # SSE 클라이언트의 기본 Accept: text/event-stream 도 협상 통과 (오류 응답은 error 이벤트)
+        renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, EventStreamRenderer],
+    )
+    def stream(self, request):
+        """
+        AI 챗봇 스트리밍 응답 (Server-Sent Events)
 
-            week_ago = timezone.now() - timedelta(days=7)
+        event: token  data: {"content": "..."}
+        event: done   data: {provider, model, tokens_used, cost_estimate, cached, ttft_ms, elapsed_ms, intent, session_id}
+        event: error  data: {error, message, intent, session_id}
 
-            alerts = QualityAlert.objects.filter(
-                product_id=product_id,
-                created_at__gte=week_ago
-            )
+        공급자 호출은 공유 이벤트 루프에서 실행되며, ASGI 에서는 비동기 이터레이터로,
+        WSGI 에서는 동기 이터레이터로 토큰을 전달한다.
+        """
+        serializer = ChatRequestSerializer(data=request.data)
 
-            violations = RunRuleViolation.objects.filter(
-                control_chart__product_id=product_id,
-                detected_at__gte=week_ago
-            )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-            context['alert_count'] = alerts.count()
-            context['violation_count'] = violations.count()
+        message = serializer.validated_data['message']
+        product_id = serializer.validated_data.get('product_id')
+        session_id = serializer.validated_data.get('session_id')
 
-            # Format alert details
-            alert_details = []
-            for alert in alerts[:5]:
-                alert_details.append(
-                    f"- {alert.alert_type}: {alert.description} "
-                    f"(Priority: {alert.get_priority_display()})"
-                )
-            context['alert_details'] = '\n'.join(alert_details) if alert_details else 'No recent alerts'
+        from django.core.handlers.asgi import ASGIRequest
+        from django.http import StreamingHttpResponse
+        from .services.llm_service import get_spc_chatbot_service
 
-            # Format violation details
-            violation_details = []
-            for violation in violations[:5]:
-                violation_details.append(
-                    f"- {violation.rule_type}: {violation.description}"
-                )
-            context['violation_details'] = '\n'.join(violation_details) if violation_details else 'No recent violations'
+        intent, context_data, conversation_history = self._prepare_chat(message, product_id, session_id)
+        llm_chatbot = get_spc_chatbot_service()
+        meta = {'intent': intent, 'session_id': session_id}
 
-        elif intent == 'trend_analysis':
-            import numpy as np
-            from datetime import timedelta
-            from django.utils import timezone
+        if isinstance(request._request, ASGIRequest):
+            events = llm_chatbot.astream_chat(message, intent, context_data, conversation_history, product_id)
+            content = self._async_sse(events, message, session_id, meta)
+        else:
+            events = llm_chatbot.stream_chat(message, intent, context_data, conversation_history, product_id)
+            content = self._sync_sse(events, message, session_id, meta)
+
+        response = StreamingHttpResponse(content, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx 버퍼링 해제
+        return response
+
+    def _sync_sse(self, events, message: str, session_id: str, meta: Dict[str, Any]):
+        parts = []
+        for event in events:
+            if event.type == 'token':
+                parts.append(event.content)
+            else:
+                event.data.update(meta)
+                if session_id:
+                    self._save_conversation_message(
+                        session_id, message, ''.join(parts) or event.data.get('message', '')
+                    )
+            yield event.to_sse()
 
-            thirty_days_ago = timezone.now() - timedelta(days=30)
-            measurements = QualityMeasurement.objects.filter(
-                product_id=product_id,
-                measured_at__gte=thirty_days_ago
-            ).order_by('measured_at')
+    async def _async_sse(self, events, message: str, session_id: str, meta: Dict[str, Any]):
+        from asgiref.sync import sync_to_async
 
-            if measurements.count() >= 30:
-                values = list(measurements.values_list('measurement_value', flat=True))
-                measurements_array = np.array(values)
-
-                mean = np.mean(measurements_array)
-                std = np.std(measurements_array)
-                min_val = np.min(measurements_array)
-                max_val = np.max(measurements_array)
-                cv = (std / mean) * 100 if mean != 0 else 0
-
-                # Trend analysis
-                x = np.arange(len(measurements_array))
-                z = np.polyfit(x, measurements_array, 1)
-                slope = z[0]
-
-                if abs(slope) < 0.0001:
-                    trend = "Stable"
-                    trend_desc = "Process is stable"
-                elif slope > 0:
-                    trend = "Increasing"
-                    trend_desc = f"Measurements trending upward (slope: {slope:.6f})"
-                else:
-                    trend = "Decreasing"
-                    trend_desc = f"Measurements trending downward (slope: {slope:.6f})"
-
-                context.update({
-                    'data_count': len(values),
-                    'mean': mean,
-                    'std_dev': std,
-                    'min_val': min_val,
-                    'max_val': max_val,
-                    'cv': cv,
-                    'trend': trend,
-                    'slope': slope,
-                    'trend_desc': trend_desc,
-                })
+        parts = []
+        async for event in events:
+            if event.type == 'token':
+                parts.append(event.content)
             else:
-                context['data_count'] = measurements.count()
-                context['mean'] = 0
-                context['std_dev'] = 0
+                event.data.update(meta)
+                if session_id:
+                    await sync_to_async(self._save_conversation_message)(
+                        session_id, message, ''.join(parts) or event.data.get('message', '')
+                    )
+            yield event.to_sse()
 
-        elif intent == 'root_cause':
-            from datetime import timedelta
-            from django.utils import timezone
+    def _prepare_chat(self, message: str, product_id: int, session_id: str):
+        """의도 감지 / 프롬프트 컨텍스트 / 대화 이력 준비 (chat, stream 공용)"""
+        from .services.spc_chatbot import SPCQualityChatbot
 
-            week_ago = timezone.now() - timedelta(days=7)
-            alerts = QualityAlert.objects.filter(
-                product_id=product_id,
-                created_at__gte=week_ago
-            )
+        # Get intent using original chatbot
+        intent = SPCQualityChatbot()._detect_intent(message)
 
-            context['alert_count'] = alerts.count()
+        # Prepare context data
+        context_data = self._prepare_context_data(intent, product_id, message)
 
-            # Issue patterns
-            issue_patterns = []
-            alert_types = alerts.values('alert_type').annotate(count=Count('alert_type'))
-            for alert_type in alert_types:
-                issue_patterns.append(
-                    f"- {alert_type['alert_type']}: {alert_type['count']} occurrences"
-                )
+        # Get conversation history (if session_id provided)
+        conversation_history = self._get_conversation_history(session_id) if session_id else None
 
-            context['issue_patterns'] = '\n'.join(issue_patterns) if issue_patterns else 'No patterns identified'
+        return intent, context_data, conversation_history
 
-        elif intent == 'improvement':
-            capability = ProcessCapability.objects.filter(
-                product_id=product_id
-            ).order_by('-analyzed_at').first()
-
-            if capability:
-                from scipy.stats import norm
-
-                current_cpk = capability.cpk
-                target_cpk = capability.product.min_cpk_target or 1.33
-                cpk_gap = target_cpk - current_cpk
-
-                # Calculate PPM
-                z_current = current_cpk * 3
-                z_target = target_cpk * 3
-                current_ppm = (1 - norm.cdf(z_current)) * 2 * 1_000_000
-                target_ppm = (1 - norm.cdf(z_target)) * 2 * 1_000_000
-
-                context.update({
-                    'current_cpk': current_cpk,
-                    'target_cpk': target_cpk,
-                    'cpk_gap': cpk_gap,
-                    'current_ppm': current_ppm,
-                    'target_ppm': target_ppm,
-                })
+    def _prepare_context_data(self, intent: str, product_id: int, message: str) -> Dict[str, Any]:
+        """Prepare context data for LLM prompt based on intent (cached product snapshot)"""
+        from .services.context_snapshot import get_product_context
 
-        return context
+        snapshot = get_product_context(product_id)
+        if snapshot is None:
+            return {}
+        return snapshot.llm_context(intent)
 
     def _get_conversation_history(self, session_id: str) -> List[Dict[str, str]]:
         """Get conversation history from database"""
@@ -860,6 +868,7 @@ class ChatbotViewSet(viewsets.GenericViewSet):
             'status': 'online',
             'llm_integration': True,
             **provider_status,
+            'cache': llm_service.get_cache_stats(),
             'configuration': {
                 'openai_available': bool(os.environ.get('OPENAI_API_KEY')),
                 'anthropic_available': bool(os.environ.get('ANTHROPIC_API_KEY')),
@@ -1523,6 +1532,13 @@ class AIPromptViewSet(viewsets.GenericViewSet):
 
         try:
             from .services.ai_prompt_service import AIPromptService
+            from .services.context_snapshot import get_product_context
+
+            # 제품 지정 시 챗봇과 같은 제품 컨텍스트 스냅샷을 입력에 포함
+            product_id = request.data.get('product_id') or inputs.get('product_id')
+            snapshot = get_product_context(product_id)
+            if snapshot is not None:
+                inputs = {**inputs, 'product_context': snapshot.prompt_context()}
 
             result = AIPromptService.execute_prompt(
                 use_case=use_case,
@@ -34,11 +34,13 @@ from apps.spc.serializers_master_data import (
     InspectionStandardMasterSerializer,
     InspectionStandardMasterListSerializer,
     QualitySyncLogSerializer,
+    GageRRBatchSerializer,
     ERPItemImportSerializer,
     MESProcessImportSerializer,
     ERPItemBatchImportSerializer,
     MESProcessBatchImportSerializer,
 )
+from apps.spc.services import gage_rr, master_data_import
 
 
 # ============================================================================
@@ -94,60 +96,15 @@ class QualityItemMasterViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        items_data = serializer.validated_data['items']
-        sync_log = QualitySyncLog.objects.create(
+        # 청크 단위 set 기반 upsert (진행 상황은 QualitySyncLog.sync_details 에 기록)
+        result = master_data_import.run_import(
+            QualityItemMaster,
+            key_field='itm_id',
+            records=serializer.validated_data['items'],
             sync_type='ITEM',
             sync_source='ERP',
-            sync_status='SUCCESS',
-            records_total=len(items_data),
-            sync_start_ts=timezone.now(),
+            sync_ts_field='erp_sync_ts',
         )
-
-        result = {
-            'total': len(items_data),
-            'created': 0,
-            'updated': 0,
-            'failed': 0,
-            'errors': []
-        }
-
-        try:
-            with transaction.atomic():
-                for item_data in items_data:
-                    try:
-                        item, created = QualityItemMaster.objects.update_or_create(
-                            itm_id=item_data['itm_id'],
-                            defaults={
-                                **item_data,
-                                'active_yn': 'Y',
-                                'erp_sync_ts': timezone.now()
-                            }
-                        )
-                        if created:
-                            result['created'] += 1
-                        else:
-                            result['updated'] += 1
-                    except Exception as e:
-                        result['failed'] += 1
-                        result['errors'].append({
-                            'itm_id': item_data.get('itm_id'),
-                            'error': str(e)
-                        })
-
-                sync_log.records_success = result['created'] + result['updated']
-                sync_log.records_failed = result['failed']
-                sync_log.sync_end_ts = timezone.now()
-                sync_log.sync_status = 'FAILED' if result['failed'] > 0 else 'SUCCESS'
-                sync_log.sync_details = result
-                sync_log.save()
-
-        except Exception as e:
-            sync_log.sync_status = 'FAILED'
-            sync_log.error_message = str(e)
-            sync_log.sync_end_ts = timezone.now()
-            sync_log.save()
-            raise
-
         return Response(result, status=status.HTTP_200_OK)
 
 
@@ -200,60 +157,15 @@ class QualityProcessMasterViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        processes_data = serializer.validated_data['processes']
-        sync_log = QualitySyncLog.objects.create(
+        # 청크 단위 set 기반 upsert (진행 상황은 QualitySyncLog.sync_details 에 기록)
+        result = master_data_import.run_import(
+            QualityProcessMaster,
+            key_field='process_cd',
+            records=serializer.validated_data['processes'],
             sync_type='PROCESS',
             sync_source='MES',
-            sync_status='SUCCESS',
-            records_total=len(processes_data),
-            sync_start_ts=timezone.now(),
+            sync_ts_field='mes_sync_ts',
         )
-
-        result = {
-            'total': len(processes_data),
-            'created': 0,
-            'updated': 0,
-            'failed': 0,
-            'errors': []
-        }
-
-        try:
-            with transaction.atomic():
-                for process_data in processes_data:
-                    try:
-                        process, created = QualityProcessMaster.objects.update_or_create(
-                            process_cd=process_data['process_cd'],
-                            defaults={
-                                **process_data,
-                                'active_yn': 'Y',
-                                'mes_sync_ts': timezone.now()
-                            }
-                        )
-                        if created:
-                            result['created'] += 1
-                        else:
-                            result['updated'] += 1
-                    except Exception as e:
-                        result['failed'] += 1
-                        result['errors'].append({
-                            'process_cd': process_data.get('process_cd'),
-                            'error': str(e)
-                        })
-
-                sync_log.records_success = result['created'] + result['updated']
-                sync_log.records_failed = result['failed']
-                sync_log.sync_end_ts = timezone.now()
-                sync_log.sync_status = 'FAILED' if result['failed'] > 0 else 'SUCCESS'
-                sync_log.sync_details = result
-                sync_log.save()
-
-        except Exception as e:
-            sync_log.sync_status = 'FAILED'
-            sync_log.error_message = str(e)
-            sync_log.sync_end_ts = timezone.now()
-            sync_log.save()
-            raise
-
         return Response(result, status=status.HTTP_200_OK)
 
 
@@ -341,6 +253,58 @@ class MeasurementInstrumentMasterViewSet(viewsets.ModelViewSet):
         serializer = MeasurementInstrumentMasterListSerializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'])
+    def gage_rr_batch(self, request):
+        """
+        여러 기구의 Gage R&R 연구를 한 번에 분석 (교차 이원분산분석)
+
+        POST /api/spc/master-data/instruments/gage_rr_batch/
+        {
+            "studies": [
+                {
+                    "instrument_cd": "INST-001",
+                    "tolerance": 0.2,
+                    "measurements": [{"operator": "A", "part": "1", "measurement": 10.02}, ...]
+                }
+            ],
+            "apply": true
+        }
+        apply 이면 기구의 gage_rr_last_date / gage_rr_result 와 시스템 구성의 ev_contribution 갱신
+        """
+        serializer = GageRRBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {'error': 'Invalid data', 'details': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = serializer.validated_data
+        results = gage_rr.analyze_studies(
+            [
+                {
+                    'key': study['instrument_cd'],
+                    'measurements': study.get('measurements'),
+                    'tolerance': study.get('tolerance'),
+                }
+                for study in data['studies']
+            ],
+            tolerance=data.get('tolerance'),
+            alpha=data['alpha'],
+        )
+
+        applied = None
+        if data['apply']:
+            with transaction.atomic():
+                applied = gage_rr.apply_instrument_results(results)
+
+        return Response({
+            'studies': len(results),
+            'analyzed': sum(1 for item in results if 'result' in item),
+            'failed': sum(1 for item in results if 'error' in item),
+            'applied': applied,
+            'results': results,
+        })
+
 
 class MeasurementSystemMasterViewSet(viewsets.ModelViewSet):
     """측정 ?�스??마스??뷰셋"""
@@ -60,6 +60,12 @@ app.conf.beat_schedule = {
         'task': 'apps.spc.tasks.cleanup_old_data',
         'schedule': crontab(hour=2, minute=0),  # 매일 새벽 2시
     },
+
+    # 매일 야간 공정능력 일괄 갱신 (제품 ProcessCapability / 품질특성 Cpk 기준 비교)
+    'refresh-all-process-capability': {
+        'task': 'apps.spc.tasks.refresh_all_process_capability',
+        'schedule': crontab(hour=3, minute=0),  # 매일 새벽 3시
+    },
 }
 
 # Celery Worker 설정
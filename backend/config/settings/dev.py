@@ -52,6 +52,7 @@ MIDDLEWARE = [
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -161,6 +162,8 @@ REST_FRAMEWORK = {
     ],
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
 }
+# ?page_size= 로 요청할 수 있는 최대 페이지 크기 (smart_spc/pagination.py, 커서 페이지네이션 목록 뷰)
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', '1000'))
 
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
@@ -302,3 +305,70 @@ ANTHROPIC_MODEL = os.environ.get('ANTHROPIC_MODEL', 'claude-3-5-sonnet-20241022'
 
 # LLM Cache Settings
 LLM_CACHE_TIMEOUT = 3600  # 1 hour in seconds
+
+# LLM 챗봇 스트리밍 (apps/spc/services/llm_service.py)
+# API_BASE 를 로컬 가짜 서버로 지정하면 외부 호출 없이 스트리밍 경로를 시험할 수 있음
+OPENAI_API_BASE = os.environ.get('OPENAI_API_BASE', 'https://api.openai.com/v1')
+ANTHROPIC_API_BASE = os.environ.get('ANTHROPIC_API_BASE', 'https://api.anthropic.com/v1')
+LLM_HTTP_MAX_CONNECTIONS = int(os.environ.get('LLM_HTTP_MAX_CONNECTIONS', '20'))
+LLM_STREAM_TIMEOUT = float(os.environ.get('LLM_STREAM_TIMEOUT', '60'))
+# 공급자별 동시 호출 수 / 슬롯 대기 한도 (초)
+LLM_MAX_CONCURRENCY = {
+    'openai': int(os.environ.get('OPENAI_MAX_CONCURRENCY', '8')),
+    'anthropic': int(os.environ.get('ANTHROPIC_MAX_CONCURRENCY', '8')),
+}
+LLM_QUEUE_TIMEOUT = float(os.environ.get('LLM_QUEUE_TIMEOUT', '10'))
+
+# APS 공정 시간 예측 (XGBoost, apps/aps/services/process_time.py)
+PROCESS_TIME_PREDICTION_ENABLED = os.environ.get('PROCESS_TIME_PREDICTION_ENABLED', 'True').lower() == 'true'
+PROCESS_TIME_MODEL_DIR = os.environ.get(
+    'PROCESS_TIME_MODEL_DIR', str(BASE_DIR / 'ai_modules' / 'ml_models' / 'saved')
+)
+# 작업 / 마스터에 없는 특징의 기본값 (학습 데이터 기준 표준 조건, apps/aps/services/process_time.py)
+PROCESS_TIME_FEATURE_DEFAULTS = {
+    'complexity': 5,
+    'operator_skill': 3,
+    'shift': 1,
+    'temperature': 23.0,
+    'humidity': 50.0,
+    'machine_age_days': 730,
+    'maintenance_days_ago': 30,
+    'has_previous_job': 1,
+    'setup_time': 0,
+}
+
+# 챗봇 응답 캐시 (apps/spc/services/chatbot_cache.py)
+CHATBOT_CACHE_ENABLED = os.environ.get('CHATBOT_CACHE_ENABLED', 'True').lower() == 'true'
+CHATBOT_CACHE_TIMEOUT = int(os.environ.get('CHATBOT_CACHE_TIMEOUT', '3600'))
+CHATBOT_CACHE_LRU_SIZE = int(os.environ.get('CHATBOT_CACHE_LRU_SIZE', '256'))
+# 컨텍스트 수치 반올림 유효숫자 (Cpk 1.2345 → 1.23)
+CHATBOT_CACHE_SIGNIFICANT_DIGITS = 3
+# 제품 컨텍스트 스냅샷 보관 시간 (초, 측정 데이터 반영 주기, apps/spc/services/context_snapshot.py)
+CHATBOT_SNAPSHOT_TTL = int(os.environ.get('CHATBOT_SNAPSHOT_TTL', '60'))
+
+# 대용량 데이터 내보내기 (apps/aps/services/exports.py)
+EXPORT_ROOT = os.environ.get('EXPORT_ROOT', str(BASE_DIR / 'exports'))
+# 서버측 커서 조회 단위 / Parquet row group 행 수
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', '5000'))
+EXPORT_PARQUET_ROW_GROUP_SIZE = int(os.environ.get('EXPORT_PARQUET_ROW_GROUP_SIZE', '100000'))
+
+# 제품별 일일 품질 집계 (apps/spc/services/quality_rollups.py)
+# 일일 보고서 작업이 집계가 없는 최근 일자를 다시 계산하는 범위 (일)
+QUALITY_ROLLUP_LOOKBACK_DAYS = int(os.environ.get('QUALITY_ROLLUP_LOOKBACK_DAYS', '35'))
+
+# ERP / MES 기준정보 일괄 Import (apps/spc/services/master_data_import.py)
+# 청크당 레코드 수 (청크마다 커밋하고 QualitySyncLog 에 진행 상황 기록)
+MASTER_DATA_IMPORT_CHUNK_SIZE = int(os.environ.get('MASTER_DATA_IMPORT_CHUNK_SIZE', '1000'))
+
+# 공정능력 일괄 분석 / 야간 갱신 (apps/spc/services/capability_batch.py)
+# 갱신 분석 기간 (일) / 정규성 검정 그룹당 최대 표본 수 / 검정 결과 캐시 보관 시간 (초, 0 = 캐시 안 함)
+CAPABILITY_REFRESH_DAYS = int(os.environ.get('CAPABILITY_REFRESH_DAYS', '30'))
+CAPABILITY_NORMALITY_SAMPLE_SIZE = int(os.environ.get('CAPABILITY_NORMALITY_SAMPLE_SIZE', '500'))
+CAPABILITY_NORMALITY_CACHE_TIMEOUT = int(os.environ.get('CAPABILITY_NORMALITY_CACHE_TIMEOUT', '604800'))
+
+# 대시보드 HTTP 캐시 (smart_spc/resource_versions.py)
+# 리소스 버전 기반 ETag / 응답 캐시 사용 여부, 응답 보관 시간 (초),
+# 데이터 변경 없이 시간 창 집계를 다시 계산하는 주기 (초, 0 = 리소스 버전만 사용)
+HTTP_CACHE_ENABLED = os.environ.get('HTTP_CACHE_ENABLED', 'True').lower() == 'true'
+HTTP_CACHE_TIMEOUT = int(os.environ.get('HTTP_CACHE_TIMEOUT', '300'))
+HTTP_CACHE_BUCKET_SECONDS = int(os.environ.get('HTTP_CACHE_BUCKET_SECONDS', '60'))
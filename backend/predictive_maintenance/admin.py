@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import Equipment, SensorData, MaintenanceRecord, FailurePrediction, MaintenancePlan
+from .models import (
+    Equipment, SensorData, SensorRollupMinute, SensorRollupHour,
+    SensorLatestValue, SensorBaseline, EquipmentStatusSummary,
+    MaintenanceRecord, FailurePrediction, MaintenancePlan
+)
 
 
 @admin.register(Equipment)
@@ -37,6 +41,35 @@ class SensorDataAdmin(admin.ModelAdmin):
     date_hierarchy = 'timestamp'
 
 
+@admin.register(SensorRollupMinute, SensorRollupHour)
+class SensorRollupAdmin(admin.ModelAdmin):
+    list_display = ['equipment', 'sensor_type', 'sensor_id', 'bucket', 'sample_count', 'value_min', 'value_max', 'last_value', 'anomaly_count']
+    list_filter = ['sensor_type', 'bucket']
+    search_fields = ['equipment__code', 'sensor_id']
+    date_hierarchy = 'bucket'
+
+
+@admin.register(SensorLatestValue)
+class SensorLatestValueAdmin(admin.ModelAdmin):
+    list_display = ['equipment', 'sensor_type', 'sensor_id', 'value', 'unit', 'is_normal', 'anomaly_score', 'timestamp']
+    list_filter = ['sensor_type', 'is_normal']
+    search_fields = ['equipment__code', 'equipment__name', 'sensor_id']
+
+
+@admin.register(SensorBaseline)
+class SensorBaselineAdmin(admin.ModelAdmin):
+    list_display = ['equipment', 'sensor_type', 'sensor_id', 'sample_count', 'mean', 'std_dev', 'threshold_min', 'threshold_max', 'updated_at']
+    list_filter = ['sensor_type']
+    search_fields = ['equipment__code', 'sensor_id']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(EquipmentStatusSummary)
+class EquipmentStatusSummaryAdmin(admin.ModelAdmin):
+    list_display = ['equipment', 'sensor_count', 'abnormal_sensor_count', 'max_anomaly_score', 'last_reading_at', 'updated_at']
+    search_fields = ['equipment__code', 'equipment__name']
+
+
 @admin.register(MaintenanceRecord)
 class MaintenanceRecordAdmin(admin.ModelAdmin):
     list_display = ['equipment', 'record_type', 'status', 'title', 'scheduled_date', 'technician', 'total_cost']
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PredictiveMaintenanceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "predictive_maintenance"
+
+    def ready(self):
+        """앱이 준비될 때 signals 연결"""
+        import predictive_maintenance.signals  # noqa
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from predictive_maintenance.services.sensor_timeseries import compact_sensor_data
+
+
+class Command(BaseCommand):
+    help = '센서 데이터 보존 정책 적용 (만료된 원시 데이터를 1분 / 1시간 집계로 압축 후 삭제)'
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'보존 기간: 원시 {settings.SENSOR_RAW_RETENTION_DAYS}일, '
+            f'1분 집계 {settings.SENSOR_MINUTE_RETENTION_DAYS or "영구"}일, '
+            f'1시간 집계 {settings.SENSOR_HOUR_RETENTION_DAYS or "영구"}일'
+        )
+        result = compact_sensor_data()
+
+        for resolution, deleted in result['rollups_deleted'].items():
+            self.stdout.write(f'  {resolution} 집계 {deleted}건 삭제')
+        self.stdout.write(self.style.SUCCESS(
+            f"센서 데이터 압축 완료: {result['compacted_hours']}시간 구간, "
+            f"원시 데이터 {result['raw_deleted']}건 삭제 ({result['raw_cutoff']:%Y-%m-%d %H:%M} UTC 이전)"
+        ))
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from predictive_maintenance.services.sensor_timeseries import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = '원시 센서 데이터로부터 1분 / 1시간 집계 재계산 (기존 데이터 백필, 수정 / 삭제 반영)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='시작 시각 (ISO 8601, 예: 2026-01-01 또는 2026-01-01T09:00)')
+        parser.add_argument('--end', help='종료 시각 (ISO 8601, 기본: 현재)')
+        parser.add_argument('--days', type=int, default=7, help='--start 미지정 시 종료 시각 기준 일수')
+
+    def handle(self, *args, **options):
+        try:
+            end = self._parse(options['end']) if options['end'] else timezone.now()
+            start = self._parse(options['start']) if options['start'] else end - timedelta(days=options['days'])
+        except ValueError as e:
+            raise CommandError(f'잘못된 시각 형식: {e}')
+        if start >= end:
+            raise CommandError('--start 가 --end 보다 늦습니다')
+
+        result = rebuild_rollups(start, end)
+        self.stdout.write(self.style.SUCCESS(
+            f"센서 집계 재계산 완료: {result['rebuilt_hours']}시간 구간, 원시 데이터 {result['readings']}건 "
+            f"({start:%Y-%m-%d %H:%M} ~ {end:%Y-%m-%d %H:%M})"
+        ))
+
+    @staticmethod
+    def _parse(value):
+        parsed = datetime.fromisoformat(value)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from predictive_maintenance.services.sensor_state import rebuild_latest
+
+
+class Command(BaseCommand):
+    help = '원시 센서 데이터 이력으로부터 센서별 최신값 / 설비 상태 요약 재구성'
+
+    def handle(self, *args, **options):
+        sensors = rebuild_latest()
+        self.stdout.write(self.style.SUCCESS(f'센서 최신값 재구성 완료: {sensors}개 센서'))
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("predictive_maintenance", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SensorRollupHour",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("sensor_type", models.CharField(choices=[("VIBRATION", "진동"), ("TEMPERATURE", "온도"), ("PRESSURE", "압력"), ("CURRENT", "전류"), ("VOLTAGE", "전압"), ("SPEED", "속도"), ("FLOW", "유량"), ("NOISE", "소음"), ("OTHER", "기타")], max_length=20, verbose_name="센서 유형")),
+                ("sensor_id", models.CharField(max_length=100, verbose_name="센서 ID")),
+                ("bucket", models.DateTimeField(verbose_name="버킷 시작 시각")),
+                ("sample_count", models.IntegerField(default=0, verbose_name="데이터 수")),
+                ("value_sum", models.FloatField(default=0.0, verbose_name="측정값 합계")),
+                ("value_min", models.FloatField(verbose_name="최소값")),
+                ("value_max", models.FloatField(verbose_name="최대값")),
+                ("last_value", models.FloatField(verbose_name="마지막 값")),
+                ("last_timestamp", models.DateTimeField(verbose_name="마지막 측정 시간")),
+                ("anomaly_count", models.IntegerField(default=0, verbose_name="이상 데이터 수")),
+                ("equipment", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="predictive_maintenance.equipment", verbose_name="설비")),
+            ],
+            options={
+                "verbose_name": "센서 데이터 1시간 집계",
+                "verbose_name_plural": "센서 데이터 1시간 집계",
+                "db_table": "pm_sensor_rollup_1h",
+                "indexes": [models.Index(fields=["equipment", "bucket"], name="pm_sensor_r_equipme_77639d_idx"), models.Index(fields=["bucket"], name="pm_sensor_r_bucket_4b726a_idx")],
+                "constraints": [models.UniqueConstraint(fields=("equipment", "sensor_type", "sensor_id", "bucket"), name="uq_pm_rollup_1h_series_bucket")],
+            },
+        ),
+        migrations.CreateModel(
+            name="SensorRollupMinute",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("sensor_type", models.CharField(choices=[("VIBRATION", "진동"), ("TEMPERATURE", "온도"), ("PRESSURE", "압력"), ("CURRENT", "전류"), ("VOLTAGE", "전압"), ("SPEED", "속도"), ("FLOW", "유량"), ("NOISE", "소음"), ("OTHER", "기타")], max_length=20, verbose_name="센서 유형")),
+                ("sensor_id", models.CharField(max_length=100, verbose_name="센서 ID")),
+                ("bucket", models.DateTimeField(verbose_name="버킷 시작 시각")),
+                ("sample_count", models.IntegerField(default=0, verbose_name="데이터 수")),
+                ("value_sum", models.FloatField(default=0.0, verbose_name="측정값 합계")),
+                ("value_min", models.FloatField(verbose_name="최소값")),
+                ("value_max", models.FloatField(verbose_name="최대값")),
+                ("last_value", models.FloatField(verbose_name="마지막 값")),
+                ("last_timestamp", models.DateTimeField(verbose_name="마지막 측정 시간")),
+                ("anomaly_count", models.IntegerField(default=0, verbose_name="이상 데이터 수")),
+                ("equipment", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="predictive_maintenance.equipment", verbose_name="설비")),
+            ],
+            options={
+                "verbose_name": "센서 데이터 1분 집계",
+                "verbose_name_plural": "센서 데이터 1분 집계",
+                "db_table": "pm_sensor_rollup_1m",
+                "indexes": [models.Index(fields=["equipment", "bucket"], name="pm_sensor_r_equipme_484a13_idx"), models.Index(fields=["bucket"], name="pm_sensor_r_bucket_a80723_idx")],
+                "constraints": [models.UniqueConstraint(fields=("equipment", "sensor_type", "sensor_id", "bucket"), name="uq_pm_rollup_1m_series_bucket")],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("predictive_maintenance", "0002_sensor_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EquipmentStatusSummary",
+            fields=[
+                ("equipment", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="status_summary", serialize=False, to="predictive_maintenance.equipment", verbose_name="설비")),
+                ("sensor_count", models.IntegerField(default=0, verbose_name="센서 수")),
+                ("abnormal_sensor_count", models.IntegerField(default=0, verbose_name="이상 센서 수")),
+                ("max_anomaly_score", models.FloatField(default=0.0, verbose_name="최대 이상 점수")),
+                ("last_reading_at", models.DateTimeField(blank=True, null=True, verbose_name="마지막 측정 시간")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="수정일")),
+            ],
+            options={
+                "verbose_name": "설비 상태 요약",
+                "verbose_name_plural": "설비 상태 요약",
+                "db_table": "pm_equipment_status_summary",
+            },
+        ),
+        migrations.CreateModel(
+            name="SensorLatestValue",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("sensor_type", models.CharField(choices=[("VIBRATION", "진동"), ("TEMPERATURE", "온도"), ("PRESSURE", "압력"), ("CURRENT", "전류"), ("VOLTAGE", "전압"), ("SPEED", "속도"), ("FLOW", "유량"), ("NOISE", "소음"), ("OTHER", "기타")], max_length=20, verbose_name="센서 유형")),
+                ("sensor_id", models.CharField(max_length=100, verbose_name="센서 ID")),
+                ("reading_id", models.BigIntegerField(blank=True, null=True, verbose_name="원시 데이터 ID")),
+                ("value", models.FloatField(verbose_name="측정값")),
+                ("unit", models.CharField(blank=True, max_length=20, verbose_name="단위")),
+                ("threshold_min", models.FloatField(blank=True, null=True, verbose_name="최소 임계값")),
+                ("threshold_max", models.FloatField(blank=True, null=True, verbose_name="최대 임계값")),
+                ("is_normal", models.BooleanField(default=True, verbose_name="정상 여부")),
+                ("anomaly_score", models.FloatField(default=0.0, verbose_name="이상 점수")),
+                ("timestamp", models.DateTimeField(verbose_name="측정 시간")),
+                ("equipment", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="latest_values", to="predictive_maintenance.equipment", verbose_name="설비")),
+            ],
+            options={
+                "verbose_name": "센서 최신값",
+                "verbose_name_plural": "센서 최신값",
+                "db_table": "pm_sensor_latest",
+                "ordering": ["equipment", "sensor_type", "sensor_id"],
+                "indexes": [models.Index(fields=["-timestamp"], name="pm_sensor_l_timesta_aaf387_idx")],
+                "constraints": [models.UniqueConstraint(fields=("equipment", "sensor_type", "sensor_id"), name="uq_pm_sensor_latest_series")],
+            },
+        ),
+    ]
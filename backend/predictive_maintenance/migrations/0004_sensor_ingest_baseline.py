@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("predictive_maintenance", "0003_sensor_latest_state"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="sensordata",
+            name="timestamp",
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name="측정 시간"),
+        ),
+        migrations.CreateModel(
+            name="SensorBaseline",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("sensor_type", models.CharField(choices=[("VIBRATION", "진동"), ("TEMPERATURE", "온도"), ("PRESSURE", "압력"), ("CURRENT", "전류"), ("VOLTAGE", "전압"), ("SPEED", "속도"), ("FLOW", "유량"), ("NOISE", "소음"), ("OTHER", "기타")], max_length=20, verbose_name="센서 유형")),
+                ("sensor_id", models.CharField(max_length=100, verbose_name="센서 ID")),
+                ("sample_count", models.IntegerField(default=0, verbose_name="유효 표본 수")),
+                ("mean", models.FloatField(default=0.0, verbose_name="평균")),
+                ("m2", models.FloatField(default=0.0, verbose_name="편차 제곱합")),
+                ("threshold_min", models.FloatField(blank=True, null=True, verbose_name="최소 임계값")),
+                ("threshold_max", models.FloatField(blank=True, null=True, verbose_name="최대 임계값")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="수정일")),
+                ("equipment", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="predictive_maintenance.equipment", verbose_name="설비")),
+            ],
+            options={
+                "verbose_name": "센서 기준 통계",
+                "verbose_name_plural": "센서 기준 통계",
+                "db_table": "pm_sensor_baseline",
+                "constraints": [models.UniqueConstraint(fields=("equipment", "sensor_type", "sensor_id"), name="uq_pm_sensor_baseline_series")],
+            },
+        ),
+    ]
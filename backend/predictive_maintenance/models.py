@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -93,7 +94,7 @@ class SensorData(models.Model):
     is_normal = models.BooleanField(default=True, verbose_name='정상 여부')
     anomaly_score = models.FloatField(default=0.0, verbose_name='이상 점수')
 
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='측정 시간')
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True, verbose_name='측정 시간')
 
     class Meta:
         db_table = 'pm_sensor_data'
@@ -109,6 +110,174 @@ class SensorData(models.Model):
         return f"{self.equipment.code} - {self.sensor_type}: {self.value} {self.unit}"
 
 
+class SensorRollupBase(models.Model):
+    """센서 데이터 시간 버킷 집계 (공통 필드)
+
+    (설비, 센서 유형, 센서 ID, 버킷 시작 시각) 당 한 행.
+    수집 시점에 누적되고, 원시 데이터 보존 기간이 지나면 원시 데이터로부터 다시 계산된 뒤
+    원시 데이터는 삭제된다. (predictive_maintenance/services/sensor_timeseries.py)
+    """
+
+    equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name='+', verbose_name='설비')
+    sensor_type = models.CharField(max_length=20, choices=SensorData.SENSOR_TYPE_CHOICES, verbose_name='센서 유형')
+    sensor_id = models.CharField(max_length=100, verbose_name='센서 ID')
+    bucket = models.DateTimeField(verbose_name='버킷 시작 시각')
+
+    sample_count = models.IntegerField(default=0, verbose_name='데이터 수')
+    value_sum = models.FloatField(default=0.0, verbose_name='측정값 합계')
+    value_min = models.FloatField(verbose_name='최소값')
+    value_max = models.FloatField(verbose_name='최대값')
+    last_value = models.FloatField(verbose_name='마지막 값')
+    last_timestamp = models.DateTimeField(verbose_name='마지막 측정 시간')
+    anomaly_count = models.IntegerField(default=0, verbose_name='이상 데이터 수')
+
+    class Meta:
+        abstract = True
+
+    @property
+    def value_mean(self):
+        return self.value_sum / self.sample_count if self.sample_count else None
+
+    def __str__(self):
+        return f"{self.sensor_id} @ {self.bucket}: n={self.sample_count}"
+
+
+class SensorRollupMinute(SensorRollupBase):
+    """센서 데이터 1분 집계"""
+
+    class Meta:
+        db_table = 'pm_sensor_rollup_1m'
+        verbose_name = '센서 데이터 1분 집계'
+        verbose_name_plural = '센서 데이터 1분 집계'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['equipment', 'sensor_type', 'sensor_id', 'bucket'],
+                name='uq_pm_rollup_1m_series_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['equipment', 'bucket']),
+            models.Index(fields=['bucket']),
+        ]
+
+
+class SensorRollupHour(SensorRollupBase):
+    """센서 데이터 1시간 집계"""
+
+    class Meta:
+        db_table = 'pm_sensor_rollup_1h'
+        verbose_name = '센서 데이터 1시간 집계'
+        verbose_name_plural = '센서 데이터 1시간 집계'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['equipment', 'sensor_type', 'sensor_id', 'bucket'],
+                name='uq_pm_rollup_1h_series_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['equipment', 'bucket']),
+            models.Index(fields=['bucket']),
+        ]
+
+
+class SensorLatestValue(models.Model):
+    """센서별 마지막 측정값 (설비, 센서 유형, 센서 ID 당 한 행)
+
+    수집 시점에 갱신되어 최신값 조회가 원시 데이터 이력 크기와 무관하다.
+    (predictive_maintenance/services/sensor_state.py)
+    """
+
+    equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name='latest_values', verbose_name='설비')
+    sensor_type = models.CharField(max_length=20, choices=SensorData.SENSOR_TYPE_CHOICES, verbose_name='센서 유형')
+    sensor_id = models.CharField(max_length=100, verbose_name='센서 ID')
+
+    # 원시 데이터는 보존 기간이 지나면 삭제되므로 FK 대신 ID 만 보관
+    reading_id = models.BigIntegerField(blank=True, null=True, verbose_name='원시 데이터 ID')
+    value = models.FloatField(verbose_name='측정값')
+    unit = models.CharField(max_length=20, blank=True, verbose_name='단위')
+    threshold_min = models.FloatField(blank=True, null=True, verbose_name='최소 임계값')
+    threshold_max = models.FloatField(blank=True, null=True, verbose_name='최대 임계값')
+    is_normal = models.BooleanField(default=True, verbose_name='정상 여부')
+    anomaly_score = models.FloatField(default=0.0, verbose_name='이상 점수')
+    timestamp = models.DateTimeField(verbose_name='측정 시간')
+
+    class Meta:
+        db_table = 'pm_sensor_latest'
+        verbose_name = '센서 최신값'
+        verbose_name_plural = '센서 최신값'
+        ordering = ['equipment', 'sensor_type', 'sensor_id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['equipment', 'sensor_type', 'sensor_id'],
+                name='uq_pm_sensor_latest_series',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['-timestamp']),
+        ]
+
+    def __str__(self):
+        return f"{self.sensor_id} ({self.sensor_type}): {self.value} {self.unit}"
+
+
+class SensorBaseline(models.Model):
+    """센서별 이상 탐지 기준 통계 (정상 측정값의 이동 평균 / 분산, 마지막 임계값)
+
+    일괄 수집 시 배치마다 갱신된다. 유효 표본 수는 SENSOR_BASELINE_WINDOW 로 제한되어
+    오래된 측정값의 가중치가 점차 줄어든다. (predictive_maintenance/services/sensor_ingest.py)
+    """
+
+    equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name='+', verbose_name='설비')
+    sensor_type = models.CharField(max_length=20, choices=SensorData.SENSOR_TYPE_CHOICES, verbose_name='센서 유형')
+    sensor_id = models.CharField(max_length=100, verbose_name='센서 ID')
+
+    sample_count = models.IntegerField(default=0, verbose_name='유효 표본 수')
+    mean = models.FloatField(default=0.0, verbose_name='평균')
+    m2 = models.FloatField(default=0.0, verbose_name='편차 제곱합')
+    threshold_min = models.FloatField(blank=True, null=True, verbose_name='최소 임계값')
+    threshold_max = models.FloatField(blank=True, null=True, verbose_name='최대 임계값')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    class Meta:
+        db_table = 'pm_sensor_baseline'
+        verbose_name = '센서 기준 통계'
+        verbose_name_plural = '센서 기준 통계'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['equipment', 'sensor_type', 'sensor_id'],
+                name='uq_pm_sensor_baseline_series',
+            ),
+        ]
+
+    @property
+    def std_dev(self):
+        return (max(self.m2, 0.0) / self.sample_count) ** 0.5 if self.sample_count else None
+
+    def __str__(self):
+        return f"{self.sensor_id} ({self.sensor_type}): n={self.sample_count}, mean={self.mean:.3f}"
+
+
+class EquipmentStatusSummary(models.Model):
+    """설비별 센서 상태 요약 (SensorLatestValue 갱신 시 함께 다시 계산)"""
+
+    equipment = models.OneToOneField(
+        Equipment, on_delete=models.CASCADE, primary_key=True, related_name='status_summary', verbose_name='설비'
+    )
+    sensor_count = models.IntegerField(default=0, verbose_name='센서 수')
+    abnormal_sensor_count = models.IntegerField(default=0, verbose_name='이상 센서 수')
+    max_anomaly_score = models.FloatField(default=0.0, verbose_name='최대 이상 점수')
+    last_reading_at = models.DateTimeField(blank=True, null=True, verbose_name='마지막 측정 시간')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    class Meta:
+        db_table = 'pm_equipment_status_summary'
+        verbose_name = '설비 상태 요약'
+        verbose_name_plural = '설비 상태 요약'
+
+    def __str__(self):
+        return f"{self.equipment_id}: {self.abnormal_sensor_count}/{self.sensor_count} 이상"
+
+
 class MaintenanceRecord(models.Model):
     """점검/수리 이력 모델"""
 
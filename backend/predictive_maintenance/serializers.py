@@ -1,5 +1,8 @@
 from rest_framework import serializers
+
+from smart_spc.api_mixins import SparseFieldsetMixin
 from .models import Equipment, SensorData, MaintenanceRecord, FailurePrediction, MaintenancePlan
+from .services.sensor_ingest import timestamp_window
 
 
 class EquipmentSerializer(serializers.ModelSerializer):
@@ -35,7 +38,7 @@ class EquipmentListSerializer(serializers.ModelSerializer):
         return False
 
 
-class SensorDataSerializer(serializers.ModelSerializer):
+class SensorDataSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """센서 데이터 시리얼라이저"""
 
     sensor_type_display = serializers.CharField(source='get_sensor_type_display', read_only=True)
@@ -46,6 +49,15 @@ class SensorDataSerializer(serializers.ModelSerializer):
         model = SensorData
         fields = '__all__'
 
+    def validate_timestamp(self, value):
+        """장비 측정 시각 허용 범위 (원시 데이터 보존 기간 ~ 허용 미래 오차)"""
+        oldest, newest = timestamp_window()
+        if value < oldest:
+            raise serializers.ValidationError('timestamp is older than the raw data retention period')
+        if value > newest:
+            raise serializers.ValidationError('timestamp is in the future')
+        return value
+
 
 class MaintenanceRecordSerializer(serializers.ModelSerializer):
     """점검/수리 이력 시리얼라이저"""
@@ -0,0 +1,510 @@
+"""
+센서 데이터 일괄 수집 (게이트웨이용)
+
+입력 형식 (parse_payload)
+- JSON 배열: [{"equipment": 3, "sensor_type": "VIBRATION", "sensor_id": "V1", "value": 1.2, "timestamp": ...}, ...]
+- {"readings": [...]}
+- NDJSON (Content-Type: application/x-ndjson): 한 줄에 측정값 하나
+- 컬럼형: {"equipment_code": "CNC-01", "sensor_type": "VIBRATION", "sensor_id": "V1",
+           "timestamp": [...], "value": [...]}  - 스칼라는 모든 행에 적용, 배열은 길이가 같아야 함
+설비는 equipment (ID) 또는 equipment_code 로 지정. timestamp 는 ISO 8601 또는 epoch 초 (없으면 수신 시각,
+시간대가 없으면 TIME_ZONE 기준).
+
+처리 (ingest_readings) - 배치 전체를 pandas / numpy 로 한 번에 계산
+1. 검증: 잘못된 행은 사유와 함께 제외하고 나머지는 저장
+2. 임계값 판정: 행에 임계값이 없으면 센서의 마지막 임계값 (SensorBaseline) 사용
+3. 이상 점수: 센서별 정상 측정값의 평균 / 분산 대비 |z| (1차원 Mahalanobis 거리).
+   같은 배치의 측정값은 배치 이전 기준으로 판정하고, 정상 측정값으로 기준을 한 번에 갱신
+4. 원시 데이터 bulk_create → 1분 / 1시간 집계, 센서 최신값, 기준 통계 갱신
+5. 설비별 이상 건수가 SENSOR_ALERT_MIN_ANOMALIES 이상이면 고장 예측을 배치당 한 번 생성
+   알림은 FailurePrediction 행으로만 남는다 (미확인 예측 목록 / 대시보드에서 조회).
+   smart_spc 설정에는 채널 레이어가 없어 WebSocket 으로 전송하지 않는다.
+"""
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from predictive_maintenance.models import Equipment, FailurePrediction, SensorBaseline, SensorData
+from predictive_maintenance.services import sensor_state, sensor_timeseries
+
+logger = logging.getLogger(__name__)
+
+
+INGEST_FIELDS = [
+    'equipment', 'equipment_code', 'sensor_type', 'sensor_id', 'value', 'unit',
+    'threshold_min', 'threshold_max', 'timestamp',
+]
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+VALID_SENSOR_TYPES = [code for code, _ in SensorData.SENSOR_TYPE_CHOICES]
+
+MODEL_TYPE = 'SENSOR_ZSCORE'
+MODEL_VERSION = '1.0'
+SCORE_CAP = 99.0
+MAX_REPORTED_ERRORS = 50
+
+SEVERITY_RANK = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2, 'CRITICAL': 3}
+SEVERITY_PROFILE = {
+    # 기본 고장 확률 (%), 예상 고장까지 일수, 우선순위, 권장 조치
+    'MEDIUM': (40.0, 7, 3, '이상 센서 추세 모니터링 강화 및 다음 정기 점검 시 확인'),
+    'HIGH': (70.0, 3, 2, '72시간 내 설비 점검 및 이상 센서 부위 확인'),
+    'CRITICAL': (90.0, 1, 1, '즉시 설비 점검, 필요 시 가동 중지 후 부품 상태 확인'),
+}
+
+
+class IngestError(ValueError):
+    """요청 전체를 처리할 수 없는 입력 오류"""
+
+
+@dataclass
+class IngestResult:
+    """일괄 수집 결과"""
+    received: int
+    created: int = 0
+    rejected: int = 0
+    anomalies: int = 0
+    threshold_breaches: int = 0
+    predictions: List[int] = field(default_factory=list)
+    errors: List[dict] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def timestamp_window(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """허용되는 측정 시각 범위 (원시 데이터 보존 기간 ~ 허용 미래 오차)"""
+    now = now or timezone.now()
+    return (
+        now - timedelta(days=sensor_timeseries.raw_retention_days()),
+        now + timedelta(seconds=_setting('SENSOR_INGEST_MAX_FUTURE_SECONDS', 300)),
+    )
+
+
+# ----------------------------------------------------------------------
+# 입력 파싱
+# ----------------------------------------------------------------------
+
+def is_ndjson(content_type: str) -> bool:
+    return (content_type or '').split(';')[0].strip().lower() in NDJSON_CONTENT_TYPES
+
+
+def _frame_from_rows(rows) -> pd.DataFrame:
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise IngestError('readings must be a list of objects')
+    return pd.DataFrame(rows).reindex(columns=INGEST_FIELDS)
+
+
+def _frame_from_columns(data: Dict) -> pd.DataFrame:
+    arrays = {key: value for key, value in data.items() if key in INGEST_FIELDS and isinstance(value, list)}
+    lengths = {len(value) for value in arrays.values()}
+    if not lengths:
+        raise IngestError('columnar payload needs at least one array field (e.g. value)')
+    if len(lengths) > 1:
+        raise IngestError('columnar arrays must have the same length')
+
+    frame = pd.DataFrame(arrays)
+    for key, value in data.items():
+        if key in INGEST_FIELDS and key not in arrays:
+            frame[key] = value
+    return frame.reindex(columns=INGEST_FIELDS)
+
+
+def parse_payload(content_type: str = '', body: bytes = b'', data=None) -> pd.DataFrame:
+    """요청 본문을 INGEST_FIELDS 열을 가진 DataFrame 으로 변환"""
+    if is_ndjson(content_type):
+        try:
+            rows = [json.loads(line) for line in body.splitlines() if line.strip()]
+        except ValueError as e:
+            raise IngestError(f'invalid NDJSON: {e}')
+        frame = _frame_from_rows(rows)
+    elif isinstance(data, list):
+        frame = _frame_from_rows(data)
+    elif isinstance(data, dict):
+        frame = _frame_from_rows(data['readings']) if 'readings' in data else _frame_from_columns(data)
+    else:
+        raise IngestError('expected a JSON array, {"readings": [...]}, NDJSON or a columnar object')
+
+    if frame.empty:
+        raise IngestError('no readings in payload')
+    max_batch = _setting('SENSOR_INGEST_MAX_BATCH', 50000)
+    if len(frame) > max_batch:
+        raise IngestError(f'batch too large: {len(frame)} readings (max {max_batch})')
+    return frame
+
+
+def _parse_timestamps(column: pd.Series, now: datetime) -> pd.Series:
+    """ISO 8601 문자열 / epoch 초 / 누락 (수신 시각) → UTC datetime (실패 시 NaT)"""
+    result = pd.Series(pd.NaT, index=column.index, dtype='datetime64[ns, UTC]')
+    missing = column.isna()
+    result[missing] = pd.Timestamp(now)
+
+    numeric = pd.to_numeric(column, errors='coerce')
+    is_numeric = numeric.notna() & ~missing
+    if is_numeric.any():
+        result[is_numeric] = pd.to_datetime(numeric[is_numeric], unit='s', utc=True)
+
+    text = column[~missing & ~is_numeric].astype(str)
+    if len(text):
+        parsed = pd.to_datetime(text, utc=True, errors='coerce', format='ISO8601')
+        naive = ~text.str.contains(r'(?:Z|[+-]\d{2}:?\d{2})$', regex=True)
+        if naive.any():
+            parsed[naive] = (
+                pd.to_datetime(text[naive], errors='coerce', format='ISO8601')
+                .dt.tz_localize(timezone.get_current_timezone(), ambiguous='NaT', nonexistent='NaT')
+                .dt.tz_convert('UTC')
+            )
+        result[text.index] = parsed
+    # DB / datetime 정밀도 (마이크로초) 에 맞춤
+    return result.dt.round('us')
+
+
+def _resolve_equipment(frame: pd.DataFrame) -> pd.Series:
+    """equipment (ID) / equipment_code → 설비 ID (없는 설비는 NaN), 쿼리 1회"""
+    ids = pd.to_numeric(frame['equipment'], errors='coerce')
+    codes = frame['equipment_code'].where(ids.isna())
+
+    id_values = {int(value) for value in ids.dropna().unique() if float(value).is_integer()}
+    code_values = {str(value) for value in codes.dropna().unique()}
+    known = list(
+        Equipment.objects.filter(Q(id__in=id_values) | Q(code__in=code_values)).values_list('id', 'code')
+    )
+    known_ids = {pk for pk, _ in known}
+    by_code = {code: pk for pk, code in known}
+
+    resolved = ids.where(ids.isin(known_ids))
+    return resolved.fillna(codes.astype(object).map(by_code)).astype(float)
+
+
+def _validate(frame: pd.DataFrame, now: datetime) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    행 단위 검증 / 정규화
+
+    Returns:
+        (정규화된 전체 행, 행별 거부 사유 - 정상 행은 NaN)
+    """
+    reasons = pd.Series(np.nan, index=frame.index, dtype=object)
+
+    def reject(mask, reason):
+        mask = np.asarray(pd.Series(mask, index=frame.index).fillna(False), dtype=bool) & reasons.isna().to_numpy()
+        reasons[mask] = reason
+
+    equipment_id = _resolve_equipment(frame)
+    reject(equipment_id.isna(), 'unknown equipment')
+
+    sensor_type = frame['sensor_type'].astype(object).where(frame['sensor_type'].notna(), '').astype(str).str.upper()
+    reject(~sensor_type.isin(VALID_SENSOR_TYPES), f"sensor_type must be one of: {', '.join(VALID_SENSOR_TYPES)}")
+
+    sensor_id = frame['sensor_id'].astype(object).where(frame['sensor_id'].notna(), '').astype(str).str.strip()
+    reject((sensor_id.str.len() == 0) | (sensor_id.str.len() > 100), 'sensor_id is required (max 100 characters)')
+
+    value = pd.to_numeric(frame['value'], errors='coerce').astype(float)
+    reject(~np.isfinite(value.to_numpy()), 'value must be a finite number')
+
+    timestamp = _parse_timestamps(frame['timestamp'], now)
+    oldest, newest = timestamp_window(now)
+    reject(timestamp.isna(), 'invalid timestamp')
+    reject(timestamp < pd.Timestamp(oldest), 'timestamp is older than the raw data retention period')
+    reject(timestamp > pd.Timestamp(newest), 'timestamp is in the future')
+
+    normalized = pd.DataFrame({
+        'equipment_id': equipment_id,
+        'sensor_type': sensor_type,
+        'sensor_id': sensor_id,
+        'value': value,
+        'unit': frame['unit'].astype(object).where(frame['unit'].notna(), '').astype(str).str.slice(0, 20),
+        'threshold_min': pd.to_numeric(frame['threshold_min'], errors='coerce').astype(float),
+        'threshold_max': pd.to_numeric(frame['threshold_max'], errors='coerce').astype(float),
+        'timestamp': timestamp,
+    })
+    return normalized, reasons
+
+
+# ----------------------------------------------------------------------
+# 기준 통계 / 이상 점수
+# ----------------------------------------------------------------------
+
+def _lock_baselines(series_keys: List[tuple]) -> List[SensorBaseline]:
+    """배치 센서들의 기준 통계 (없으면 저장 전 새 인스턴스), series_keys 순서"""
+    existing = {
+        (row.equipment_id, row.sensor_type, row.sensor_id): row
+        for row in SensorBaseline.objects.select_for_update().filter(
+            equipment_id__in={key[0] for key in series_keys},
+            sensor_id__in={key[2] for key in series_keys},
+        )
+    }
+    return [
+        existing.get(key) or SensorBaseline(equipment_id=key[0], sensor_type=key[1], sensor_id=key[2])
+        for key in series_keys
+    ]
+
+
+def score_batch(values: np.ndarray, codes: np.ndarray, row_min: np.ndarray, row_max: np.ndarray,
+                baselines: List[SensorBaseline]) -> Dict[str, np.ndarray]:
+    """
+    배치 전체 임계값 판정 / 이상 점수 (배치 이전 기준 통계 사용)
+
+    Returns:
+        threshold_min / threshold_max (적용된 임계값), breach, score, anomaly, is_normal - 행 배열
+    """
+    count = np.array([b.sample_count for b in baselines], dtype=float)
+    mean = np.array([b.mean for b in baselines], dtype=float)
+    m2 = np.array([b.m2 for b in baselines], dtype=float)
+    base_min = np.array([np.nan if b.threshold_min is None else b.threshold_min for b in baselines], dtype=float)
+    base_max = np.array([np.nan if b.threshold_max is None else b.threshold_max for b in baselines], dtype=float)
+
+    threshold_min = np.where(np.isnan(row_min), base_min[codes], row_min)
+    threshold_max = np.where(np.isnan(row_max), base_max[codes], row_max)
+    breach = (values < np.nan_to_num(threshold_min, nan=-np.inf)) | (values > np.nan_to_num(threshold_max, nan=np.inf))
+
+    std = np.sqrt(np.maximum(m2, 0.0) / np.maximum(count, 1.0))[codes]
+    deviation = np.abs(values - mean[codes])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.where(std > 0, deviation / std, np.where(deviation > 0, SCORE_CAP, 0.0))
+    mature = (count >= _setting('SENSOR_BASELINE_MIN_SAMPLES', 30))[codes]
+    score = np.where(mature, np.minimum(score, SCORE_CAP), 0.0)
+
+    anomaly = score > _setting('SENSOR_ANOMALY_Z_THRESHOLD', 4.0)
+    return {
+        'threshold_min': threshold_min,
+        'threshold_max': threshold_max,
+        'breach': breach,
+        'score': np.round(score, 4),
+        'anomaly': anomaly,
+        'is_normal': ~(breach | anomaly),
+    }
+
+
+def update_baselines(baselines: List[SensorBaseline], values: np.ndarray, codes: np.ndarray,
+                     is_normal: np.ndarray) -> None:
+    """정상 측정값으로 기준 통계 병합 (Chan 병렬 분산 공식, 유효 표본 수 SENSOR_BASELINE_WINDOW 상한)"""
+    groups = len(baselines)
+    weights = is_normal.astype(float)
+    n_b = np.bincount(codes, weights=weights, minlength=groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_b = np.where(n_b > 0, np.bincount(codes, weights=values * weights, minlength=groups) / n_b, 0.0)
+    m2_b = np.bincount(codes, weights=weights * (values - mean_b[codes]) ** 2, minlength=groups)
+
+    n_a = np.array([b.sample_count for b in baselines], dtype=float)
+    mean_a = np.array([b.mean for b in baselines], dtype=float)
+    m2_a = np.array([b.m2 for b in baselines], dtype=float)
+
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(n > 0, mean_a + delta * n_b / n, mean_a)
+        m2 = m2_a + m2_b + np.where(n > 0, delta ** 2 * n_a * n_b / n, 0.0)
+
+    window = _setting('SENSOR_BASELINE_WINDOW', 10000)
+    scale = np.where(n > window, window / np.maximum(n, 1.0), 1.0)
+    for baseline, count, mean_value, m2_value in zip(baselines, n * scale, mean, m2 * scale):
+        baseline.sample_count = int(round(count))
+        baseline.mean = float(mean_value)
+        baseline.m2 = float(m2_value)
+
+
+# ----------------------------------------------------------------------
+# 고장 예측
+# ----------------------------------------------------------------------
+
+def _severity(max_score: float, breaches: int, readings: int) -> str:
+    z_threshold = _setting('SENSOR_ANOMALY_Z_THRESHOLD', 4.0)
+    if max_score >= 2 * z_threshold or breaches * 2 >= readings:
+        return 'CRITICAL'
+    if breaches or max_score >= 1.5 * z_threshold:
+        return 'HIGH'
+    return 'MEDIUM'
+
+
+def raise_predictions(batch: pd.DataFrame, now: datetime) -> List[FailurePrediction]:
+    """
+    배치의 설비별 이상 현황으로 고장 예측 생성 (설비당 최대 1건)
+
+    SENSOR_ALERT_COOLDOWN_MINUTES 안에 같은 등급 이상의 미확인 예측이 있는 설비는 건너뛴다.
+    """
+    min_anomalies = _setting('SENSOR_ALERT_MIN_ANOMALIES', 5)
+    abnormal = batch[~batch['is_normal']]
+    if len(abnormal) < min_anomalies:
+        return []
+
+    readings = batch.groupby('equipment_id').size()
+    per_equipment = abnormal.groupby('equipment_id').agg(
+        anomalies=('score', 'size'), breaches=('breach', 'sum'), max_score=('score', 'max'),
+    )
+    per_equipment = per_equipment[per_equipment['anomalies'] >= min_anomalies]
+    if per_equipment.empty:
+        return []
+
+    cooldown_start = now - timedelta(minutes=_setting('SENSOR_ALERT_COOLDOWN_MINUTES', 10))
+    recent_rank: Dict[int, int] = {}
+    for equipment_id, severity in FailurePrediction.objects.filter(
+        equipment_id__in=[int(pk) for pk in per_equipment.index],
+        model_type=MODEL_TYPE,
+        is_acknowledged=False,
+        prediction_date__gte=cooldown_start,
+    ).values_list('equipment_id', 'severity'):
+        recent_rank[equipment_id] = max(recent_rank.get(equipment_id, 0), SEVERITY_RANK.get(severity, 0))
+
+    per_sensor = abnormal.groupby(['equipment_id', 'sensor_type', 'sensor_id']).agg(
+        anomalies=('score', 'size'), breaches=('breach', 'sum'), max_score=('score', 'max'),
+    ).sort_values('max_score', ascending=False)
+
+    predictions = []
+    for equipment_id, row in per_equipment.iterrows():
+        equipment_id = int(equipment_id)
+        total = int(readings[equipment_id])
+        severity = _severity(float(row['max_score']), int(row['breaches']), total)
+        if recent_rank.get(equipment_id, -1) >= SEVERITY_RANK[severity]:
+            continue
+
+        base_probability, days, priority, actions = SEVERITY_PROFILE[severity]
+        sensors = per_sensor.loc[equipment_id].head(5)
+        causes = [
+            f"{sensor_type}/{sensor_id}: 이상 {int(s['anomalies'])}건, "
+            f"최대 이상 점수 {s['max_score']:.1f}, 임계값 초과 {int(s['breaches'])}건"
+            for (sensor_type, sensor_id), s in sensors.iterrows()
+        ]
+        predictions.append(FailurePrediction(
+            equipment_id=equipment_id,
+            predicted_failure_date=now + timedelta(days=days),
+            failure_probability=round(base_probability + (100 - base_probability) * 0.5 * row['anomalies'] / total, 1),
+            confidence=round(50 + 45 * min(1.0, row['anomalies'] / (4 * min_anomalies)), 1),
+            severity=severity,
+            potential_causes='\n'.join(causes),
+            affected_components=', '.join(sensor_id for _, sensor_id in sensors.index),
+            recommended_actions=actions,
+            priority=priority,
+            model_version=MODEL_VERSION,
+            model_type=MODEL_TYPE,
+        ))
+
+    return FailurePrediction.objects.bulk_create(predictions)
+
+
+# ----------------------------------------------------------------------
+# 수집
+# ----------------------------------------------------------------------
+
+def _store_batch(batch: pd.DataFrame, now: datetime) -> Tuple[pd.DataFrame, List[FailurePrediction]]:
+    """검증된 배치 저장 (한 트랜잭션)"""
+    key_index = pd.MultiIndex.from_arrays(
+        [batch['equipment_id'].astype(int), batch['sensor_type'], batch['sensor_id']]
+    )
+    codes, uniques = key_index.factorize()
+    series_keys = [(int(e), t, s) for e, t, s in uniques]
+    values = batch['value'].to_numpy(dtype=float)
+
+    with transaction.atomic():
+        baselines = _lock_baselines(series_keys)
+        scores = score_batch(
+            values, codes,
+            batch['threshold_min'].to_numpy(dtype=float), batch['threshold_max'].to_numpy(dtype=float),
+            baselines,
+        )
+        batch = batch.assign(
+            threshold_min=scores['threshold_min'], threshold_max=scores['threshold_max'],
+            breach=scores['breach'], score=scores['score'], is_normal=scores['is_normal'],
+        )
+
+        readings = [
+            SensorData(
+                equipment_id=int(equipment_id), sensor_type=sensor_type, sensor_id=sensor_id,
+                value=value, unit=unit,
+                threshold_min=None if np.isnan(threshold_min) else threshold_min,
+                threshold_max=None if np.isnan(threshold_max) else threshold_max,
+                is_normal=is_normal, anomaly_score=score, timestamp=timestamp,
+            )
+            for equipment_id, sensor_type, sensor_id, value, unit, threshold_min, threshold_max, is_normal, score, timestamp
+            in zip(
+                batch['equipment_id'].tolist(), batch['sensor_type'].tolist(), batch['sensor_id'].tolist(),
+                values.tolist(), batch['unit'].tolist(),
+                batch['threshold_min'].tolist(), batch['threshold_max'].tolist(),
+                batch['is_normal'].tolist(), batch['score'].tolist(),
+                batch['timestamp'].dt.to_pydatetime().tolist(),
+            )
+        ]
+        SensorData.objects.bulk_create(readings, batch_size=_setting('SENSOR_INGEST_INSERT_BATCH', 2000))
+
+        sensor_timeseries.merge_summary(sensor_timeseries.summarize_frame(
+            batch[['equipment_id', 'sensor_type', 'sensor_id', 'timestamp', 'value', 'is_normal']]
+            .astype({'equipment_id': int})
+        ))
+        # 센서별 가장 늦은 측정값만 최신값 저장소로 전달
+        order = np.lexsort((batch['timestamp'].dt.tz_localize(None).to_numpy(), codes))
+        newest = order[np.append(codes[order][1:] != codes[order][:-1], True)]
+        sensor_state.record_latest([readings[i] for i in newest.tolist()])
+
+        # 기준 통계: 정상 측정값 병합 + 배치에서 받은 마지막 임계값 반영
+        update_baselines(baselines, values, codes, scores['is_normal'])
+        for column in ('threshold_min', 'threshold_max'):
+            supplied = pd.Series(batch[column].to_numpy(), index=codes)[~np.isnan(scores[column])]
+            for code, threshold in supplied.groupby(level=0).last().items():
+                setattr(baselines[code], column, float(threshold))
+        for baseline in baselines:
+            baseline.updated_at = now
+        SensorBaseline.objects.bulk_create([b for b in baselines if b.pk is None])
+        SensorBaseline.objects.bulk_update(
+            [b for b in baselines if b.pk is not None],
+            ['sample_count', 'mean', 'm2', 'threshold_min', 'threshold_max', 'updated_at'],
+        )
+
+        predictions = raise_predictions(batch, now)
+    return batch, predictions
+
+
+def ingest_readings(frame: pd.DataFrame, now: Optional[datetime] = None) -> IngestResult:
+    """파싱된 배치를 검증 / 판정 / 저장하고 결과 반환"""
+    now = now or timezone.now()
+    result = IngestResult(received=len(frame))
+
+    normalized, reasons = _validate(frame.reset_index(drop=True), now)
+    invalid = reasons.notna()
+    result.rejected = int(invalid.sum())
+    result.errors = [
+        {'index': int(index), 'error': reason}
+        for index, reason in reasons[invalid].head(MAX_REPORTED_ERRORS).items()
+    ]
+    batch = normalized[~invalid].reset_index(drop=True)
+    if batch.empty:
+        return result
+
+    # 같은 센서의 기준 통계를 동시에 처음 생성하면 유니크 제약 위반 → 배치 전체를 한 번 더 시도
+    for attempt in range(2):
+        try:
+            batch, predictions = _store_batch(batch, now)
+            break
+        except IntegrityError:
+            if attempt:
+                raise
+            logger.info("센서 기준 통계 동시 생성 감지, 배치 재시도")
+
+    result.created = len(batch)
+    result.anomalies = int((batch['score'] > _setting('SENSOR_ANOMALY_Z_THRESHOLD', 4.0)).sum())
+    result.threshold_breaches = int(batch['breach'].sum())
+    result.predictions = [prediction.id for prediction in predictions]
+
+    if predictions:
+        codes = dict(
+            Equipment.objects.filter(id__in={p.equipment_id for p in predictions}).values_list('id', 'code')
+        )
+        logger.warning(
+            f"센서 이상으로 고장 예측 {len(predictions)}건 생성: "
+            f"{[f'{codes.get(p.equipment_id)} ({p.severity})' for p in predictions]}"
+        )
+
+    logger.info(
+        f"센서 일괄 수집: {result.created}/{result.received}건 저장, 이상 {result.anomalies}건, "
+        f"임계값 초과 {result.threshold_breaches}건"
+    )
+    return result
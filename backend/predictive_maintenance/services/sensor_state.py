@@ -0,0 +1,229 @@
+"""
+센서 현재 상태 저장소 (센서별 마지막 측정값 / 설비 상태 요약)
+
+- 수집: record_latest() 가 (설비, 센서) 별 마지막 측정값을 갱신하고 해당 설비의 상태 요약을 다시 계산
+- 조회: latest_values() / recent_values() / status_overview() 는 센서 수 / 설비 수 만큼의 행만 읽으므로
+  원시 데이터 (SensorData) 이력 크기와 무관
+- SENSOR_LATEST_CACHE_ENABLED 이면 설비별 마지막 측정값 목록을 Django cache 에도 기록 (커밋 후 write-through).
+  여러 워커가 같은 값을 보려면 공유 캐시 백엔드 (Redis 등) 를 사용해야 한다.
+- 갱신된 설비의 'equipment' 리소스 버전 증가 (대시보드 ETag / 응답 캐시 무효화)
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, F, Max, Q, Sum, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from predictive_maintenance.models import Equipment, EquipmentStatusSummary, SensorData, SensorLatestValue
+from smart_spc import resource_versions
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_KEY_PREFIX = 'pm_sensor_latest'
+
+READING_FIELDS = ['value', 'unit', 'threshold_min', 'threshold_max', 'is_normal', 'anomaly_score', 'timestamp']
+SUMMARY_FIELDS = ['sensor_count', 'abnormal_sensor_count', 'max_anomaly_score', 'last_reading_at', 'updated_at']
+
+SENSOR_TYPE_DISPLAY = dict(SensorData.SENSOR_TYPE_CHOICES)
+
+
+def cache_enabled() -> bool:
+    return getattr(settings, 'SENSOR_LATEST_CACHE_ENABLED', False)
+
+
+def cache_key(equipment_id) -> str:
+    return f'{CACHE_KEY_PREFIX}:{equipment_id}'
+
+
+# ----------------------------------------------------------------------
+# 갱신
+# ----------------------------------------------------------------------
+
+def _upsert_latest(newest: Dict[tuple, SensorData]) -> None:
+    """센서별 마지막 측정값 갱신 (저장된 값보다 오래된 측정값은 무시)"""
+    equipment_ids = {key[0] for key in newest}
+    sensor_ids = {key[2] for key in newest}
+
+    existing = {
+        (row.equipment_id, row.sensor_type, row.sensor_id): row
+        for row in SensorLatestValue.objects.select_for_update().filter(
+            equipment_id__in=equipment_ids, sensor_id__in=sensor_ids,
+        )
+    }
+    to_create, to_update = [], []
+    for key, reading in newest.items():
+        row = existing.get(key)
+        if row is None:
+            row = SensorLatestValue(equipment_id=key[0], sensor_type=key[1], sensor_id=key[2])
+            to_create.append(row)
+        elif reading.timestamp < row.timestamp:
+            continue
+        else:
+            to_update.append(row)
+        row.reading_id = reading.pk
+        for name in READING_FIELDS:
+            setattr(row, name, getattr(reading, name))
+
+    if to_create:
+        SensorLatestValue.objects.bulk_create(to_create)
+    if to_update:
+        SensorLatestValue.objects.bulk_update(to_update, ['reading_id'] + READING_FIELDS)
+
+
+def refresh_summaries(equipment_ids: Iterable[int]) -> None:
+    """설비 상태 요약을 센서별 마지막 측정값으로부터 다시 계산"""
+    now = timezone.now()
+    rows = (
+        SensorLatestValue.objects.filter(equipment_id__in=list(equipment_ids))
+        .order_by()
+        .values('equipment_id')
+        .annotate(
+            sensor_count=Count('id'),
+            abnormal_sensor_count=Count('id', filter=Q(is_normal=False)),
+            max_anomaly_score=Max('anomaly_score'),
+            last_reading_at=Max('timestamp'),
+        )
+    )
+    EquipmentStatusSummary.objects.bulk_create(
+        [EquipmentStatusSummary(updated_at=now, **row) for row in rows],
+        update_conflicts=True,
+        unique_fields=['equipment'],
+        update_fields=SUMMARY_FIELDS,
+    )
+
+
+def record_latest(readings: Iterable[SensorData]) -> int:
+    """저장된 원시 데이터로 센서별 마지막 측정값 / 설비 상태 요약 갱신"""
+    newest: Dict[tuple, SensorData] = {}
+    for reading in readings:
+        key = (reading.equipment_id, reading.sensor_type, reading.sensor_id)
+        current = newest.get(key)
+        if current is None or reading.timestamp >= current.timestamp:
+            newest[key] = reading
+    if not newest:
+        return 0
+
+    equipment_ids = {key[0] for key in newest}
+    # 같은 센서의 첫 측정값이 동시에 들어오면 유니크 제약 위반 → 생성된 행을 잠그고 한 번 더 갱신
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                _upsert_latest(newest)
+                refresh_summaries(equipment_ids)
+            break
+        except IntegrityError:
+            if attempt:
+                raise
+            logger.info("센서 최신값 동시 생성 감지, 재시도")
+
+    if cache_enabled():
+        transaction.on_commit(lambda: refresh_cache(equipment_ids))
+    # bulk 갱신은 모델 시그널이 없으므로 대시보드 리소스 버전을 직접 증가
+    resource_versions.bump('equipment', *equipment_ids)
+    return len(newest)
+
+
+def rebuild_latest(chunk_size: int = 1000) -> int:
+    """
+    원시 데이터 이력으로부터 센서별 마지막 측정값 재구성 (초기 적재 / 복구용)
+
+    늦게 도착한 과거 측정값이 더 큰 id 를 가질 수 있으므로 측정 시각 기준 (동률이면 id) 으로 고른다.
+    """
+    latest_ids = list(
+        SensorData.objects.annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F('equipment_id'), F('sensor_type'), F('sensor_id')],
+                order_by=[F('timestamp').desc(), F('id').desc()]
+            )
+        ).filter(row_number=1).values_list('id', flat=True)
+    )
+    for i in range(0, len(latest_ids), chunk_size):
+        record_latest(SensorData.objects.filter(id__in=latest_ids[i:i + chunk_size]))
+    return len(latest_ids)
+
+
+# ----------------------------------------------------------------------
+# 조회
+# ----------------------------------------------------------------------
+
+def _latest_rows(queryset) -> List[dict]:
+    """SensorDataSerializer 와 같은 키 구성의 dict 목록 (id 는 원시 데이터 ID)"""
+    rows = queryset.values(
+        'reading_id', 'equipment_id', 'equipment__code', 'equipment__name',
+        'sensor_type', 'sensor_id', *READING_FIELDS,
+    )
+    return [
+        {
+            'id': row.pop('reading_id'),
+            'equipment': row.pop('equipment_id'),
+            'equipment_code': row.pop('equipment__code'),
+            'equipment_name': row.pop('equipment__name'),
+            'sensor_type_display': SENSOR_TYPE_DISPLAY.get(row['sensor_type'], row['sensor_type']),
+            **row,
+        }
+        for row in rows
+    ]
+
+
+def refresh_cache(equipment_ids: Iterable[int]) -> Dict[int, List[dict]]:
+    """설비별 마지막 측정값 목록을 캐시에 기록"""
+    grouped: Dict[int, List[dict]] = {int(equipment_id): [] for equipment_id in equipment_ids}
+    for row in _latest_rows(SensorLatestValue.objects.filter(equipment_id__in=list(grouped))):
+        grouped[row['equipment']].append(row)
+    cache.set_many(
+        {cache_key(equipment_id): rows for equipment_id, rows in grouped.items()},
+        getattr(settings, 'SENSOR_LATEST_CACHE_TIMEOUT', 300),
+    )
+    return grouped
+
+
+def latest_values(equipment_id: Optional[int] = None, sensor_type: Optional[str] = None) -> List[dict]:
+    """센서별 마지막 측정값 (설비 지정 + 캐시 사용 시 캐시 우선)"""
+    if equipment_id is not None and cache_enabled():
+        rows = cache.get(cache_key(equipment_id))
+        if rows is None:
+            rows = refresh_cache([equipment_id])[int(equipment_id)]
+        if sensor_type:
+            rows = [row for row in rows if row['sensor_type'] == sensor_type]
+        return rows
+
+    queryset = SensorLatestValue.objects.all()
+    if equipment_id is not None:
+        queryset = queryset.filter(equipment_id=equipment_id)
+    if sensor_type:
+        queryset = queryset.filter(sensor_type=sensor_type)
+    return _latest_rows(queryset)
+
+
+def recent_values(limit: int = 10) -> List[dict]:
+    """가장 최근에 갱신된 센서들의 마지막 측정값"""
+    return _latest_rows(SensorLatestValue.objects.order_by('-timestamp')[:limit])
+
+
+def status_overview() -> Dict:
+    """설비 상태 / 위험도 / 가동률 / 센서 이상 현황 (설비 테이블과 상태 요약만 집계)"""
+    equipment = Equipment.objects.aggregate(
+        total_equipment=Count('id'),
+        operational=Count('id', filter=Q(status='OPERATIONAL')),
+        maintenance=Count('id', filter=Q(status='MAINTENANCE')),
+        breakdown=Count('id', filter=Q(status='BREAKDOWN')),
+        high_risk=Count('id', filter=Q(failure_probability__gte=70)),
+        avg_availability=Avg('availability_current'),
+    )
+    sensors = EquipmentStatusSummary.objects.aggregate(
+        sensor_count=Sum('sensor_count'),
+        abnormal_sensors=Sum('abnormal_sensor_count'),
+        sensor_alarm_equipment=Count('equipment', filter=Q(abnormal_sensor_count__gt=0)),
+    )
+
+    equipment['avg_availability'] = round(equipment['avg_availability'] or 0, 2)
+    equipment['sensor_count'] = sensors['sensor_count'] or 0
+    equipment['abnormal_sensors'] = sensors['abnormal_sensors'] or 0
+    equipment['sensor_alarm_equipment'] = sensors['sensor_alarm_equipment']
+    return equipment
@@ -0,0 +1,438 @@
+"""
+센서 시계열 저장 계층 (원시 → 1분 → 1시간)
+
+- 수집: record_readings() 가 새 원시 데이터 (SensorData) 를 1분 / 1시간 집계에 누적
+- 보존: compact_sensor_data() 가 보존 기간이 지난 원시 데이터를 시간 단위로 집계에 다시 계산한 뒤 삭제,
+  1분 / 1시간 집계도 각 보존 기간이 지나면 삭제 (보존 기간 0 = 영구 보존)
+- 조회: query_series() 가 조회 구간과 점 개수 한도에 맞는 해상도를 자동 선택
+
+버킷은 UTC epoch 기준으로 자른다 (1분 / 1시간 단위라 로컬 시간대와 경계가 같음).
+원시 데이터 보존 기간보다 오래된 측정 시각은 수집 단계에서 거부하므로 (sensor_ingest.py),
+이미 압축된 시간대에 원시 데이터가 다시 들어오지 않는다.
+"""
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Min, Sum
+from django.utils import timezone
+
+from predictive_maintenance.models import SensorData, SensorRollupHour, SensorRollupMinute
+
+logger = logging.getLogger(__name__)
+
+
+RESOLUTION_RAW = 'raw'
+RESOLUTION_MINUTE = '1m'
+RESOLUTION_HOUR = '1h'
+RESOLUTIONS = (RESOLUTION_RAW, RESOLUTION_MINUTE, RESOLUTION_HOUR)
+
+STAT_FIELDS = [
+    'sample_count', 'value_sum', 'value_min', 'value_max',
+    'last_value', 'last_timestamp', 'anomaly_count',
+]
+
+RAW_FIELDS = ['equipment_id', 'sensor_type', 'sensor_id', 'timestamp', 'value', 'is_normal']
+
+# (설비 ID, 센서 유형, 센서 ID, 버킷 시작 시각)
+SeriesKey = Tuple[int, str, str, datetime]
+
+
+@dataclass(frozen=True)
+class RollupTier:
+    """집계 단계 정의"""
+    resolution: str
+    model: type
+    seconds: int
+    retention_setting: str
+
+    @property
+    def retention_days(self) -> int:
+        return getattr(settings, self.retention_setting, 0)
+
+    def bucket_of(self, ts: datetime) -> datetime:
+        return floor_time(ts, self.seconds)
+
+
+MINUTE_TIER = RollupTier(RESOLUTION_MINUTE, SensorRollupMinute, 60, 'SENSOR_MINUTE_RETENTION_DAYS')
+HOUR_TIER = RollupTier(RESOLUTION_HOUR, SensorRollupHour, 3600, 'SENSOR_HOUR_RETENTION_DAYS')
+ROLLUP_TIERS = (MINUTE_TIER, HOUR_TIER)
+
+
+def floor_time(ts: datetime, seconds: int) -> datetime:
+    """UTC epoch 기준 seconds 단위 버킷 시작 시각"""
+    epoch = math.floor(ts.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % seconds, tz=dt_timezone.utc)
+
+
+def raw_retention_days() -> int:
+    return getattr(settings, 'SENSOR_RAW_RETENTION_DAYS', 7)
+
+
+def max_points_default() -> int:
+    return getattr(settings, 'SENSOR_SERIES_MAX_POINTS', 2000)
+
+
+# ----------------------------------------------------------------------
+# 집계 누적
+# ----------------------------------------------------------------------
+
+@dataclass
+class SeriesStats:
+    """한 버킷의 병합 가능한 집계 (필드명은 SensorRollupBase 와 동일)"""
+    sample_count: int
+    value_sum: float
+    value_min: float
+    value_max: float
+    last_value: float
+    last_timestamp: datetime
+    anomaly_count: int
+
+    @classmethod
+    def of(cls, value: float, timestamp: datetime, is_normal: bool) -> 'SeriesStats':
+        return cls(1, value, value, value, value, timestamp, 0 if is_normal else 1)
+
+    def merge_into(self, target) -> None:
+        """target (SeriesStats 또는 집계 모델 인스턴스) 에 이 집계를 더함"""
+        target.sample_count += self.sample_count
+        target.value_sum += self.value_sum
+        target.value_min = min(target.value_min, self.value_min)
+        target.value_max = max(target.value_max, self.value_max)
+        target.anomaly_count += self.anomaly_count
+        if self.last_timestamp >= target.last_timestamp:
+            target.last_value = self.last_value
+            target.last_timestamp = self.last_timestamp
+
+    def to_rollup(self, model: type, key: SeriesKey):
+        equipment_id, sensor_type, sensor_id, bucket = key
+        return model(
+            equipment_id=equipment_id, sensor_type=sensor_type, sensor_id=sensor_id, bucket=bucket,
+            **{name: getattr(self, name) for name in STAT_FIELDS}
+        )
+
+
+def summarize(rows: Iterable[tuple]) -> Dict[str, Dict[SeriesKey, SeriesStats]]:
+    """
+    원시 데이터 행 (RAW_FIELDS 순서) 을 단계별 버킷 집계로 요약
+
+    1시간 집계는 1분 집계를 병합해 만든다. 행 순서는 상관없음.
+    """
+    minute: Dict[SeriesKey, SeriesStats] = {}
+    for equipment_id, sensor_type, sensor_id, ts, value, is_normal in rows:
+        key = (equipment_id, sensor_type, sensor_id, MINUTE_TIER.bucket_of(ts))
+        stats = SeriesStats.of(value, ts, is_normal)
+        if key in minute:
+            stats.merge_into(minute[key])
+        else:
+            minute[key] = stats
+
+    hour: Dict[SeriesKey, SeriesStats] = {}
+    for (equipment_id, sensor_type, sensor_id, bucket), stats in minute.items():
+        key = (equipment_id, sensor_type, sensor_id, HOUR_TIER.bucket_of(bucket))
+        if key in hour:
+            stats.merge_into(hour[key])
+        else:
+            hour[key] = SeriesStats(**{name: getattr(stats, name) for name in STAT_FIELDS})
+
+    return {MINUTE_TIER.resolution: minute, HOUR_TIER.resolution: hour}
+
+
+def _merge_partials(tier: RollupTier, partials: Dict[SeriesKey, SeriesStats]) -> None:
+    """버킷 집계를 기존 집계 행에 병합 (없으면 생성)"""
+    model = tier.model
+    equipment_ids = {key[0] for key in partials}
+    buckets = {key[3] for key in partials}
+
+    # 같은 버킷을 동시에 처음 생성하면 유니크 제약 위반 → 생성된 행을 잠그고 한 번 더 병합
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                existing = {
+                    (row.equipment_id, row.sensor_type, row.sensor_id, row.bucket): row
+                    for row in model.objects.select_for_update().filter(
+                        equipment_id__in=equipment_ids, bucket__in=buckets,
+                    )
+                }
+                to_create, to_update = [], []
+                for key, stats in partials.items():
+                    row = existing.get(key)
+                    if row is None:
+                        to_create.append(stats.to_rollup(model, key))
+                    else:
+                        stats.merge_into(row)
+                        to_update.append(row)
+                if to_create:
+                    model.objects.bulk_create(to_create)
+                if to_update:
+                    model.objects.bulk_update(to_update, STAT_FIELDS)
+            return
+        except IntegrityError:
+            if attempt:
+                raise
+            logger.info(f"센서 집계 동시 생성 감지, 재시도: {tier.resolution}")
+
+
+def summarize_frame(frame: pd.DataFrame) -> Dict[str, Dict[SeriesKey, SeriesStats]]:
+    """
+    summarize() 의 벡터화 버전 (일괄 수집용)
+
+    frame 열: RAW_FIELDS (timestamp 는 UTC datetime64)
+    """
+    frame = frame.assign(
+        abnormal=~frame['is_normal'].astype(bool),
+        bucket=frame['timestamp'].dt.floor('min'),
+    ).sort_values('timestamp', kind='stable')
+    minute = frame.groupby(['equipment_id', 'sensor_type', 'sensor_id', 'bucket'], sort=False).agg(
+        sample_count=('value', 'size'),
+        value_sum=('value', 'sum'),
+        value_min=('value', 'min'),
+        value_max=('value', 'max'),
+        last_value=('value', 'last'),
+        last_timestamp=('timestamp', 'last'),
+        anomaly_count=('abnormal', 'sum'),
+    ).reset_index()
+
+    minute['hour'] = minute['bucket'].dt.floor('h')
+    hour = minute.sort_values('last_timestamp', kind='stable').groupby(
+        ['equipment_id', 'sensor_type', 'sensor_id', 'hour'], sort=False
+    ).agg(
+        sample_count=('sample_count', 'sum'),
+        value_sum=('value_sum', 'sum'),
+        value_min=('value_min', 'min'),
+        value_max=('value_max', 'max'),
+        last_value=('last_value', 'last'),
+        last_timestamp=('last_timestamp', 'last'),
+        anomaly_count=('anomaly_count', 'sum'),
+    ).reset_index().rename(columns={'hour': 'bucket'})
+
+    def to_stats(table: pd.DataFrame) -> Dict[SeriesKey, SeriesStats]:
+        return {
+            (int(row.equipment_id), row.sensor_type, row.sensor_id, row.bucket.to_pydatetime()): SeriesStats(
+                int(row.sample_count), float(row.value_sum), float(row.value_min), float(row.value_max),
+                float(row.last_value), row.last_timestamp.to_pydatetime(), int(row.anomaly_count),
+            )
+            for row in table.itertuples(index=False)
+        }
+
+    return {MINUTE_TIER.resolution: to_stats(minute), HOUR_TIER.resolution: to_stats(hour)}
+
+
+def merge_summary(partials: Dict[str, Dict[SeriesKey, SeriesStats]]) -> None:
+    """summarize() / summarize_frame() 결과를 1분 / 1시간 집계에 누적"""
+    for tier in ROLLUP_TIERS:
+        if partials[tier.resolution]:
+            _merge_partials(tier, partials[tier.resolution])
+
+
+def record_readings(readings: Iterable[SensorData]) -> int:
+    """저장된 원시 데이터를 1분 / 1시간 집계에 누적"""
+    rows = [
+        (r.equipment_id, r.sensor_type, r.sensor_id, r.timestamp, r.value, r.is_normal)
+        for r in readings
+    ]
+    if not rows:
+        return 0
+
+    merge_summary(summarize(rows))
+    return len(rows)
+
+
+# ----------------------------------------------------------------------
+# 재계산 / 보존 정책
+# ----------------------------------------------------------------------
+
+def rebuild_window(start: datetime, end: datetime) -> int:
+    """
+    [start, end) 구간 집계를 원시 데이터로부터 다시 계산
+
+    start / end 는 1시간 경계여야 한다. 원시 데이터가 없는 구간은 (이미 압축된 구간일 수 있으므로)
+    기존 집계를 그대로 둔다.
+    """
+    rows = (
+        SensorData.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        .order_by()
+        .values_list(*RAW_FIELDS)
+        .iterator(chunk_size=10000)
+    )
+    partials = summarize(rows)
+    raw_count = sum(stats.sample_count for stats in partials[HOUR_TIER.resolution].values())
+    if not raw_count:
+        return 0
+
+    with transaction.atomic():
+        for tier in ROLLUP_TIERS:
+            tier.model.objects.filter(bucket__gte=start, bucket__lt=end).delete()
+            tier.model.objects.bulk_create(
+                [stats.to_rollup(tier.model, key) for key, stats in partials[tier.resolution].items()],
+                batch_size=1000,
+            )
+    return raw_count
+
+
+def rebuild_rollups(start: datetime, end: datetime) -> Dict:
+    """구간 내 원시 데이터가 있는 시간대의 집계를 모두 다시 계산"""
+    window = timedelta(seconds=HOUR_TIER.seconds)
+    cursor = floor_time(start, HOUR_TIER.seconds)
+    hours = readings = 0
+
+    while cursor < end:
+        oldest = SensorData.objects.filter(
+            timestamp__gte=cursor, timestamp__lt=end
+        ).aggregate(oldest=Min('timestamp'))['oldest']
+        if oldest is None:
+            break
+        cursor = floor_time(oldest, HOUR_TIER.seconds)
+        readings += rebuild_window(cursor, cursor + window)
+        hours += 1
+        cursor += window
+
+    return {'rebuilt_hours': hours, 'readings': readings}
+
+
+def compact_sensor_data(now: Optional[datetime] = None) -> Dict:
+    """
+    보존 정책 적용
+
+    1. SENSOR_RAW_RETENTION_DAYS 가 지난 원시 데이터를 1시간 구간씩 집계로 다시 계산한 뒤 삭제
+    2. SENSOR_MINUTE_RETENTION_DAYS / SENSOR_HOUR_RETENTION_DAYS 가 지난 집계 삭제 (0 이면 보존)
+    """
+    now = now or timezone.now()
+    window = timedelta(seconds=HOUR_TIER.seconds)
+    raw_cutoff = floor_time(now - timedelta(days=raw_retention_days()), HOUR_TIER.seconds)
+
+    compacted_hours = raw_deleted = 0
+    while True:
+        oldest = SensorData.objects.filter(
+            timestamp__lt=raw_cutoff
+        ).aggregate(oldest=Min('timestamp'))['oldest']
+        if oldest is None:
+            break
+        start = floor_time(oldest, HOUR_TIER.seconds)
+        with transaction.atomic():
+            rebuild_window(start, start + window)
+            deleted, _ = SensorData.objects.filter(
+                timestamp__gte=start, timestamp__lt=start + window
+            ).delete()
+        compacted_hours += 1
+        raw_deleted += deleted
+
+    rollups_deleted = {}
+    for tier in ROLLUP_TIERS:
+        if not tier.retention_days:
+            continue
+        cutoff = floor_time(now - timedelta(days=tier.retention_days), HOUR_TIER.seconds)
+        rollups_deleted[tier.resolution], _ = tier.model.objects.filter(bucket__lt=cutoff).delete()
+
+    logger.info(
+        f"센서 데이터 압축 완료: {compacted_hours}시간, 원시 {raw_deleted}건 삭제, 집계 삭제 {rollups_deleted}"
+    )
+    return {
+        'raw_cutoff': raw_cutoff,
+        'compacted_hours': compacted_hours,
+        'raw_deleted': raw_deleted,
+        'rollups_deleted': rollups_deleted,
+    }
+
+
+# ----------------------------------------------------------------------
+# 조회
+# ----------------------------------------------------------------------
+
+def _series_filter(queryset, equipment_id, sensor_type=None, sensor_id=None):
+    queryset = queryset.filter(equipment_id=equipment_id)
+    if sensor_type:
+        queryset = queryset.filter(sensor_type=sensor_type)
+    if sensor_id:
+        queryset = queryset.filter(sensor_id=sensor_id)
+    return queryset
+
+
+def _covers(retention_days: int, start: datetime, now: datetime) -> bool:
+    return not retention_days or start >= now - timedelta(days=retention_days)
+
+
+def choose_resolution(equipment_id, start: datetime, end: datetime, sensor_type=None, sensor_id=None,
+                      max_points: Optional[int] = None, now: Optional[datetime] = None) -> str:
+    """
+    구간을 센서당 max_points 개 이하로 표현하는 가장 세밀한 해상도
+
+    - 원시: 보존 기간 안이고, 1시간 집계의 데이터 수 합계가 센서마다 max_points 이하
+    - 1분: 1분 집계 보존 기간 안이고, 구간 분 수가 max_points 이하
+    - 그 외: 1시간
+    """
+    max_points = max_points or max_points_default()
+    now = now or timezone.now()
+
+    if _covers(raw_retention_days(), start, now):
+        counts = _series_filter(
+            SensorRollupHour.objects, equipment_id, sensor_type, sensor_id
+        ).filter(
+            bucket__gte=HOUR_TIER.bucket_of(start), bucket__lt=end
+        ).values('sensor_type', 'sensor_id').annotate(total=Sum('sample_count')).values_list('total', flat=True)
+        if all(total <= max_points for total in counts):
+            return RESOLUTION_RAW
+
+    span_seconds = (end - start).total_seconds()
+    if _covers(MINUTE_TIER.retention_days, start, now) and span_seconds / MINUTE_TIER.seconds <= max_points:
+        return RESOLUTION_MINUTE
+    return RESOLUTION_HOUR
+
+
+def _raw_points(equipment_id, start, end, sensor_type, sensor_id) -> List[dict]:
+    return list(
+        _series_filter(SensorData.objects, equipment_id, sensor_type, sensor_id)
+        .filter(timestamp__gte=start, timestamp__lt=end)
+        .order_by('timestamp')
+        .values('id', 'sensor_type', 'sensor_id', 'value', 'unit', 'is_normal', 'anomaly_score', 'timestamp')
+    )
+
+
+def _rollup_points(tier: RollupTier, equipment_id, start, end, sensor_type, sensor_id) -> List[dict]:
+    rows = (
+        _series_filter(tier.model.objects, equipment_id, sensor_type, sensor_id)
+        .filter(bucket__gte=tier.bucket_of(start), bucket__lt=end)
+        .order_by('bucket', 'sensor_type', 'sensor_id')
+        .values_list(
+            'sensor_type', 'sensor_id', 'bucket',
+            'sample_count', 'value_sum', 'value_min', 'value_max', 'last_value', 'anomaly_count',
+        )
+    )
+    return [
+        {
+            'sensor_type': sensor_type_,
+            'sensor_id': sensor_id_,
+            'timestamp': bucket,
+            'value': value_sum / count if count else None,
+            'min': value_min,
+            'max': value_max,
+            'last': last_value,
+            'count': count,
+            'anomaly_count': anomaly_count,
+        }
+        for sensor_type_, sensor_id_, bucket, count, value_sum, value_min, value_max, last_value, anomaly_count
+        in rows
+    ]
+
+
+def query_series(equipment_id, start: datetime, end: datetime, sensor_type=None, sensor_id=None,
+                 resolution: str = 'auto', max_points: Optional[int] = None) -> Tuple[str, List[dict]]:
+    """
+    설비 센서 시계열 조회
+
+    Returns:
+        (해상도, 점 목록) - 원시 해상도는 측정값 그대로, 집계 해상도는 버킷별 평균을 value 로 반환
+    """
+    if resolution == 'auto':
+        resolution = choose_resolution(equipment_id, start, end, sensor_type, sensor_id, max_points)
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"지원하지 않는 해상도: {resolution}")
+
+    if resolution == RESOLUTION_RAW:
+        return resolution, _raw_points(equipment_id, start, end, sensor_type, sensor_id)
+    tier = MINUTE_TIER if resolution == RESOLUTION_MINUTE else HOUR_TIER
+    return resolution, _rollup_points(tier, equipment_id, start, end, sensor_type, sensor_id)
@@ -0,0 +1,11 @@
+"""
+예지보전 Signals
+설비 / 고장 예측 변경 시 대시보드 리소스 버전 증가 (smart_spc/resource_versions.py)
+센서 측정값은 bulk 저장이므로 services/sensor_state.record_latest 에서 직접 증가
+"""
+from smart_spc.resource_versions import track
+
+from .models import Equipment, FailurePrediction
+
+track(Equipment, 'equipment', scope='pk')
+track(FailurePrediction, 'equipment', scope='equipment_id')
@@ -1,3 +1,498 @@
-from django.test import TestCase
+"""
+Tests for sensor ingestion and storage (predictive_maintenance/services/)
 
-# Create your tests here.
+sensor_ingest.py (일괄 수집), sensor_timeseries.py (1분 / 1시간 집계, 보존 정책),
+sensor_state.py (센서별 마지막 측정값 / 설비 상태 요약)
+"""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from predictive_maintenance.models import (
+    Equipment, EquipmentStatusSummary, FailurePrediction, SensorBaseline, SensorData, SensorLatestValue,
+    SensorRollupHour,
+)
+from predictive_maintenance.serializers import SensorDataSerializer
+from predictive_maintenance.services import sensor_ingest, sensor_state, sensor_timeseries
+from predictive_maintenance.services.sensor_ingest import IngestError, parse_payload
+from predictive_maintenance.services.sensor_timeseries import (
+    HOUR_TIER, MINUTE_TIER, RAW_FIELDS, STAT_FIELDS, choose_resolution, compact_sensor_data, merge_summary, summarize,
+)
+
+
+@pytest.fixture
+def equipment():
+    return Equipment.objects.create(code='CNC-01', name='CNC 1호기', category='CNC', installation_date=date(2020, 1, 1))
+
+
+def _baseline(values=(), threshold_min=None, threshold_max=None):
+    values = np.asarray(values, dtype=float)
+    return SensorBaseline(
+        sample_count=len(values),
+        mean=float(values.mean()) if len(values) else 0.0,
+        m2=float(((values - values.mean()) ** 2).sum()) if len(values) else 0.0,
+        threshold_min=threshold_min,
+        threshold_max=threshold_max,
+    )
+
+
+class TestParsePayload:
+    """입력 형식 → DataFrame"""
+
+    def test_row_formats(self):
+        row = {'equipment': 1, 'sensor_type': 'VIBRATION', 'sensor_id': 'V1', 'value': 1.5}
+        for frame in (
+            parse_payload(data=[row, row]),
+            parse_payload(data={'readings': [row, row]}),
+            parse_payload('application/x-ndjson', body=b'{"equipment": 1, "value": 1.5}\n\n{"value": 2}\n'),
+        ):
+            assert len(frame) == 2
+            assert list(frame.columns) == sensor_ingest.INGEST_FIELDS
+
+    def test_columnar_broadcasts_scalars(self):
+        frame = parse_payload(data={'equipment_code': 'CNC-01', 'sensor_type': 'TEMPERATURE',
+                                    'sensor_id': 'T1', 'value': [1.0, 2.0, 3.0]})
+        assert frame['value'].tolist() == [1.0, 2.0, 3.0]
+        assert frame['equipment_code'].tolist() == ['CNC-01'] * 3
+
+    @pytest.mark.parametrize('kwargs', [
+        {'data': []},
+        {'data': 'text'},
+        {'data': [1, 2]},
+        {'data': {'value': [1, 2], 'timestamp': [1]}},
+        {'data': {'sensor_id': 'V1'}},
+        {'content_type': 'application/x-ndjson', 'body': b'{"value": 1}\nnot json'},
+    ])
+    def test_invalid_payload(self, kwargs):
+        with pytest.raises(IngestError):
+            parse_payload(**kwargs)
+
+    def test_batch_limit(self, settings):
+        settings.SENSOR_INGEST_MAX_BATCH = 2
+        with pytest.raises(IngestError):
+            parse_payload(data={'value': [1, 2, 3]})
+
+
+@pytest.mark.django_db
+class TestValidate:
+    """행 단위 검증 (잘못된 행만 제외)"""
+
+    def test_rejects_invalid_rows_with_index(self, equipment):
+        now = timezone.now()
+        frame = parse_payload(data=[
+            {'equipment': equipment.id, 'sensor_type': 'vibration', 'sensor_id': 'V1', 'value': 1.0},
+            {'equipment': 9999, 'sensor_type': 'VIBRATION', 'sensor_id': 'V1', 'value': 1.0},
+            {'equipment_code': 'CNC-01', 'sensor_type': 'SMELL', 'sensor_id': 'V1', 'value': 1.0},
+            {'equipment': equipment.id, 'sensor_type': 'VIBRATION', 'sensor_id': '', 'value': 1.0},
+            {'equipment': equipment.id, 'sensor_type': 'VIBRATION', 'sensor_id': 'V1', 'value': 'abc'},
+            {'equipment': equipment.id, 'sensor_type': 'VIBRATION', 'sensor_id': 'V1', 'value': 1.0,
+             'timestamp': (now + timedelta(hours=1)).isoformat()},
+            {'equipment': equipment.id, 'sensor_type': 'VIBRATION', 'sensor_id': 'V1', 'value': 1.0,
+             'timestamp': 'yesterday'},
+            {'equipment_code': 'CNC-01', 'sensor_type': 'VIBRATION', 'sensor_id': 'V1', 'value': 2.0,
+             'timestamp': (now - timedelta(minutes=1)).timestamp()},
+        ])
+
+        result = sensor_ingest.ingest_readings(frame, now)
+
+        assert (result.received, result.created, result.rejected) == (8, 2, 6)
+        assert [e['index'] for e in result.errors] == [1, 2, 3, 4, 5, 6]
+        assert result.errors[0]['error'] == 'unknown equipment'
+        assert result.errors[4]['error'] == 'timestamp is in the future'
+        assert SensorData.objects.filter(equipment=equipment, sensor_type='VIBRATION').count() == 2
+
+
+class TestScoring:
+    """임계값 / 이상 점수 / 기준 통계 병합"""
+
+    def test_thresholds_fall_back_to_baseline(self):
+        baselines = [_baseline(threshold_min=0.0, threshold_max=10.0), _baseline()]
+        scores = sensor_ingest.score_batch(
+            np.array([11.0, 5.0, 11.0, 100.0]), np.array([0, 0, 0, 1]),
+            np.array([np.nan, np.nan, np.nan, np.nan]), np.array([np.nan, np.nan, 20.0, np.nan]),
+            baselines,
+        )
+        assert scores['breach'].tolist() == [True, False, False, False]
+        assert scores['threshold_max'][:3].tolist() == [10.0, 10.0, 20.0]
+        # 임계값이 없고 기준 표본이 부족한 센서는 정상
+        assert scores['is_normal'].tolist() == [False, True, True, True]
+
+    def test_z_score_against_mature_baseline(self, settings):
+        settings.SENSOR_BASELINE_MIN_SAMPLES = 30
+        history = np.random.default_rng(0).normal(10.0, 2.0, 200)
+        baselines = [_baseline(history), _baseline(history[:10])]
+        values = np.array([10.0, history.mean() + 5 * history.std(), 1000.0])
+        scores = sensor_ingest.score_batch(values, np.array([0, 0, 1]), np.full(3, np.nan), np.full(3, np.nan), baselines)
+
+        assert scores['score'][0] < 1.0
+        assert scores['score'][1] == pytest.approx(5.0, abs=1e-3)
+        assert scores['anomaly'].tolist() == [False, True, False]
+
+    def test_baseline_merge_matches_full_recompute(self, settings):
+        settings.SENSOR_BASELINE_WINDOW = 10 ** 9
+        rng = np.random.default_rng(1)
+        history = [rng.normal(5.0, 1.0, 50), np.array([])]
+        baselines = [_baseline(history[0]), _baseline()]
+        values = rng.normal(6.0, 2.0, 40)
+        codes = np.array([0, 1] * 20)
+        is_normal = np.ones(40, dtype=bool)
+        is_normal[::7] = False
+
+        sensor_ingest.update_baselines(baselines, values, codes, is_normal)
+
+        for code, baseline in enumerate(baselines):
+            expected = np.concatenate([history[code], values[(codes == code) & is_normal]])
+            assert baseline.sample_count == len(expected)
+            assert baseline.mean == pytest.approx(expected.mean())
+            assert baseline.m2 / baseline.sample_count == pytest.approx(expected.var())
+
+    def test_baseline_window_caps_sample_count(self, settings):
+        settings.SENSOR_BASELINE_WINDOW = 100
+        baselines = [_baseline(np.linspace(0, 1, 100))]
+        sensor_ingest.update_baselines(baselines, np.linspace(0, 1, 50), np.zeros(50, dtype=int), np.ones(50, dtype=bool))
+        assert baselines[0].sample_count == 100
+
+
+@pytest.mark.django_db
+class TestIngest:
+    """배치 저장 / 기준 통계 / 고장 예측"""
+
+    def test_baseline_persisted_across_batches(self, equipment, settings):
+        settings.SENSOR_BASELINE_WINDOW = 10 ** 9
+        rng = np.random.default_rng(2)
+        batches = [rng.normal(20.0, 0.5, 30), rng.normal(20.5, 0.5, 20)]
+        for values in batches:
+            sensor_ingest.ingest_readings(parse_payload(data={
+                'equipment': equipment.id, 'sensor_type': 'TEMPERATURE', 'sensor_id': 'T1',
+                'threshold_max': 80.0, 'value': values.tolist(),
+            }))
+
+        baseline = SensorBaseline.objects.get(equipment=equipment, sensor_id='T1')
+        expected = np.concatenate(batches)
+        assert baseline.sample_count == 50
+        assert baseline.mean == pytest.approx(expected.mean())
+        assert baseline.m2 == pytest.approx(((expected - expected.mean()) ** 2).sum())
+        assert baseline.threshold_max == 80.0
+
+    def test_anomalies_create_one_prediction_per_equipment(self, equipment, settings):
+        settings.SENSOR_ALERT_MIN_ANOMALIES = 5
+        payload = {'equipment': equipment.id, 'sensor_type': 'VIBRATION', 'sensor_id': 'V1', 'threshold_max': 5.0}
+        sensor_ingest.ingest_readings(parse_payload(data={**payload, 'value': [1.0] * 10}))
+
+        result = sensor_ingest.ingest_readings(parse_payload(data={**payload, 'value': [9.0] * 6 + [1.0] * 4}))
+
+        assert result.threshold_breaches == 6
+        assert len(result.predictions) == 1
+        prediction = FailurePrediction.objects.get(pk=result.predictions[0])
+        assert prediction.equipment_id == equipment.id
+        assert prediction.model_type == sensor_ingest.MODEL_TYPE
+        assert prediction.severity == 'CRITICAL'
+
+        # 재알림 억제: 같은 등급의 미확인 예측이 있으면 새로 만들지 않음
+        again = sensor_ingest.ingest_readings(parse_payload(data={**payload, 'value': [9.0] * 6}))
+        assert again.predictions == []
+
+
+@pytest.mark.django_db
+class TestSensorDataList:
+    """GET sensor-data/ (커서 페이지네이션 + values() 응답)"""
+
+    @pytest.fixture
+    def readings(self, equipment):
+        now = timezone.now().replace(microsecond=0)
+        return SensorData.objects.bulk_create([
+            SensorData(equipment=equipment, sensor_type='VIBRATION', sensor_id='V1', value=float(i),
+                       timestamp=now - timedelta(seconds=i // 2))
+            for i in range(12)
+        ])
+
+    def test_cursor_pages_match_serializer(self, api_client, readings):
+        url, rows = f"{reverse('pm-sensor-data-list')}?page_size=5", []
+        while url:
+            body = api_client.get(url).json()
+            rows.extend(body['results'])
+            url = body['next']
+
+        queryset = SensorData.objects.select_related('equipment').order_by('-timestamp', '-id')
+        assert rows == [dict(item) for item in SensorDataSerializer(queryset, many=True).data]
+
+    def test_fields_and_invalid_cursor(self, api_client, readings):
+        url = reverse('pm-sensor-data-list')
+        body = api_client.get(f'{url}?fields=sensor_id,value&page_size=20').json()
+        assert [list(row) for row in body['results']] == [['sensor_id', 'value']] * 12
+
+        assert api_client.get(f'{url}?cursor=bogus').status_code == 404
+
+
+# ----------------------------------------------------------------------
+# 센서 시계열 집계 (sensor_timeseries.py)
+# ----------------------------------------------------------------------
+
+ROLLUP_START = datetime(2024, 3, 1, 9, 0, tzinfo=dt_timezone.utc)
+
+
+def _raw_rows(equipment_ids, start=ROLLUP_START, hours=3, seed=0):
+    """(RAW_FIELDS 순서) 센서 2개 × 설비별, 시각 중복 없는 불규칙 간격, 섞인 순서"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for equipment_id in equipment_ids:
+        for sensor_type, sensor_id in (('VIBRATION', 'V1'), ('TEMPERATURE', 'T1')):
+            seconds = np.sort(rng.choice(hours * 3600, size=hours * 40, replace=False))
+            for second in seconds.tolist():
+                rows.append((
+                    equipment_id, sensor_type, sensor_id, start + timedelta(seconds=second),
+                    float(rng.normal(20.0, 3.0)), bool(rng.random() > 0.1),
+                ))
+    rng.shuffle(rows)
+    return rows
+
+
+def _raw_aggregates(rows, tier):
+    """원시 행을 pandas 로 직접 집계 → {(설비, 유형, 센서, 버킷): 통계 dict}"""
+    frame = pd.DataFrame(rows, columns=RAW_FIELDS)
+    frame['bucket'] = [tier.bucket_of(ts) for ts in frame['timestamp']]
+    frame = frame.sort_values('timestamp')
+    result = {}
+    for key, group in frame.groupby(['equipment_id', 'sensor_type', 'sensor_id', 'bucket']):
+        result[key] = {
+            'sample_count': len(group),
+            'value_sum': group['value'].sum(),
+            'value_min': group['value'].min(),
+            'value_max': group['value'].max(),
+            'last_value': group['value'].iloc[-1],
+            'last_timestamp': group['timestamp'].iloc[-1],
+            'anomaly_count': int((~group['is_normal']).sum()),
+        }
+    return result
+
+
+def _assert_stats(actual, expected):
+    assert set(actual) == set(expected)
+    for key, stats in expected.items():
+        row = actual[key]
+        for name in STAT_FIELDS:
+            value = getattr(row, name) if not isinstance(row, dict) else row[name]
+            if name == 'value_sum':
+                assert value == pytest.approx(stats[name]), (key, name)
+            else:
+                assert value == stats[name], (key, name)
+
+
+def _stored(tier):
+    return {
+        (row.equipment_id, row.sensor_type, row.sensor_id, row.bucket): row
+        for row in tier.model.objects.all()
+    }
+
+
+class TestRollupSummaries:
+    """버킷 집계 = 원시 집계"""
+
+    @pytest.mark.parametrize('tier', [MINUTE_TIER, HOUR_TIER], ids=['1m', '1h'])
+    def test_summarize_matches_raw(self, tier):
+        rows = _raw_rows([1, 2])
+        _assert_stats(summarize(rows)[tier.resolution], _raw_aggregates(rows, tier))
+
+    @pytest.mark.parametrize('tier', [MINUTE_TIER, HOUR_TIER], ids=['1m', '1h'])
+    def test_summarize_frame_matches_summarize(self, tier):
+        rows = _raw_rows([1, 2], seed=1)
+        frame = pd.DataFrame(rows, columns=RAW_FIELDS)
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], utc=True)
+
+        _assert_stats(sensor_timeseries.summarize_frame(frame)[tier.resolution], _raw_aggregates(rows, tier))
+
+
+@pytest.mark.django_db
+class TestRollupStorage:
+    """DB 집계 병합 / 압축"""
+
+    @pytest.fixture
+    def equipments(self, equipment):
+        other = Equipment.objects.create(code='CNC-02', name='CNC 2호기', category='CNC',
+                                         installation_date=date(2021, 1, 1))
+        return [equipment.id, other.id]
+
+    def test_merged_batches_match_raw(self, equipments):
+        rows = _raw_rows(equipments, seed=2)
+        # 같은 버킷이 여러 배치에 걸치고, 늦게 도착한 과거 데이터가 last_value 를 덮지 않아야 함
+        batches = [rows[i::3] for i in range(3)]
+        batches[1].sort(key=lambda row: row[3], reverse=True)
+        for batch in batches:
+            merge_summary(summarize(batch))
+
+        for tier in (MINUTE_TIER, HOUR_TIER):
+            _assert_stats(_stored(tier), _raw_aggregates(rows, tier))
+
+    def test_compaction_keeps_summaries_and_drops_raw(self, equipments, settings):
+        settings.SENSOR_RAW_RETENTION_DAYS = 7
+        settings.SENSOR_MINUTE_RETENTION_DAYS = 30
+        settings.SENSOR_HOUR_RETENTION_DAYS = 0
+        now = datetime(2024, 6, 1, 12, 30, tzinfo=dt_timezone.utc)
+        old = _raw_rows(equipments, start=now - timedelta(days=10), hours=2, seed=3)
+        recent = _raw_rows(equipments, start=now - timedelta(days=2), hours=1, seed=4)
+        expired = _raw_rows(equipments[:1], start=now - timedelta(days=40), hours=1, seed=5)
+        SensorData.objects.bulk_create([SensorData(**dict(zip(RAW_FIELDS, row))) for row in old + recent + expired])
+        # 오래된 데이터 일부만 집계된 상태 (압축 시 원시 데이터로 다시 계산되어야 함)
+        merge_summary(summarize(old[::2] + recent + expired))
+
+        result = compact_sensor_data(now)
+
+        assert result['raw_deleted'] == len(old) + len(expired)
+        assert result['compacted_hours'] == len({HOUR_TIER.bucket_of(row[3]) for row in old + expired}) == 5
+        assert result['raw_cutoff'] == datetime(2024, 5, 25, 12, tzinfo=dt_timezone.utc)
+        assert SensorData.objects.count() == len(recent)
+        assert not SensorData.objects.filter(timestamp__lt=result['raw_cutoff']).exists()
+
+        # 1시간 집계는 영구 보존, 1분 집계는 30일 지난 버킷 삭제
+        _assert_stats(_stored(HOUR_TIER), _raw_aggregates(old + recent + expired, HOUR_TIER))
+        _assert_stats(_stored(MINUTE_TIER), _raw_aggregates(old + recent, MINUTE_TIER))
+        assert result['rollups_deleted'] == {MINUTE_TIER.resolution: len(_raw_aggregates(expired, MINUTE_TIER))}
+
+        # 다시 실행해도 변화 없음
+        again = compact_sensor_data(now)
+        assert (again['compacted_hours'], again['raw_deleted']) == (0, 0)
+        _assert_stats(_stored(HOUR_TIER), _raw_aggregates(old + recent + expired, HOUR_TIER))
+
+
+@pytest.mark.django_db
+class TestChooseResolution:
+    """해상도 선택 경계 (보존 기간 / 점 개수 한도)"""
+
+    NOW = datetime(2024, 6, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+    @pytest.fixture(autouse=True)
+    def retention(self, settings):
+        settings.SENSOR_RAW_RETENTION_DAYS = 7
+        settings.SENSOR_MINUTE_RETENTION_DAYS = 30
+
+    def _choose(self, equipment, start, end, max_points):
+        return choose_resolution(equipment.id, start, end, max_points=max_points, now=self.NOW)
+
+    def _hour_rollup(self, equipment, sensor_id, bucket, count):
+        SensorRollupHour.objects.create(
+            equipment=equipment, sensor_type='VIBRATION', sensor_id=sensor_id, bucket=bucket, sample_count=count,
+            value_sum=float(count), value_min=1.0, value_max=1.0, last_value=1.0, last_timestamp=bucket,
+        )
+
+    def test_raw_point_limit_per_sensor(self, equipment):
+        start, end = self.NOW - timedelta(hours=3), self.NOW
+        self._hour_rollup(equipment, 'V1', start, 60)
+        self._hour_rollup(equipment, 'V1', start + timedelta(hours=1), 40)
+        self._hour_rollup(equipment, 'V2', start, 100)
+        # 구간 밖 버킷은 세지 않음
+        self._hour_rollup(equipment, 'V1', end, 500)
+
+        # 센서별 합계 (V1 60 + 40, V2 100) 가 한도 이하 → 원시 (센서 간 합계 200 은 무관)
+        assert self._choose(equipment, start, end, max_points=100) == 'raw'
+        # 원시 한도 초과 + 180분 구간 > 99 → 1시간
+        assert self._choose(equipment, start, end, max_points=99) == '1h'
+        # 시작 시각이 버킷 중간이면 그 버킷도 포함
+        assert self._choose(equipment, start + timedelta(minutes=30), end, max_points=100) == 'raw'
+
+    def test_raw_retention_boundary(self, equipment):
+        edge = self.NOW - timedelta(days=7)
+        assert self._choose(equipment, edge, edge + timedelta(hours=1), max_points=100) == 'raw'
+        assert self._choose(equipment, edge - timedelta(seconds=1), edge + timedelta(hours=1), max_points=100) == '1m'
+
+    def test_minute_span_and_retention_boundary(self, equipment):
+        start = self.NOW - timedelta(days=10)
+        assert self._choose(equipment, start, start + timedelta(minutes=120), max_points=120) == '1m'
+        assert self._choose(equipment, start, start + timedelta(minutes=121), max_points=120) == '1h'
+
+        edge = self.NOW - timedelta(days=30)
+        assert self._choose(equipment, edge, edge + timedelta(minutes=60), max_points=120) == '1m'
+        assert self._choose(equipment, edge - timedelta(seconds=1), edge + timedelta(minutes=60), max_points=120) == '1h'
+
+    def test_zero_retention_keeps_finest_resolution(self, equipment, settings):
+        settings.SENSOR_RAW_RETENTION_DAYS = 0
+        start = self.NOW - timedelta(days=365)
+        assert self._choose(equipment, start, start + timedelta(hours=1), max_points=10) == 'raw'
+
+
+# ----------------------------------------------------------------------
+# 센서 현재 상태 (sensor_state.py)
+# ----------------------------------------------------------------------
+
+def _reading(equipment, sensor_id, value, timestamp, is_normal=True, anomaly_score=0.0, sensor_type='VIBRATION'):
+    return SensorData(equipment=equipment, sensor_type=sensor_type, sensor_id=sensor_id, value=value,
+                      timestamp=timestamp, is_normal=is_normal, anomaly_score=anomaly_score)
+
+
+def _latest(equipment):
+    return {row.sensor_id: row for row in SensorLatestValue.objects.filter(equipment=equipment)}
+
+
+@pytest.mark.django_db
+class TestSensorState:
+    """마지막 측정값 / 상태 요약"""
+
+    def test_late_arrival_does_not_overwrite_newer_state(self, equipment):
+        now = timezone.now()
+        newer, = SensorData.objects.bulk_create([_reading(equipment, 'V1', 2.0, now)])
+        sensor_state.record_latest([newer])
+
+        # 나중에 도착한 과거 측정값 (id 는 더 큼)
+        older, = SensorData.objects.bulk_create([_reading(equipment, 'V1', 1.0, now - timedelta(minutes=5))])
+        sensor_state.record_latest([older])
+
+        latest = _latest(equipment)['V1']
+        assert (latest.reading_id, latest.value, latest.timestamp) == (newer.id, 2.0, now)
+
+    def test_rebuild_picks_latest_timestamp_then_id(self, equipment):
+        now = timezone.now()
+        rows = SensorData.objects.bulk_create([
+            _reading(equipment, 'V1', 2.0, now),
+            _reading(equipment, 'V1', 1.0, now - timedelta(minutes=5)),  # 늦게 도착 (id 최대)
+            _reading(equipment, 'V2', 3.0, now - timedelta(minutes=1)),
+            _reading(equipment, 'V2', 4.0, now - timedelta(minutes=1)),  # 같은 시각 → id 큰 쪽
+            _reading(equipment, 'V1', 9.0, now, sensor_type='TEMPERATURE'),
+        ])
+
+        assert sensor_state.rebuild_latest(chunk_size=2) == 3
+
+        latest = {
+            (row.sensor_type, row.sensor_id): (row.reading_id, row.value)
+            for row in SensorLatestValue.objects.filter(equipment=equipment)
+        }
+        assert latest == {
+            ('VIBRATION', 'V1'): (rows[0].id, 2.0),
+            ('VIBRATION', 'V2'): (rows[3].id, 4.0),
+            ('TEMPERATURE', 'V1'): (rows[4].id, 9.0),
+        }
+
+    def test_refresh_summaries_aggregates_latest_values(self, equipment):
+        other = Equipment.objects.create(code='CNC-02', name='CNC 2호기', category='CNC',
+                                         installation_date=date(2021, 1, 1))
+        now = timezone.now().replace(microsecond=0)
+        readings = SensorData.objects.bulk_create([
+            _reading(equipment, 'V1', 1.0, now - timedelta(minutes=3), is_normal=False, anomaly_score=4.5),
+            _reading(equipment, 'V2', 1.0, now - timedelta(minutes=1), anomaly_score=0.5),
+            _reading(equipment, 'V3', 1.0, now - timedelta(minutes=2), is_normal=False, anomaly_score=3.0),
+            _reading(other, 'V1', 1.0, now - timedelta(minutes=9), anomaly_score=0.1),
+        ])
+        sensor_state.record_latest(readings)
+
+        summaries = {s.equipment_id: s for s in EquipmentStatusSummary.objects.all()}
+        summary = summaries[equipment.id]
+        assert (summary.sensor_count, summary.abnormal_sensor_count) == (3, 2)
+        assert summary.max_anomaly_score == 4.5
+        assert summary.last_reading_at == now - timedelta(minutes=1)
+        other_summary = summaries[other.id]
+        assert (other_summary.sensor_count, other_summary.abnormal_sensor_count) == (1, 0)
+        assert other_summary.last_reading_at == now - timedelta(minutes=9)
+
+        # V1 이 정상으로 돌아오면 해당 설비 요약만 갱신 (행은 설비당 1개 유지)
+        recovered, = SensorData.objects.bulk_create([_reading(equipment, 'V1', 1.0, now, anomaly_score=0.2)])
+        sensor_state.record_latest([recovered])
+
+        summary.refresh_from_db()
+        assert (summary.sensor_count, summary.abnormal_sensor_count) == (3, 1)
+        assert summary.max_anomaly_score == 3.0
+        assert summary.last_reading_at == now
+        assert EquipmentStatusSummary.objects.count() == 2
+
+        assert sensor_state.status_overview()['abnormal_sensors'] == 1
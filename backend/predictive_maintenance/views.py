@@ -2,8 +2,15 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
 from django.db.models import Q, Count, Avg
 from django.utils import timezone
+from datetime import timedelta
+
+from smart_spc.api_mixins import ValuesListMixin
+from smart_spc.pagination import KeysetCursorPagination
+from smart_spc.renderers import ORJSONRenderer
+from smart_spc.resource_versions import versioned_response
 
 from .models import Equipment, SensorData, MaintenanceRecord, FailurePrediction, MaintenancePlan
 from .serializers import (
@@ -13,6 +20,7 @@ from .serializers import (
     FailurePredictionSerializer, FailurePredictionCreateSerializer,
     MaintenancePlanSerializer, MaintenancePlanCreateSerializer
 )
+from .services import sensor_ingest, sensor_state, sensor_timeseries
 
 
 class EquipmentViewSet(viewsets.ModelViewSet):
@@ -32,22 +40,40 @@ class EquipmentViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def sensor_data(self, request, pk=None):
-        """센서 데이터 조회"""
+        """센서 데이터 조회
+
+        조회 구간 / 점 개수 한도 (max_points, 센서당) 에 맞춰 원시 / 1분 / 1시간 집계 중 해상도를 자동 선택
+        (resolution=raw|1m|1h 로 지정 가능, 선택된 해상도는 X-Series-Resolution 헤더)
+        """
         equipment = self.get_object()
         sensor_type = request.query_params.get('sensor_type')
-        hours = int(request.query_params.get('hours', 24))
-
-        queryset = equipment.sensor_data.all()
-        if sensor_type:
-            queryset = queryset.filter(sensor_type=sensor_type)
+        sensor_id = request.query_params.get('sensor_id')
+        resolution = request.query_params.get('resolution', 'auto')
+        try:
+            hours = float(request.query_params.get('hours', 24))
+            max_points = int(request.query_params.get('max_points', 0)) or None
+        except ValueError:
+            return Response(
+                {'error': 'hours and max_points must be numbers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if resolution != 'auto' and resolution not in sensor_timeseries.RESOLUTIONS:
+            return Response(
+                {'error': f"resolution must be one of: auto, {', '.join(sensor_timeseries.RESOLUTIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        from django.utils import timezone
-        from datetime import timedelta
-        cutoff_time = timezone.now() - timedelta(hours=hours)
-        queryset = queryset.filter(timestamp__gte=cutoff_time)
+        end = timezone.now()
+        start = end - timedelta(hours=hours)
+        resolution, points = sensor_timeseries.query_series(
+            equipment.id, start, end,
+            sensor_type=sensor_type, sensor_id=sensor_id,
+            resolution=resolution, max_points=max_points,
+        )
 
-        serializer = SensorDataSerializer(queryset, many=True)
-        return Response(serializer.data)
+        response = Response(points)
+        response['X-Series-Resolution'] = resolution
+        return response
 
     @action(detail=True, methods=['get'])
     def maintenance_history(self, request, pk=None):
@@ -78,25 +104,14 @@ class EquipmentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
+    @versioned_response('equipment')
     def dashboard(self, request):
-        """설비 대시보드 데이터"""
-        total_equipment = Equipment.objects.count()
-        operational = Equipment.objects.filter(status='OPERATIONAL').count()
-        maintenance = Equipment.objects.filter(status='MAINTENANCE').count()
-        breakdown = Equipment.objects.filter(status='BREAKDOWN').count()
-
-        # 고장 위험 설비
-        high_risk = Equipment.objects.filter(
-            failure_probability__gte=70
-        ).count()
-
-        # 가동률 평균
-        avg_availability = Equipment.objects.aggregate(
-            avg=Avg('availability_current')
-        )['avg'] or 0
+        """설비 대시보드 데이터
 
-        # 최근 센서 데이터
-        recent_sensor_data = SensorData.objects.select_related('equipment').order_by('-timestamp')[:10]
+        상태 / 위험도 / 가동률 / 최근 센서값은 설비 테이블과 센서 현재 상태 저장소에서만 읽음
+        (센서 데이터 이력 크기와 무관)
+        """
+        data = sensor_state.status_overview()
 
         # 긴급 예측
         critical_predictions = FailurePrediction.objects.filter(
@@ -104,21 +119,13 @@ class EquipmentViewSet(viewsets.ModelViewSet):
             is_acknowledged=False
         ).select_related('equipment').order_by('-predicted_failure_date')[:5]
 
-        data = {
-            'total_equipment': total_equipment,
-            'operational': operational,
-            'maintenance': maintenance,
-            'breakdown': breakdown,
-            'high_risk': high_risk,
-            'avg_availability': round(avg_availability, 2),
-            'recent_sensor_data': SensorDataSerializer(recent_sensor_data, many=True).data,
-            'critical_predictions': FailurePredictionSerializer(critical_predictions, many=True).data,
-        }
+        data['recent_sensor_data'] = sensor_state.recent_values(10)
+        data['critical_predictions'] = FailurePredictionSerializer(critical_predictions, many=True).data
 
         return Response(data)
 
 
-class SensorDataViewSet(viewsets.ModelViewSet):
+class SensorDataViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """센서 데이터 ViewSet"""
 
     queryset = SensorData.objects.select_related('equipment').all()
@@ -129,27 +136,74 @@ class SensorDataViewSet(viewsets.ModelViewSet):
     ordering_fields = ['timestamp', 'value']
     ordering = ['-timestamp']
 
+    # 목록: 측정 시각 커서 페이지네이션 + values() 응답 (SensorDataSerializer 와 같은 필드)
+    pagination_class = KeysetCursorPagination
+    renderer_classes = [ORJSONRenderer]
+    paginate_always = True
+    cursor_ordering = ('-timestamp', '-id')
+    list_values = {
+        'id': 'id',
+        'sensor_type_display': 'sensor_type',
+        'equipment_code': 'equipment__code',
+        'equipment_name': 'equipment__name',
+        'equipment': 'equipment',
+        'sensor_type': 'sensor_type',
+        'sensor_id': 'sensor_id',
+        'value': 'value',
+        'unit': 'unit',
+        'threshold_min': 'threshold_min',
+        'threshold_max': 'threshold_max',
+        'is_normal': 'is_normal',
+        'anomaly_score': 'anomaly_score',
+        'timestamp': 'timestamp',
+    }
+    list_choice_labels = {'sensor_type_display': 'sensor_type'}
+
+    def perform_create(self, serializer):
+        # 원시 데이터 저장과 1분 / 1시간 집계 누적, 센서 최신값 갱신을 함께 처리
+        with transaction.atomic():
+            reading = serializer.save()
+            sensor_timeseries.record_readings([reading])
+            sensor_state.record_latest([reading])
+
     @action(detail=False, methods=['get'])
     def latest(self, request):
-        """최신 센서 데이터"""
+        """최신 센서 데이터 (센서별 마지막 측정값 저장소에서 조회)"""
         equipment_id = request.query_params.get('equipment')
         sensor_type = request.query_params.get('sensor_type')
 
-        queryset = self.queryset
         if equipment_id:
-            queryset = queryset.filter(equipment_id=equipment_id)
-        if sensor_type:
-            queryset = queryset.filter(sensor_type=sensor_type)
-
-        # 그룹별 최신 데이터
-        from django.db.models import Max
-        latest_ids = queryset.values('equipment', 'sensor_type').annotate(
-            latest_id=Max('id')
-        ).values_list('latest_id', flat=True)
-
-        queryset = self.queryset.filter(id__in=latest_ids)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+            try:
+                equipment_id = int(equipment_id)
+            except ValueError:
+                return Response(
+                    {'error': 'equipment must be an integer'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        return Response(sensor_state.latest_values(equipment_id or None, sensor_type))
+
+    @action(detail=False, methods=['post'], url_path='ingest')
+    def ingest(self, request):
+        """
+        센서 데이터 일괄 수집 (게이트웨이용)
+
+        JSON 배열 / {"readings": [...]} / 컬럼형 JSON / NDJSON (application/x-ndjson) 지원.
+        잘못된 행은 errors 에 사유를 담아 제외하고 나머지는 저장한다.
+        """
+        try:
+            if sensor_ingest.is_ndjson(request.content_type):
+                frame = sensor_ingest.parse_payload(request.content_type, body=request.body)
+            else:
+                frame = sensor_ingest.parse_payload(request.content_type, data=request.data)
+            result = sensor_ingest.ingest_readings(frame)
+        except sensor_ingest.IngestError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            result.to_dict(),
+            status=status.HTTP_201_CREATED if result.created else status.HTTP_400_BAD_REQUEST
+        )
 
 
 class MaintenanceRecordViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,124 @@
+"""
+대용량 목록 API 공통 Mixin
+
+- ?fields=id,measured_at,... 로 응답 필드 선택 (sparse fieldset)
+- SparseFieldsetMixin: ModelSerializer 에서 요청하지 않은 필드 제거 (조회 / 목록 공통)
+- ValuesListMixin: 목록 조회를 serializer 인스턴스 대신 queryset.values() dict 로 응답
+  (필요한 컬럼만 SELECT, 관계 필드는 JOIN 경로로 조회, 출력 형식은 기존 serializer 와 같음)
+"""
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+FIELDS_QUERY_PARAM = 'fields'
+
+
+def requested_fields(request) -> Optional[Set[str]]:
+    """?fields= 로 요청한 필드 이름 (없으면 None = 전체)"""
+    if request is None or request.method != 'GET':
+        return None
+    value = request.query_params.get(FIELDS_QUERY_PARAM)
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def datetime_formatter():
+    """DateTimeField.to_representation 과 같은 결과 (ISO 8601 + 현재 시간대는 시간대 조회를 한 번만)"""
+    field = serializers.DateTimeField()
+    tz = field.default_timezone()
+    if (api_settings.DATETIME_FORMAT or '').lower() != ISO_8601 or tz is None:
+        return field.to_representation
+
+    def to_representation(value):
+        if timezone.is_aware(value):
+            value = value.astimezone(tz)
+        text = value.isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return to_representation
+
+
+class SparseFieldsetMixin:
+    """?fields= 에 없는 필드를 응답에서 제거 (모르는 이름은 무시)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class ValuesListMixin:
+    """
+    values() 기반 목록 응답
+
+    list_values: {응답 필드: ORM 조회 경로} (기존 serializer 의 필드와 같은 이름 / 순서)
+    list_choice_labels: {응답 필드: choices 필드} (get_FOO_display 대응)
+    """
+    list_values: Dict[str, str] = {}
+    list_choice_labels: Dict[str, str] = {}
+
+    def list(self, request, *args, **kwargs):
+        if not self.list_values:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = requested_fields(request)
+        output = [name for name in self.list_values if fields is None or name in fields]
+        if fields is not None and not output:
+            output = list(self.list_values)
+
+        # 커서 위치 계산에 필요한 정렬 컬럼은 요청하지 않았어도 함께 조회
+        selected = list(output)
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, 'get_ordering'):
+            for field in paginator.get_ordering(request, queryset, self):
+                name = field.lstrip('-')
+                if name not in selected:
+                    selected.append(name)
+
+        rows = self._values(queryset, selected)
+        page = self.paginate_queryset(rows)
+        rows = self._to_representation(page if page is not None else rows, output)
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
+
+    def _values(self, queryset, selected):
+        plain, expressions = [], {}
+        for name in selected:
+            lookup = self.list_choice_labels.get(name) or self.list_values.get(name, name)
+            if lookup == name:
+                plain.append(name)
+            else:
+                expressions[name] = F(lookup)
+        return queryset.select_related(None).values(*plain, **expressions)
+
+    def _to_representation(self, rows, output):
+        """serializer 와 같은 출력: 시각은 현재 시간대 ISO 8601, choices 는 표시 이름"""
+        model = self.get_queryset().model
+        labels = {
+            name: dict(model._meta.get_field(field).flatchoices)
+            for name, field in self.list_choice_labels.items() if name in output
+        }
+        to_datetime = datetime_formatter()
+
+        # 페이지네이터가 다음 커서 계산에 원본 행을 쓰므로 새 dict 로 변환
+        result = []
+        for row in rows:
+            item = {}
+            for name in output:
+                value = row[name]
+                if isinstance(value, datetime):
+                    value = to_datetime(value)
+                elif name in labels and value is not None:
+                    value = str(labels[name].get(value, value))
+                item[name] = value
+            result.append(item)
+        return result
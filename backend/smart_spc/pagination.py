@@ -0,0 +1,60 @@
+"""
+프로젝트 공통 목록 페이지네이션 (커서 / keyset 방식)
+
+- 정렬 컬럼 값의 위치로 다음 페이지를 조회 (OFFSET 없음) → 페이지 깊이와 관계없이 인덱스 범위 조회 한 번
+- 정렬 우선순위: ?ordering= (OrderingFilter) → 뷰의 cursor_ordering → 쿼리셋 order_by → 모델 Meta.ordering,
+  마지막에 pk 를 붙여 같은 시각의 행도 순서가 고정되도록 함
+- 대용량 목록 뷰 (paginate_always = True) 는 항상 페이지 단위로 응답,
+  그 외 뷰는 cursor / page_size 파라미터가 있을 때만 페이지네이션 (기존 배열 응답 호환)
+- 응답: {"next": url, "previous": url, "results": [...]} (전체 건수 COUNT 는 하지 않음)
+- 기본 페이지네이션이 다른 설정 (config.settings.dev 는 PageNumberPagination) 에서도 동작하도록
+  대용량 목록 뷰는 pagination_class 로 직접 지정
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+from rest_framework.settings import api_settings
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class KeysetCursorPagination(CursorPagination):
+    """인덱스가 있는 시각 컬럼 + pk 기준 커서 페이지네이션"""
+    # PAGE_SIZE 가 없는 설정에서도 paginate_always 뷰는 페이지 단위로 응답
+    page_size = api_settings.PAGE_SIZE or DEFAULT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 1000)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        requested = (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
+        if not requested and not getattr(view, 'paginate_always', False):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering_filters = [
+            backend for backend in getattr(view, 'filter_backends', [])
+            if hasattr(backend, 'get_ordering')
+        ]
+        if ordering_filters and request.query_params.get(ordering_filters[0].ordering_param):
+            return super().get_ordering(request, queryset, view)
+
+        ordering = (
+            getattr(view, 'cursor_ordering', None)
+            or queryset.query.order_by
+            or queryset.model._meta.ordering
+        )
+        # 관계 경로 / 표현식 정렬은 행에서 커서 위치를 읽을 수 없으므로 pk 정렬로 대체
+        if not all(isinstance(field, str) and '__' not in field for field in ordering):
+            ordering = ()
+        return self._with_pk(tuple(ordering), queryset.model._meta.pk.name)
+
+    @staticmethod
+    def _with_pk(ordering, pk_name):
+        names = {field.lstrip('-') for field in ordering}
+        if pk_name in names or 'pk' in names:
+            return ordering
+        descending = ordering[0].startswith('-') if ordering else True
+        return ordering + (f"{'-' if descending else ''}{pk_name}",)
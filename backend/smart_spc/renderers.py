@@ -0,0 +1,51 @@
+"""
+orjson 기반 JSON 렌더러
+
+- 출력은 DRF JSONRenderer 와 같은 형식 (UTF-8, 공백 없음, UTC 시각 'Z' 표기, 숫자가 아닌 dict 키는 문자열)
+- orjson 이 직접 처리하지 못하는 값 (Decimal, 지연 번역 문자열, 시각 등) 은 DRF JSONEncoder 로 변환
+- orjson 미설치 또는 들여쓰기 요청 (Accept: application/json; indent=4) 시 JSONRenderer 로 동작
+
+text/event-stream 렌더러 (SSE 스트리밍 action 용)
+- Accept: text/event-stream 요청이 콘텐츠 협상 (406) 을 통과하도록 action 의 renderer_classes 에 추가
+- 스트리밍 응답은 렌더러를 거치지 않고, 검증 오류 등 일반 Response 는 이벤트 1개로 렌더링
+"""
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer 호환 orjson 렌더러"""
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            default=self.encoder.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+
+
+class EventStreamRenderer(BaseRenderer):
+    """일반 Response 를 SSE 이벤트 1개로 렌더링 (오류 응답은 'error', 그 외 'message')"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        response = (renderer_context or {}).get('response')
+        event = 'error' if response is not None and response.status_code >= 400 else 'message'
+        payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+        return f"event: {event}\ndata: {payload}\n\n".encode(self.charset)
@@ -0,0 +1,142 @@
+"""
+리소스 버전 카운터 / 버전 기반 HTTP 캐시 (대시보드 폴링용)
+
+- 리소스 (quality_alert, equipment 등) 전체 버전과 범위 (제품 / 설비 / 시나리오 ID) 별 버전을 Django cache 에 보관
+- 모델 시그널 (track) 또는 bulk 작업 후 bump() 로 커밋 시점에 버전 증가
+  (값은 시각 기반 → 키가 축출돼도 이전 값으로 돌아가지 않음)
+- versioned_response: 뷰가 의존하는 리소스 버전 + 경로 / 쿼리 + 시간 구간으로 ETag 계산
+  - If-None-Match 가 같으면 304 (집계 쿼리 실행 안 함)
+  - 같은 ETag 의 응답이 캐시에 있으면 그대로 반환, 없으면 계산 후 저장
+- 데이터 변경 없이도 바뀌는 시간 창 집계 (최근 7일 등) 는 HTTP_CACHE_BUCKET_SECONDS 구간마다 ETag 가 바뀌어 반영
+- 여러 워커가 같은 버전을 보려면 공유 캐시 백엔드 (Redis 등) 를 사용해야 한다
+"""
+import functools
+import hashlib
+import time
+from typing import Callable, List, Optional, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import patch_cache_control
+from rest_framework import status
+from rest_framework.response import Response
+
+
+KEY_PREFIX = 'resource_version'
+RESPONSE_KEY_PREFIX = 'http_cache'
+
+
+def cache_enabled() -> bool:
+    return getattr(settings, 'HTTP_CACHE_ENABLED', True)
+
+
+def version_key(resource: str, scope=None) -> str:
+    return f'{KEY_PREFIX}:{resource}' if scope is None else f'{KEY_PREFIX}:{resource}:{scope}'
+
+
+# ----------------------------------------------------------------------
+# 버전 카운터
+# ----------------------------------------------------------------------
+
+def bump(resource: str, *scopes) -> None:
+    """리소스 전체 버전과 범위별 버전 증가 (트랜잭션 안이면 커밋 후)"""
+    keys = [version_key(resource)] + [version_key(resource, scope) for scope in scopes if scope is not None]
+
+    def _bump():
+        version = time.time_ns()
+        cache.set_many({key: version for key in keys}, None)
+
+    transaction.on_commit(_bump)
+
+
+def current_versions(resources: List[str]) -> List[int]:
+    """리소스 버전 목록 (없으면 현재 시각으로 초기화)"""
+    keys = [version_key(resource) for resource in resources]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        versions.append(version)
+    return versions
+
+
+def track(model: Union[str, type], resource: str, scope: Optional[Union[str, Callable]] = None) -> None:
+    """
+    모델 저장 / 삭제 시 리소스 버전 증가
+
+    Args:
+        model: 모델 클래스 또는 'app_label.ModelName' (아직 로드되지 않은 모델도 연결됨)
+        scope: 범위 ID 속성 이름 (예: 'product_id') 또는 instance → ID 함수
+    """
+    def receiver(sender, instance, **kwargs):
+        value = scope(instance) if callable(scope) else getattr(instance, scope, None) if scope else None
+        bump(resource, value)
+
+    label = model if isinstance(model, str) else model._meta.label
+    for signal in (post_save, post_delete):
+        signal.connect(receiver, sender=model, weak=False, dispatch_uid=f'{KEY_PREFIX}:{resource}:{label}:{signal is post_save}')
+
+
+# ----------------------------------------------------------------------
+# 버전 기반 ETag / 응답 캐시
+# ----------------------------------------------------------------------
+
+def make_etag(request, resources: List[str], bucket_seconds: int) -> str:
+    versions = current_versions(resources)
+    bucket = int(time.time() // bucket_seconds) if bucket_seconds else 0
+    payload = f'{request.get_full_path()}|{"|".join(map(str, versions))}|{bucket}'
+    return f'"{hashlib.sha1(payload.encode()).hexdigest()}"'
+
+
+def _etag_matches(request, etag: str) -> bool:
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return etag in candidates or '*' in candidates
+
+
+def _finalize(response: Response, etag: str) -> Response:
+    response['ETag'] = etag
+    # 브라우저는 응답을 보관하되 매번 If-None-Match 로 재검증
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def versioned_response(*resources: str, timeout: Optional[int] = None, bucket_seconds: Optional[int] = None):
+    """
+    GET 뷰 (ViewSet action) 응답을 리소스 버전 기준으로 재사용
+
+    Args:
+        resources: 응답이 의존하는 리소스 이름 (bump / track 에서 쓰는 이름)
+        timeout: 응답 캐시 보관 시간 (기본 HTTP_CACHE_TIMEOUT)
+        bucket_seconds: 시간 구간 길이 (기본 HTTP_CACHE_BUCKET_SECONDS, 0 이면 버전만 사용)
+    """
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != 'GET' or not cache_enabled():
+                return view_method(self, request, *args, **kwargs)
+
+            bucket = bucket_seconds if bucket_seconds is not None else getattr(settings, 'HTTP_CACHE_BUCKET_SECONDS', 60)
+            etag = make_etag(request, list(resources), bucket)
+            if _etag_matches(request, etag):
+                return _finalize(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+            key = f'{RESPONSE_KEY_PREFIX}:{etag.strip(chr(34))}'
+            data = cache.get(key)
+            if data is not None:
+                return _finalize(Response(data), etag)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout or getattr(settings, 'HTTP_CACHE_TIMEOUT', 300))
+                _finalize(response, etag)
+            return response
+        return wrapper
+    return decorator
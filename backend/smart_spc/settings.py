@@ -58,6 +58,7 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -164,13 +165,18 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',  # 읽기는 허용
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'smart_spc.renderers.ORJSONRenderer',  # orjson 미설치 시 JSONRenderer 와 동일
     ),
     'DEFAULT_PARSER_CLASSES': (
         'rest_framework.parsers.JSONParser',
     ),
+    # 커서 페이지네이션: 대용량 목록 뷰 (paginate_always) 는 항상, 그 외는 ?cursor= / ?page_size= 지정 시
+    'DEFAULT_PAGINATION_CLASS': 'smart_spc.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', '100')),
     'EXCEPTION_HANDLER': 'smart_spc.exceptions.custom_exception_handler',
 }
+# ?page_size= 로 요청할 수 있는 최대 페이지 크기
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '1000'))
 
 # JWT Settings
 from datetime import timedelta
@@ -216,3 +222,37 @@ CORS_ALLOW_METHODS = [
     'POST',
     'PUT',
 ]
+
+# 예지 보전 센서 시계열 보존 정책 (predictive_maintenance/services/sensor_timeseries.py)
+# 원시 데이터는 보존 기간이 지나면 1분 / 1시간 집계로 압축 후 삭제 (manage.py compact_sensor_data)
+SENSOR_RAW_RETENTION_DAYS = int(os.getenv('SENSOR_RAW_RETENTION_DAYS', '7'))
+# 집계 보존 기간 (일, 0 = 영구 보존)
+SENSOR_MINUTE_RETENTION_DAYS = int(os.getenv('SENSOR_MINUTE_RETENTION_DAYS', '90'))
+SENSOR_HOUR_RETENTION_DAYS = int(os.getenv('SENSOR_HOUR_RETENTION_DAYS', '0'))
+# 시계열 조회 시 센서당 최대 점 개수 (해상도 자동 선택 기준)
+SENSOR_SERIES_MAX_POINTS = int(os.getenv('SENSOR_SERIES_MAX_POINTS', '2000'))
+# 센서 최신값 저장소 캐시 미러 (predictive_maintenance/services/sensor_state.py)
+# 워커 간 공유되는 캐시 백엔드 (Redis 등) 를 사용할 때만 켤 것
+SENSOR_LATEST_CACHE_ENABLED = os.getenv('SENSOR_LATEST_CACHE_ENABLED', 'False').lower() == 'true'
+SENSOR_LATEST_CACHE_TIMEOUT = int(os.getenv('SENSOR_LATEST_CACHE_TIMEOUT', '300'))
+
+# 센서 데이터 일괄 수집 (predictive_maintenance/services/sensor_ingest.py)
+# 요청당 최대 측정값 수 / INSERT 배치 크기
+SENSOR_INGEST_MAX_BATCH = int(os.getenv('SENSOR_INGEST_MAX_BATCH', '50000'))
+SENSOR_INGEST_INSERT_BATCH = int(os.getenv('SENSOR_INGEST_INSERT_BATCH', '2000'))
+# 장비 시계 오차로 허용하는 미래 시각 (초)
+SENSOR_INGEST_MAX_FUTURE_SECONDS = int(os.getenv('SENSOR_INGEST_MAX_FUTURE_SECONDS', '300'))
+# 이상 판정 |z| 기준 / 판정 시작에 필요한 기준 표본 수 / 기준 통계 유효 표본 수 상한
+SENSOR_ANOMALY_Z_THRESHOLD = float(os.getenv('SENSOR_ANOMALY_Z_THRESHOLD', '4.0'))
+SENSOR_BASELINE_MIN_SAMPLES = int(os.getenv('SENSOR_BASELINE_MIN_SAMPLES', '30'))
+SENSOR_BASELINE_WINDOW = int(os.getenv('SENSOR_BASELINE_WINDOW', '10000'))
+# 배치 내 설비별 이상 건수가 이 값 이상이면 고장 예측 생성, 같은 설비 재알림 억제 시간 (분)
+SENSOR_ALERT_MIN_ANOMALIES = int(os.getenv('SENSOR_ALERT_MIN_ANOMALIES', '5'))
+SENSOR_ALERT_COOLDOWN_MINUTES = int(os.getenv('SENSOR_ALERT_COOLDOWN_MINUTES', '10'))
+
+# 대시보드 HTTP 캐시 (smart_spc/resource_versions.py)
+# 리소스 버전 기반 ETag / 응답 캐시 사용 여부, 응답 보관 시간 (초),
+# 데이터 변경 없이 시간 창 집계를 다시 계산하는 주기 (초, 0 = 리소스 버전만 사용)
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'True').lower() == 'true'
+HTTP_CACHE_TIMEOUT = int(os.getenv('HTTP_CACHE_TIMEOUT', '300'))
+HTTP_CACHE_BUCKET_SECONDS = int(os.getenv('HTTP_CACHE_BUCKET_SECONDS', '60'))